@@ -0,0 +1,188 @@
+import json
+import platform
+import random
+import sqlite3
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import UTC, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+import django
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client, override_settings
+
+from application.benchmarks.harness import measure
+from application.presentation.deals import views
+from application.presentation.deals.serializers import DealSerializer
+from application.usecase.deals.create_deal import CreateDealUseCase
+from application.usecase.deals.get_deal_by_id import GetDealByIdUseCase
+from application.usecase.deals.get_deals_page import GetDealsPageUseCase
+from core.models import CompanyModel, DealModel
+from domain.deals.entity import DealEntity
+from domain.deals.filters import DealFilters
+from infra.cache.deals.cached_repository import CachedDealRepository
+from infra.db.deals.db_repository import DealRepositoryDB
+from infra.db.deals.seed import TITLE_WORDS, seed_deals
+
+# Deals per page in the list cases, as requested by typical clients.
+PAGE_SIZE = 50
+
+Operation = Callable[[int], object]
+
+
+@contextmanager
+def bench_database(path: Path) -> Iterator[None]:
+    """Point the default database at a SQLite file, migrated, for the block."""
+    connection = connections[DEFAULT_DB_ALIAS]
+    original = connection.settings_dict["NAME"]
+    connection.close()
+    connection.settings_dict["NAME"] = str(path)
+    try:
+        call_command("migrate", verbosity=0, interactive=False)
+        yield
+    finally:
+        connection.close()
+        connection.settings_dict["NAME"] = original
+
+
+def deal_cases(size: int) -> dict[str, Operation]:
+    """Return the operations measured on a database of `size` seeded deals.
+
+    Each operation gets the index of its iteration, from which it draws the
+    deals and companies it reads or writes, so every run reads the same ones.
+    """
+    repository = DealRepositoryDB()
+    companies = CompanyModel._default_manager.count()
+    client = Client()
+
+    def draw(index: int, high: int) -> int:
+        # Not for security: reproducible picks.
+        return random.Random(index).randint(1, high)  # noqa: S311
+
+    def title(index: int) -> str:
+        return TITLE_WORDS[index % len(TITLE_WORDS)]
+
+    page = repository.get_page(limit=PAGE_SIZE).deals
+    get_page = GetDealsPageUseCase(repository)
+    get_by_id = GetDealByIdUseCase(repository)
+    create = CreateDealUseCase(repository)
+
+    return {
+        "repository.get_one": lambda index: repository.get_one(draw(index, size)),
+        "repository.get_page": lambda index: repository.get_page(limit=PAGE_SIZE),
+        "repository.get_page.value_desc": lambda index: repository.get_page(
+            limit=PAGE_SIZE, ordering="-value"
+        ),
+        "repository.get_page.company": lambda index: repository.get_page(
+            limit=PAGE_SIZE, filters=DealFilters(company_id=draw(index, companies))
+        ),
+        "repository.search": lambda index: repository.search(title(index), PAGE_SIZE),
+        "repository.get_stats": lambda index: repository.get_stats(
+            "company", list(range(1, min(companies, 100) + 1))
+        ),
+        "repository.update": lambda index: repository.update(
+            deal_id=draw(index, size),
+            title=None,
+            distributor_id=None,
+            tags=None,
+            value=Decimal(index % 1000 + 1),
+        ),
+        "usecase.get_deals_page": lambda index: get_page.execute(limit=PAGE_SIZE),
+        "usecase.get_deal_by_id": lambda index: get_by_id.execute(draw(index, size)),
+        "usecase.create_deal": lambda index: create.execute(
+            title=f"Bench deal {index}",
+            company_id=draw(index, companies),
+            value=Decimal("100.00"),
+            tags=[1, 2],
+        ),
+        "domain.from_model": lambda index: [
+            DealEntity.from_model(model)
+            for model in DealModel._default_manager.filter(
+                id__gt=draw(index, size)
+            ).order_by("id")[:PAGE_SIZE]
+        ],
+        "serializer.deals": lambda index: DealSerializer(page, many=True).data,
+        "http.list": lambda index: client.get(f"/api/deals/?limit={PAGE_SIZE}"),
+        "http.list.company": lambda index: client.get(
+            f"/api/deals/?limit={PAGE_SIZE}&company_id={draw(index, companies)}"
+        ),
+        "http.detail": lambda index: client.get(f"/api/deals/{draw(index, size)}/"),
+        "http.search": lambda index: client.get(f"/api/deals/search?q={title(index)}"),
+        "http.create": lambda index: client.post(
+            "/api/deals/",
+            {"title": f"Bench deal {index}", "company_id": 1, "value": "100.00"},
+            content_type="application/json",
+        ),
+    }
+
+
+def run_suite(
+    sizes: list[int],
+    directory: Path,
+    iterations: int,
+    only: str | None = None,
+    report: Callable[[str], None] = print,
+) -> dict[str, Any]:
+    """Run the benchmark cases on a database of each size, returning the results.
+
+    Seeded databases are kept in `directory` and reused by later runs. Writes
+    done by a run are kept too: they add far fewer deals than any size.
+
+    Args:
+        sizes: Numbers of deals to seed
+        directory: Directory of the seeded databases
+        iterations: Timed calls of each case
+        only: Prefix of the names of the cases to run, if not all
+        report: Callable receiving a progress line per case
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    results: dict[str, Any] = {
+        "meta": {
+            "date": datetime.now(UTC).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.machine(),
+        },
+        "sizes": {},
+    }
+
+    # Debug cursors would log every query, adding their own overhead.
+    with override_settings(DEBUG=False):
+        for size in sizes:
+            with bench_database(directory / f"deals-{size}.sqlite3"):
+                if not DealModel._default_manager.exists():
+                    report(f"Seeding {size} deals...")
+                    seed_deals(size)
+                # The views' cache would serve deals of the previous database.
+                if isinstance(views.deal_repository, CachedDealRepository):
+                    views.deal_repository.local_cache.clear()
+
+                cases = results["sizes"].setdefault(str(size), {})
+                for name, operation in deal_cases(size).items():
+                    if only and not name.startswith(only):
+                        continue
+                    result = measure(operation, iterations)
+                    cases[name] = asdict(result)
+                    report(
+                        f"{size:>9} {name:<34} p50 {result.p50_ms:8.3f} ms  "
+                        f"p95 {result.p95_ms:8.3f} ms  {result.queries:>3} queries  "
+                        f"{result.peak_memory_kib:9.1f} KiB"
+                    )
+    return results
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    """Read the results of an earlier run."""
+    results: dict[str, Any] = json.loads(path.read_text())
+    return results
+
+
+def save_results(results: dict[str, Any], path: Path) -> None:
+    """Write the results of a run as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2) + "\n")
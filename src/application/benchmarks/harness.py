@@ -0,0 +1,116 @@
+import math
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Latency increases below this are noise, whatever the tolerance.
+MIN_REGRESSION_MS = 0.05
+
+
+@dataclass(frozen=True)
+class CaseResult:
+    """Measurements of a benchmark case."""
+
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    ops_per_second: float
+    # SQL queries of one operation.
+    queries: int
+    # Peak of the memory allocated by one operation.
+    peak_memory_kib: float
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    """Return the nearest-rank percentile of sorted values."""
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[max(rank - 1, 0)]
+
+
+def measure(
+    operation: Callable[[int], object], iterations: int, warmup: int = 3
+) -> CaseResult:
+    """Measure an operation, called with the index of each iteration.
+
+    Latencies are timed without instrumentation. The queries and the memory
+    peak are then measured on one more call each, as counting queries and
+    tracing allocations slow operations down.
+    """
+    for index in range(warmup):
+        operation(index)
+
+    latencies = []
+    started = time.perf_counter()
+    for index in range(warmup, warmup + iterations):
+        start = time.perf_counter()
+        operation(index)
+        latencies.append((time.perf_counter() - start) * 1000)
+    elapsed = time.perf_counter() - started
+
+    index = warmup + iterations
+    with CaptureQueriesContext(connection) as queries:
+        operation(index)
+    # Read now: the next request resets the connection's query log.
+    query_count = len(queries)
+
+    tracemalloc.start()
+    try:
+        operation(index + 1)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return CaseResult(
+        iterations=iterations,
+        p50_ms=percentile(latencies, 50),
+        p95_ms=percentile(latencies, 95),
+        p99_ms=percentile(latencies, 99),
+        max_ms=latencies[-1],
+        ops_per_second=iterations / elapsed,
+        queries=query_count,
+        peak_memory_kib=peak / 1024,
+    )
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Return the regressions of results against a baseline.
+
+    A case regresses when its p95 latency grows by more than `tolerance` (a
+    fraction) or when it runs more queries. Cases missing from either side
+    are ignored.
+
+    Args:
+        results: Output of a benchmark run
+        baseline: Output of an earlier run
+        tolerance: Allowed relative increase of the p95 latency
+    """
+    regressions = []
+    for size, cases in results["sizes"].items():
+        for name, result in cases.items():
+            base = baseline.get("sizes", {}).get(size, {}).get(name)
+            if base is None:
+                continue
+            if (
+                result["p95_ms"] > base["p95_ms"] * (1 + tolerance)
+                and result["p95_ms"] - base["p95_ms"] > MIN_REGRESSION_MS
+            ):
+                regressions.append(
+                    f"{name} ({size} deals): p95 {result['p95_ms']:.3f} ms, "
+                    f"was {base['p95_ms']:.3f} ms"
+                )
+            if result["queries"] > base["queries"]:
+                regressions.append(
+                    f"{name} ({size} deals): {result['queries']} queries, "
+                    f"was {base['queries']}"
+                )
+    return regressions
@@ -0,0 +1,45 @@
+from typing import Any
+
+from django.test import TestCase
+
+from core.models import CompanyModel, DealModel
+
+from .harness import compare, measure, percentile
+
+
+def _results(p95_ms: float, queries: int) -> dict[str, Any]:
+    return {"sizes": {"1000": {"case": {"p95_ms": p95_ms, "queries": queries}}}}
+
+
+class HarnessTest(TestCase):
+    def test_percentile_is_nearest_rank(self) -> None:
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 95), 95.0)
+        self.assertEqual(percentile([3.0], 99), 3.0)
+
+    def test_measure_counts_queries_of_one_call(self) -> None:
+        CompanyModel.objects.create(id=1, name="Acme")
+        calls = []
+
+        def operation(index: int) -> None:
+            calls.append(index)
+            list(DealModel.objects.all())
+            list(CompanyModel.objects.all())
+
+        result = measure(operation, iterations=10, warmup=2)
+        self.assertEqual(calls, list(range(14)))
+        self.assertEqual(result.iterations, 10)
+        self.assertEqual(result.queries, 2)
+        self.assertLessEqual(result.p50_ms, result.p95_ms)
+        self.assertLessEqual(result.p99_ms, result.max_ms)
+        self.assertGreater(result.peak_memory_kib, 0)
+
+    def test_compare_flags_slower_cases_and_extra_queries(self) -> None:
+        baseline = _results(p95_ms=2.0, queries=2)
+        self.assertEqual(compare(_results(2.3, 2), baseline, tolerance=0.2), [])
+        self.assertEqual(len(compare(_results(2.5, 2), baseline, tolerance=0.2)), 1)
+        self.assertEqual(len(compare(_results(2.0, 3), baseline, tolerance=0.2)), 1)
+        # Tiny cases are not flagged for noise-level increases.
+        self.assertEqual(compare(_results(0.03, 1), _results(0.01, 1), tolerance=0.2), [])
+        self.assertEqual(compare(_results(9.0, 9), {"sizes": {}}, tolerance=0.2), [])
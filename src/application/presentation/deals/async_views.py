@@ -0,0 +1,278 @@
+import json
+from typing import Any
+
+from django.db import DEFAULT_DB_ALIAS
+from django.http import (
+    HttpRequest,
+    HttpResponseBase,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+
+from application.usecase.deals.create_deal import AsyncCreateDealUseCase
+from application.usecase.deals.delete_deal import AsyncDeleteDealUseCase
+from application.usecase.deals.export_deals import AsyncExportDealsUseCase
+from application.usecase.deals.get_deal_by_id import AsyncGetDealByIdUseCase
+from application.usecase.deals.get_deal_version import AsyncGetDealVersionUseCase
+from application.usecase.deals.get_deals_page import AsyncGetDealsPageUseCase
+from application.usecase.deals.get_deals_page_versions import (
+    AsyncGetDealsPageVersionsUseCase,
+)
+from application.usecase.deals.update_deal import AsyncUpdateDealUseCase
+from domain.deals.pagination import InvalidCursorError
+from domain.deals.repository import AsyncDealRepository
+from infra.cache.deals.cached_repository import (
+    AsyncCachedDealRepository,
+    CachedDealRepository,
+)
+from infra.db.deals.async_db_repository import (
+    AsyncDealRepositoryDB,
+    ThreadedDealRepository,
+)
+from infra.db.deals.shards import ShardMap
+from infra.metrics.deals.instrumented_repository import (
+    AsyncInstrumentedDealRepository,
+)
+from infra.metrics.instrumentation import instrument_usecase
+
+from .conditional import deal_etag, has_conditional_headers, page_etag, set_validators
+from .export import aiter_csv, aiter_ndjson
+from .serializers import (
+    DealCreateSerializer,
+    DealExportQuerySerializer,
+    DealIdSerializer,
+    DealListQuerySerializer,
+    DealSerializer,
+    DealUpdateSerializer,
+)
+from .views import deal_repository
+
+
+def async_deal_repository_from_settings(
+    repository: CachedDealRepository,
+) -> AsyncDealRepository:
+    """Build the async repository of the views, writing through the sync one.
+
+    Reads go to the async ORM behind the deal cache of the sync views, and
+    writes through the sync repository, so they keep invalidating that cache.
+    The async ORM reads a single database: with several shards configured in
+    `DEALS_SHARDS`, every call goes to the sync repository, in a thread.
+    """
+    shard_map = ShardMap.from_settings()
+    if len(shard_map.databases) > 1:
+        return ThreadedDealRepository(repository)
+    (alias,) = shard_map.databases
+    return AsyncCachedDealRepository(
+        AsyncDealRepositoryDB(
+            writer=repository, using=None if alias == DEFAULT_DB_ALIAS else alias
+        ),
+        repository,
+    )
+
+
+async_deal_repository = AsyncInstrumentedDealRepository.from_settings(
+    async_deal_repository_from_settings(deal_repository)
+)
+
+
+def _json_body(request: HttpRequest) -> dict[str, Any] | None:
+    """Return the JSON object sent in the request body, or None if malformed."""
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _malformed_body() -> JsonResponse:
+    """Return the response to a request body that is not a JSON object."""
+    return JsonResponse(
+        {"detail": "Expected a JSON object."}, status=status.HTTP_400_BAD_REQUEST
+    )
+
+
+def _not_found() -> JsonResponse:
+    """Return the response to a request for a missing deal."""
+    return JsonResponse({"error": "Deal not found"}, status=status.HTTP_404_NOT_FOUND)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncDealListCreateView(View):
+    """Async view for listing all deals and creating a new deal."""
+
+    http_method_names = ["get", "post"]
+    list_usecase: AsyncGetDealsPageUseCase = instrument_usecase(
+        AsyncGetDealsPageUseCase(async_deal_repository)
+    )
+    versions_usecase: AsyncGetDealsPageVersionsUseCase = instrument_usecase(
+        AsyncGetDealsPageVersionsUseCase(async_deal_repository)
+    )
+    create_usecase: AsyncCreateDealUseCase = instrument_usecase(
+        AsyncCreateDealUseCase(async_deal_repository)
+    )
+
+    async def get(self, request: HttpRequest) -> HttpResponseBase:
+        """List a page of deals, following the `next` cursor for the next page."""
+        serializer = DealListQuerySerializer(data=request.GET)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        query = serializer.page_query()
+        query_key = serializer.query_key()
+        try:
+            if has_conditional_headers(request):
+                versions = await self.versions_usecase.execute(**query)
+                etag = page_etag(
+                    query_key,
+                    versions[: query["limit"]],
+                    has_next=len(versions) > query["limit"],
+                )
+                not_modified = get_conditional_response(request, etag=etag)
+                if not_modified is not None:
+                    return set_validators(not_modified, etag)
+
+            page = await self.list_usecase.execute(**query)
+        except InvalidCursorError as exc:
+            return JsonResponse(
+                {"cursor": [str(exc)]}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        response = JsonResponse(
+            {
+                "deals": [DealSerializer(d).data for d in page.deals],
+                "next": page.next_cursor,
+            }
+        )
+        return set_validators(
+            response,
+            page_etag(
+                query_key,
+                [(d.id, d.updated_at) for d in page.deals],
+                has_next=page.next_cursor is not None,
+            ),
+        )
+
+    async def post(self, request: HttpRequest) -> JsonResponse:
+        """Create a new deal."""
+        data = _json_body(request)
+        if data is None:
+            return _malformed_body()
+
+        serializer = DealCreateSerializer(data=data)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        deal = await self.create_usecase.execute(**serializer.validated_data)
+        return JsonResponse(DealSerializer(deal).data, status=status.HTTP_201_CREATED)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncDealDetailView(View):
+    """Async view for retrieving, updating, and deleting a deal by id."""
+
+    http_method_names = ["get", "put", "delete"]
+    get_usecase: AsyncGetDealByIdUseCase = instrument_usecase(
+        AsyncGetDealByIdUseCase(async_deal_repository)
+    )
+    version_usecase: AsyncGetDealVersionUseCase = instrument_usecase(
+        AsyncGetDealVersionUseCase(async_deal_repository)
+    )
+    update_usecase: AsyncUpdateDealUseCase = instrument_usecase(
+        AsyncUpdateDealUseCase(async_deal_repository)
+    )
+    delete_usecase: AsyncDeleteDealUseCase = instrument_usecase(
+        AsyncDeleteDealUseCase(async_deal_repository)
+    )
+
+    async def get(self, request: HttpRequest, deal_id: int) -> HttpResponseBase:
+        """Retrieve a deal by id, answering conditional requests from its version.
+
+        If the deal changed, a cached copy older than that version is dropped.
+        """
+        serializer = DealIdSerializer(data={"deal_id": deal_id})
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        deal_id = serializer.validated_data["deal_id"]
+        updated_at = None
+        if has_conditional_headers(request):
+            updated_at = await self.version_usecase.execute(deal_id=deal_id)
+            if updated_at is None:
+                return _not_found()
+
+            etag = deal_etag(deal_id, updated_at)
+            not_modified = get_conditional_response(
+                request, etag=etag, last_modified=int(updated_at.timestamp())
+            )
+            if not_modified is not None:
+                return set_validators(not_modified, etag, updated_at)
+
+        deal = await self.get_usecase.execute(deal_id=deal_id, min_version=updated_at)
+        if deal is None:
+            return _not_found()
+
+        response = JsonResponse(DealSerializer(deal).data)
+        if deal.updated_at is not None:
+            set_validators(response, deal_etag(deal.id, deal.updated_at), deal.updated_at)
+        return response
+
+    async def put(self, request: HttpRequest, deal_id: int) -> JsonResponse:
+        """Update a deal by id."""
+        data = _json_body(request)
+        if data is None:
+            return _malformed_body()
+
+        serializer = DealUpdateSerializer(data={**data, "deal_id": deal_id})
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        deal = await self.update_usecase.execute(**serializer.validated_data)
+        if deal is None:
+            return _not_found()
+        return JsonResponse(DealSerializer(deal).data)
+
+    async def delete(self, request: HttpRequest, deal_id: int) -> JsonResponse:
+        """Delete a deal by id."""
+        serializer = DealIdSerializer(data={"deal_id": deal_id})
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        success = await self.delete_usecase.execute(
+            deal_id=serializer.validated_data["deal_id"]
+        )
+        if not success:
+            return _not_found()
+        return JsonResponse({"success": True})
+
+
+class AsyncDealExportView(View):
+    """Async view for streaming every deal as NDJSON or CSV."""
+
+    http_method_names = ["get"]
+    export_usecase: AsyncExportDealsUseCase = instrument_usecase(
+        AsyncExportDealsUseCase(async_deal_repository)
+    )
+
+    async def get(self, request: HttpRequest) -> HttpResponseBase:
+        """Stream all deals, encoding them batch by batch."""
+        serializer = DealExportQuerySerializer(data=request.GET)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        output = serializer.validated_data["output"]
+        deals = self.export_usecase.execute(
+            batch_size=serializer.validated_data["batch_size"]
+        )
+        if output == "csv":
+            response = StreamingHttpResponse(aiter_csv(deals), content_type="text/csv")
+        else:
+            response = StreamingHttpResponse(
+                aiter_ndjson(deals), content_type="application/x-ndjson"
+            )
+        response["Content-Disposition"] = f'attachment; filename="deals.{output}"'
+        return response
@@ -0,0 +1,129 @@
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any, cast
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.views import View
+
+from application.presentation.deals.async_views import (
+    AsyncDealDetailView,
+    AsyncDealExportView,
+    AsyncDealListCreateView,
+    async_deal_repository_from_settings,
+)
+from application.presentation.deals.views import deal_repository
+from core.models import CompanyModel, DealModel
+from infra.cache.deals.cached_repository import AsyncCachedDealRepository
+from infra.cache.lru import LRUCache
+from infra.db.deals.async_db_repository import ThreadedDealRepository
+
+
+def _async_view(view: type[View]) -> Callable[..., Awaitable[Any]]:
+    # The stubs type the view functions of async views as synchronous.
+    return cast(Callable[..., Awaitable[Any]], view.as_view())
+
+
+class AsyncDealViewsTest(TestCase):
+    def setUp(self) -> None:
+        self.factory = AsyncRequestFactory()
+        self.company = CompanyModel.objects.create(name="Test Company")
+        self.list_view = _async_view(AsyncDealListCreateView)
+        self.detail_view = _async_view(AsyncDealDetailView)
+
+    async def _create(self, title: str) -> dict[str, Any]:
+        request = self.factory.post(
+            "/api/deals/",
+            data={"title": title, "company_id": self.company.id, "value": "10.00"},
+            content_type="application/json",
+        )
+        response = await self.list_view(request)
+        self.assertEqual(response.status_code, 201)
+        deal: dict[str, Any] = json.loads(response.content)
+        return deal
+
+    async def test_create_and_list(self) -> None:
+        first = await self._create("First")
+        await self._create("Second")
+
+        response = await self.list_view(self.factory.get("/api/deals/", {"limit": 1}))
+        self.assertEqual(response.status_code, 200)
+        body = json.loads(response.content)
+        self.assertEqual(body["deals"], [first])
+        self.assertIsNotNone(body["next"])
+
+        etag = response["ETag"]
+        response = await self.list_view(
+            self.factory.get("/api/deals/", {"limit": 1}, headers={"if-none-match": etag})
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_invalid_query_and_body(self) -> None:
+        response = await self.list_view(self.factory.get("/api/deals/", {"cursor": "x"}))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("cursor", json.loads(response.content))
+
+        request = self.factory.post(
+            "/api/deals/", data="[1]", content_type="application/json"
+        )
+        self.assertEqual((await self.list_view(request)).status_code, 400)
+
+    async def test_detail_update_and_delete(self) -> None:
+        deal = await self._create("Deal")
+        url = f"/api/deals/{deal['id']}/"
+
+        response = await self.detail_view(self.factory.get(url), deal_id=deal["id"])
+        self.assertEqual(json.loads(response.content), deal)
+        self.assertIn("Last-Modified", response)
+
+        request = self.factory.put(
+            url, data={"title": "Renamed"}, content_type="application/json"
+        )
+        response = await self.detail_view(request, deal_id=deal["id"])
+        self.assertEqual(json.loads(response.content)["title"], "Renamed")
+
+        response = await self.detail_view(self.factory.delete(url), deal_id=deal["id"])
+        self.assertEqual(json.loads(response.content), {"success": True})
+
+        response = await self.detail_view(self.factory.get(url), deal_id=deal["id"])
+        self.assertEqual(response.status_code, 404)
+
+    async def test_detail_drops_a_cached_copy_older_than_the_deal(self) -> None:
+        deal = await self._create("Deal")
+        url = f"/api/deals/{deal['id']}/"
+
+        with patch.object(deal_repository, "local_cache", LRUCache(100, 60)):
+            response = await self.detail_view(self.factory.get(url), deal_id=deal["id"])
+            etag = response["ETag"]
+            # Updated by another process, whose invalidation does not reach here.
+            deal_model = await DealModel.objects.aget(id=deal["id"])
+            deal_model.title = "New"
+            await sync_to_async(deal_model.save)()
+
+            request = self.factory.get(url, headers={"if-none-match": etag})
+            response = await self.detail_view(request, deal_id=deal["id"])
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response["ETag"], etag)
+            self.assertEqual(json.loads(response.content)["title"], "New")
+
+    async def test_export_streams_asynchronously(self) -> None:
+        deal = await self._create("Deal")
+
+        response = await _async_view(AsyncDealExportView)(
+            self.factory.get("/api/deals/export", {"output": "ndjson"})
+        )
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(json.loads(content)["id"], deal["id"])
+
+
+class AsyncDealRepositoryFromSettingsTest(TestCase):
+    def test_reads_every_shard_through_the_sync_repository(self) -> None:
+        self.assertIsInstance(
+            async_deal_repository_from_settings(deal_repository),
+            AsyncCachedDealRepository,
+        )
+        with override_settings(DEALS_SHARDS={"DATABASES": {"default": 0, "shard": 1}}):
+            repository = async_deal_repository_from_settings(deal_repository)
+        self.assertIsInstance(repository, ThreadedDealRepository)
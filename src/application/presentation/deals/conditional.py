@@ -0,0 +1,48 @@
+import hashlib
+from collections.abc import Iterable
+from datetime import datetime
+
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.http import http_date
+from rest_framework.request import Request
+
+
+def has_conditional_headers(request: HttpRequest | Request) -> bool:
+    """Return whether the request may be answered with 304 Not Modified."""
+    return (
+        "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META
+    )
+
+
+def deal_etag(deal_id: int, updated_at: datetime) -> str:
+    """Return the strong ETag of a deal, which changes with every update."""
+    return f'"deal-{deal_id}-{int(updated_at.timestamp() * 1_000_000)}"'
+
+
+def page_etag(
+    query: str,
+    versions: Iterable[tuple[int, datetime | None]],
+    has_next: bool,
+) -> str:
+    """Return the strong ETag of a page of deals.
+
+    Args:
+        query: Canonical form of the page's query parameters
+        versions: (id, updated_at) pairs of the page's deals, in order
+        has_next: Whether the page has a next page
+    """
+    digest = hashlib.sha256(f"{query}|{has_next}".encode())
+    for deal_id, updated_at in versions:
+        stamp = updated_at.isoformat() if updated_at else ""
+        digest.update(f"|{deal_id}:{stamp}".encode())
+    return f'"deals-{digest.hexdigest()[:32]}"'
+
+
+def set_validators(
+    response: HttpResponseBase, etag: str, last_modified: datetime | None = None
+) -> HttpResponseBase:
+    """Set the ETag and, if given, the Last-Modified header of a response."""
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
@@ -0,0 +1,28 @@
+import unittest
+from datetime import UTC, datetime, timedelta
+
+from application.presentation.deals.conditional import deal_etag, page_etag
+
+NOW = datetime(2025, 7, 15, 12, 0, tzinfo=UTC)
+
+
+class ConditionalTest(unittest.TestCase):
+    def test_deal_etag_changes_with_updates(self) -> None:
+        self.assertEqual(deal_etag(1, NOW), deal_etag(1, NOW))
+        self.assertNotEqual(
+            deal_etag(1, NOW), deal_etag(1, NOW + timedelta(microseconds=1))
+        )
+        self.assertNotEqual(deal_etag(1, NOW), deal_etag(2, NOW))
+        self.assertTrue(deal_etag(1, NOW).startswith('"'))
+
+    def test_page_etag(self) -> None:
+        versions = [(1, NOW), (2, NOW)]
+        etag = page_etag("50|None|id", versions, has_next=False)
+        self.assertEqual(etag, page_etag("50|None|id", list(versions), has_next=False))
+        self.assertNotEqual(etag, page_etag("50|None|id", versions, has_next=True))
+        self.assertNotEqual(etag, page_etag("50|None|id", versions[:1], has_next=False))
+        self.assertNotEqual(etag, page_etag("50|None|-id", versions, has_next=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from typing import Any
+
+from domain.deals.entity import DealEntity
+
+# Same fields, in the same order, as `DealSerializer`.
+EXPORT_FIELDS = ("id", "title", "company_id", "value", "tags", "distributor_id")
+
+# Rows encoded per chunk handed to the WSGI/ASGI server.
+ROWS_PER_CHUNK = 500
+
+
+class _LineBuffer:
+    """File-like object that hands back what `csv.writer` writes to it."""
+
+    def write(self, value: str) -> str:
+        """Return the written value instead of storing it."""
+        return value
+
+
+def _as_record(deal: DealEntity) -> dict[str, Any]:
+    """Return the exported representation of a deal."""
+    return {
+        "id": deal.id,
+        "title": deal.title,
+        "company_id": deal.company_id,
+        "value": str(deal.value),
+        "tags": deal.tags or [],
+        "distributor_id": deal.distributor_id,
+    }
+
+
+def _chunked(lines: Iterable[str]) -> Iterator[str]:
+    """Join encoded lines into chunks of `ROWS_PER_CHUNK` rows."""
+    chunk: list[str] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+async def _achunked(lines: AsyncIterable[str]) -> AsyncIterator[str]:
+    """Join asynchronously encoded lines into chunks of `ROWS_PER_CHUNK` rows."""
+    chunk: list[str] = []
+    async for line in lines:
+        chunk.append(line)
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def _ndjson_line(deal: DealEntity) -> str:
+    """Encode a deal as one line of newline-delimited JSON."""
+    return json.dumps(_as_record(deal), separators=(",", ":")) + "\n"
+
+
+def _csv_row(deal: DealEntity) -> list[Any]:
+    """Return the CSV cells of a deal; tag IDs are separated by `|`."""
+    record = _as_record(deal)
+    record["tags"] = "|".join(str(tag) for tag in record["tags"])
+    return [record[field] for field in EXPORT_FIELDS]
+
+
+def iter_ndjson(deals: Iterable[DealEntity]) -> Iterator[str]:
+    """Encode deals as newline-delimited JSON, one object per line."""
+    return _chunked(_ndjson_line(deal) for deal in deals)
+
+
+def iter_csv(deals: Iterable[DealEntity]) -> Iterator[str]:
+    """Encode deals as CSV with a header row; tag IDs are separated by `|`."""
+    writer = csv.writer(_LineBuffer())
+
+    def lines() -> Iterator[str]:
+        yield writer.writerow(EXPORT_FIELDS)
+        for deal in deals:
+            yield writer.writerow(_csv_row(deal))
+
+    return _chunked(lines())
+
+
+def aiter_ndjson(deals: AsyncIterable[DealEntity]) -> AsyncIterator[str]:
+    """Encode an async stream of deals as newline-delimited JSON."""
+    return _achunked(_ndjson_line(deal) async for deal in deals)
+
+
+def aiter_csv(deals: AsyncIterable[DealEntity]) -> AsyncIterator[str]:
+    """Encode an async stream of deals as CSV with a header row."""
+    writer = csv.writer(_LineBuffer())
+
+    async def lines() -> AsyncIterator[str]:
+        yield writer.writerow(EXPORT_FIELDS)
+        async for deal in deals:
+            yield writer.writerow(_csv_row(deal))
+
+    return _achunked(lines())
@@ -0,0 +1,74 @@
+import json
+import unittest
+from collections.abc import AsyncIterator
+from decimal import Decimal
+
+from application.presentation.deals import export
+from domain.deals.entity import DealEntity
+
+
+def _deals(count: int) -> list[DealEntity]:
+    return [
+        DealEntity(
+            id=i,
+            title=f"Deal, {i}",
+            company_id=1,
+            value=Decimal("10.50"),
+            tags=[1, 2] if i % 2 else [],
+            distributor_id=None if i % 2 else 3,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+class ExportEncodingTest(unittest.TestCase):
+    def test_iter_ndjson(self) -> None:
+        lines = "".join(export.iter_ndjson(_deals(2))).splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(
+            json.loads(lines[0]),
+            {
+                "id": 1,
+                "title": "Deal, 1",
+                "company_id": 1,
+                "value": "10.50",
+                "tags": [1, 2],
+                "distributor_id": None,
+            },
+        )
+
+    def test_iter_csv(self) -> None:
+        lines = "".join(export.iter_csv(_deals(2))).splitlines()
+        self.assertEqual(lines[0], "id,title,company_id,value,tags,distributor_id")
+        self.assertEqual(lines[1], '1,"Deal, 1",1,10.50,1|2,')
+        self.assertEqual(lines[2], '2,"Deal, 2",1,10.50,,3')
+
+    def test_rows_are_grouped_in_chunks(self) -> None:
+        chunks = list(export.iter_ndjson(_deals(export.ROWS_PER_CHUNK + 1)))
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(chunks[1].count("\n"), 1)
+
+    def test_empty_export(self) -> None:
+        self.assertEqual(list(export.iter_ndjson([])), [])
+        self.assertEqual(
+            "".join(export.iter_csv([])).strip(),
+            "id,title,company_id,value,tags,distributor_id",
+        )
+
+
+class AsyncExportEncodingTest(unittest.IsolatedAsyncioTestCase):
+    async def test_async_encoders_match_sync_ones(self) -> None:
+        deals = _deals(export.ROWS_PER_CHUNK + 1)
+
+        async def stream() -> AsyncIterator[DealEntity]:
+            for deal in deals:
+                yield deal
+
+        ndjson = [chunk async for chunk in export.aiter_ndjson(stream())]
+        csv = [chunk async for chunk in export.aiter_csv(stream())]
+        self.assertEqual(ndjson, list(export.iter_ndjson(deals)))
+        self.assertEqual(csv, list(export.iter_csv(deals)))
+
+
+if __name__ == "__main__":
+    unittest.main()
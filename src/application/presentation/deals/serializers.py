@@ -1,7 +1,24 @@
 # mypy: disable-error-code="type-arg"
 # pyright: reportMissingTypeArgument=false
+from decimal import Decimal
+from typing import Any
+
 from rest_framework import serializers
 
+from domain.deals.filters import DealFilters
+from domain.deals.pagination import DEAL_ORDERINGS
+from domain.deals.search import search_terms
+from domain.deals.stats import STATS_DIMENSIONS
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_BULK_SIZE = 10_000
+MAX_FILTER_TAGS = 50
+MAX_STATS_GROUPS = 500
+
+# Query parameters of the deal list which are not filters.
+PAGE_ARGUMENTS = frozenset({"limit", "cursor", "ordering"})
+
 
 class DealCreateSerializer(serializers.Serializer):
     """Serializer for creating a deal."""
@@ -15,6 +32,22 @@ class DealCreateSerializer(serializers.Serializer):
     distributor_id = serializers.IntegerField(required=False, allow_null=True)
 
 
+class DealBulkItemSerializer(DealCreateSerializer):
+    """Serializer for a deal of a bulk creation, valid as a `NewDeal`."""
+
+    value = serializers.DecimalField(
+        max_digits=12, decimal_places=2, min_value=Decimal("0.01")
+    )
+
+
+class DealBulkCreateSerializer(serializers.Serializer):
+    """Serializer for creating many deals in a single request."""
+
+    deals: serializers.ListSerializer = serializers.ListSerializer(
+        child=DealBulkItemSerializer(), allow_empty=False, max_length=MAX_BULK_SIZE
+    )
+
+
 class DealUpdateSerializer(serializers.Serializer):
     """Serializer for updating a deal."""
 
@@ -35,6 +68,109 @@ class DealIdSerializer(serializers.Serializer):
     deal_id = serializers.IntegerField()
 
 
+class DealListQuerySerializer(serializers.Serializer):
+    """Serializer for the query parameters of the deal list."""
+
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_PAGE_SIZE, default=DEFAULT_PAGE_SIZE
+    )
+    cursor = serializers.CharField(required=False, allow_blank=False)
+    # Defaults to the ordering an index serves the filters in, e.g. by value for a
+    # value range.
+    ordering = serializers.ChoiceField(choices=DEAL_ORDERINGS, required=False)
+    company_id = serializers.IntegerField(required=False, min_value=1)
+    distributor_id = serializers.IntegerField(required=False, min_value=1)
+    # Repeated parameter: ?tags=1&tags=2
+    tags = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=MAX_FILTER_TAGS,
+    )
+    tags_match = serializers.ChoiceField(choices=["any", "all"], default="any")
+    value_min = serializers.DecimalField(max_digits=12, decimal_places=2, required=False)
+    value_max = serializers.DecimalField(max_digits=12, decimal_places=2, required=False)
+    updated_since = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        """Check the value range, defaulting the ordering to the filters' one."""
+        value_min, value_max = attrs.get("value_min"), attrs.get("value_max")
+        if value_min is not None and value_max is not None and value_min > value_max:
+            raise serializers.ValidationError(
+                {"value_max": ["Must be greater than or equal to value_min."]}
+            )
+
+        if "ordering" not in attrs:
+            attrs["ordering"] = DealFilters(
+                **{
+                    name: value
+                    for name, value in attrs.items()
+                    if name not in PAGE_ARGUMENTS
+                }
+            ).default_ordering()
+        return attrs
+
+    def page_query(self) -> dict[str, Any]:
+        """Return the validated query as page arguments, with grouped filters."""
+        criteria = dict(self.validated_data)
+        query = {
+            "limit": criteria.pop("limit"),
+            "cursor": criteria.pop("cursor", None),
+            "ordering": criteria.pop("ordering"),
+        }
+        query["filters"] = DealFilters(**criteria)
+        return query
+
+    def query_key(self) -> str:
+        """Return a canonical form of the validated query."""
+        return "|".join(
+            f"{name}={value}" for name, value in sorted(self.validated_data.items())
+        )
+
+
+class DealSearchQuerySerializer(serializers.Serializer):
+    """Serializer for the query parameters of the deal search."""
+
+    q = serializers.CharField(max_length=200)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_PAGE_SIZE, default=DEFAULT_PAGE_SIZE
+    )
+    cursor = serializers.CharField(required=False, allow_blank=False)
+
+    def validate_q(self, value: str) -> str:
+        """Check that the query has a word to search for."""
+        if not search_terms(value):
+            raise serializers.ValidationError("Enter at least one word.")
+        return value
+
+
+class DealStatsQuerySerializer(serializers.Serializer):
+    """Serializer for the query parameters of the deal stats."""
+
+    dimension = serializers.ChoiceField(choices=STATS_DIMENSIONS)
+    # Repeated parameter: ?ids=1&ids=2
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_STATS_GROUPS,
+    )
+
+
+class DealStatsSerializer(serializers.Serializer):
+    """Serializer for the stats of a group of deals."""
+
+    id = serializers.IntegerField(source="group_id")
+    deal_count = serializers.IntegerField()
+    value_sum = serializers.DecimalField(max_digits=20, decimal_places=2)
+
+
+class DealExportQuerySerializer(serializers.Serializer):
+    """Serializer for the query parameters of the deal export."""
+
+    output = serializers.ChoiceField(choices=["ndjson", "csv"], default="ndjson")
+    batch_size = serializers.IntegerField(min_value=1, max_value=10_000, default=1000)
+
+
 class DealSerializer(serializers.Serializer):
     """Serializer for deal output (minimal example)."""
 
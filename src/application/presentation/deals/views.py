@@ -1,36 +1,123 @@
+from collections.abc import Iterable
+
+from django.http import HttpResponseBase, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
 from rest_framework import status
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from application.tasks.deals.tasks import event_publisher_from_settings
 from application.usecase.deals.create_deal import CreateDealUseCase
+from application.usecase.deals.create_deals import CreateDealsUseCase
 from application.usecase.deals.delete_deal import DeleteDealUseCase
-from application.usecase.deals.get_all_deals import GetAllDealsUseCase
+from application.usecase.deals.export_deals import ExportDealsUseCase
 from application.usecase.deals.get_deal_by_id import GetDealByIdUseCase
+from application.usecase.deals.get_deal_stats import GetDealStatsUseCase
+from application.usecase.deals.get_deal_version import GetDealVersionUseCase
+from application.usecase.deals.get_deals_page import GetDealsPageUseCase
+from application.usecase.deals.get_deals_page_versions import (
+    GetDealsPageVersionsUseCase,
+)
+from application.usecase.deals.search_deals import SearchDealsUseCase
 from application.usecase.deals.update_deal import UpdateDealUseCase
-from infra.db.deals.db_repository import DealRepositoryDB
+from domain.deals.entity import NewDeal
+from domain.deals.pagination import InvalidCursorError
+from domain.deals.repository import InvalidDealReferencesError
+from infra.cache.deals.cached_repository import CachedDealRepository
+from infra.db.deals.coordinated_repository import CoordinatedDealRepository
+from infra.db.deals.sharded_repository import ShardedDealRepository
+from infra.metrics.deals.instrumented_repository import InstrumentedDealRepository
+from infra.metrics.instrumentation import instrument_usecase
 
+from .conditional import deal_etag, has_conditional_headers, page_etag, set_validators
+from .export import iter_csv, iter_ndjson
 from .serializers import (
+    DealBulkCreateSerializer,
     DealCreateSerializer,
+    DealExportQuerySerializer,
     DealIdSerializer,
+    DealListQuerySerializer,
+    DealSearchQuerySerializer,
     DealSerializer,
+    DealStatsQuerySerializer,
+    DealStatsSerializer,
     DealUpdateSerializer,
 )
 
-# Instantiate the repository
-deal_repository = DealRepositoryDB()
+# Instantiate the repository, sharded if configured, behind the read-through
+# cache of deals by ID and, if enabled, the write coordinator. Metrics time
+# the calls reaching the database.
+deal_repository = CachedDealRepository.from_settings(
+    CoordinatedDealRepository.from_settings(
+        InstrumentedDealRepository.from_settings(
+            ShardedDealRepository.from_settings(events=event_publisher_from_settings())
+        )
+    )
+)
 
 
 class DealListCreateView(APIView):
     """API view for listing all deals and creating a new deal."""
 
-    list_usecase: GetAllDealsUseCase = GetAllDealsUseCase(deal_repository)
-    create_usecase: CreateDealUseCase = CreateDealUseCase(deal_repository)
+    list_usecase: GetDealsPageUseCase = instrument_usecase(
+        GetDealsPageUseCase(deal_repository)
+    )
+    versions_usecase: GetDealsPageVersionsUseCase = instrument_usecase(
+        GetDealsPageVersionsUseCase(deal_repository)
+    )
+    create_usecase: CreateDealUseCase = instrument_usecase(
+        CreateDealUseCase(deal_repository)
+    )
 
-    def get(self, request: Request) -> Response:
-        """List all deals."""
-        deals = self.list_usecase.execute()
-        return Response({"deals": [DealSerializer(d).data for d in deals]})  # type: ignore
+    def get(self, request: Request) -> HttpResponseBase:
+        """List a page of deals matching the filters, following the `next` cursor.
+
+        Conditional requests are answered from the (id, updated_at) pairs of
+        the page alone, without loading the deals.
+        """
+        serializer = DealListQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors,  # type: ignore
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        query = serializer.page_query()
+        query_key = serializer.query_key()
+        try:
+            if has_conditional_headers(request):
+                versions = self.versions_usecase.execute(**query)
+                etag = page_etag(
+                    query_key,
+                    versions[: query["limit"]],
+                    has_next=len(versions) > query["limit"],
+                )
+                not_modified = get_conditional_response(request, etag=etag)
+                if not_modified is not None:
+                    return set_validators(not_modified, etag)
+
+            page = self.list_usecase.execute(**query)
+        except InvalidCursorError as exc:
+            return Response({"cursor": [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = Response(
+            {
+                "deals": [DealSerializer(d).data for d in page.deals],  # type: ignore
+                "next": page.next_cursor,
+            }
+        )
+        return set_validators(
+            response,
+            page_etag(
+                query_key,
+                [(d.id, d.updated_at) for d in page.deals],
+                has_next=page.next_cursor is not None,
+            ),
+        )
 
     def post(self, request: Request) -> Response:
         """Create a new deal."""
@@ -47,24 +134,98 @@ class DealListCreateView(APIView):
         )
 
 
+class DealBulkCreateView(APIView):
+    """API view for creating many deals in a single request."""
+
+    create_usecase: CreateDealsUseCase = instrument_usecase(
+        CreateDealsUseCase(deal_repository)
+    )
+
+    def post(self, request: Request) -> Response:
+        """Create all deals of the request, or none if any of them is invalid.
+
+        Errors are reported per deal, in the same position as in the request.
+        """
+        serializer = DealBulkCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors,  # type: ignore
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        items = serializer.validated_data["deals"]
+        try:
+            deals = self.create_usecase.execute([NewDeal(**item) for item in items])
+        except InvalidDealReferencesError as exc:
+            return Response(
+                {"deals": [exc.errors.get(index, {}) for index in range(len(items))]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(
+            {"ids": [deal.id for deal in deals]},
+            status=status.HTTP_201_CREATED,
+        )
+
+
 class DealDetailView(APIView):
     """API view for retrieving, updating, and deleting a deal by id."""
 
-    get_usecase: GetDealByIdUseCase = GetDealByIdUseCase(deal_repository)
-    update_usecase: UpdateDealUseCase = UpdateDealUseCase(deal_repository)
-    delete_usecase: DeleteDealUseCase = DeleteDealUseCase(deal_repository)
+    get_usecase: GetDealByIdUseCase = instrument_usecase(
+        GetDealByIdUseCase(deal_repository)
+    )
+    version_usecase: GetDealVersionUseCase = instrument_usecase(
+        GetDealVersionUseCase(deal_repository)
+    )
+    update_usecase: UpdateDealUseCase = instrument_usecase(
+        UpdateDealUseCase(deal_repository)
+    )
+    delete_usecase: DeleteDealUseCase = instrument_usecase(
+        DeleteDealUseCase(deal_repository)
+    )
 
-    def get(self, request: Request, deal_id: int) -> Response:
-        """Retrieve a deal by id."""
+    def get(self, request: Request, deal_id: int) -> HttpResponseBase:
+        """Retrieve a deal by id.
+
+        Conditional requests are answered after a single primary key lookup of
+        the deal's `updated_at`, without loading or serializing the deal. If
+        the deal changed, a cached copy older than that version is dropped, so
+        the deal served matches its validators.
+        """
         serializer = DealIdSerializer(data={"deal_id": deal_id})
         if serializer.is_valid():
-            deal = self.get_usecase.execute(deal_id=serializer.validated_data["deal_id"])
+            deal_id = serializer.validated_data["deal_id"]
+            updated_at = None
+            if has_conditional_headers(request):
+                updated_at = self.version_usecase.execute(deal_id=deal_id)
+                if updated_at is None:
+                    return Response(
+                        {"error": "Deal not found"},
+                        status=status.HTTP_404_NOT_FOUND,
+                    )
+
+                etag = deal_etag(deal_id, updated_at)
+                not_modified = get_conditional_response(
+                    request, etag=etag, last_modified=int(updated_at.timestamp())
+                )
+                if not_modified is not None:
+                    return set_validators(not_modified, etag, updated_at)
+
+            # A cached copy older than the version the validators were built
+            # from is read again, so the body matches them.
+            deal = self.get_usecase.execute(deal_id=deal_id, min_version=updated_at)
             if deal is None:
                 return Response(
                     {"error": "Deal not found"},
                     status=status.HTTP_404_NOT_FOUND,
                 )
-            return Response(DealSerializer(deal).data)  # type: ignore
+
+            response = Response(DealSerializer(deal).data)  # type: ignore
+            if deal.updated_at is not None:
+                set_validators(
+                    response, deal_etag(deal.id, deal.updated_at), deal.updated_at
+                )
+            return response
         return Response(
             serializer.errors,  # type: ignore
             status=status.HTTP_400_BAD_REQUEST,
@@ -103,3 +264,124 @@ class DealDetailView(APIView):
             serializer.errors,  # type: ignore
             status=status.HTTP_400_BAD_REQUEST,
         )
+
+
+class DealSearchView(APIView):
+    """API view for searching deals by the words of their title."""
+
+    search_usecase: SearchDealsUseCase = instrument_usecase(
+        SearchDealsUseCase(deal_repository)
+    )
+
+    def get(self, request: Request) -> Response:
+        """List a page of the deals matching `q`, best matches first.
+
+        Each word of `q` matches the title words it starts, so partially typed
+        words match too.
+        """
+        serializer = DealSearchQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors,  # type: ignore
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            page = self.search_usecase.execute(
+                serializer.validated_data["q"],
+                limit=serializer.validated_data["limit"],
+                cursor=serializer.validated_data.get("cursor"),
+            )
+        except InvalidCursorError as exc:
+            return Response(
+                {"cursor": [str(exc)]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(
+            {
+                "deals": [DealSerializer(d).data for d in page.deals],
+                "next": page.next_cursor,
+            }
+        )
+
+
+class DealStatsView(APIView):
+    """API view for the deal count and value sum of companies, distributors or tags."""
+
+    stats_usecase: GetDealStatsUseCase = instrument_usecase(
+        GetDealStatsUseCase(deal_repository)
+    )
+
+    def get(self, request: Request) -> Response:
+        """Return the stats of each requested group, read from the stats table."""
+        serializer = DealStatsQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors,  # type: ignore
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        dimension = serializer.validated_data["dimension"]
+        stats = self.stats_usecase.execute(dimension, serializer.validated_data["ids"])
+        return Response(
+            {
+                "dimension": dimension,
+                "stats": DealStatsSerializer(stats, many=True).data,
+            }
+        )
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """Content negotiation that ignores the Accept header.
+
+    The export picks its encoding from the `output` query parameter, and
+    streams it without going through a DRF renderer.
+    """
+
+    def select_parser(
+        self, request: Request, parsers: Iterable[BaseParser]
+    ) -> BaseParser | None:
+        """Select the first parser, if any."""
+        return next(iter(parsers), None)
+
+    def select_renderer(
+        self,
+        request: Request,
+        renderers: Iterable[BaseRenderer],
+        format_suffix: str | None = None,
+    ) -> tuple[BaseRenderer, str]:
+        """Select the first renderer, used only for error responses."""
+        renderer = next(iter(renderers))
+        return (renderer, renderer.media_type)
+
+
+class DealExportView(APIView):
+    """API view for streaming every deal as NDJSON or CSV."""
+
+    content_negotiation_class = IgnoreClientContentNegotiation
+    export_usecase: ExportDealsUseCase = instrument_usecase(
+        ExportDealsUseCase(deal_repository)
+    )
+
+    def get(self, request: Request) -> Response | StreamingHttpResponse:
+        """Stream all deals, encoding them batch by batch."""
+        serializer = DealExportQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors,  # type: ignore
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        output = serializer.validated_data["output"]
+        deals = self.export_usecase.execute(
+            batch_size=serializer.validated_data["batch_size"]
+        )
+        if output == "csv":
+            response = StreamingHttpResponse(iter_csv(deals), content_type="text/csv")
+        else:
+            response = StreamingHttpResponse(
+                iter_ndjson(deals), content_type="application/x-ndjson"
+            )
+        response["Content-Disposition"] = f'attachment; filename="deals.{output}"'
+        return response
@@ -0,0 +1,276 @@
+from decimal import Decimal
+from typing import Any
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from application.presentation.deals.views import deal_repository
+from core.models import CompanyModel, DealModel, TagModel
+from infra.cache.lru import LRUCache
+from infra.db.deals.db_repository import DealRepositoryDB
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self) -> None:
+        self.repo = DealRepositoryDB()
+        company = CompanyModel.objects.create(name="Test Company")
+        self.deal = self.repo.create(
+            title="Deal",
+            company_id=company.id,
+            value=Decimal("10.00"),
+            tags=None,
+            distributor_id=None,
+        )
+        self.url = f"/api/deals/{self.deal.id}/"
+
+    def test_detail_returns_validators(self) -> None:
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"deal-'))
+        self.assertIn("Last-Modified", response)
+
+    def test_detail_not_modified_after_one_query(self) -> None:
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_detail_modified_since(self) -> None:
+        last_modified = self.client.get(self.url)["Last-Modified"]
+        response = self.client.get(self.url, headers={"if-modified-since": last_modified})
+        self.assertEqual(response.status_code, 304)
+
+    def test_detail_changes_after_update(self) -> None:
+        etag = self.client.get(self.url)["ETag"]
+        self.repo.update(
+            deal_id=self.deal.id, title="New", distributor_id=None, tags=None, value=None
+        )
+
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["title"], "New")
+
+    def test_detail_drops_a_cached_copy_older_than_the_deal(self) -> None:
+        # Cached by this process; updated by another, whose invalidation only
+        # reaches the shared tier.
+        with patch.object(deal_repository, "local_cache", LRUCache(100, 60)):
+            etag = self.client.get(self.url)["ETag"]
+            self.repo.update(
+                deal_id=self.deal.id,
+                title="New",
+                distributor_id=None,
+                tags=None,
+                value=None,
+            )
+            self.assertEqual(self.client.get(self.url).json()["title"], "Deal")
+
+            response = self.client.get(self.url, headers={"if-none-match": etag})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response["ETag"], etag)
+            self.assertEqual(response.json()["title"], "New")
+            self.assertEqual(self.client.get(self.url).json()["title"], "New")
+
+    def test_detail_conditional_not_found(self) -> None:
+        response = self.client.get("/api/deals/9999/", headers={"if-none-match": '"x"'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_list_not_modified(self) -> None:
+        etag = self.client.get("/api/deals/?limit=10")["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                "/api/deals/?limit=10", headers={"if-none-match": etag}
+            )
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_changes_after_delete(self) -> None:
+        etag = self.client.get("/api/deals/?limit=10")["ETag"]
+        self.repo.delete(self.deal.id)
+
+        response = self.client.get(
+            "/api/deals/?limit=10", headers={"if-none-match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["deals"], [])
+
+
+class DealListFilterTest(TestCase):
+    def setUp(self) -> None:
+        self.repo = DealRepositoryDB()
+        self.company = CompanyModel.objects.create(name="Test Company")
+        self.tag = TagModel.objects.create(name="tag")
+        self.cheap, self.tagged = (
+            self.repo.create(
+                title=title,
+                company_id=self.company.id,
+                value=Decimal(value),
+                tags=tags,
+                distributor_id=None,
+            )
+            for title, value, tags in (
+                ("Cheap", "5", None),
+                ("Tagged", "50", [self.tag.id]),
+            )
+        )
+
+    def test_list_filters(self) -> None:
+        query: dict[str, int | str | list[int]] = {
+            "company_id": self.company.id,
+            "tags": [self.tag.id],
+            "value_min": "10",
+            "ordering": "-value",
+        }
+        response = self.client.get("/api/deals/", query)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([d["id"] for d in response.json()["deals"]], [self.tagged.id])
+
+        response = self.client.get("/api/deals/", {"company_id": self.company.id})
+        self.assertEqual(len(response.json()["deals"]), 2)
+
+    def test_filters_default_to_an_ordering_they_allow(self) -> None:
+        cheapest = self.repo.create(
+            title="Cheapest",
+            company_id=self.company.id,
+            value=Decimal(1),
+            tags=None,
+            distributor_id=None,
+        )
+
+        first = self.client.get("/api/deals/", {"value_max": "100", "limit": "1"}).json()
+        self.assertEqual([d["id"] for d in first["deals"]], [cheapest.id])
+        response = self.client.get(
+            "/api/deals/", {"value_max": "100", "cursor": first["next"]}
+        )
+        self.assertEqual(
+            [d["id"] for d in response.json()["deals"]], [self.cheap.id, self.tagged.id]
+        )
+
+    def test_filters_in_any_ordering(self) -> None:
+        response = self.client.get(
+            "/api/deals/", {"value_min": "10", "ordering": "-updated_at"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([d["id"] for d in response.json()["deals"]], [self.tagged.id])
+
+        for query in (
+            {"value_min": "10", "updated_since": "2020-01-01T00:00:00Z"},
+            {"tags": [str(self.tag.id)], "value_min": "10"},
+        ):
+            with self.subTest(query=query):
+                response = self.client.get("/api/deals/", query)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    [d["id"] for d in response.json()["deals"]], [self.tagged.id]
+                )
+
+    def test_filters_are_part_of_the_etag(self) -> None:
+        all_deals = self.client.get("/api/deals/")["ETag"]
+        filtered = self.client.get("/api/deals/", {"value_min": "10"})["ETag"]
+        self.assertNotEqual(all_deals, filtered)
+
+    def test_invalid_filters(self) -> None:
+        response = self.client.get("/api/deals/", {"value_min": "10", "value_max": "1"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("value_max", response.json())
+
+        response = self.client.get("/api/deals/", {"tags_match": "some"})
+        self.assertEqual(response.status_code, 400)
+
+
+class DealBulkCreateViewTest(TestCase):
+    def setUp(self) -> None:
+        self.company = CompanyModel.objects.create(name="Test Company")
+
+    def _deals(self, *values: str) -> dict[str, Any]:
+        return {
+            "deals": [
+                {"title": "Deal", "company_id": self.company.id, "value": value}
+                for value in values
+            ]
+        }
+
+    def test_creates_every_deal(self) -> None:
+        response = self.client.post(
+            "/api/deals/bulk",
+            self._deals("1.00", "2.50"),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()["ids"]), 2)
+
+    def test_non_positive_values_are_reported_per_deal(self) -> None:
+        response = self.client.post(
+            "/api/deals/bulk",
+            self._deals("1.00", "0", "-5"),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["deals"]
+        self.assertEqual(errors[0], {})
+        self.assertEqual(set(errors[1]), {"value"})
+        self.assertEqual(set(errors[2]), {"value"})
+        self.assertFalse(DealModel.objects.exists())
+
+
+class DealStatsViewTest(TestCase):
+    def setUp(self) -> None:
+        self.repo = DealRepositoryDB()
+        self.company = CompanyModel.objects.create(name="Test Company")
+        self.repo.create(
+            title="Deal",
+            company_id=self.company.id,
+            value=Decimal("12.50"),
+            tags=None,
+            distributor_id=None,
+        )
+
+    def test_stats_of_each_requested_group(self) -> None:
+        query: dict[str, str | list[int]] = {
+            "dimension": "company",
+            "ids": [self.company.id, self.company.id + 1],
+        }
+        response = self.client.get("/api/deals/stats", query)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "dimension": "company",
+                "stats": [
+                    {"id": self.company.id, "deal_count": 1, "value_sum": "12.50"},
+                    {"id": self.company.id + 1, "deal_count": 0, "value_sum": "0.00"},
+                ],
+            },
+        )
+
+    def test_invalid_query(self) -> None:
+        response = self.client.get("/api/deals/stats", {"dimension": "region"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {"dimension", "ids"})
+
+
+class DealSearchViewTest(TestCase):
+    def setUp(self) -> None:
+        company = CompanyModel.objects.create(name="Test Company")
+        DealRepositoryDB().create(
+            title="Acme renewal",
+            company_id=company.id,
+            value=Decimal("10.00"),
+            tags=None,
+            distributor_id=None,
+        )
+
+    def test_search(self) -> None:
+        response = self.client.get("/api/deals/search", {"q": "acm"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [deal["title"] for deal in response.json()["deals"]], ["Acme renewal"]
+        )
+        self.assertIsNone(response.json()["next"])
+
+    def test_query_without_words(self) -> None:
+        response = self.client.get("/api/deals/search", {"q": "!?"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("q", response.json())
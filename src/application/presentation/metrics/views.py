@@ -0,0 +1,18 @@
+from django.http import Http404, HttpRequest, HttpResponse
+from django.views import View
+
+from infra.metrics.exposition import CONTENT_TYPE, render
+from infra.metrics.multiprocess import collect_all
+from infra.metrics.registry import metrics_settings, registry
+
+
+class MetricsView(View):
+    """Metrics of this host's processes, in the Prometheus text format."""
+
+    http_method_names = ["get"]
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        """Render the metrics, or 404 when metrics are disabled."""
+        if not metrics_settings()["ENABLED"]:
+            raise Http404
+        return HttpResponse(render(collect_all(registry)), content_type=CONTENT_TYPE)
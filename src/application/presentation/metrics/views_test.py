@@ -0,0 +1,32 @@
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+
+from core.models import CompanyModel
+
+
+class MetricsViewTest(TestCase):
+    def test_reports_requests_use_cases_and_repository_calls(self) -> None:
+        company = CompanyModel.objects.create(name="Company")
+        response = self.client.post(
+            "/api/deals/",
+            {"title": "Deal", "company_id": company.id, "value": str(Decimal("10.00"))},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        for sample in (
+            'http_request_duration_seconds_count{view="deal-list-create",'
+            'method="POST",status="201"}',
+            'usecase_duration_seconds_count{usecase="CreateDealUseCase",outcome="ok"}',
+            'deal_repository_duration_seconds_count{method="create",outcome="ok"}',
+        ):
+            self.assertIn(sample, body)
+
+    @override_settings(METRICS={"ENABLED": False})
+    def test_disabled(self) -> None:
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
@@ -1,13 +1,44 @@
-from infra.celery.app import app
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.utils import timezone
 
-# TODO: Implement actual event emission logic
-# Ideally it should be an interface using `typing.Protocol`,
-# to be properly injected into the repository.
+from domain.deals.events import DealEvent, EventPublisher, coalesce_deal_events
+from infra.celery.app import app
+from infra.db.deals.outbox import DealOutbox
+from infra.db.deals.shards import ShardMap
+from infra.events.deals.background_publisher import (
+    DEFAULT_PUBLISHER_SETTINGS,
+    BackgroundEventPublisher,
+)
 
 # Celery uses the same context to issue and receive an asynchronous operation,
 # so I chose to group everything in /tasks. In another scenario, we would have
 # `src/application/presentation/deals/listener.py` and `src/application/emitters/deals/`.
 
+DEFAULT_OUTBOX_SETTINGS: dict[str, Any] = {
+    "BATCH_SIZE": 500,
+    "RETENTION": 7 * 24 * 3600,
+    "COALESCE_WINDOW": 0,
+}
+
+
+def outbox_settings() -> dict[str, Any]:
+    """Return the `DEALS_OUTBOX` setting, completed with the defaults."""
+    return {**DEFAULT_OUTBOX_SETTINGS, **getattr(settings, "DEALS_OUTBOX", {})}
+
+
+@app.task
+def deal_events_emitter(events: list[dict[str, Any]]) -> None:
+    """Emit a batch of deal events relayed from the outbox."""
+    print(f"Deal events emitted for {len(events)} event(s)")
+
+
+# The per-deal emitters below are no longer sent by the repository, which
+# records events in the outbox instead. They stay registered so that messages
+# queued before the outbox existed are still consumed.
+
 
 @app.task
 def deal_created_emitter(deal_id: int) -> None:
@@ -15,6 +46,12 @@ def deal_created_emitter(deal_id: int) -> None:
     print(f"Deal created event emitted for deal_id={deal_id}")
 
 
+@app.task
+def deals_created_emitter(deal_ids: list[int]) -> None:
+    """Emit a single event for a batch of created deals."""
+    print(f"Deals created event emitted for {len(deal_ids)} deal(s)")
+
+
 @app.task
 def deal_updated_emitter(deal_id: int) -> None:
     """Emit an event when a deal is updated."""
@@ -25,3 +62,65 @@ def deal_updated_emitter(deal_id: int) -> None:
 def deal_deleted_emitter(deal_id: int) -> None:
     """Emit an event when a deal is deleted."""
     print(f"Deal deleted event emitted for deal_id={deal_id}")
+
+
+def publish_deal_events(events: list[DealEvent]) -> None:
+    """Publish a batch of outbox events as a single Celery message.
+
+    The batch is coalesced first, so a burst of writes to a deal is emitted once
+    and a deal created then deleted is not emitted at all.
+    """
+    events = coalesce_deal_events(events)
+    if events:
+        deal_events_emitter.delay([event.model_dump() for event in events])
+
+
+def relay_outbox(batch_size: int | None = None) -> int:
+    """Publish every pending deal event of the outbox as configured.
+
+    Returns:
+        int: Number of outbox events relayed, before coalescing
+    """
+    config = outbox_settings()
+    return sum(
+        outbox.relay_all(
+            publish_deal_events,
+            batch_size or config["BATCH_SIZE"],
+            min_age=config["COALESCE_WINDOW"],
+        )
+        for outbox in ShardMap.from_settings().outboxes()
+    )
+
+
+def event_publisher_from_settings() -> EventPublisher:
+    """Build the publisher of deal events selected by the `DEALS_EVENTS` setting.
+
+    `outbox` records events in the write's transaction, for the relay to publish.
+    `background` queues them in process on commit and sends them from a thread:
+    on the commit of the deals' database, or of each shard's when there are
+    several, as the sharded repository defers them to it.
+    """
+    config = {**DEFAULT_PUBLISHER_SETTINGS, **getattr(settings, "DEALS_EVENTS", {})}
+    if config["PUBLISHER"] == "background":
+        databases = ShardMap.from_settings().databases
+        return BackgroundEventPublisher.from_settings(
+            publish_deal_events,
+            using=next(iter(databases)) if len(databases) == 1 else None,
+        )
+    return DealOutbox()
+
+
+@app.task(ignore_result=True)
+def relay_deal_events(batch_size: int | None = None) -> int:
+    """Publish every pending deal event of the outbox, in batches."""
+    return relay_outbox(batch_size)
+
+
+@app.task(ignore_result=True)
+def prune_deal_events() -> int:
+    """Delete outbox events sent longer ago than the retention period."""
+    retention = timedelta(seconds=outbox_settings()["RETENTION"])
+    return sum(
+        outbox.prune(sent_before=timezone.now() - retention)
+        for outbox in ShardMap.from_settings().outboxes()
+    )
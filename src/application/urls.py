@@ -1,8 +1,39 @@
+from django.conf import settings
 from django.urls import path
+from django.views import View
 
-from application.presentation.deals.views import DealDetailView, DealListCreateView
+from application.presentation.deals.views import (
+    DealBulkCreateView,
+    DealDetailView,
+    DealExportView,
+    DealListCreateView,
+    DealSearchView,
+    DealStatsView,
+)
+
+deal_views: dict[str, type[View]] = {
+    "list": DealListCreateView,
+    "detail": DealDetailView,
+    "export": DealExportView,
+}
+if getattr(settings, "DEALS_ASYNC_VIEWS", False):
+    from application.presentation.deals.async_views import (
+        AsyncDealDetailView,
+        AsyncDealExportView,
+        AsyncDealListCreateView,
+    )
+
+    deal_views = {
+        "list": AsyncDealListCreateView,
+        "detail": AsyncDealDetailView,
+        "export": AsyncDealExportView,
+    }
 
 urlpatterns = [
-    path("deals/", DealListCreateView.as_view(), name="deal-list-create"),
-    path("deals/<int:deal_id>/", DealDetailView.as_view(), name="deal-detail"),
+    path("deals/", deal_views["list"].as_view(), name="deal-list-create"),
+    path("deals/<int:deal_id>/", deal_views["detail"].as_view(), name="deal-detail"),
+    path("deals/bulk", DealBulkCreateView.as_view(), name="deal-bulk-create"),
+    path("deals/export", deal_views["export"].as_view(), name="deal-export"),
+    path("deals/search", DealSearchView.as_view(), name="deal-search"),
+    path("deals/stats", DealStatsView.as_view(), name="deal-stats"),
 ]
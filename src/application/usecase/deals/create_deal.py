@@ -1,7 +1,7 @@
 from decimal import Decimal
 
 from domain.deals.entity import DealEntity
-from domain.deals.repository import DealRepository
+from domain.deals.repository import AsyncDealRepository, DealRepository
 
 
 class CreateDealUseCase:
@@ -27,3 +27,28 @@ class CreateDealUseCase:
             tags=tags,
             distributor_id=distributor_id,
         )
+
+
+class AsyncCreateDealUseCase:
+    """Async variant of `CreateDealUseCase`."""
+
+    def __init__(self, repository: AsyncDealRepository) -> None:
+        """Initialize with an AsyncDealRepository implementation."""
+        self.repository = repository
+
+    async def execute(
+        self,
+        title: str,
+        company_id: int,
+        value: Decimal,
+        tags: list[int] | None = None,
+        distributor_id: int | None = None,
+    ) -> DealEntity:
+        """Create a new deal using the repository and return the created entity."""
+        return await self.repository.create(
+            title=title,
+            company_id=company_id,
+            value=value,
+            tags=tags,
+            distributor_id=distributor_id,
+        )
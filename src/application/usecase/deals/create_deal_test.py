@@ -1,8 +1,11 @@
 import unittest
 from decimal import Decimal
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
-from application.usecase.deals.create_deal import CreateDealUseCase
+from application.usecase.deals.create_deal import (
+    AsyncCreateDealUseCase,
+    CreateDealUseCase,
+)
 from domain.deals.entity import DealEntity
 
 
@@ -37,5 +40,30 @@ class CreateDealUseCaseTest(unittest.TestCase):
         )
 
 
+class AsyncCreateDealUseCaseTest(unittest.IsolatedAsyncioTestCase):
+    async def test_execute_creates_deal(self) -> None:
+        mock_repo = AsyncMock()
+        expected_deal = DealEntity(
+            id=1,
+            title="Deal",
+            company_id=2,
+            value=Decimal(100),
+            tags=[],
+            distributor_id=None,
+        )
+        mock_repo.create.return_value = expected_deal
+        usecase = AsyncCreateDealUseCase(mock_repo)
+
+        result = await usecase.execute(title="Deal", company_id=2, value=Decimal(100))
+        self.assertEqual(result, expected_deal)
+        mock_repo.create.assert_awaited_once_with(
+            title="Deal",
+            company_id=2,
+            value=Decimal(100),
+            tags=None,
+            distributor_id=None,
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,14 @@
+from domain.deals.entity import DealEntity, NewDeal
+from domain.deals.repository import DealRepository
+
+
+class CreateDealsUseCase:
+    """Use case for creating many deals in a single batch."""
+
+    def __init__(self, repository: DealRepository) -> None:
+        """Initialize with a DealRepository implementation."""
+        self.repository = repository
+
+    def execute(self, deals: list[NewDeal]) -> list[DealEntity]:
+        """Create all deals or none of them, and return the created entities."""
+        return self.repository.bulk_create(deals)
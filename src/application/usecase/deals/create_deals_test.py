@@ -0,0 +1,57 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock
+
+from application.usecase.deals.create_deals import CreateDealsUseCase
+from domain.deals.entity import DealEntity, NewDeal
+from domain.deals.repository import InvalidDealReferencesError
+
+
+class CreateDealsUseCaseTest(unittest.TestCase):
+    def test_execute_creates_deals(self) -> None:
+        mock_repo = Mock()
+        new_deals = [
+            NewDeal(title="Deal1", company_id=2, value=Decimal("100.0"), tags=[1]),
+            NewDeal(title="Deal2", company_id=3, value=Decimal("50.0")),
+        ]
+        expected = [
+            DealEntity(
+                id=1,
+                title="Deal1",
+                company_id=2,
+                value=Decimal("100.0"),
+                tags=[1],
+                distributor_id=None,
+            ),
+            DealEntity(
+                id=2,
+                title="Deal2",
+                company_id=3,
+                value=Decimal("50.0"),
+                tags=[],
+                distributor_id=None,
+            ),
+        ]
+        mock_repo.bulk_create.return_value = expected
+        usecase = CreateDealsUseCase(mock_repo)
+
+        result = usecase.execute(new_deals)
+        self.assertEqual(result, expected)
+        mock_repo.bulk_create.assert_called_once_with(new_deals)
+
+    def test_execute_propagates_reference_errors(self) -> None:
+        mock_repo = Mock()
+        mock_repo.bulk_create.side_effect = InvalidDealReferencesError(
+            {0: {"company_id": ["Company with ID 2 does not exist."]}}
+        )
+        usecase = CreateDealsUseCase(mock_repo)
+
+        with self.assertRaises(InvalidDealReferencesError) as ctx:
+            usecase.execute(
+                [NewDeal(title="Deal1", company_id=2, value=Decimal("100.0"))]
+            )
+        self.assertIn(0, ctx.exception.errors)
+
+
+if __name__ == "__main__":
+    unittest.main()
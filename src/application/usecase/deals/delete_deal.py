@@ -1,4 +1,4 @@
-from domain.deals.repository import DealRepository
+from domain.deals.repository import AsyncDealRepository, DealRepository
 
 
 class DeleteDealUseCase:
@@ -11,3 +11,15 @@ class DeleteDealUseCase:
     def execute(self, deal_id: int) -> bool:
         """Delete a deal by its ID. Returns True if deleted, False otherwise."""
         return self.repository.delete(deal_id)
+
+
+class AsyncDeleteDealUseCase:
+    """Async variant of `DeleteDealUseCase`."""
+
+    def __init__(self, repository: AsyncDealRepository) -> None:
+        """Initialize with an AsyncDealRepository implementation."""
+        self.repository = repository
+
+    async def execute(self, deal_id: int) -> bool:
+        """Delete a deal by its ID. Returns True if deleted, False otherwise."""
+        return await self.repository.delete(deal_id)
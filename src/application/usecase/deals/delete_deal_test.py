@@ -1,7 +1,10 @@
 import unittest
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
-from application.usecase.deals.delete_deal import DeleteDealUseCase
+from application.usecase.deals.delete_deal import (
+    AsyncDeleteDealUseCase,
+    DeleteDealUseCase,
+)
 
 
 class DeleteDealUseCaseTest(unittest.TestCase):
@@ -22,5 +25,14 @@ class DeleteDealUseCaseTest(unittest.TestCase):
         mock_repo.delete.assert_called_once_with(99)
 
 
+class AsyncDeleteDealUseCaseTest(unittest.IsolatedAsyncioTestCase):
+    async def test_execute_deletes_deal(self) -> None:
+        mock_repo = AsyncMock()
+        mock_repo.delete.return_value = True
+        usecase = AsyncDeleteDealUseCase(mock_repo)
+        self.assertTrue(await usecase.execute(1))
+        mock_repo.delete.assert_awaited_once_with(1)
+
+
 if __name__ == "__main__":
     unittest.main()
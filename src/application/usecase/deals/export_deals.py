@@ -0,0 +1,28 @@
+from collections.abc import AsyncIterator, Iterator
+
+from domain.deals.entity import DealEntity
+from domain.deals.repository import AsyncDealRepository, DealRepository
+
+
+class ExportDealsUseCase:
+    """Use case for streaming every deal, e.g. for batch exports."""
+
+    def __init__(self, repository: DealRepository) -> None:
+        """Initialize with a DealRepository implementation."""
+        self.repository = repository
+
+    def execute(self, batch_size: int = 1000) -> Iterator[DealEntity]:
+        """Return a lazy iterator over all deals, fetched `batch_size` at a time."""
+        return self.repository.iter_all(batch_size=batch_size)
+
+
+class AsyncExportDealsUseCase:
+    """Async variant of `ExportDealsUseCase`."""
+
+    def __init__(self, repository: AsyncDealRepository) -> None:
+        """Initialize with an AsyncDealRepository implementation."""
+        self.repository = repository
+
+    def execute(self, batch_size: int = 1000) -> AsyncIterator[DealEntity]:
+        """Return a lazy async iterator over all deals."""
+        return self.repository.iter_all(batch_size=batch_size)
@@ -0,0 +1,58 @@
+import unittest
+from collections.abc import AsyncIterator
+from decimal import Decimal
+from unittest.mock import Mock
+
+from application.usecase.deals.export_deals import (
+    AsyncExportDealsUseCase,
+    ExportDealsUseCase,
+)
+from domain.deals.entity import DealEntity
+
+
+class ExportDealsUseCaseTest(unittest.TestCase):
+    def test_execute_streams_deals(self) -> None:
+        mock_repo = Mock()
+        deals = [
+            DealEntity(
+                id=1,
+                title="Deal1",
+                company_id=2,
+                value=Decimal(100),
+                tags=[],
+                distributor_id=None,
+            )
+        ]
+        mock_repo.iter_all.return_value = iter(deals)
+        usecase = ExportDealsUseCase(mock_repo)
+        result = usecase.execute(batch_size=500)
+        self.assertEqual(list(result), deals)
+        mock_repo.iter_all.assert_called_once_with(batch_size=500)
+
+
+class AsyncExportDealsUseCaseTest(unittest.IsolatedAsyncioTestCase):
+    async def test_execute_streams_deals(self) -> None:
+        mock_repo = Mock()
+        deals = [
+            DealEntity(
+                id=1,
+                title="Deal1",
+                company_id=2,
+                value=Decimal(100),
+                tags=[],
+                distributor_id=None,
+            )
+        ]
+
+        async def iter_all(batch_size: int) -> AsyncIterator[DealEntity]:
+            for deal in deals:
+                yield deal
+
+        mock_repo.iter_all.side_effect = iter_all
+        usecase = AsyncExportDealsUseCase(mock_repo)
+        self.assertEqual([deal async for deal in usecase.execute(batch_size=10)], deals)
+        mock_repo.iter_all.assert_called_once_with(batch_size=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
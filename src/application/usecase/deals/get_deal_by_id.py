@@ -1,5 +1,7 @@
+from datetime import datetime
+
 from domain.deals.entity import DealEntity
-from domain.deals.repository import DealRepository
+from domain.deals.repository import AsyncDealRepository, DealRepository
 
 
 class GetDealByIdUseCase:
@@ -9,6 +11,28 @@ class GetDealByIdUseCase:
         """Initialize with a DealRepository implementation."""
         self.repository = repository
 
-    def execute(self, deal_id: int) -> DealEntity | None:
-        """Retrieve a deal by its ID. Returns None if not found."""
-        return self.repository.get_one(deal_id)
+    def execute(
+        self, deal_id: int, min_version: datetime | None = None
+    ) -> DealEntity | None:
+        """Retrieve a deal by its ID, not older than a version if given.
+
+        Returns None if not found.
+        """
+        return self.repository.get_one(deal_id, min_version)
+
+
+class AsyncGetDealByIdUseCase:
+    """Async variant of `GetDealByIdUseCase`."""
+
+    def __init__(self, repository: AsyncDealRepository) -> None:
+        """Initialize with an AsyncDealRepository implementation."""
+        self.repository = repository
+
+    async def execute(
+        self, deal_id: int, min_version: datetime | None = None
+    ) -> DealEntity | None:
+        """Retrieve a deal by its ID, not older than a version if given.
+
+        Returns None if not found.
+        """
+        return await self.repository.get_one(deal_id, min_version)
@@ -1,8 +1,11 @@
 import unittest
 from decimal import Decimal
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
-from application.usecase.deals.get_deal_by_id import GetDealByIdUseCase
+from application.usecase.deals.get_deal_by_id import (
+    AsyncGetDealByIdUseCase,
+    GetDealByIdUseCase,
+)
 from domain.deals.entity import DealEntity
 
 
@@ -21,7 +24,7 @@ class GetDealByIdUseCaseTest(unittest.TestCase):
         usecase = GetDealByIdUseCase(mock_repo)
         result = usecase.execute(1)
         self.assertEqual(result, expected_deal)
-        mock_repo.get_one.assert_called_once_with(1)
+        mock_repo.get_one.assert_called_once_with(1, None)
 
     def test_execute_returns_none_if_not_found(self) -> None:
         mock_repo = Mock()
@@ -29,7 +32,30 @@ class GetDealByIdUseCaseTest(unittest.TestCase):
         usecase = GetDealByIdUseCase(mock_repo)
         result = usecase.execute(99)
         self.assertIsNone(result)
-        mock_repo.get_one.assert_called_once_with(99)
+        mock_repo.get_one.assert_called_once_with(99, None)
+
+
+class AsyncGetDealByIdUseCaseTest(unittest.IsolatedAsyncioTestCase):
+    async def test_execute_returns_deal(self) -> None:
+        mock_repo = AsyncMock()
+        expected_deal = DealEntity(
+            id=1,
+            title="Deal",
+            company_id=2,
+            value=Decimal(100),
+            tags=[],
+            distributor_id=None,
+        )
+        mock_repo.get_one.return_value = expected_deal
+        usecase = AsyncGetDealByIdUseCase(mock_repo)
+        self.assertEqual(await usecase.execute(1), expected_deal)
+        mock_repo.get_one.assert_awaited_once_with(1, None)
+
+    async def test_execute_returns_none_if_not_found(self) -> None:
+        mock_repo = AsyncMock()
+        mock_repo.get_one.return_value = None
+        usecase = AsyncGetDealByIdUseCase(mock_repo)
+        self.assertIsNone(await usecase.execute(99))
 
 
 if __name__ == "__main__":
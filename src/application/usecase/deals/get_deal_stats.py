@@ -0,0 +1,14 @@
+from domain.deals.repository import DealRepository
+from domain.deals.stats import DealStats, StatsDimension
+
+
+class GetDealStatsUseCase:
+    """Use case for retrieving the deal count and value sum of groups."""
+
+    def __init__(self, repository: DealRepository) -> None:
+        """Initialize with a DealRepository implementation."""
+        self.repository = repository
+
+    def execute(self, dimension: StatsDimension, group_ids: list[int]) -> list[DealStats]:
+        """Return the stats of each company, distributor or tag, in order."""
+        return self.repository.get_stats(dimension, group_ids)
@@ -0,0 +1,24 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock
+
+from application.usecase.deals.get_deal_stats import GetDealStatsUseCase
+from domain.deals.stats import DealStats
+
+
+class GetDealStatsUseCaseTest(unittest.TestCase):
+    def test_execute_returns_stats(self) -> None:
+        mock_repo = Mock()
+        stats = [
+            DealStats(
+                dimension="tag", group_id=1, deal_count=2, value_sum=Decimal("3.50")
+            )
+        ]
+        mock_repo.get_stats.return_value = stats
+        usecase = GetDealStatsUseCase(mock_repo)
+        self.assertEqual(usecase.execute("tag", [1]), stats)
+        mock_repo.get_stats.assert_called_once_with("tag", [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
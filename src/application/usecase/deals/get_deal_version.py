@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from domain.deals.repository import AsyncDealRepository, DealRepository
+
+
+class GetDealVersionUseCase:
+    """Use case for retrieving when a deal was last updated."""
+
+    def __init__(self, repository: DealRepository) -> None:
+        """Initialize with a DealRepository implementation."""
+        self.repository = repository
+
+    def execute(self, deal_id: int) -> datetime | None:
+        """Return the last update time of a deal. Returns None if not found."""
+        return self.repository.get_version(deal_id)
+
+
+class AsyncGetDealVersionUseCase:
+    """Async variant of `GetDealVersionUseCase`."""
+
+    def __init__(self, repository: AsyncDealRepository) -> None:
+        """Initialize with an AsyncDealRepository implementation."""
+        self.repository = repository
+
+    async def execute(self, deal_id: int) -> datetime | None:
+        """Return the last update time of a deal. Returns None if not found."""
+        return await self.repository.get_version(deal_id)
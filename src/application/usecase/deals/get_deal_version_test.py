@@ -0,0 +1,39 @@
+import unittest
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, Mock
+
+from application.usecase.deals.get_deal_version import (
+    AsyncGetDealVersionUseCase,
+    GetDealVersionUseCase,
+)
+
+
+class GetDealVersionUseCaseTest(unittest.TestCase):
+    def test_execute_returns_version(self) -> None:
+        mock_repo = Mock()
+        updated_at = datetime(2025, 1, 1, tzinfo=UTC)
+        mock_repo.get_version.return_value = updated_at
+        usecase = GetDealVersionUseCase(mock_repo)
+        self.assertEqual(usecase.execute(1), updated_at)
+        mock_repo.get_version.assert_called_once_with(1)
+
+    def test_execute_returns_none_if_not_found(self) -> None:
+        mock_repo = Mock()
+        mock_repo.get_version.return_value = None
+        usecase = GetDealVersionUseCase(mock_repo)
+        self.assertIsNone(usecase.execute(99))
+        mock_repo.get_version.assert_called_once_with(99)
+
+
+class AsyncGetDealVersionUseCaseTest(unittest.IsolatedAsyncioTestCase):
+    async def test_execute_returns_version(self) -> None:
+        mock_repo = AsyncMock()
+        updated_at = datetime(2025, 1, 1, tzinfo=UTC)
+        mock_repo.get_version.return_value = updated_at
+        usecase = AsyncGetDealVersionUseCase(mock_repo)
+        self.assertEqual(await usecase.execute(1), updated_at)
+        mock_repo.get_version.assert_awaited_once_with(1)
+
+
+if __name__ == "__main__":
+    unittest.main()
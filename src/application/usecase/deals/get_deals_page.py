@@ -0,0 +1,43 @@
+from domain.deals.filters import DealFilters
+from domain.deals.pagination import DealOrdering, DealPage
+from domain.deals.repository import AsyncDealRepository, DealRepository
+
+
+class GetDealsPageUseCase:
+    """Use case for retrieving a page of deals."""
+
+    def __init__(self, repository: DealRepository) -> None:
+        """Initialize with a DealRepository implementation."""
+        self.repository = repository
+
+    def execute(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> DealPage:
+        """Retrieve a page of deals, starting after the given cursor."""
+        return self.repository.get_page(
+            limit=limit, cursor=cursor, ordering=ordering, filters=filters
+        )
+
+
+class AsyncGetDealsPageUseCase:
+    """Async variant of `GetDealsPageUseCase`."""
+
+    def __init__(self, repository: AsyncDealRepository) -> None:
+        """Initialize with an AsyncDealRepository implementation."""
+        self.repository = repository
+
+    async def execute(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> DealPage:
+        """Retrieve a page of deals, starting after the given cursor."""
+        return await self.repository.get_page(
+            limit=limit, cursor=cursor, ordering=ordering, filters=filters
+        )
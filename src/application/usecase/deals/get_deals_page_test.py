@@ -0,0 +1,66 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
+
+from application.usecase.deals.get_deals_page import (
+    AsyncGetDealsPageUseCase,
+    GetDealsPageUseCase,
+)
+from domain.deals.entity import DealEntity
+from domain.deals.filters import DealFilters
+from domain.deals.pagination import DealPage
+
+
+class GetDealsPageUseCaseTest(unittest.TestCase):
+    def test_execute_returns_page(self) -> None:
+        mock_repo = Mock()
+        page = DealPage(
+            deals=[
+                DealEntity(
+                    id=1,
+                    title="Deal1",
+                    company_id=2,
+                    value=Decimal(100),
+                    tags=[],
+                    distributor_id=None,
+                )
+            ],
+            next_cursor="abc",
+        )
+        mock_repo.get_page.return_value = page
+        usecase = GetDealsPageUseCase(mock_repo)
+        filters = DealFilters(company_id=2, tags=[1, 3], tags_match="all")
+        result = usecase.execute(
+            limit=1, cursor="xyz", ordering="-updated_at", filters=filters
+        )
+        self.assertEqual(result, page)
+        mock_repo.get_page.assert_called_once_with(
+            limit=1, cursor="xyz", ordering="-updated_at", filters=filters
+        )
+
+    def test_execute_defaults_to_first_page_by_id(self) -> None:
+        mock_repo = Mock()
+        mock_repo.get_page.return_value = DealPage(deals=[], next_cursor=None)
+        usecase = GetDealsPageUseCase(mock_repo)
+        result = usecase.execute(limit=10)
+        self.assertEqual(result.deals, [])
+        self.assertIsNone(result.next_cursor)
+        mock_repo.get_page.assert_called_once_with(
+            limit=10, cursor=None, ordering="id", filters=None
+        )
+
+
+class AsyncGetDealsPageUseCaseTest(unittest.IsolatedAsyncioTestCase):
+    async def test_execute_returns_page(self) -> None:
+        mock_repo = AsyncMock()
+        page = DealPage(deals=[], next_cursor=None)
+        mock_repo.get_page.return_value = page
+        usecase = AsyncGetDealsPageUseCase(mock_repo)
+        self.assertEqual(await usecase.execute(limit=5), page)
+        mock_repo.get_page.assert_awaited_once_with(
+            limit=5, cursor=None, ordering="id", filters=None
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from domain.deals.filters import DealFilters
+from domain.deals.pagination import DealOrdering
+from domain.deals.repository import AsyncDealRepository, DealRepository
+
+
+class GetDealsPageVersionsUseCase:
+    """Use case for retrieving the versions of the deals of a page."""
+
+    def __init__(self, repository: DealRepository) -> None:
+        """Initialize with a DealRepository implementation."""
+        self.repository = repository
+
+    def execute(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> list[tuple[int, datetime]]:
+        """Return the (id, updated_at) pairs of a page, plus the row after it."""
+        return self.repository.get_page_versions(
+            limit=limit, cursor=cursor, ordering=ordering, filters=filters
+        )
+
+
+class AsyncGetDealsPageVersionsUseCase:
+    """Async variant of `GetDealsPageVersionsUseCase`."""
+
+    def __init__(self, repository: AsyncDealRepository) -> None:
+        """Initialize with an AsyncDealRepository implementation."""
+        self.repository = repository
+
+    async def execute(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> list[tuple[int, datetime]]:
+        """Return the (id, updated_at) pairs of a page, plus the row after it."""
+        return await self.repository.get_page_versions(
+            limit=limit, cursor=cursor, ordering=ordering, filters=filters
+        )
@@ -0,0 +1,37 @@
+import unittest
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, Mock
+
+from application.usecase.deals.get_deals_page_versions import (
+    AsyncGetDealsPageVersionsUseCase,
+    GetDealsPageVersionsUseCase,
+)
+
+
+class GetDealsPageVersionsUseCaseTest(unittest.TestCase):
+    def test_execute_returns_versions(self) -> None:
+        mock_repo = Mock()
+        versions = [(1, datetime(2025, 1, 1, tzinfo=UTC))]
+        mock_repo.get_page_versions.return_value = versions
+        usecase = GetDealsPageVersionsUseCase(mock_repo)
+        result = usecase.execute(limit=10, cursor="abc", ordering="-id")
+        self.assertEqual(result, versions)
+        mock_repo.get_page_versions.assert_called_once_with(
+            limit=10, cursor="abc", ordering="-id", filters=None
+        )
+
+
+class AsyncGetDealsPageVersionsUseCaseTest(unittest.IsolatedAsyncioTestCase):
+    async def test_execute_returns_versions(self) -> None:
+        mock_repo = AsyncMock()
+        versions = [(1, datetime(2025, 1, 1, tzinfo=UTC))]
+        mock_repo.get_page_versions.return_value = versions
+        usecase = AsyncGetDealsPageVersionsUseCase(mock_repo)
+        self.assertEqual(await usecase.execute(limit=10), versions)
+        mock_repo.get_page_versions.assert_awaited_once_with(
+            limit=10, cursor=None, ordering="id", filters=None
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,14 @@
+from domain.deals.pagination import DealPage
+from domain.deals.repository import DealRepository
+
+
+class SearchDealsUseCase:
+    """Use case for searching deals by the words of their title."""
+
+    def __init__(self, repository: DealRepository) -> None:
+        """Initialize with a DealRepository implementation."""
+        self.repository = repository
+
+    def execute(self, query: str, limit: int, cursor: str | None = None) -> DealPage:
+        """Return a page of the deals matching the query, best matches first."""
+        return self.repository.search(query, limit, cursor)
@@ -0,0 +1,19 @@
+import unittest
+from unittest.mock import Mock
+
+from application.usecase.deals.search_deals import SearchDealsUseCase
+from domain.deals.pagination import DealPage
+
+
+class SearchDealsUseCaseTest(unittest.TestCase):
+    def test_execute_returns_page(self) -> None:
+        mock_repo = Mock()
+        page = DealPage(deals=[], next_cursor=None)
+        mock_repo.search.return_value = page
+        usecase = SearchDealsUseCase(mock_repo)
+        self.assertEqual(usecase.execute("acme", limit=10, cursor="abc"), page)
+        mock_repo.search.assert_called_once_with("acme", 10, "abc")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 from decimal import Decimal
 
 from domain.deals.entity import DealEntity
-from domain.deals.repository import DealRepository
+from domain.deals.repository import AsyncDealRepository, DealRepository
 
 
 class UpdateDealUseCase:
@@ -30,3 +30,31 @@ class UpdateDealUseCase:
             tags=tags,
             value=value,
         )
+
+
+class AsyncUpdateDealUseCase:
+    """Async variant of `UpdateDealUseCase`."""
+
+    def __init__(self, repository: AsyncDealRepository) -> None:
+        """Initialize with an AsyncDealRepository implementation."""
+        self.repository = repository
+
+    async def execute(
+        self,
+        deal_id: int,
+        title: str | None = None,
+        distributor_id: int | None = None,
+        tags: list[int] | None = None,
+        value: Decimal | None = None,
+    ) -> DealEntity | None:
+        """Update an existing deal using the repository and return the updated entity.
+
+        Returns None if the deal is not found.
+        """
+        return await self.repository.update(
+            deal_id=deal_id,
+            title=title,
+            distributor_id=distributor_id,
+            tags=tags,
+            value=value,
+        )
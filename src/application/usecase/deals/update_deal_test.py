@@ -1,8 +1,11 @@
 import unittest
 from decimal import Decimal
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
-from application.usecase.deals.update_deal import UpdateDealUseCase
+from application.usecase.deals.update_deal import (
+    AsyncUpdateDealUseCase,
+    UpdateDealUseCase,
+)
 from domain.deals.entity import DealEntity
 
 
@@ -58,5 +61,26 @@ class UpdateDealUseCaseTest(unittest.TestCase):
         )
 
 
+class AsyncUpdateDealUseCaseTest(unittest.IsolatedAsyncioTestCase):
+    async def test_execute_updates_deal(self) -> None:
+        mock_repo = AsyncMock()
+        expected_deal = DealEntity(
+            id=1,
+            title="Deal",
+            company_id=2,
+            value=Decimal(100),
+            tags=[],
+            distributor_id=None,
+        )
+        mock_repo.update.return_value = expected_deal
+        usecase = AsyncUpdateDealUseCase(mock_repo)
+
+        result = await usecase.execute(deal_id=1, title="Deal")
+        self.assertEqual(result, expected_deal)
+        mock_repo.update.assert_awaited_once_with(
+            deal_id=1, title="Deal", distributor_id=None, tags=None, value=None
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
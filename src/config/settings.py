@@ -52,6 +52,42 @@ CELERY_TIMEZONE = "UTC"
 CELERY_TASK_ALWAYS_EAGER = True  # Execute tasks synchronously for testing
 CELERY_TASK_EAGER_PROPAGATES = True
 
+# Results are stored per task as set by TASK_RESULT_POLICIES below.
+CELERY_TASK_ANNOTATIONS = ["infra.celery.results.ResultPolicyAnnotation"]
+CELERY_RESULT_EXTENDED = True  # Store task names, to prune results per task
+CELERY_RESULT_EXPIRES = None  # Pruned by prune_task_results instead of Celery
+
+# Periodic tasks, synced into django_celery_beat's tables by its scheduler.
+CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+# Deal events are written to an outbox table and relayed by these periodic tasks.
+CELERY_BEAT_SCHEDULE: dict[str, Any] = {
+    "relay-deal-events": {
+        "task": "application.tasks.deals.tasks.relay_deal_events",
+        "schedule": 1.0,  # Seconds
+    },
+    "prune-deal-events": {
+        "task": "application.tasks.deals.tasks.prune_deal_events",
+        "schedule": 3600.0,
+    },
+    "prune-task-results": {
+        "task": "infra.celery.tasks.prune_task_results",
+        "schedule": 600.0,
+    },
+}
+
+# Result policy of each task: the first matching task name pattern applies.
+# POLICY is "ignore", "failure_only" or "ttl"; stored results are deleted TTL
+# seconds after they are done (None keeps them).
+TASK_RESULT_POLICIES: dict[str, dict[str, Any]] = {
+    "application.tasks.deals.tasks.*_emitter": {
+        "POLICY": "failure_only",
+        "TTL": 7 * 24 * 3600,
+    },
+    "application.tasks.deals.tasks.*": {"POLICY": "ignore"},
+    "infra.celery.tasks.*": {"POLICY": "ignore"},
+    "*": {"POLICY": "ttl", "TTL": 24 * 3600},
+}
+
 # Database broker configuration for SQLite
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 CELERY_BROKER_TRANSPORT_OPTIONS: dict[str, Any] = {
@@ -60,6 +96,61 @@ CELERY_BROKER_TRANSPORT_OPTIONS: dict[str, Any] = {
     "fanout_patterns": True,
 }
 
+# Deals read-through cache (see `infra.cache.deals.cached_repository`)
+DEALS_CACHE: dict[str, Any] = {
+    "MAX_SIZE": 10_000,  # Deals kept in each process
+    "TTL": 30,  # Seconds; bounds staleness across processes
+    "SHARED_CACHE_ALIAS": None,  # Django cache alias of the shared tier, if any
+    "SHARED_TTL": 300,  # Seconds
+}
+
+# Route deal writes through a per-host write coordinator. The writes of every
+# worker process are then applied one group-committed batch at a time, instead of
+# racing for the SQLite write lock. Requires a single database in DEALS_SHARDS.
+DEALS_WRITES: dict[str, Any] = {
+    "COORDINATED": False,
+    "LOCK_PATH": None,  # Defaults to the database file with a .write-lock suffix
+    "TIMEOUT": 10.0,  # Seconds a write may wait before it starts
+    "MAX_BATCH": 32,  # Writes committed per transaction
+}
+
+# Databases holding the deals, each company's deals in one of them. A company
+# goes to the database its ID hashes to, unless moved by `move_company_shard`.
+DEALS_SHARDS: dict[str, Any] = {
+    # Alias of each shard in DATABASES: its number, which must never change.
+    "DATABASES": {"default": 0},
+    "DIRECTORY": "default",  # Database recording the moved companies
+    # Deal IDs allocated by shard n are multiples of ID_STRIDE plus n.
+    "ID_STRIDE": 1024,
+}
+
+# Serve the deal list, detail and export endpoints with native async views.
+# Only worth it under ASGI: under WSGI each async view runs in its own event loop.
+# With several DEALS_SHARDS, they call the sharded repository in threads instead.
+DEALS_ASYNC_VIEWS = False
+
+DEALS_EVENTS: dict[str, Any] = {
+    # "outbox": events are written with the change and relayed (at least once).
+    # "background": events are queued in process on commit and sent from a
+    # thread; faster writes, but queued events are lost if the process dies.
+    "PUBLISHER": "outbox",
+    # Options of the background publisher.
+    "QUEUE_SIZE": 10_000,  # Events waiting to be sent
+    "BATCH_SIZE": 500,  # Events per Celery message
+    "FLUSH_INTERVAL": 0.5,  # Seconds spent filling a batch
+    "OVERFLOW": "block",  # When the queue is full: "block", "drop" or "spill"
+    "BLOCK_TIMEOUT": 1.0,  # Seconds "block" waits for room per write before dropping
+    "SPILL_PATH": BASE_DIR / "var" / "deal_events.spill",  # Used by "spill"
+}
+
+DEALS_OUTBOX: dict[str, Any] = {
+    "BATCH_SIZE": 500,  # Events published per Celery message
+    "RETENTION": 7 * 24 * 3600,  # Seconds sent events are kept before pruning
+    # Seconds events wait before being relayed, so that bursts of writes to a
+    # deal are coalesced into one event. Events are always coalesced per batch.
+    "COALESCE_WINDOW": 0,
+}
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -81,6 +172,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "infra.metrics.middleware.MetricsMiddleware",
+    "infra.db.instrumentation.middleware.QueryInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -88,6 +181,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "infra.db.replicas.middleware.ReplicaRoutingMiddleware",
+    "infra.profiling.middleware.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -116,13 +211,94 @@ WSGI_APPLICATION = "config.wsgi.application"
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
 
+# The SQLite backend of `infra.db.sqlite` applies a pragma profile (WAL journal,
+# `synchronous=NORMAL`, mmap, page cache, in-memory temp store, busy timeout) to
+# every connection; OPTIONS["pragmas"] overrides entries of its DEFAULT_PRAGMAS.
+# Connections are kept for CONN_MAX_AGE seconds and checked before reuse. Set
+# CONN_MAX_AGE to 0 when serving the async views, which don't reuse connections.
 DATABASES: dict[str, dict[str, Any]] = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
+        "ENGINE": "infra.db.sqlite",
         "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            # Take the write lock when a transaction starts, so concurrent
+            # writers wait on the busy timeout instead of failing to upgrade.
+            "transaction_mode": "IMMEDIATE",
+            "pragmas": {},
+        },
     }
 }
 
+# Reads go to the replicas below and writes to the primary. A client that wrote
+# reads from the primary for STICKY_SECONDS, so it reads its own writes.
+DATABASE_ROUTERS = ["infra.db.replicas.router.ReplicaRouter"]
+DATABASE_REPLICAS: dict[str, Any] = {
+    "PRIMARY": "default",
+    "REPLICAS": {},  # Alias in DATABASES of each replica: its weight
+    "SELECTION": "weighted",  # "weighted" (random) or "least_loaded"
+    "STICKY_SECONDS": 5.0,
+    "STICKY_COOKIE": "primary_until",
+    "STICKY_HEADER": "X-Primary-Until",
+}
+
+# In-process metrics, served at /metrics in the Prometheus text format.
+METRICS: dict[str, Any] = {
+    "ENABLED": True,
+    # Directory where each process (e.g. gunicorn worker) of the host writes its
+    # metrics, so /metrics serves them all. Empty it when the server starts.
+    "MULTIPROCESS_DIR": None,
+    "FLUSH_INTERVAL": 1.0,  # Seconds between writes of a process's metrics
+}
+
+# Count and time the queries of each request (Server-Timing header and a log
+# line), and check them against the budget of the view.
+SQL_INSTRUMENTATION: dict[str, Any] = {
+    "ENABLED": True,
+    # Maximum queries of a request, by URL name or dotted path of the view.
+    # Deal lists and searches must not grow with the number of deals listed.
+    "BUDGETS": {
+        "deal-list-create": 8,
+        "deal-detail": 12,
+        "deal-bulk-create": 12,
+        "deal-search": 6,
+        "deal-stats": 4,
+    },
+    "DEFAULT_BUDGET": None,  # Budget of the other views; None for no budget
+    "ON_BUDGET_EXCEEDED": "warn",  # "warn" (log) or "raise"
+    "SERVER_TIMING": True,
+    "LOG": True,
+}
+
+# Log the queries slower than a threshold, with their plan, to a rotating file;
+# group them with `manage.py slow_query_report`.
+SLOW_QUERY_LOG: dict[str, Any] = {
+    "ENABLED": True,
+    "THRESHOLD_MS": 100.0,
+    "PATH": BASE_DIR / "var" / "log" / "slow_queries.log",
+    "MAX_BYTES": 10 * 1024 * 1024,  # Size at which the log rotates
+    "BACKUP_COUNT": 5,  # Rotated logs kept
+    # Log the query plan, flagging full table scans. Runs EXPLAIN on each slow
+    # query.
+    "EXPLAIN": True,
+}
+
+# Profile the views of some requests with cProfile and tracemalloc; rank the
+# results with `manage.py profile_report`.
+PROFILING: dict[str, Any] = {
+    "ENABLED": False,
+    "DIRECTORY": BASE_DIR / "var" / "profiles",
+    "SAMPLE_RATE": 0.0,  # Share of the requests profiled at random
+    # Requests sending a token from `manage.py profile_token` in this header are
+    # profiled, whatever the sample rate.
+    "HEADER": "X-Profile",
+    "TOKEN_MAX_AGE": 3600,  # Seconds a token stays valid
+    "MAX_DUMPS": 1000,  # Profiles kept in DIRECTORY before profiling stops
+    "TOP_ALLOCATIONS": 25,  # Source lines with the largest allocations kept
+    "TRACEMALLOC_FRAMES": 1,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
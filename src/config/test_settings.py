@@ -1,7 +1,7 @@
 # mypy: ignore-errors
 # pyright: ignore
 # type: ignore
-# ruff: noqa: F403, D101, ANN204, ANN001, D105, S105
+# ruff: noqa: F403, F405, D101, ANN204, ANN001, D105, S105
 
 """Test settings for Django project."""
 
@@ -23,7 +23,17 @@ DATABASES: dict[str, dict[str, Any]] = {
         "OPTIONS": {
             "timeout": 20,
         },
-    }
+    },
+    # A second deal shard, for the tests of sharding.
+    "shard": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    },
+    # Not a replica unless a test configures DATABASE_REPLICAS, and syncs it.
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    },
 }
 
 
@@ -45,5 +55,20 @@ PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.MD5PasswordHasher",  # Faster for tests
 ]
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# The views' repository outlives each test database, so never serve cached deals.
+DEALS_CACHE = {**DEALS_CACHE, "TTL": 0}
+
+# Fail the requests running more queries than their view's budget.
+SQL_INSTRUMENTATION = {**SQL_INSTRUMENTATION, "ON_BUDGET_EXCEEDED": "raise"}
+
+# Tests install the slow query log themselves, instead of writing to var/log.
+SLOW_QUERY_LOG = {**SLOW_QUERY_LOG, "ENABLED": False}
+
 # Disable logging during tests
 LOGGING_CONFIG = None
@@ -18,7 +18,10 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import include, path
 
+from application.presentation.metrics.views import MetricsView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("application.urls")),
+    path("metrics", MetricsView.as_view(), name="metrics"),
 ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.2 on 2026-10-18 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="dealmodel",
+            index=models.Index(
+                fields=["updated_at", "id"], name="deal_updated_at_id_idx"
+            ),
+        ),
+    ]
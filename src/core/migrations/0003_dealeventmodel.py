@@ -0,0 +1,41 @@
+# Generated by Django 5.2.2 on 2026-10-18 11:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_dealmodel_updated_at_id_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DealEventModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("event_type", models.CharField(max_length=16)),
+                ("deal_id", models.BigIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("sent_at__isnull", True)),
+                        fields=["id"],
+                        name="deal_event_unsent_idx",
+                    ),
+                    models.Index(fields=["sent_at"], name="deal_event_sent_at_idx"),
+                ],
+            },
+        ),
+    ]
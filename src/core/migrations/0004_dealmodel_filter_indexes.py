@@ -0,0 +1,30 @@
+# Generated by Django 5.2.2 on 2026-10-18 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_dealeventmodel"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="dealmodel",
+            index=models.Index(fields=["value", "id"], name="deal_value_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="dealmodel",
+            index=models.Index(
+                fields=["company_id", "updated_at", "id"], name="deal_company_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="dealmodel",
+            index=models.Index(
+                fields=["distributor_id", "updated_at", "id"],
+                name="deal_distributor_updated_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.2 on 2026-10-18 11:32
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_dealmodel_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DealStatsModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("dimension", models.CharField(max_length=16)),
+                ("group_id", models.BigIntegerField()),
+                ("deal_count", models.BigIntegerField(default=0)),
+                (
+                    "value_sum",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0"), max_digits=20
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("dimension", "group_id"), name="deal_stats_group_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
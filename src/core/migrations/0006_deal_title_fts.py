@@ -0,0 +1,97 @@
+"""Full-text index of deal titles, on SQLite only.
+
+`core_deal_title_fts` is an external content FTS5 table: it indexes the titles
+of `core_dealmodel` without storing them again, and triggers keep it in sync
+with every insert, delete and title update. Other databases keep no index and
+search titles with `icontains`.
+
+SQLite drops the triggers of a table it drops, and Django remakes a table to
+alter most of its columns on SQLite. A later migration remaking
+`core_dealmodel` must run `create_triggers` again.
+"""
+
+from django.apps.registry import Apps
+from django.db import migrations
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+CREATE_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS core_deal_title_fts USING fts5(
+    title,
+    content='core_dealmodel',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+)
+"""
+
+CREATE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS core_deal_title_fts_insert
+    AFTER INSERT ON core_dealmodel BEGIN
+        INSERT INTO core_deal_title_fts(rowid, title) VALUES (new.id, new.title);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_deal_title_fts_delete
+    AFTER DELETE ON core_dealmodel BEGIN
+        INSERT INTO core_deal_title_fts(core_deal_title_fts, rowid, title)
+        VALUES ('delete', old.id, old.title);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_deal_title_fts_update
+    AFTER UPDATE OF title ON core_dealmodel BEGIN
+        INSERT INTO core_deal_title_fts(core_deal_title_fts, rowid, title)
+        VALUES ('delete', old.id, old.title);
+        INSERT INTO core_deal_title_fts(rowid, title) VALUES (new.id, new.title);
+    END
+    """,
+]
+
+REBUILD_INDEX = "INSERT INTO core_deal_title_fts(core_deal_title_fts) VALUES ('rebuild')"
+
+DROP_INDEX = [
+    "DROP TRIGGER IF EXISTS core_deal_title_fts_insert",
+    "DROP TRIGGER IF EXISTS core_deal_title_fts_delete",
+    "DROP TRIGGER IF EXISTS core_deal_title_fts_update",
+    "DROP TABLE IF EXISTS core_deal_title_fts",
+]
+
+
+def create_triggers(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """Create the triggers syncing the index, and index the existing titles."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    for sql in CREATE_TRIGGERS:
+        schema_editor.execute(sql)
+    schema_editor.execute(REBUILD_INDEX)
+
+
+def create_index(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """Create the full-text index of the deal titles, with its triggers."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    schema_editor.execute(CREATE_TABLE)
+    create_triggers(apps, schema_editor)
+
+
+def drop_index(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """Drop the triggers and the full-text index."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    for sql in DROP_INDEX:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_dealstatsmodel"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.2 on 2026-10-18 11:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_deal_title_fts"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CompanyShardModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("company_id", models.BigIntegerField(unique=True)),
+                ("database", models.CharField(max_length=64)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="DealIdSequenceModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("shard", models.PositiveIntegerField(unique=True)),
+                ("last_value", models.BigIntegerField()),
+            ],
+        ),
+    ]
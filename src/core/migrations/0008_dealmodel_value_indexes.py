@@ -0,0 +1,26 @@
+# Generated by Django 5.2.2 on 2026-10-18 12:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_deal_shards"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="dealmodel",
+            index=models.Index(
+                fields=["company_id", "value", "id"], name="deal_company_value_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="dealmodel",
+            index=models.Index(
+                fields=["distributor_id", "value", "id"],
+                name="deal_distributor_value_idx",
+            ),
+        ),
+    ]
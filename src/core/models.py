@@ -80,6 +80,135 @@ class DealModel(BaseModel):
         max_digits=12, decimal_places=2
     )
 
+    class Meta:
+        """Meta options for the DealModel."""
+
+        indexes = [
+            # Keyset pagination ordered by (updated_at, id), and `updated_since`.
+            models.Index(fields=["updated_at", "id"], name="deal_updated_at_id_idx"),
+            # Keyset pagination ordered by (value, id), and value ranges.
+            models.Index(fields=["value", "id"], name="deal_value_id_idx"),
+            # Deals of a company or distributor by update time or value; the
+            # foreign key indexes serve them by ID.
+            models.Index(
+                fields=["company_id", "updated_at", "id"],
+                name="deal_company_updated_idx",
+            ),
+            models.Index(
+                fields=["distributor_id", "updated_at", "id"],
+                name="deal_distributor_updated_idx",
+            ),
+            models.Index(
+                fields=["company_id", "value", "id"], name="deal_company_value_idx"
+            ),
+            models.Index(
+                fields=["distributor_id", "value", "id"],
+                name="deal_distributor_value_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         """Return the string representation of the deal (its title)."""
         return self.title
+
+
+class DealStatsModel(models.Model):
+    """Deal count and value sum of a company, distributor or tag.
+
+    Maintained by the deal repository in the transaction of each write, and
+    rebuilt from the deals by the `rebuild_deal_stats` command.
+    """
+
+    id: int
+    # One of `domain.deals.stats.STATS_DIMENSIONS`.
+    dimension: "models.CharField[str, str]" = models.CharField(max_length=16)
+    group_id: "models.BigIntegerField[int, int]" = models.BigIntegerField()
+    deal_count: "models.BigIntegerField[int, int]" = models.BigIntegerField(default=0)
+    value_sum: "models.DecimalField[Decimal, Decimal]" = models.DecimalField(
+        max_digits=20, decimal_places=2, default=Decimal(0)
+    )
+
+    class Meta:
+        """Meta options for the DealStatsModel."""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dimension", "group_id"], name="deal_stats_group_uniq"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """Return the string representation of the group's stats."""
+        return f"{self.dimension} {self.group_id}: {self.deal_count} deal(s)"
+
+
+class DealEventModel(models.Model):
+    """Outbox of deal events, written in the same transaction as the change.
+
+    A relay publishes unsent events in batches and then marks them as sent.
+    """
+
+    id: int
+    # One of `domain.deals.events.DEAL_EVENT_TYPES`.
+    event_type: "models.CharField[str, str]" = models.CharField(max_length=16)
+    # Not a foreign key: events outlive the deals they are about.
+    deal_id: "models.BigIntegerField[int, int]" = models.BigIntegerField()
+    created_at: "models.DateTimeField[datetime, datetime]" = models.DateTimeField(
+        auto_now_add=True
+    )
+    sent_at: "models.DateTimeField[datetime | None, datetime | None]" = (
+        models.DateTimeField(null=True, blank=True)
+    )
+
+    class Meta:
+        """Meta options for the DealEventModel."""
+
+        indexes = [
+            # The relay scans unsent events in ID order.
+            models.Index(
+                fields=["id"],
+                condition=models.Q(sent_at__isnull=True),
+                name="deal_event_unsent_idx",
+            ),
+            # Pruning deletes sent events by age.
+            models.Index(fields=["sent_at"], name="deal_event_sent_at_idx"),
+        ]
+
+    def __str__(self) -> str:
+        """Return the string representation of the event."""
+        return f"{self.event_type} deal {self.deal_id}"
+
+
+class CompanyShardModel(models.Model):
+    """Shard of a company's deals, overriding the one its ID hashes to.
+
+    Kept in the directory database, and written when a company is moved to
+    another shard.
+    """
+
+    id: int
+    company_id: "models.BigIntegerField[int, int]" = models.BigIntegerField(unique=True)
+    # Alias of the shard's database.
+    database: "models.CharField[str, str]" = models.CharField(max_length=64)
+
+    def __str__(self) -> str:
+        """Return the string representation of the company's shard."""
+        return f"company {self.company_id}: {self.database}"
+
+
+class DealIdSequenceModel(models.Model):
+    """Last deal ID sequence value used by a shard, stored in that shard.
+
+    Deal IDs of shard `n` are `value * ID_STRIDE + n`, so shards never allocate
+    the same ID.
+    """
+
+    id: int
+    shard: "models.PositiveIntegerField[int, int]" = models.PositiveIntegerField(
+        unique=True
+    )
+    last_value: "models.BigIntegerField[int, int]" = models.BigIntegerField()
+
+    def __str__(self) -> str:
+        """Return the string representation of the sequence."""
+        return f"shard {self.shard}: {self.last_value}"
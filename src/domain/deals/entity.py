@@ -1,5 +1,7 @@
+from collections.abc import Mapping
+from datetime import datetime
 from decimal import Decimal
-from typing import Annotated
+from typing import Annotated, Any
 
 from pydantic import BaseModel, Field
 
@@ -15,6 +17,7 @@ class DealEntity(BaseModel):
     distributor_id: int | None
     tags: list[int] | None
     value: Annotated[Decimal, Field(gt=0)]
+    updated_at: datetime | None = None
 
     def __str__(self) -> str:
         """Return the string representation of the deal."""
@@ -22,15 +25,47 @@ class DealEntity(BaseModel):
 
     @staticmethod
     def from_model(model: DealModel) -> "DealEntity":
-        """Create a DealEntity from a model instance."""
-        if not model.company or model.company and not model.company.id:
+        """Create a DealEntity from a model instance.
+
+        Foreign keys are read from their `*_id` attributes, so the related
+        company and distributor are never loaded. Prefetch `tags` when building
+        entities for many models.
+        """
+        if not model.company_id:
             raise ValueError("Company must be associated with the deal.")
 
         return DealEntity(
             id=model.id,
             title=model.title,
-            company_id=model.company.id,
-            distributor_id=model.distributor.id if model.distributor else None,
+            company_id=model.company_id,
+            distributor_id=model.distributor_id,
             tags=[tag.id for tag in model.tags.all()],
             value=model.value,
+            updated_at=model.updated_at,
+        )
+
+    @staticmethod
+    def from_values(row: Mapping[str, Any], tags: list[int]) -> "DealEntity":
+        """Create a DealEntity from a `QuerySet.values()` row and its tag IDs."""
+        if not row["company_id"]:
+            raise ValueError("Company must be associated with the deal.")
+
+        return DealEntity(
+            id=row["id"],
+            title=row["title"],
+            company_id=row["company_id"],
+            distributor_id=row["distributor_id"],
+            tags=tags,
+            value=row["value"],
+            updated_at=row.get("updated_at"),
         )
+
+
+class NewDeal(BaseModel):
+    """Represents the attributes of a deal that is yet to be created."""
+
+    title: str
+    company_id: int
+    value: Annotated[Decimal, Field(gt=0)]
+    tags: list[int] | None = None
+    distributor_id: int | None = None
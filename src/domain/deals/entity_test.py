@@ -77,6 +77,34 @@ class TestDealEntity(unittest.TestCase):
         self.assertEqual(entity.tags, [1, 2])
         self.assertEqual(entity.value, Decimal(200.0))
 
+    def test_from_values(self) -> None:
+        """Test creating a DealEntity from a values() row."""
+        row = {
+            "id": 7,
+            "title": "Row Deal",
+            "company_id": 3,
+            "distributor_id": None,
+            "value": Decimal("12.50"),
+        }
+        entity = DealEntity.from_values(row, tags=[4, 5])
+        self.assertEqual(entity.id, 7)
+        self.assertEqual(entity.company_id, 3)
+        self.assertIsNone(entity.distributor_id)
+        self.assertEqual(entity.tags, [4, 5])
+        self.assertEqual(entity.value, Decimal("12.50"))
+
+    def test_from_values_requires_company(self) -> None:
+        """Test that a row without a company is rejected."""
+        row = {
+            "id": 7,
+            "title": "Row Deal",
+            "company_id": None,
+            "distributor_id": None,
+            "value": Decimal("12.50"),
+        }
+        with self.assertRaises(ValueError):
+            DealEntity.from_values(row, tags=[])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,66 @@
+from collections.abc import Iterable
+from typing import Literal, Protocol, get_args
+
+from pydantic import BaseModel
+
+DealEventType = Literal["created", "updated", "deleted"]
+
+DEAL_EVENT_TYPES: tuple[str, ...] = get_args(DealEventType)
+
+
+class DealEvent(BaseModel):
+    """An event about a deal, as published to consumers.
+
+    Events are delivered at least once; `event_id` lets consumers drop duplicates.
+    """
+
+    event_id: int
+    event_type: DealEventType
+    deal_id: int
+
+
+class EventPublisher(Protocol):
+    """Publishes the events of deal writes.
+
+    Called by the repository inside the transaction of the write; events must
+    not reach consumers unless that transaction commits.
+    """
+
+    def publish(self, event_type: DealEventType, deal_ids: list[int]) -> None:
+        """Publish one event of the given type per deal."""
+        ...
+
+
+def coalesce_deal_events(events: Iterable[DealEvent]) -> list[DealEvent]:
+    """Collapse a batch of events into the fewest that tell consumers the same.
+
+    For each deal, in event order:
+
+    - Repeated events of one type are kept once, as the latest of them.
+    - Updates of a deal created in the batch are folded into its creation.
+    - A deletion drops the deal's earlier events; if the deal was created in the
+      batch, the deletion is dropped too.
+
+    Args:
+        events: Events in any order
+
+    Returns:
+        list[DealEvent]: Surviving events, ordered by event ID
+    """
+    by_deal: dict[int, dict[str, DealEvent]] = {}
+    for event in sorted(events, key=lambda event: event.event_id):
+        kept = by_deal.setdefault(event.deal_id, {})
+        if event.event_type == "deleted":
+            created = kept.pop("created", None)
+            kept.clear()
+            if created is None:
+                kept["deleted"] = event
+        elif event.event_type == "updated" and "created" in kept:
+            continue
+        else:
+            kept[event.event_type] = event
+
+    return sorted(
+        (event for kept in by_deal.values() for event in kept.values()),
+        key=lambda event: event.event_id,
+    )
@@ -0,0 +1,58 @@
+import unittest
+
+from .events import DealEvent, DealEventType, coalesce_deal_events
+
+
+def _events(*events: tuple[DealEventType, int]) -> list[DealEvent]:
+    return [
+        DealEvent(event_id=event_id, event_type=event_type, deal_id=deal_id)
+        for event_id, (event_type, deal_id) in enumerate(events, start=1)
+    ]
+
+
+def _summary(events: list[DealEvent]) -> list[tuple[int, str, int]]:
+    return [(event.event_id, event.event_type, event.deal_id) for event in events]
+
+
+class TestCoalesceDealEvents(unittest.TestCase):
+    """Unit tests for coalesce_deal_events."""
+
+    def test_repeated_updates_keep_the_latest(self) -> None:
+        """Test that a burst of updates of a deal collapses into one."""
+        burst: list[tuple[DealEventType, int]] = [("updated", 1)] * 20
+        events = _events(*burst, ("updated", 2))
+        self.assertEqual(
+            _summary(coalesce_deal_events(events)),
+            [(20, "updated", 1), (21, "updated", 2)],
+        )
+
+    def test_updates_fold_into_creation(self) -> None:
+        """Test that updates of a deal created in the batch are dropped."""
+        events = _events(("created", 1), ("updated", 1), ("updated", 1))
+        self.assertEqual(_summary(coalesce_deal_events(events)), [(1, "created", 1)])
+
+    def test_create_then_delete_cancels_out(self) -> None:
+        """Test that a deal created and deleted in the batch emits nothing."""
+        events = _events(("created", 1), ("updated", 1), ("deleted", 1), ("created", 2))
+        self.assertEqual(_summary(coalesce_deal_events(events)), [(4, "created", 2)])
+
+    def test_delete_drops_earlier_updates(self) -> None:
+        """Test that only the deletion of an existing deal is kept."""
+        events = _events(("updated", 1), ("deleted", 1))
+        self.assertEqual(_summary(coalesce_deal_events(events)), [(2, "deleted", 1)])
+
+    def test_events_are_ordered_by_id(self) -> None:
+        """Test that input order does not matter."""
+        events = _events(("updated", 1), ("updated", 2), ("updated", 1))
+        self.assertEqual(
+            _summary(coalesce_deal_events(reversed(events))),
+            [(2, "updated", 2), (3, "updated", 1)],
+        )
+
+    def test_empty(self) -> None:
+        """Test coalescing no events."""
+        self.assertEqual(coalesce_deal_events([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Literal
+
+from pydantic import BaseModel
+
+# The criteria an index of each ordering field serves while reading the deals in
+# order. With a company or distributor, tags are checked on the deals of that
+# company or distributor, in any order. Other criteria are checked on the deals
+# read in order, until a page is filled.
+ORDERED_CRITERIA: dict[str, frozenset[str]] = {
+    "id": frozenset({"company_id", "distributor_id", "tags"}),
+    "updated_at": frozenset({"company_id", "distributor_id", "updated_since"}),
+    "value": frozenset({"company_id", "distributor_id", "value_min", "value_max"}),
+}
+
+
+class DealFilters(BaseModel):
+    """Criteria a listed deal must match; unset criteria match every deal."""
+
+    company_id: int | None = None
+    distributor_id: int | None = None
+    tags: list[int] | None = None
+    # Whether a deal needs any or all of `tags`.
+    tags_match: Literal["any", "all"] = "any"
+    value_min: Decimal | None = None
+    value_max: Decimal | None = None
+    updated_since: datetime | None = None
+
+    def is_empty(self) -> bool:
+        """Return whether no criteria are set."""
+        return not self.model_dump(exclude_defaults=True)
+
+    def default_ordering(self) -> str:
+        """Return the field deals matching the criteria are ordered by by default.
+
+        It is the first field whose index serves every criteria, e.g. the value
+        for a value range, or the ID when none does.
+        """
+        criteria = set(self.model_dump(exclude_defaults=True)) - {"tags_match"}
+        if self.company_id is not None or self.distributor_id is not None:
+            criteria.discard("tags")
+        return next(
+            (field for field, served in ORDERED_CRITERIA.items() if criteria <= served),
+            "id",
+        )
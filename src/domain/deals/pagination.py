@@ -0,0 +1,66 @@
+import base64
+import binascii
+import json
+from typing import Any, Literal, get_args
+
+from pydantic import BaseModel
+
+from domain.deals.entity import DealEntity
+
+DealOrdering = Literal["id", "-id", "updated_at", "-updated_at", "value", "-value"]
+
+DEAL_ORDERINGS: tuple[str, ...] = get_args(DealOrdering)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or was issued for another ordering."""
+
+
+class DealPage(BaseModel):
+    """A page of deals returned by keyset pagination."""
+
+    deals: list[DealEntity]
+    next_cursor: str | None
+
+
+def encode_cursor(ordering: str, keys: list[Any]) -> str:
+    """Encode the keyset position of the last row of a page into an opaque cursor.
+
+    Args:
+        ordering: The ordering the page was produced with
+        keys: JSON-serializable sort key values of the last row, ending with its ID
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    payload = json.dumps({"o": ordering, "k": keys}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, ordering: str) -> list[Any]:
+    """Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor: The opaque cursor string
+        ordering: The ordering the caller is paginating with
+
+    Returns:
+        list[Any]: The sort key values stored in the cursor
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or belongs to another ordering
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed cursor.") from exc
+
+    keys = payload.get("k") if isinstance(payload, dict) else None
+    if not isinstance(keys, list):
+        raise InvalidCursorError("Malformed cursor.")
+
+    if payload.get("o") != ordering:
+        raise InvalidCursorError("Cursor does not match the requested ordering.")
+
+    return keys
@@ -1,7 +1,25 @@
+from collections.abc import AsyncIterator, Iterator
+from datetime import datetime
 from decimal import Decimal
 from typing import Protocol
 
-from domain.deals.entity import DealEntity
+from domain.deals.entity import DealEntity, NewDeal
+from domain.deals.filters import DealFilters
+from domain.deals.pagination import DealOrdering, DealPage
+from domain.deals.stats import DealStats, StatsDimension
+
+
+class InvalidDealReferencesError(ValueError):
+    """Raised when deals reference companies, distributors or tags that don't exist.
+
+    Attributes:
+        errors: Error messages by field, keyed by the position of each invalid deal
+    """
+
+    def __init__(self, errors: dict[int, dict[str, list[str]]]) -> None:
+        """Initialize with the errors of each invalid deal."""
+        super().__init__(f"{len(errors)} deal(s) reference missing records.")
+        self.errors = errors
 
 
 class DealRepository(Protocol):
@@ -29,11 +47,29 @@ class DealRepository(Protocol):
         """
         ...
 
-    def get_one(self, deal_id: int) -> DealEntity | None:
+    def bulk_create(self, deals: list[NewDeal]) -> list[DealEntity]:
+        """Create many deals at once, all or nothing.
+
+        Args:
+            deals: The deals to create
+
+        Returns:
+            list[DealEntity]: The created deal entities, in the same order
+
+        Raises:
+            InvalidDealReferencesError: If any deal references a missing record
+        """
+        ...
+
+    def get_one(
+        self, deal_id: int, min_version: datetime | None = None
+    ) -> DealEntity | None:
         """Retrieve a deal by its ID.
 
         Args:
             deal_id: The ID of the deal to retrieve
+            min_version: Last update time the deal is known to have, e.g. from
+                `get_version`. A cached copy updated before it is read again.
 
         Returns:
             DealEntity | None: The deal entity if found, None otherwise
@@ -48,6 +84,111 @@ class DealRepository(Protocol):
         """
         ...
 
+    def iter_all(self, batch_size: int = 1000) -> Iterator[DealEntity]:
+        """Iterate over all deals ordered by ID, fetching them in batches.
+
+        Args:
+            batch_size: Number of deals fetched from storage at a time
+
+        Returns:
+            Iterator[DealEntity]: Lazy iterator over every deal entity
+        """
+        ...
+
+    def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> DealPage:
+        """Retrieve a page of deals using keyset pagination.
+
+        Args:
+            limit: Maximum number of deals to return
+            cursor: Opaque cursor returned by a previous page, None for the first page
+            ordering: Sort key of the pagination, prefixed with "-" for descending
+            filters: Criteria the deals must match, None for every deal
+
+        Returns:
+            DealPage: The deals of the page and the cursor of the next one, if any
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or belongs to another ordering
+        """
+        ...
+
+    def get_version(self, deal_id: int) -> datetime | None:
+        """Return when a deal was last updated, without loading it.
+
+        Args:
+            deal_id: The ID of the deal
+
+        Returns:
+            datetime | None: The last update time if the deal exists, None otherwise
+        """
+        ...
+
+    def get_page_versions(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> list[tuple[int, datetime]]:
+        """Return the ID and last update time of each deal of a page.
+
+        The first deal after the page is included too, so the result also
+        changes when the page gains or loses a next page.
+
+        Args:
+            limit: Maximum number of deals of the page
+            cursor: Opaque cursor returned by a previous page, None for the first page
+            ordering: Sort key of the pagination, prefixed with "-" for descending
+            filters: Criteria the deals must match, None for every deal
+
+        Returns:
+            list[tuple[int, datetime]]: Up to `limit + 1` (id, updated_at) pairs
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or belongs to another ordering
+        """
+        ...
+
+    def search(self, query: str, limit: int, cursor: str | None = None) -> DealPage:
+        """Search deals by the words of their title, best matches first.
+
+        Every word of the query must start a word of the title. How many
+        matches are ranked may be bounded by the implementation.
+
+        Args:
+            query: Free text to search for
+            limit: Maximum number of deals to return
+            cursor: Opaque cursor returned by a previous page, None for the first page
+
+        Returns:
+            DealPage: The matching deals of the page and the cursor of the next one
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        ...
+
+    def get_stats(
+        self, dimension: StatsDimension, group_ids: list[int]
+    ) -> list[DealStats]:
+        """Return the deal count and value sum of companies, distributors or tags.
+
+        Args:
+            dimension: What the group IDs are IDs of
+            group_ids: IDs of the groups
+
+        Returns:
+            list[DealStats]: The stats of each group, in the order of `group_ids`,
+                zero for groups without deals
+        """
+        ...
+
     def update(
         self,
         deal_id: int,
@@ -83,3 +224,151 @@ class DealRepository(Protocol):
             bool: True if the deal was deleted successfully, False otherwise
         """
         ...
+
+
+class AsyncDealRepository(Protocol):
+    """Protocol for deal repositories serving async (ASGI) callers.
+
+    It mirrors `DealRepository`, with coroutines instead of blocking calls.
+    """
+
+    async def create(
+        self,
+        title: str,
+        company_id: int,
+        value: Decimal,
+        tags: list[int] | None,
+        distributor_id: int | None,
+    ) -> DealEntity:
+        """Create a new deal.
+
+        Args:
+            title: The title of the deal
+            company_id: ID of the associated company
+            value: Value of the deal
+            tags: Optional list of tag IDs to associate with the deal
+            distributor_id: Optional ID of the associated distributor
+
+        Returns:
+            DealEntity: The created deal entity
+        """
+        ...
+
+    async def get_one(
+        self, deal_id: int, min_version: datetime | None = None
+    ) -> DealEntity | None:
+        """Retrieve a deal by its ID.
+
+        Args:
+            deal_id: The ID of the deal to retrieve
+            min_version: Last update time the deal is known to have, e.g. from
+                `get_version`. A cached copy updated before it is read again.
+
+        Returns:
+            DealEntity | None: The deal entity if found, None otherwise
+        """
+        ...
+
+    def iter_all(self, batch_size: int = 1000) -> AsyncIterator[DealEntity]:
+        """Iterate over all deals ordered by ID, fetching them in batches.
+
+        Args:
+            batch_size: Number of deals fetched from storage at a time
+
+        Returns:
+            AsyncIterator[DealEntity]: Lazy async iterator over every deal entity
+        """
+        ...
+
+    async def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> DealPage:
+        """Retrieve a page of deals using keyset pagination.
+
+        Args:
+            limit: Maximum number of deals to return
+            cursor: Opaque cursor returned by a previous page, None for the first page
+            ordering: Sort key of the pagination, prefixed with "-" for descending
+            filters: Criteria the deals must match, None for every deal
+
+        Returns:
+            DealPage: The deals of the page and the cursor of the next one, if any
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or belongs to another ordering
+        """
+        ...
+
+    async def get_version(self, deal_id: int) -> datetime | None:
+        """Return when a deal was last updated, without loading it.
+
+        Args:
+            deal_id: The ID of the deal
+
+        Returns:
+            datetime | None: The last update time if the deal exists, None otherwise
+        """
+        ...
+
+    async def get_page_versions(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> list[tuple[int, datetime]]:
+        """Return the ID and last update time of each deal of a page.
+
+        Args:
+            limit: Maximum number of deals of the page
+            cursor: Opaque cursor returned by a previous page, None for the first page
+            ordering: Sort key of the pagination, prefixed with "-" for descending
+            filters: Criteria the deals must match, None for every deal
+
+        Returns:
+            list[tuple[int, datetime]]: Up to `limit + 1` (id, updated_at) pairs
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or belongs to another ordering
+        """
+        ...
+
+    async def update(
+        self,
+        deal_id: int,
+        title: str | None,
+        distributor_id: int | None,
+        tags: list[int] | None,
+        value: Decimal | None,
+    ) -> DealEntity | None:
+        """Update an existing deal.
+
+        Args:
+            deal_id: ID of the deal to update
+            title: Optional new title for the deal
+            distributor_id: Optional new distributor ID
+            tags: Optional new list of tag IDs
+            value: Optional new value for the deal
+
+        Returns:
+            DealEntity | None: The updated deal entity if successful, None otherwise
+
+        Raises:
+            ValueError: If the deal or distributor doesn't exist
+        """
+        ...
+
+    async def delete(self, deal_id: int) -> bool:
+        """Delete a deal by its ID.
+
+        Args:
+            deal_id: The ID of the deal to delete
+
+        Returns:
+            bool: True if the deal was deleted successfully, False otherwise
+        """
+        ...
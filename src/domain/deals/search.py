@@ -0,0 +1,18 @@
+import re
+
+# Words beyond this are ignored, bounding the cost of a search.
+MAX_SEARCH_TERMS = 8
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def search_terms(query: str) -> list[str]:
+    """Split a title search into its words, ignoring punctuation and operators.
+
+    Args:
+        query: Free text typed by the user
+
+    Returns:
+        list[str]: The words of the query, at most `MAX_SEARCH_TERMS` of them
+    """
+    return WORD_PATTERN.findall(query)[:MAX_SEARCH_TERMS]
@@ -0,0 +1,17 @@
+from decimal import Decimal
+from typing import Literal, get_args
+
+from pydantic import BaseModel
+
+StatsDimension = Literal["company", "distributor", "tag"]
+
+STATS_DIMENSIONS: tuple[str, ...] = get_args(StatsDimension)
+
+
+class DealStats(BaseModel):
+    """Number and total value of the deals of a company, distributor or tag."""
+
+    dimension: StatsDimension
+    group_id: int
+    deal_count: int = 0
+    value_sum: Decimal = Decimal(0)
@@ -5,3 +5,13 @@ class AppConfig(DjangoAppConfig):
     """Configuration for the app application."""
 
     name = "infra"
+
+    def ready(self) -> None:
+        """Record the metrics of Celery tasks, and log slow queries."""
+        from django.db.backends.signals import connection_created
+
+        from infra.db.instrumentation.slow_queries import install_slow_query_log
+        from infra.metrics.instrumentation import connect_celery_signals
+
+        connect_celery_signals()
+        connection_created.connect(install_slow_query_log)
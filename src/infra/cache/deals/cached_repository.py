@@ -0,0 +1,367 @@
+from collections.abc import AsyncIterator, Iterator, Sequence
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, TypeGuard
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from domain.deals.entity import DealEntity, NewDeal
+from domain.deals.filters import DealFilters
+from domain.deals.pagination import DealOrdering, DealPage
+from domain.deals.repository import AsyncDealRepository, DealRepository
+from domain.deals.stats import DealStats, StatsDimension
+from infra.cache.lru import CacheStats, LRUCache
+from infra.db.deals.shards import shard_settings
+from infra.db.replicas.router import primary_reads
+
+# Bump when the cached representation of a deal changes.
+CACHE_KEY_VERSION = 1
+
+DEFAULT_CACHE_SETTINGS: dict[str, Any] = {
+    "MAX_SIZE": 10_000,
+    "TTL": 30,
+    "SHARED_CACHE_ALIAS": None,
+    "SHARED_TTL": 300,
+}
+
+
+def _is_current(
+    entity: DealEntity | None, min_version: datetime | None
+) -> TypeGuard[DealEntity]:
+    """Return whether a cached deal exists and was not updated before a version."""
+    if entity is None:
+        return False
+    return (
+        min_version is None
+        or entity.updated_at is None
+        or entity.updated_at >= min_version
+    )
+
+
+class CachedDealRepository(DealRepository):
+    """Read-through cache of deals by ID in front of another DealRepository.
+
+    Deals are cached in an in-process LRU and, optionally, in a Django cache
+    shared by every process. Updates and deletions invalidate both tiers, both
+    right away and once the surrounding transaction commits. Other processes
+    only see invalidations through the shared tier, so the in-process TTL
+    bounds how stale their copy can be. Misses are read from the primary
+    database, never from a replica: a lagging replica would put back the
+    copy an update just invalidated, for longer than clients stick to the
+    primary after they write.
+    """
+
+    def __init__(
+        self,
+        repository: DealRepository,
+        max_size: int = DEFAULT_CACHE_SETTINGS["MAX_SIZE"],
+        ttl: float = DEFAULT_CACHE_SETTINGS["TTL"],
+        shared_cache: BaseCache | None = None,
+        shared_ttl: float = DEFAULT_CACHE_SETTINGS["SHARED_TTL"],
+        databases: Sequence[str] = (DEFAULT_DB_ALIAS,),
+    ) -> None:
+        """Initialize the cache around a repository.
+
+        Args:
+            repository: The repository the cache reads through to
+            max_size: Maximum number of deals kept in process
+            ttl: Seconds a deal stays in the in-process cache
+            shared_cache: Optional Django cache used as a second tier
+            shared_ttl: Seconds a deal stays in the shared cache
+            databases: Aliases of the databases the repository writes deals to
+        """
+        self.repository = repository
+        self.local_cache: LRUCache[int, DealEntity] = LRUCache(max_size, ttl)
+        self.shared_cache = shared_cache
+        self.shared_ttl = shared_ttl
+        self.databases = databases
+
+    @classmethod
+    def from_settings(cls, repository: DealRepository) -> "CachedDealRepository":
+        """Build the cache as configured by the `DEALS_CACHE` setting."""
+        config = {**DEFAULT_CACHE_SETTINGS, **getattr(settings, "DEALS_CACHE", {})}
+        alias = config["SHARED_CACHE_ALIAS"]
+        return cls(
+            repository,
+            max_size=config["MAX_SIZE"],
+            ttl=config["TTL"],
+            shared_cache=caches[alias] if alias else None,
+            shared_ttl=config["SHARED_TTL"],
+            databases=list(shard_settings()["DATABASES"]),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether deals are kept in either tier."""
+        return self.local_cache.ttl > 0 or self.shared_cache is not None
+
+    @property
+    def stats(self) -> CacheStats:
+        """Return the counters of the in-process cache."""
+        return self.local_cache.stats
+
+    @staticmethod
+    def _shared_key(deal_id: int) -> str:
+        """Return the key of a deal in the shared cache."""
+        return f"deals:v{CACHE_KEY_VERSION}:{deal_id}"
+
+    def invalidate(self, deal_id: int) -> None:
+        """Drop a deal from both cache tiers."""
+        self.local_cache.delete(deal_id)
+        if self.shared_cache is not None:
+            self.shared_cache.delete(self._shared_key(deal_id))
+
+    def _invalidate_now_and_on_commit(self, deal_id: int) -> None:
+        """Invalidate a deal, then again once the current transaction commits.
+
+        The second pass drops any copy cached from a concurrent read that ran
+        before the write became visible. The write may run in a transaction of
+        any database the repository writes to, such as the deal's shard.
+        """
+        self.invalidate(deal_id)
+        for alias in self.databases:
+            transaction.on_commit(lambda: self.invalidate(deal_id), using=alias)
+
+    def get_one(
+        self, deal_id: int, min_version: datetime | None = None
+    ) -> DealEntity | None:
+        """Retrieve a deal by its ID, from the cache when possible."""
+        entity = self.local_cache.get(deal_id)
+        if _is_current(entity, min_version):
+            return entity
+
+        if self.shared_cache is not None:
+            data = self.shared_cache.get(self._shared_key(deal_id))
+            if data is not None:
+                entity = DealEntity.model_validate(data)
+                if _is_current(entity, min_version):
+                    self.local_cache.set(deal_id, entity)
+                    return entity
+
+        if self.enabled:
+            with primary_reads():
+                entity = self.repository.get_one(deal_id, min_version)
+        else:
+            # Nothing is cached: the read may go to a replica.
+            entity = self.repository.get_one(deal_id, min_version)
+        if entity is not None:
+            self.local_cache.set(deal_id, entity)
+            if self.shared_cache is not None:
+                self.shared_cache.set(
+                    self._shared_key(deal_id), entity.model_dump(), self.shared_ttl
+                )
+        return entity
+
+    def create(
+        self,
+        title: str,
+        company_id: int,
+        value: Decimal,
+        tags: list[int] | None,
+        distributor_id: int | None,
+    ) -> DealEntity:
+        """Create a new deal."""
+        return self.repository.create(
+            title=title,
+            company_id=company_id,
+            value=value,
+            tags=tags,
+            distributor_id=distributor_id,
+        )
+
+    def bulk_create(self, deals: list[NewDeal]) -> list[DealEntity]:
+        """Create many deals at once."""
+        return self.repository.bulk_create(deals)
+
+    def get_all(self) -> list[DealEntity]:
+        """Retrieve all deals."""
+        return self.repository.get_all()
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[DealEntity]:
+        """Iterate over all deals ordered by ID."""
+        return self.repository.iter_all(batch_size=batch_size)
+
+    def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> DealPage:
+        """Retrieve a page of deals."""
+        return self.repository.get_page(
+            limit=limit, cursor=cursor, ordering=ordering, filters=filters
+        )
+
+    def get_version(self, deal_id: int) -> datetime | None:
+        """Return when a deal was last updated, always from the repository."""
+        return self.repository.get_version(deal_id)
+
+    def get_page_versions(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> list[tuple[int, datetime]]:
+        """Return the (id, updated_at) pairs of a page."""
+        return self.repository.get_page_versions(
+            limit=limit, cursor=cursor, ordering=ordering, filters=filters
+        )
+
+    def search(self, query: str, limit: int, cursor: str | None = None) -> DealPage:
+        """Search deals by title."""
+        return self.repository.search(query, limit, cursor)
+
+    def get_stats(
+        self, dimension: StatsDimension, group_ids: list[int]
+    ) -> list[DealStats]:
+        """Return the deal count and value sum of groups."""
+        return self.repository.get_stats(dimension, group_ids)
+
+    def update(
+        self,
+        deal_id: int,
+        title: str | None,
+        distributor_id: int | None,
+        tags: list[int] | None,
+        value: Decimal | None,
+    ) -> DealEntity | None:
+        """Update an existing deal and invalidate its cached copies."""
+        try:
+            return self.repository.update(
+                deal_id=deal_id,
+                title=title,
+                distributor_id=distributor_id,
+                tags=tags,
+                value=value,
+            )
+        finally:
+            self._invalidate_now_and_on_commit(deal_id)
+
+    def delete(self, deal_id: int) -> bool:
+        """Delete a deal by its ID and invalidate its cached copies."""
+        try:
+            return self.repository.delete(deal_id)
+        finally:
+            self._invalidate_now_and_on_commit(deal_id)
+
+
+class AsyncCachedDealRepository(AsyncDealRepository):
+    """Read-through cache of deals by ID in front of an AsyncDealRepository.
+
+    It reads and fills the tiers of a `CachedDealRepository`, whose writes
+    invalidate them, so the async repository must write through that one.
+    Misses are read from the primary database, as they are by the sync cache.
+    """
+
+    def __init__(
+        self, repository: AsyncDealRepository, cache: CachedDealRepository
+    ) -> None:
+        """Initialize with the repository read through and the cache it shares."""
+        self.repository = repository
+        self.cache = cache
+
+    async def get_one(
+        self, deal_id: int, min_version: datetime | None = None
+    ) -> DealEntity | None:
+        """Retrieve a deal by its ID, from the cache when possible."""
+        entity = self.cache.local_cache.get(deal_id)
+        if _is_current(entity, min_version):
+            return entity
+
+        shared_cache = self.cache.shared_cache
+        if shared_cache is not None:
+            data = await shared_cache.aget(self.cache._shared_key(deal_id))
+            if data is not None:
+                entity = DealEntity.model_validate(data)
+                if _is_current(entity, min_version):
+                    self.cache.local_cache.set(deal_id, entity)
+                    return entity
+
+        if self.cache.enabled:
+            with primary_reads():
+                entity = await self.repository.get_one(deal_id, min_version)
+        else:
+            entity = await self.repository.get_one(deal_id, min_version)
+        if entity is not None:
+            self.cache.local_cache.set(deal_id, entity)
+            if shared_cache is not None:
+                await shared_cache.aset(
+                    self.cache._shared_key(deal_id),
+                    entity.model_dump(),
+                    self.cache.shared_ttl,
+                )
+        return entity
+
+    async def create(
+        self,
+        title: str,
+        company_id: int,
+        value: Decimal,
+        tags: list[int] | None,
+        distributor_id: int | None,
+    ) -> DealEntity:
+        """Create a new deal."""
+        return await self.repository.create(
+            title=title,
+            company_id=company_id,
+            value=value,
+            tags=tags,
+            distributor_id=distributor_id,
+        )
+
+    def iter_all(self, batch_size: int = 1000) -> AsyncIterator[DealEntity]:
+        """Iterate over all deals ordered by ID."""
+        return self.repository.iter_all(batch_size=batch_size)
+
+    async def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> DealPage:
+        """Retrieve a page of deals."""
+        return await self.repository.get_page(
+            limit=limit, cursor=cursor, ordering=ordering, filters=filters
+        )
+
+    async def get_version(self, deal_id: int) -> datetime | None:
+        """Return when a deal was last updated, always from the repository."""
+        return await self.repository.get_version(deal_id)
+
+    async def get_page_versions(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> list[tuple[int, datetime]]:
+        """Return the (id, updated_at) pairs of a page."""
+        return await self.repository.get_page_versions(
+            limit=limit, cursor=cursor, ordering=ordering, filters=filters
+        )
+
+    async def update(
+        self,
+        deal_id: int,
+        title: str | None,
+        distributor_id: int | None,
+        tags: list[int] | None,
+        value: Decimal | None,
+    ) -> DealEntity | None:
+        """Update an existing deal."""
+        return await self.repository.update(
+            deal_id=deal_id,
+            title=title,
+            distributor_id=distributor_id,
+            tags=tags,
+            value=value,
+        )
+
+    async def delete(self, deal_id: int) -> bool:
+        """Delete a deal by its ID."""
+        return await self.repository.delete(deal_id)
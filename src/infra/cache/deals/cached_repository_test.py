@@ -0,0 +1,231 @@
+import unittest
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
+
+from asgiref.sync import sync_to_async
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from core.models import CompanyModel
+from domain.deals.entity import DealEntity
+from domain.deals.repository import DealRepository
+from infra.cache.deals.cached_repository import (
+    AsyncCachedDealRepository,
+    CachedDealRepository,
+)
+from infra.db.deals.db_repository import DealRepositoryDB
+from infra.db.replicas.middleware_test import replicate
+from infra.db.replicas.router import ReadScope, read_scope
+
+
+def _deal(
+    deal_id: int = 1, title: str = "Deal", updated_at: datetime | None = None
+) -> DealEntity:
+    return DealEntity(
+        id=deal_id,
+        title=title,
+        company_id=2,
+        value=Decimal("100.00"),
+        tags=[1, 2],
+        distributor_id=None,
+        updated_at=updated_at,
+    )
+
+
+class CachedDealRepositoryTest(TestCase):
+    databases = {"default", "shard"}
+
+    def setUp(self) -> None:
+        self.inner = Mock()
+        self.shared = LocMemCache("cached-deal-repository-test", {})
+        self.shared.clear()
+        self.repo = CachedDealRepository(self.inner, shared_cache=self.shared)
+
+    def test_get_one_reads_through_once(self) -> None:
+        self.inner.get_one.return_value = _deal()
+
+        self.assertEqual(self.repo.get_one(1), _deal())
+        self.assertEqual(self.repo.get_one(1), _deal())
+
+        self.inner.get_one.assert_called_once_with(1, None)
+        self.assertEqual(self.repo.stats.hits, 1)
+        self.assertEqual(self.repo.stats.misses, 1)
+
+    def test_get_one_does_not_cache_missing_deals(self) -> None:
+        self.inner.get_one.return_value = None
+
+        self.assertIsNone(self.repo.get_one(1))
+        self.assertIsNone(self.repo.get_one(1))
+        self.assertEqual(self.inner.get_one.call_count, 2)
+
+    def test_shared_tier_serves_other_processes(self) -> None:
+        self.inner.get_one.return_value = _deal()
+        self.repo.get_one(1)
+
+        # Another process has an empty local cache but shares the second tier.
+        other = CachedDealRepository(self.inner, shared_cache=self.shared)
+        self.assertEqual(other.get_one(1), _deal())
+        self.inner.get_one.assert_called_once_with(1, None)
+
+    def test_update_invalidates_both_tiers(self) -> None:
+        self.inner.get_one.return_value = _deal()
+        self.repo.get_one(1)
+        self.inner.update.return_value = _deal(title="Updated")
+
+        self.repo.update(
+            deal_id=1, title="Updated", distributor_id=None, tags=None, value=None
+        )
+
+        self.inner.get_one.return_value = _deal(title="Updated")
+        self.assertEqual(self.repo.get_one(1), _deal(title="Updated"))
+        self.assertEqual(self.inner.get_one.call_count, 2)
+
+    def test_failed_update_still_invalidates(self) -> None:
+        self.inner.get_one.return_value = _deal()
+        self.repo.get_one(1)
+        self.inner.update.side_effect = ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            self.repo.update(
+                deal_id=1, title="Updated", distributor_id=None, tags=None, value=None
+            )
+
+        self.repo.get_one(1)
+        self.assertEqual(self.inner.get_one.call_count, 2)
+
+    def test_delete_invalidates(self) -> None:
+        self.inner.get_one.return_value = _deal()
+        self.repo.get_one(1)
+        self.inner.delete.return_value = True
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.assertTrue(self.repo.delete(1))
+        self.assertEqual(len(callbacks), 1)
+
+        self.inner.get_one.return_value = None
+        self.assertIsNone(self.repo.get_one(1))
+
+    def test_copies_older_than_a_version_are_read_again(self) -> None:
+        version = datetime(2025, 1, 2, tzinfo=UTC)
+        self.inner.get_one.return_value = _deal(updated_at=version - timedelta(days=1))
+        self.repo.get_one(1)
+        updated = _deal(title="Updated", updated_at=version)
+        self.inner.get_one.return_value = updated
+
+        self.assertEqual(self.repo.get_one(1, version), updated)
+        self.inner.get_one.assert_called_with(1, version)
+        self.assertEqual(self.repo.get_one(1), updated)
+        self.assertEqual(self.inner.get_one.call_count, 2)
+
+    def test_writes_invalidate_on_commit_of_each_database(self) -> None:
+        repo = CachedDealRepository(self.inner, databases=("default", "shard"))
+        self.inner.get_one.return_value = _deal()
+        self.inner.delete.return_value = True
+
+        with (
+            self.captureOnCommitCallbacks() as default_callbacks,
+            self.captureOnCommitCallbacks(using="shard") as shard_callbacks,
+        ):
+            repo.delete(1)
+            repo.get_one(1)
+        for callback in shard_callbacks:
+            callback()
+
+        self.assertEqual((len(default_callbacks), len(shard_callbacks)), (1, 1))
+        repo.get_one(1)
+        self.assertEqual(self.inner.get_one.call_count, 2)
+
+    def test_other_methods_are_delegated(self) -> None:
+        self.repo.get_all()
+        self.repo.get_page(limit=10, cursor="abc", ordering="-id")
+        self.repo.bulk_create([])
+        self.repo.iter_all(batch_size=5)
+
+        self.inner.get_all.assert_called_once_with()
+        self.inner.get_page.assert_called_once_with(
+            limit=10, cursor="abc", ordering="-id", filters=None
+        )
+        self.inner.bulk_create.assert_called_once_with([])
+        self.inner.iter_all.assert_called_once_with(batch_size=5)
+
+
+class AsyncCachedDealRepositoryTest(TestCase):
+    def setUp(self) -> None:
+        self.inner = Mock()
+        self.async_inner = AsyncMock()
+        self.shared = LocMemCache("async-cached-deal-repository-test", {})
+        self.shared.clear()
+        self.cache = CachedDealRepository(self.inner, shared_cache=self.shared)
+        self.repo = AsyncCachedDealRepository(self.async_inner, self.cache)
+
+    async def test_shares_the_tiers_of_the_sync_cache(self) -> None:
+        self.async_inner.get_one.return_value = _deal()
+
+        self.assertEqual(await self.repo.get_one(1), _deal())
+        self.assertEqual(await self.repo.get_one(1), _deal())
+        self.async_inner.get_one.assert_awaited_once_with(1, None)
+
+        # The sync cache serves the copy read by the async one, from either tier.
+        self.assertEqual(self.cache.get_one(1), _deal())
+        other = CachedDealRepository(self.inner, shared_cache=self.shared)
+        self.assertEqual(other.get_one(1), _deal())
+        self.inner.get_one.assert_not_called()
+
+        # Sync writes invalidate the async cache.
+        await sync_to_async(self.cache.delete)(1)
+        self.async_inner.get_one.return_value = None
+        self.assertIsNone(await self.repo.get_one(1))
+
+
+@override_settings(DATABASE_REPLICAS={"REPLICAS": {"replica": 1}})
+class CachedDealRepositoryReplicaTest(TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self) -> None:
+        shared = LocMemCache("cached-deal-repository-replica-test", {})
+        shared.clear()
+        self.repo = CachedDealRepository(
+            DealRepositoryDB(), ttl=30, shared_cache=shared, shared_ttl=300
+        )
+        company = CompanyModel.objects.create(name="Company")
+        self.deal = self.repo.create(
+            title="Old",
+            company_id=company.id,
+            value=Decimal("10.00"),
+            tags=None,
+            distributor_id=None,
+        )
+        replicate()
+
+    def test_misses_are_filled_from_the_primary(self) -> None:
+        self.repo.update(
+            deal_id=self.deal.id, title="New", distributor_id=None, tags=None, value=None
+        )
+
+        # Another client's request, which reads from the lagging replica.
+        scope = ReadScope()
+        token = read_scope.set(scope)
+        try:
+            self.assertEqual(self._title(DealRepositoryDB()), "Old")
+            self.assertEqual(self._title(self.repo), "New")
+        finally:
+            read_scope.reset(token)
+            scope.close()
+
+        # So the cache serves the write to every client, the writer included.
+        self.assertEqual(
+            self._title(
+                CachedDealRepository(Mock(), shared_cache=self.repo.shared_cache)
+            ),
+            "New",
+        )
+
+    def _title(self, repository: DealRepository) -> str:
+        deal = repository.get_one(self.deal.id)
+        assert deal is not None
+        return deal.title
+
+
+if __name__ == "__main__":
+    unittest.main()
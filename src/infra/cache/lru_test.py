@@ -0,0 +1,55 @@
+import unittest
+
+from infra.cache.lru import LRUCache
+
+
+class LRUCacheTest(unittest.TestCase):
+    def test_get_and_set(self) -> None:
+        cache: LRUCache[int, str] = LRUCache(max_size=2, ttl=10)
+        self.assertIsNone(cache.get(1))
+        cache.set(1, "one")
+        self.assertEqual(cache.get(1), "one")
+
+        stats = cache.stats
+        self.assertEqual((stats.hits, stats.misses, stats.size), (1, 1, 1))
+        self.assertEqual(stats.hit_ratio, 0.5)
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache: LRUCache[int, str] = LRUCache(max_size=2, ttl=10)
+        cache.set(1, "one")
+        cache.set(2, "two")
+        cache.get(1)
+        cache.set(3, "three")
+
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(1), "one")
+        self.assertEqual(cache.get(3), "three")
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_entries_expire_after_ttl(self) -> None:
+        now = [0.0]
+        cache: LRUCache[int, str] = LRUCache(max_size=2, ttl=5, clock=lambda: now[0])
+        cache.set(1, "one")
+
+        now[0] = 4.9
+        self.assertEqual(cache.get(1), "one")
+        now[0] = 5.0
+        self.assertIsNone(cache.get(1))
+        self.assertEqual(cache.stats.size, 0)
+
+    def test_delete_and_clear(self) -> None:
+        cache: LRUCache[int, str] = LRUCache(max_size=2, ttl=10)
+        cache.set(1, "one")
+        cache.set(2, "two")
+        cache.delete(1)
+        self.assertIsNone(cache.get(1))
+        cache.clear()
+        self.assertIsNone(cache.get(2))
+
+    def test_rejects_empty_cache(self) -> None:
+        with self.assertRaises(ValueError):
+            LRUCache(max_size=0, ttl=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
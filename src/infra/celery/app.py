@@ -11,3 +11,5 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 
 # Auto-discover tasks from all registered Django app configs
 app.autodiscover_tasks()
+# Task modules outside of the apps' top-level `tasks` modules.
+app.autodiscover_tasks(["application.tasks.deals", "infra.celery"])
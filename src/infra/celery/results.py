@@ -0,0 +1,158 @@
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from fnmatch import fnmatchcase
+from typing import Any, Literal
+
+from celery import Task
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.models import Count, Sum, Value
+from django.db.models.functions import Coalesce, Length
+from django.utils import timezone
+from django_celery_results.models import TaskResult
+
+from infra.db.lookups import ID_LOOKUP_BATCH_SIZE
+
+ResultPolicy = Literal["ignore", "failure_only", "ttl"]
+
+DEFAULT_RESULT_POLICY: dict[str, Any] = {
+    "POLICY": "ttl",
+    "TTL": 24 * 3600,
+}
+
+# Text columns of a task result, whose lengths approximate its size.
+RESULT_PAYLOAD_FIELDS = ("task_args", "task_kwargs", "result", "traceback", "meta")
+
+
+def result_policy(task_name: str | None) -> dict[str, Any]:
+    """Return the result policy of a task.
+
+    It is the first entry of the `TASK_RESULT_POLICIES` setting whose pattern
+    matches the task name, completed with the defaults.
+    """
+    for pattern, policy in getattr(settings, "TASK_RESULT_POLICIES", {}).items():
+        if fnmatchcase(task_name or "", pattern):
+            return {**DEFAULT_RESULT_POLICY, **policy}
+    return dict(DEFAULT_RESULT_POLICY)
+
+
+class ResultPolicyAnnotation:
+    """Celery task annotation applying the result policy of each task.
+
+    Listed in `CELERY_TASK_ANNOTATIONS`, it is evaluated once per task when the
+    Celery app is finalized.
+    """
+
+    def annotate(self, task: "Task[Any, Any]") -> dict[str, bool]:
+        """Return the task attributes implementing its result policy."""
+        policy: ResultPolicy = result_policy(task.name)["POLICY"]
+        if policy == "ignore":
+            return {"ignore_result": True, "store_errors_even_if_ignored": False}
+        if policy == "failure_only":
+            return {"ignore_result": True, "store_errors_even_if_ignored": True}
+        return {"ignore_result": False}
+
+
+def prune_task_results(
+    now: datetime | None = None, chunk_size: int = 500, pause: float = 0
+) -> int:
+    """Delete the task results older than the TTL of their task's policy.
+
+    Rows are deleted in chunks, each in its own short transaction, so the
+    table is never locked for long.
+
+    Args:
+        now: Reference time, defaults to now
+        chunk_size: Rows deleted per statement
+        pause: Seconds slept between chunks, leaving room to other writers
+
+    Returns:
+        int: Number of deleted results
+    """
+    now = now or timezone.now()
+    chunk_size = min(chunk_size, ID_LOOKUP_BATCH_SIZE)
+    manager = TaskResult._default_manager
+    deleted = 0
+    task_names = manager.order_by().values_list("task_name", flat=True).distinct()
+    for task_name in list(task_names):
+        ttl = result_policy(task_name)["TTL"]
+        if ttl is None:
+            continue
+
+        expired = manager.filter(
+            task_name=task_name, date_done__lt=now - timedelta(seconds=ttl)
+        ).order_by("id")
+        while True:
+            result_ids = list(expired.values_list("id", flat=True)[:chunk_size])
+            if not result_ids:
+                break
+            deleted += manager.filter(id__in=result_ids).delete()[0]
+            if pause:
+                time.sleep(pause)
+    return deleted
+
+
+@dataclass
+class TaskResultUsage:
+    """Rows and approximate payload size of the results of a task."""
+
+    task_name: str | None
+    status: str
+    rows: int
+    payload_bytes: int
+
+
+def task_result_usage() -> list[TaskResultUsage]:
+    """Return the stored results per task and status, largest first.
+
+    Payload sizes are the lengths of the text columns, which match their bytes
+    for the ASCII JSON Celery stores.
+    """
+    payload = sum(
+        (Coalesce(Length(field), Value(0)) for field in RESULT_PAYLOAD_FIELDS),
+        Value(0),
+    )
+    rows = (
+        TaskResult._default_manager.order_by()
+        .values("task_name", "status")
+        .annotate(rows=Count("id"), payload_bytes=Sum(payload))
+        .order_by("-payload_bytes", "task_name", "status")
+    )
+    return [
+        TaskResultUsage(
+            task_name=row["task_name"],
+            status=row["status"],
+            rows=row["rows"],
+            payload_bytes=row["payload_bytes"] or 0,
+        )
+        for row in rows
+    ]
+
+
+def task_result_table_bytes() -> int | None:
+    """Return the on-disk size of the results table with its indexes, if known.
+
+    Supported on SQLite builds with the `dbstat` table, and on PostgreSQL.
+    """
+    connection = connections[TaskResult._default_manager.db]
+    table = TaskResult._meta.db_table
+    if connection.vendor == "sqlite":
+        sql = (
+            "SELECT SUM(pgsize) FROM dbstat WHERE name = %s OR name IN "
+            "(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s)"
+        )
+        params: list[str] = [table, table]
+    elif connection.vendor == "postgresql":
+        sql = "SELECT pg_total_relation_size(%s)"
+        params = [table]
+    else:
+        return None
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            (size,) = cursor.fetchone()
+    except DatabaseError:
+        return None
+    return None if size is None else int(size)
@@ -0,0 +1,89 @@
+from datetime import timedelta
+from io import StringIO
+from types import SimpleNamespace
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django_celery_results.models import TaskResult
+
+from infra.celery.results import (
+    ResultPolicyAnnotation,
+    prune_task_results,
+    result_policy,
+    task_result_usage,
+)
+
+POLICIES = {
+    "deals.*_emitter": {"POLICY": "failure_only", "TTL": 3600},
+    "deals.*": {"POLICY": "ignore"},
+    "*": {"POLICY": "ttl", "TTL": 60},
+}
+
+
+@override_settings(TASK_RESULT_POLICIES=POLICIES)
+class TaskResultPolicyTest(TestCase):
+    def _result(self, task_name: str | None, age: float, status: str = "SUCCESS") -> None:
+        result = TaskResult.objects.create(
+            task_id=f"{task_name}-{age}-{status}",
+            task_name=task_name,
+            status=status,
+            result='"ok"',
+        )
+        TaskResult.objects.filter(id=result.id).update(
+            date_done=timezone.now() - timedelta(seconds=age)
+        )
+
+    def test_first_matching_pattern_applies(self) -> None:
+        self.assertEqual(result_policy("deals.created_emitter")["POLICY"], "failure_only")
+        self.assertEqual(result_policy("deals.relay")["POLICY"], "ignore")
+        self.assertEqual(result_policy("other"), {"POLICY": "ttl", "TTL": 60})
+        self.assertEqual(result_policy(None)["POLICY"], "ttl")
+
+    def test_annotation_sets_task_attributes(self) -> None:
+        def annotate(name: str) -> dict[str, bool]:
+            return ResultPolicyAnnotation().annotate(SimpleNamespace(name=name))  # type: ignore[arg-type]
+
+        self.assertEqual(
+            annotate("deals.created_emitter"),
+            {"ignore_result": True, "store_errors_even_if_ignored": True},
+        )
+        self.assertEqual(
+            annotate("deals.relay"),
+            {"ignore_result": True, "store_errors_even_if_ignored": False},
+        )
+        self.assertEqual(annotate("other"), {"ignore_result": False})
+
+    def test_prune_deletes_expired_results_per_task_in_chunks(self) -> None:
+        for age in (10, 120, 7200):
+            self._result("deals.created_emitter", age, status="FAILURE")
+            self._result("other", age)
+            self._result(None, age)
+
+        self.assertEqual(prune_task_results(chunk_size=1), 5)
+        self.assertEqual(
+            sorted(
+                TaskResult.objects.values_list("task_name", "status"),
+                key=lambda row: (row[0] or "", row[1]),
+            ),
+            [
+                (None, "SUCCESS"),
+                ("deals.created_emitter", "FAILURE"),
+                ("deals.created_emitter", "FAILURE"),
+                ("other", "SUCCESS"),
+            ],
+        )
+
+    def test_usage_and_report(self) -> None:
+        self._result("other", 10)
+        self._result("other", 120)
+
+        (usage,) = task_result_usage()
+        self.assertEqual((usage.task_name, usage.rows), ("other", 2))
+        self.assertGreater(usage.payload_bytes, 0)
+
+        stdout = StringIO()
+        call_command("task_results_report", prune=True, stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn("Pruned 1 expired result(s).", output)
+        self.assertIn("Total: 1 row(s)", output)
@@ -0,0 +1,8 @@
+from infra.celery import results
+from infra.celery.app import app
+
+
+@app.task
+def prune_task_results(chunk_size: int = 500, pause: float = 0.05) -> int:
+    """Delete expired task results in chunks, as set by `TASK_RESULT_POLICIES`."""
+    return results.prune_task_results(chunk_size=chunk_size, pause=pause)
@@ -0,0 +1,264 @@
+from collections.abc import AsyncIterator
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Any
+
+from asgiref.sync import sync_to_async
+
+from domain.deals.entity import DealEntity
+from domain.deals.filters import DealFilters
+from domain.deals.pagination import DealOrdering, DealPage, encode_cursor
+from domain.deals.repository import AsyncDealRepository, DealRepository
+from infra.db.deals.db_repository import DEAL_ENTITY_FIELDS, DealRepositoryDB
+from infra.db.lookups import ID_LOOKUP_BATCH_SIZE
+
+
+class AsyncDealRepositoryDB(AsyncDealRepository):
+    """Repository for DealModel instances built on Django's async ORM.
+
+    Reads use the async queryset API. Django has no async database drivers
+    yet, so each query still runs in a worker thread through `sync_to_async`:
+    reads don't block the event loop, but they do wait on a thread. The async
+    ORM cannot open transactions either, so writes, which are atomic and emit
+    events, call the sync repository through `sync_to_async`.
+    """
+
+    def __init__(
+        self, writer: DealRepository | None = None, using: str | None = None
+    ) -> None:
+        """Initialize the repository.
+
+        Args:
+            writer: Sync repository performing the writes, e.g. one that also
+                invalidates caches. Defaults to a `DealRepositoryDB`.
+            using: Alias of the database holding the deals. Defaults to the
+                database chosen by the routers.
+        """
+        # Builds the querysets; nothing is evaluated through it.
+        self.queries = DealRepositoryDB(using=using)
+        self.writer = writer or self.queries
+        self.deal_manager = self.queries.deal_manager
+        self.deal_tags_manager = self.queries.deal_tags_manager
+
+    async def create(
+        self,
+        title: str,
+        company_id: int,
+        value: Decimal,
+        tags: list[int] | None,
+        distributor_id: int | None,
+    ) -> DealEntity:
+        """Create a new deal."""
+        return await sync_to_async(self.writer.create)(
+            title=title,
+            company_id=company_id,
+            value=value,
+            tags=tags,
+            distributor_id=distributor_id,
+        )
+
+    async def get_one(
+        self, deal_id: int, min_version: datetime | None = None
+    ) -> DealEntity | None:
+        """Retrieve a deal by its ID, always current: nothing is cached."""
+        row = (
+            await self.deal_manager.filter(id=deal_id)
+            .values(*DEAL_ENTITY_FIELDS)
+            .afirst()
+        )
+        if row is None:
+            return None
+
+        entities = await self._build_entities([row])
+        return entities[0]
+
+    async def iter_all(self, batch_size: int = 1000) -> AsyncIterator[DealEntity]:
+        """Iterate over all deals ordered by ID, fetching them in keyset batches."""
+        last_id = 0
+        while True:
+            rows = [
+                row
+                async for row in self.deal_manager.filter(id__gt=last_id)
+                .order_by("id")
+                .values(*DEAL_ENTITY_FIELDS)[:batch_size]
+            ]
+            if not rows:
+                return
+
+            for entity in await self._build_entities(rows):
+                yield entity
+
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1]["id"]
+
+    async def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> DealPage:
+        """Retrieve a page of deals using keyset pagination."""
+        queryset = self.queries.page_queryset(cursor, ordering, filters)
+
+        # Fetch one extra row to know whether there is a next page.
+        rows = [row async for row in queryset.values(*DEAL_ENTITY_FIELDS)[: limit + 1]]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(
+                ordering, self.queries.keyset_values(ordering.lstrip("-"), rows[-1])
+            )
+
+        return DealPage(deals=await self._build_entities(rows), next_cursor=next_cursor)
+
+    async def get_version(self, deal_id: int) -> datetime | None:
+        """Return when a deal was last updated, reading only its primary key row."""
+        return (
+            await self.deal_manager.filter(id=deal_id)
+            .values_list("updated_at", flat=True)
+            .afirst()
+        )
+
+    async def get_page_versions(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> list[tuple[int, datetime]]:
+        """Return the (id, updated_at) pairs of a page, plus the first row after it."""
+        queryset = self.queries.page_queryset(cursor, ordering, filters)
+        return [
+            version
+            async for version in queryset.values_list("id", "updated_at")[: limit + 1]
+        ]
+
+    async def update(
+        self,
+        deal_id: int,
+        title: str | None,
+        distributor_id: int | None,
+        tags: list[int] | None,
+        value: Decimal | None,
+    ) -> DealEntity | None:
+        """Update an existing deal."""
+        return await sync_to_async(self.writer.update)(
+            deal_id=deal_id,
+            title=title,
+            distributor_id=distributor_id,
+            tags=tags,
+            value=value,
+        )
+
+    async def delete(self, deal_id: int) -> bool:
+        """Delete a deal by its ID."""
+        return await sync_to_async(self.writer.delete)(deal_id)
+
+    async def _build_entities(self, rows: list[dict[str, Any]]) -> list[DealEntity]:
+        """Build entities for fetched deal rows, loading all of their tags at once."""
+        tag_links: list[tuple[int, int]] = []
+        deal_ids = [row["id"] for row in rows]
+        for start in range(0, len(deal_ids), ID_LOOKUP_BATCH_SIZE):
+            tag_links.extend(
+                [
+                    link
+                    async for link in self.deal_tags_manager.filter(
+                        dealmodel_id__in=deal_ids[start : start + ID_LOOKUP_BATCH_SIZE]
+                    ).values_list("dealmodel_id", "tagmodel_id")
+                ]
+            )
+        return self.queries.to_entities(rows, tag_links)
+
+
+class ThreadedDealRepository(AsyncDealRepository):
+    """Serves async callers with a sync DealRepository, calling it in a thread.
+
+    For the repositories the async ORM cannot replace, e.g. one spreading
+    deals over shards. Each call holds a thread while it waits on the database.
+    """
+
+    def __init__(self, repository: DealRepository) -> None:
+        """Initialize with the sync repository called."""
+        self.repository = repository
+
+    async def create(
+        self,
+        title: str,
+        company_id: int,
+        value: Decimal,
+        tags: list[int] | None,
+        distributor_id: int | None,
+    ) -> DealEntity:
+        """Create a new deal."""
+        return await sync_to_async(self.repository.create)(
+            title=title,
+            company_id=company_id,
+            value=value,
+            tags=tags,
+            distributor_id=distributor_id,
+        )
+
+    async def get_one(
+        self, deal_id: int, min_version: datetime | None = None
+    ) -> DealEntity | None:
+        """Retrieve a deal by its ID."""
+        return await sync_to_async(self.repository.get_one)(deal_id, min_version)
+
+    async def iter_all(self, batch_size: int = 1000) -> AsyncIterator[DealEntity]:
+        """Iterate over all deals ordered by ID, a batch per call of the thread."""
+        deals = self.repository.iter_all(batch_size=batch_size)
+        while batch := await sync_to_async(lambda: list(islice(deals, batch_size)))():
+            for entity in batch:
+                yield entity
+
+    async def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> DealPage:
+        """Retrieve a page of deals using keyset pagination."""
+        return await sync_to_async(self.repository.get_page)(
+            limit=limit, cursor=cursor, ordering=ordering, filters=filters
+        )
+
+    async def get_version(self, deal_id: int) -> datetime | None:
+        """Return when a deal was last updated."""
+        return await sync_to_async(self.repository.get_version)(deal_id)
+
+    async def get_page_versions(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> list[tuple[int, datetime]]:
+        """Return the (id, updated_at) pairs of a page, plus the first row after it."""
+        return await sync_to_async(self.repository.get_page_versions)(
+            limit=limit, cursor=cursor, ordering=ordering, filters=filters
+        )
+
+    async def update(
+        self,
+        deal_id: int,
+        title: str | None,
+        distributor_id: int | None,
+        tags: list[int] | None,
+        value: Decimal | None,
+    ) -> DealEntity | None:
+        """Update an existing deal."""
+        return await sync_to_async(self.repository.update)(
+            deal_id=deal_id,
+            title=title,
+            distributor_id=distributor_id,
+            tags=tags,
+            value=value,
+        )
+
+    async def delete(self, deal_id: int) -> bool:
+        """Delete a deal by its ID."""
+        return await sync_to_async(self.repository.delete)(deal_id)
@@ -0,0 +1,151 @@
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+
+from core.models import CompanyModel, DealModel, DistributorModel, TagModel
+from infra.db.deals.async_db_repository import (
+    AsyncDealRepositoryDB,
+    ThreadedDealRepository,
+)
+from infra.db.deals.db_repository import DealRepositoryDB
+from infra.db.deals.sharded_repository import ShardedDealRepository
+from infra.db.deals.shards import ShardMap
+
+
+class AsyncDealRepositoryDBIntegrationTest(TestCase):
+    databases = {"default", "shard"}
+
+    def setUp(self) -> None:
+        self.repo = AsyncDealRepositoryDB()
+        self.sync_repo = DealRepositoryDB()
+        self.company = CompanyModel.objects.create(name="Test Company")
+        self.distributor = DistributorModel.objects.create(name="D1")
+        self.tag1 = TagModel.objects.create(name="tag1")
+        self.tag2 = TagModel.objects.create(name="tag2")
+
+    def _create_deals(self, count: int) -> list[int]:
+        return [
+            self.sync_repo.create(
+                title=f"Deal {index}",
+                company_id=self.company.id,
+                value=Decimal(index + 1),
+                tags=[self.tag1.id],
+                distributor_id=None,
+            ).id
+            for index in range(count)
+        ]
+
+    async def test_create_and_get_one(self) -> None:
+        created = await self.repo.create(
+            title="Async Deal",
+            company_id=self.company.id,
+            value=Decimal("100.0"),
+            tags=[self.tag2.id, self.tag1.id],
+            distributor_id=self.distributor.id,
+        )
+
+        found = await self.repo.get_one(created.id)
+        assert found is not None
+        self.assertEqual(found.title, "Async Deal")
+        self.assertEqual(found.distributor_id, self.distributor.id)
+        self.assertEqual(found.tags, sorted([self.tag1.id, self.tag2.id]))
+        self.assertIsNone(await self.repo.get_one(created.id + 1000))
+
+    async def test_get_page_matches_sync_repository(self) -> None:
+        await self._acreate_deals(5)
+
+        sync_get_page = sync_to_async(self.sync_repo.get_page)
+
+        first = await self.repo.get_page(limit=2, ordering="-id")
+        self.assertEqual(first, await sync_get_page(limit=2, ordering="-id"))
+
+        second = await self.repo.get_page(
+            limit=2, cursor=first.next_cursor, ordering="-id"
+        )
+        self.assertEqual(
+            second,
+            await sync_get_page(limit=2, cursor=first.next_cursor, ordering="-id"),
+        )
+
+    async def test_versions(self) -> None:
+        deal_ids = await self._acreate_deals(3)
+
+        versions = await self.repo.get_page_versions(limit=2)
+        self.assertEqual([deal_id for deal_id, _ in versions], deal_ids)
+        self.assertEqual(await self.repo.get_version(deal_ids[0]), versions[0][1])
+        self.assertIsNone(await self.repo.get_version(deal_ids[-1] + 1000))
+
+    async def test_iter_all_yields_every_deal_in_batches(self) -> None:
+        deal_ids = await self._acreate_deals(5)
+
+        deals = [deal async for deal in self.repo.iter_all(batch_size=2)]
+        self.assertEqual([deal.id for deal in deals], deal_ids)
+        self.assertTrue(all(deal.tags == [self.tag1.id] for deal in deals))
+
+    async def test_update_and_delete(self) -> None:
+        (deal_id,) = await self._acreate_deals(1)
+
+        updated = await self.repo.update(
+            deal_id=deal_id,
+            title="Updated",
+            distributor_id=None,
+            tags=[self.tag2.id],
+            value=None,
+        )
+        assert updated is not None
+        self.assertEqual(updated.title, "Updated")
+        self.assertEqual(updated.tags, [self.tag2.id])
+
+        self.assertTrue(await self.repo.delete(deal_id))
+        self.assertFalse(await DealModel.objects.filter(id=deal_id).aexists())
+        self.assertFalse(await self.repo.delete(deal_id))
+
+    async def test_reads_the_database_it_uses(self) -> None:
+        (deal_id,) = await self._acreate_deals(1)
+        shard = AsyncDealRepositoryDB(using="shard")
+
+        self.assertIsNone(await shard.get_one(deal_id))
+        self.assertEqual((await shard.get_page(limit=10)).deals, [])
+        self.assertIsNotNone(await self.repo.get_one(deal_id))
+
+    async def _acreate_deals(self, count: int) -> list[int]:
+        return await sync_to_async(self._create_deals)(count)
+
+
+class ThreadedDealRepositoryTest(TestCase):
+    databases = {"default", "shard"}
+
+    def setUp(self) -> None:
+        shard_map = ShardMap({"default": 0, "shard": 1}, directory="default", stride=1024)
+        self.sync_repo = ShardedDealRepository(shard_map)
+        self.repo = ThreadedDealRepository(self.sync_repo)
+        # The first company hashing to each shard, present in both.
+        companies: dict[str, int] = {}
+        company_id = 1
+        while len(companies) < len(shard_map.databases):
+            companies.setdefault(shard_map.hashed(company_id), company_id)
+            company_id += 1
+        self.company_ids = sorted(companies.values())
+        for alias in shard_map.databases:
+            for company_id in self.company_ids:
+                CompanyModel.objects.using(alias).create(id=company_id, name="Company")
+
+    async def test_reads_and_writes_every_shard(self) -> None:
+        created = [
+            await self.repo.create(
+                title=f"Deal {company_id}",
+                company_id=company_id,
+                value=Decimal(1),
+                tags=None,
+                distributor_id=None,
+            )
+            for company_id in self.company_ids
+        ]
+        self.assertTrue(await DealModel.objects.using("shard").aexists())
+
+        self.assertEqual((await self.repo.get_page(limit=10)).deals, created)
+        self.assertEqual([deal async for deal in self.repo.iter_all(1)], created)
+        self.assertEqual(await self.repo.get_one(created[-1].id), created[-1])
+        self.assertTrue(await self.repo.delete(created[-1].id))
+        self.assertIsNone(await self.repo.get_version(created[-1].id))
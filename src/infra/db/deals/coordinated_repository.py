@@ -0,0 +1,167 @@
+from collections.abc import Iterator
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from domain.deals.entity import DealEntity, NewDeal
+from domain.deals.filters import DealFilters
+from domain.deals.pagination import DealOrdering, DealPage
+from domain.deals.repository import DealRepository
+from domain.deals.stats import DealStats, StatsDimension
+from infra.db.deals.shards import shard_settings
+from infra.db.sqlite.write_coordinator import WriteCoordinator
+
+DEFAULT_WRITE_SETTINGS: dict[str, Any] = {
+    "COORDINATED": False,
+    "LOCK_PATH": None,
+    "TIMEOUT": 10.0,
+    "MAX_BATCH": 32,
+}
+
+
+class CoordinatedDealRepository(DealRepository):
+    """DealRepository applying its writes through a host-wide write coordinator.
+
+    Reads go straight to the wrapped repository. Writes are queued and
+    group-committed by the coordinator, so concurrent workers no longer race
+    for the SQLite write lock.
+    """
+
+    def __init__(self, repository: DealRepository, coordinator: WriteCoordinator) -> None:
+        """Initialize with the repository to wrap and the coordinator of writes."""
+        self.repository = repository
+        self.coordinator = coordinator
+
+    @classmethod
+    def from_settings(cls, repository: DealRepository) -> DealRepository:
+        """Wrap the repository as configured by `DEALS_WRITES`, if enabled.
+
+        Writes are coordinated on the database of the deals.
+
+        Raises:
+            ImproperlyConfigured: If enabled with several shards in `DEALS_SHARDS`
+        """
+        config = {**DEFAULT_WRITE_SETTINGS, **getattr(settings, "DEALS_WRITES", {})}
+        if not config["COORDINATED"]:
+            return repository
+
+        databases = shard_settings()["DATABASES"]
+        if len(databases) > 1:
+            raise ImproperlyConfigured(
+                "DEALS_WRITES['COORDINATED'] requires a single database in DEALS_SHARDS."
+            )
+        (alias,) = databases
+        lock_path = config["LOCK_PATH"] or (
+            f"{settings.DATABASES[alias]['NAME']}.write-lock"
+        )
+        return cls(
+            repository,
+            WriteCoordinator(
+                Path(lock_path),
+                timeout=config["TIMEOUT"],
+                max_batch=config["MAX_BATCH"],
+                using=alias,
+            ),
+        )
+
+    def create(
+        self,
+        title: str,
+        company_id: int,
+        value: Decimal,
+        tags: list[int] | None,
+        distributor_id: int | None,
+    ) -> DealEntity:
+        """Create a new deal in turn."""
+        return self.coordinator.run(
+            lambda: self.repository.create(
+                title=title,
+                company_id=company_id,
+                value=value,
+                tags=tags,
+                distributor_id=distributor_id,
+            )
+        )
+
+    def bulk_create(self, deals: list[NewDeal]) -> list[DealEntity]:
+        """Create many deals at once, in turn."""
+        return self.coordinator.run(lambda: self.repository.bulk_create(deals))
+
+    def get_one(
+        self, deal_id: int, min_version: datetime | None = None
+    ) -> DealEntity | None:
+        """Retrieve a deal by its ID."""
+        return self.repository.get_one(deal_id, min_version)
+
+    def get_all(self) -> list[DealEntity]:
+        """Retrieve all deals."""
+        return self.repository.get_all()
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[DealEntity]:
+        """Iterate over all deals ordered by ID."""
+        return self.repository.iter_all(batch_size=batch_size)
+
+    def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> DealPage:
+        """Retrieve a page of deals."""
+        return self.repository.get_page(
+            limit=limit, cursor=cursor, ordering=ordering, filters=filters
+        )
+
+    def get_version(self, deal_id: int) -> datetime | None:
+        """Return when a deal was last updated."""
+        return self.repository.get_version(deal_id)
+
+    def get_page_versions(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> list[tuple[int, datetime]]:
+        """Return the (id, updated_at) pairs of a page."""
+        return self.repository.get_page_versions(
+            limit=limit, cursor=cursor, ordering=ordering, filters=filters
+        )
+
+    def search(self, query: str, limit: int, cursor: str | None = None) -> DealPage:
+        """Search deals by title."""
+        return self.repository.search(query, limit, cursor)
+
+    def get_stats(
+        self, dimension: StatsDimension, group_ids: list[int]
+    ) -> list[DealStats]:
+        """Return the deal count and value sum of groups."""
+        return self.repository.get_stats(dimension, group_ids)
+
+    def update(
+        self,
+        deal_id: int,
+        title: str | None,
+        distributor_id: int | None,
+        tags: list[int] | None,
+        value: Decimal | None,
+    ) -> DealEntity | None:
+        """Update an existing deal in turn."""
+        return self.coordinator.run(
+            lambda: self.repository.update(
+                deal_id=deal_id,
+                title=title,
+                distributor_id=distributor_id,
+                tags=tags,
+                value=value,
+            )
+        )
+
+    def delete(self, deal_id: int) -> bool:
+        """Delete a deal by its ID, in turn."""
+        return self.coordinator.run(lambda: self.repository.delete(deal_id))
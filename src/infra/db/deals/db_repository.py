@@ -1,32 +1,102 @@
+import functools
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from datetime import datetime
 from decimal import Decimal
+from typing import Any, Protocol, cast
 
 from django.db import transaction
+from django.db.models import Exists, Manager, Q, QuerySet
+from django.utils import timezone
 
-from application.tasks.deals.tasks import (
-    deal_created_emitter,
-    deal_deleted_emitter,
-    deal_updated_emitter,
+from core.models import CompanyModel, DealModel, DistributorModel, TagModel
+from domain.deals.entity import DealEntity, NewDeal
+from domain.deals.events import EventPublisher
+from domain.deals.filters import DealFilters
+from domain.deals.pagination import (
+    DealOrdering,
+    DealPage,
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
 )
-from core.models import DealModel, DistributorModel, TagModel
-from domain.deals.entity import DealEntity
-from domain.deals.repository import DealRepository
+from domain.deals.repository import DealRepository, InvalidDealReferencesError
+from domain.deals.search import search_terms
+from domain.deals.stats import DealStats, StatsDimension
+from infra.db.deals.outbox import DealOutbox
+from infra.db.deals.search import DealTitleSearch
+from infra.db.deals.stats import DealStatsTable, StatsChanges
+from infra.db.inserts import insert_rows
+from infra.db.lookups import ID_LOOKUP_BATCH_SIZE
+
+# Columns needed to build a DealEntity without touching related tables.
+DEAL_ENTITY_FIELDS = (
+    "id",
+    "title",
+    "company_id",
+    "distributor_id",
+    "value",
+    "updated_at",
+)
+
+
+class DealIdAllocator(Protocol):
+    """Allocates the IDs of new deals, instead of the database."""
+
+    def allocate(self, count: int) -> list[int]:
+        """Return `count` unused deal IDs, in increasing order."""
+        ...
+
+
+def atomic_write[T](method: Callable[..., T]) -> Callable[..., T]:
+    """Run a repository method in a transaction of the repository's database."""
+
+    @functools.wraps(method)
+    def wrapper(self: "DealRepositoryDB", *args: Any, **kwargs: Any) -> T:  # noqa: ANN401
+        with transaction.atomic(using=self.using):
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class DealRepositoryDB(DealRepository):
     """Repository for managing DealModel instances."""
 
-    def __init__(self) -> None:
-        """Initialize the DealRepository with a deal manager."""
+    def __init__(
+        self,
+        events: EventPublisher | None = None,
+        using: str | None = None,
+        ids: DealIdAllocator | None = None,
+    ) -> None:
+        """Initialize the DealRepository with a deal manager.
+
+        Args:
+            events: Publisher of the events of writes. Defaults to the
+                transactional outbox.
+            using: Alias of the database holding the deals. Defaults to the
+                database chosen by the routers.
+            ids: Allocator of the IDs of new deals. Defaults to the database's
+                auto-increment.
+        """
         # Use the default managers for the models.
         # This is necessary to ensure that the repository
         # can interact with the models correctly.
         # Issue: https://github.com/typeddjango/django-stubs/issues/1684#issuecomment-1706446344
-        self.deal_manager = DealModel._default_manager
-        self.distributor_manager = DistributorModel._default_manager
-        self.tags_manager = TagModel._default_manager
+        self.using = using
+        self.ids = ids
+        self.deal_manager = DealModel._default_manager.db_manager(using)
+        self.company_manager = CompanyModel._default_manager.db_manager(using)
+        self.distributor_manager = DistributorModel._default_manager.db_manager(using)
+        self.tags_manager = TagModel._default_manager.db_manager(using)
+        # The stubs take the through model of `tags` for TagModel.
+        self.deal_tags_manager: Manager[Any] = (
+            DealModel.tags.through._default_manager.db_manager(using)
+        )
+        self.events = events or DealOutbox(using=using)
+        self.stats = DealStatsTable(using=using)
+        self.title_search = DealTitleSearch(using=using)
 
-    @transaction.atomic
+    @atomic_write
     def create(
         self,
         title: str,
@@ -37,36 +107,374 @@ class DealRepositoryDB(DealRepository):
     ) -> DealEntity:
         """Create a new deal."""
         deal_model = self.deal_manager.create(
+            id=self.ids.allocate(1)[0] if self.ids else None,
             title=title,
             company_id=company_id,
             distributor_id=distributor_id,
             value=value,
         )
 
-        if tags:
-            deal_model.tags.set(tags)
+        tag_ids = sorted(set(tags or []))
+        if tag_ids:
+            deal_model.tags.set(tag_ids)
+
+        changes = StatsChanges()
+        changes.add_deal(company_id, distributor_id, tag_ids, value)
+        self.stats.apply(changes)
 
-        entity = DealEntity.from_model(deal_model)
+        # Everything the entity needs is known already, no need to read it back.
+        entity = DealEntity(
+            id=deal_model.id,
+            title=title,
+            company_id=company_id,
+            distributor_id=distributor_id,
+            tags=tag_ids,
+            value=value,
+            updated_at=deal_model.updated_at,
+        )
 
-        # Emit the created deal event.
-        deal_created_emitter.delay(entity.id)
+        # Publish the created deal event, once the transaction commits.
+        self.events.publish("created", [entity.id])
         return entity
 
-    def get_one(self, deal_id: int) -> DealEntity | None:
-        """Retrieve a deal by its ID."""
-        deal_model = self.deal_manager.filter(id=deal_id).first()
+    @atomic_write
+    def bulk_create(self, deals: list[NewDeal]) -> list[DealEntity]:
+        """Create many deals with one multi-row insert per table."""
+        if not deals:
+            return []
 
-        if deal_model:
-            return DealEntity.from_model(deal_model)
+        self._check_references(deals)
 
-        return None
+        # Unless allocated here, IDs are set on the instances by INSERT ... RETURNING.
+        ids: Sequence[int | None] = [None] * len(deals)
+        if self.ids:
+            ids = self.ids.allocate(len(deals))
+        deal_models = self.deal_manager.bulk_create(
+            DealModel(
+                id=deal_id,
+                title=deal.title,
+                company_id=deal.company_id,
+                distributor_id=deal.distributor_id,
+                value=deal.value,
+            )
+            for deal_id, deal in zip(ids, deals, strict=True)
+        )
+
+        entities: list[DealEntity] = []
+        tag_links: list[tuple[int, int]] = []
+        changes = StatsChanges()
+        for deal_model, deal in zip(deal_models, deals, strict=True):
+            tag_ids = sorted(set(deal.tags or []))
+            changes.add_deal(deal.company_id, deal.distributor_id, tag_ids, deal.value)
+            tag_links.extend((deal_model.id, tag_id) for tag_id in tag_ids)
+            entities.append(
+                DealEntity(
+                    id=deal_model.id,
+                    title=deal.title,
+                    company_id=deal.company_id,
+                    distributor_id=deal.distributor_id,
+                    tags=tag_ids,
+                    value=deal.value,
+                    updated_at=deal_model.updated_at,
+                )
+            )
+
+        insert_rows(
+            self.deal_tags_manager.model,
+            ("dealmodel", "tagmodel"),
+            tag_links,
+            using=self.using,
+        )
+        self.stats.apply(changes)
+
+        # Publish the created deal events all at once.
+        self.events.publish("created", [entity.id for entity in entities])
+        return entities
+
+    def _check_references(self, deals: list[NewDeal]) -> None:
+        """Ensure every company, distributor and tag referenced by the deals exists."""
+        existing_companies = self._existing_ids(
+            self.company_manager, {deal.company_id for deal in deals}
+        )
+        existing_distributors = self._existing_ids(
+            self.distributor_manager,
+            {deal.distributor_id for deal in deals if deal.distributor_id is not None},
+        )
+        existing_tags = self._existing_ids(
+            self.tags_manager, {tag for deal in deals for tag in deal.tags or []}
+        )
+
+        errors: dict[int, dict[str, list[str]]] = {}
+        for index, deal in enumerate(deals):
+            deal_errors: dict[str, list[str]] = {}
+            if deal.company_id not in existing_companies:
+                deal_errors["company_id"] = [
+                    f"Company with ID {deal.company_id} does not exist."
+                ]
+            if (
+                deal.distributor_id is not None
+                and deal.distributor_id not in existing_distributors
+            ):
+                deal_errors["distributor_id"] = [
+                    f"Distributor with ID {deal.distributor_id} does not exist."
+                ]
+            missing_tags = sorted(set(deal.tags or []) - existing_tags)
+            if missing_tags:
+                deal_errors["tags"] = [
+                    f"Tag with ID {tag_id} does not exist." for tag_id in missing_tags
+                ]
+            if deal_errors:
+                errors[index] = deal_errors
+
+        if errors:
+            raise InvalidDealReferencesError(errors)
+
+    @staticmethod
+    def _existing_ids(manager: "Manager[Any]", ids: set[int]) -> set[int]:
+        """Return which of the given primary keys exist, in batched lookups."""
+        ordered = sorted(ids)
+        existing: set[int] = set()
+        for start in range(0, len(ordered), ID_LOOKUP_BATCH_SIZE):
+            existing.update(
+                manager.filter(
+                    id__in=ordered[start : start + ID_LOOKUP_BATCH_SIZE]
+                ).values_list("id", flat=True)
+            )
+        return existing
+
+    def get_one(
+        self, deal_id: int, min_version: datetime | None = None
+    ) -> DealEntity | None:
+        """Retrieve a deal by its ID, always current: nothing is cached."""
+        entities = self._load_entities(self.deal_manager.filter(id=deal_id))
+        return entities[0] if entities else None
 
     def get_all(self) -> list[DealEntity]:
         """Retrieve all deals."""
-        deal_models = self.deal_manager.all()
-        return [DealEntity.from_model(deal) for deal in deal_models]
+        return self._load_entities(self.deal_manager.all())
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[DealEntity]:
+        """Iterate over all deals ordered by ID, fetching them in batches.
+
+        Each batch is a keyset query on the primary key followed by one tag
+        lookup, so memory is bounded by `batch_size` and no read transaction is
+        held open between batches.
+        """
+        last_id = 0
+        while True:
+            rows = list(
+                self.deal_manager.filter(id__gt=last_id)
+                .order_by("id")
+                .values(*DEAL_ENTITY_FIELDS)[:batch_size]
+            )
+            if not rows:
+                return
+
+            yield from self._build_entities(rows)
+
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1]["id"]
+
+    def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> DealPage:
+        """Retrieve a page of deals using keyset pagination."""
+        # Fetch one extra row to know whether there is a next page.
+        rows = list(
+            self.page_queryset(cursor, ordering, filters).values(*DEAL_ENTITY_FIELDS)[
+                : limit + 1
+            ]
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(
+                ordering, self.keyset_values(ordering.lstrip("-"), rows[-1])
+            )
+
+        return DealPage(deals=self._build_entities(rows), next_cursor=next_cursor)
+
+    def get_version(self, deal_id: int) -> datetime | None:
+        """Return when a deal was last updated, reading only its primary key row."""
+        return (
+            self.deal_manager.filter(id=deal_id)
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+
+    def get_page_versions(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> list[tuple[int, datetime]]:
+        """Return the (id, updated_at) pairs of a page, plus the first row after it."""
+        return list(
+            self.page_queryset(cursor, ordering, filters).values_list("id", "updated_at")[
+                : limit + 1
+            ]
+        )
+
+    def page_queryset(
+        self,
+        cursor: str | None,
+        ordering: DealOrdering,
+        filters: DealFilters | None = None,
+    ) -> "QuerySet[DealModel]":
+        """Return the deals matching the filters after the cursor, in keyset order.
+
+        Nothing is evaluated: the async repository runs the same queryset.
+        """
+        field = ordering.lstrip("-")
+        descending = ordering.startswith("-")
+
+        queryset = self.deal_manager.all()
+        if filters is not None:
+            queryset = queryset.filter(self._filters_condition(filters))
+        if cursor is not None:
+            queryset = queryset.filter(
+                self._keyset_filter(field, descending, decode_cursor(cursor, ordering))
+            )
+
+        # Always break ties on the primary key, so the keyset is total.
+        order_by = (
+            [ordering] if field == "id" else [ordering, "-id" if descending else "id"]
+        )
+        return queryset.order_by(*order_by)
+
+    def _load_entities(self, queryset: "QuerySet[DealModel]") -> list[DealEntity]:
+        """Build entities for every deal of a queryset in exactly two queries."""
+        rows = list(queryset.values(*DEAL_ENTITY_FIELDS))
+        if not rows:
+            return []
+
+        # Select the tag links with a subquery, so the statement does not grow
+        # with the number of deals (SQLite caps the number of bound parameters).
+        tag_links = self.deal_tags_manager.filter(
+            dealmodel_id__in=queryset.values("id")
+        ).values_list("dealmodel_id", "tagmodel_id")
+        return self.to_entities(rows, tag_links)
+
+    def _build_entities(self, rows: list[dict[str, Any]]) -> list[DealEntity]:
+        """Build entities for already fetched deal rows, batching the tag lookups."""
+        tag_links: list[tuple[int, int]] = []
+        deal_ids = [row["id"] for row in rows]
+        for start in range(0, len(deal_ids), ID_LOOKUP_BATCH_SIZE):
+            tag_links.extend(
+                self.deal_tags_manager.filter(
+                    dealmodel_id__in=deal_ids[start : start + ID_LOOKUP_BATCH_SIZE]
+                ).values_list("dealmodel_id", "tagmodel_id")
+            )
+        return self.to_entities(rows, tag_links)
+
+    @staticmethod
+    def to_entities(
+        rows: list[dict[str, Any]], tag_links: Iterable[tuple[int, int]]
+    ) -> list[DealEntity]:
+        """Group (deal_id, tag_id) links by deal and build an entity per row."""
+        tags_by_deal: defaultdict[int, list[int]] = defaultdict(list)
+        for deal_id, tag_id in tag_links:
+            tags_by_deal[deal_id].append(tag_id)
+
+        return [
+            DealEntity.from_values(row, sorted(tags_by_deal[row["id"]])) for row in rows
+        ]
+
+    def _filters_condition(self, filters: DealFilters) -> Q:
+        """Translate filters into a condition on deals, evaluated by the database.
+
+        Tag criteria select deal IDs from the link table through its tag index,
+        as `id IN (subquery)`, so matching deals are never duplicated.
+        """
+        condition = Q()
+        if filters.company_id is not None:
+            condition &= Q(company_id=filters.company_id)
+        if filters.distributor_id is not None:
+            condition &= Q(distributor_id=filters.distributor_id)
+        if filters.value_min is not None:
+            condition &= Q(value__gte=filters.value_min)
+        if filters.value_max is not None:
+            condition &= Q(value__lte=filters.value_max)
+        if filters.updated_since is not None:
+            condition &= Q(updated_at__gte=filters.updated_since)
+
+        if filters.tags:
+            tag_groups = (
+                [[tag_id] for tag_id in sorted(set(filters.tags))]
+                if filters.tags_match == "all"
+                else [sorted(set(filters.tags))]
+            )
+            for tag_ids in tag_groups:
+                condition &= Q(
+                    id__in=self.deal_tags_manager.filter(tagmodel_id__in=tag_ids).values(
+                        "dealmodel_id"
+                    )
+                )
+        return condition
+
+    @staticmethod
+    def keyset_values(field: str, row: dict[str, Any]) -> list[int | str]:
+        """Return the JSON-serializable keyset position of a deal row."""
+        if field == "updated_at":
+            return [row["updated_at"].isoformat(), row["id"]]
+        if field == "value":
+            return [str(row["value"]), row["id"]]
+        return [row["id"]]
+
+    @staticmethod
+    def _keyset_filter(field: str, descending: bool, keys: list[int | str]) -> Q:
+        """Build the filter selecting rows strictly after a keyset position."""
+        lookup = "lt" if descending else "gt"
+        try:
+            if field == "id":
+                (raw_id,) = keys
+                return Q(**{f"id__{lookup}": int(raw_id)})
+
+            raw_key, raw_id = keys
+            key: datetime | Decimal = (
+                datetime.fromisoformat(str(raw_key))
+                if field == "updated_at"
+                else Decimal(str(raw_key))
+            )
+            last_id = int(raw_id)
+            if isinstance(key, Decimal) and not key.is_finite():
+                raise ValueError(key)
+            return Q(**{f"{field}__{lookup}": key}) | Q(
+                **{field: key, f"id__{lookup}": last_id}
+            )
+        except (TypeError, ValueError, ArithmeticError) as exc:
+            raise InvalidCursorError("Malformed cursor.") from exc
 
-    @transaction.atomic
+    def search(self, query: str, limit: int, cursor: str | None = None) -> DealPage:
+        """Search deals by title through the full-text index, best matches first."""
+        deal_ids, next_cursor = self.title_search.page(search_terms(query), limit, cursor)
+        return DealPage(deals=self._ranked_entities(deal_ids), next_cursor=next_cursor)
+
+    def _ranked_entities(self, deal_ids: list[int]) -> list[DealEntity]:
+        """Build the entities of deals in the given order, skipping missing ones."""
+        rows_by_id = {
+            row["id"]: row
+            for row in self.deal_manager.filter(id__in=deal_ids).values(
+                *DEAL_ENTITY_FIELDS
+            )
+        }
+        # Keep the rank order, skipping deals deleted since they were matched.
+        rows = [rows_by_id[deal_id] for deal_id in deal_ids if deal_id in rows_by_id]
+        return self._build_entities(rows)
+
+    def get_stats(
+        self, dimension: StatsDimension, group_ids: list[int]
+    ) -> list[DealStats]:
+        """Return the deal count and value sum of groups from the stats table."""
+        return self.stats.get(dimension, group_ids)
+
+    @atomic_write
     def update(
         self,
         deal_id: int,
@@ -75,51 +483,115 @@ class DealRepositoryDB(DealRepository):
         tags: list[int] | None,
         value: Decimal | None,
     ) -> DealEntity | None:
-        """Update an existing deal."""
-        deal = self.deal_manager.filter(id=deal_id).first()
-        if not deal:
-            raise ValueError(f"Deal with ID {deal_id} does not exist.")
-
-        if title is not None:
-            deal.title = title
+        """Update an existing deal, writing only what changed.
 
-        if value is not None:
-            deal.value = value
+        The deal row and the existence of the new distributor are read in one
+        query, only the changed columns are written in one UPDATE, and only the
+        added or removed tag links are touched. The returned entity is built
+        from those values instead of being read back. The row stays locked
+        until the stats are updated, so concurrent writes of the deal apply
+        their stats changes in turn.
+        """
+        deal_queryset = self.deal_manager.filter(id=deal_id)
+        row_queryset = deal_queryset.select_for_update()
+        if distributor_id:
+            row_queryset = row_queryset.annotate(
+                distributor_exists=Exists(
+                    self.distributor_manager.filter(id=distributor_id)
+                )
+            )
+        # Typed as a dict, as `distributor_exists` is unknown to the stubs.
+        row = cast(dict[str, Any] | None, row_queryset.values().first())
+        if not row:
+            raise ValueError(f"Deal with ID {deal_id} does not exist.")
 
-        if tags is not None:
-            # Delete all tags associated with the deal.
-            deleted_tags = deal.tags.all()
-            deleted_tags.delete()
+        changes: dict[str, Any] = {}
+        if title is not None and title != row["title"]:
+            changes["title"] = title
 
-            new_tags = self.tags_manager.filter(id__in=tags)
-            deal.tags.set(new_tags)
+        if value is not None and value != row["value"]:
+            changes["value"] = value
 
-        if distributor_id:
+        if distributor_id and distributor_id != row["distributor_id"]:
             # Ensure the distributor exists.
-            distributor = self.distributor_manager.filter(id=distributor_id).first()
-            if not distributor:
+            if not row["distributor_exists"]:
                 raise ValueError(f"Distributor with ID {distributor_id} does not exist.")
 
-            deal.distributor = distributor
+            changes["distributor_id"] = distributor_id
+
+        current_tags = set(
+            self.deal_tags_manager.filter(dealmodel_id=deal_id).values_list(
+                "tagmodel_id", flat=True
+            )
+        )
+        new_tags = current_tags
+        if tags is not None:
+            new_tags = self._apply_tag_changes(deal_id, current_tags, set(tags))
+
+        # Move the deal between the groups of the stats.
+        stats_changes = StatsChanges()
+        stats_changes.add_deal(
+            row["company_id"], row["distributor_id"], current_tags, row["value"], sign=-1
+        )
 
         # Update the deal attributes.
-        deal.updated_at = datetime.now()
-        deal.save()
-        entity = DealEntity.from_model(deal)
+        changes["updated_at"] = timezone.now()
+        deal_queryset.update(**changes)
+        row.update(changes)
+
+        stats_changes.add_deal(
+            row["company_id"], row["distributor_id"], new_tags, row["value"]
+        )
+        self.stats.apply(stats_changes)
+        entity = DealEntity.from_values(row, sorted(new_tags))
 
-        # Emit the updated deal event.
-        deal_updated_emitter.delay(entity.id)
+        # Publish the updated deal event.
+        self.events.publish("updated", [entity.id])
         return entity
 
+    def _apply_tag_changes(
+        self, deal_id: int, current_tags: set[int], requested_tags: set[int]
+    ) -> set[int]:
+        """Insert and delete only the tag links that differ, returning the new set.
+
+        Requested tags that don't exist are ignored.
+        """
+        removed = current_tags - requested_tags
+        if removed:
+            self.deal_tags_manager.filter(
+                dealmodel_id=deal_id, tagmodel_id__in=removed
+            ).delete()
+
+        added = self._existing_ids(self.tags_manager, requested_tags - current_tags)
+        if added:
+            self.deal_tags_manager.bulk_create(
+                self.deal_tags_manager.model(dealmodel_id=deal_id, tagmodel_id=tag_id)
+                for tag_id in sorted(added)
+            )
+
+        return (current_tags - removed) | added
+
+    @atomic_write
     def delete(self, deal_id: int) -> bool:
         """Delete a deal by its ID."""
-        deal = self.deal_manager.filter(id=deal_id).first()
+        deal = self.deal_manager.select_for_update().filter(id=deal_id).first()
         if deal:
             deal_id = deal.id
+            changes = StatsChanges()
+            changes.add_deal(
+                deal.company_id,
+                deal.distributor_id,
+                self.deal_tags_manager.filter(dealmodel_id=deal_id).values_list(
+                    "tagmodel_id", flat=True
+                ),
+                deal.value,
+                sign=-1,
+            )
             deal.delete()
+            self.stats.apply(changes)
 
-            # Emit the deleted deal event.
-            deal_deleted_emitter.delay(deal_id)
+            # Publish the deleted deal event.
+            self.events.publish("deleted", [deal_id])
 
             return True
         return False
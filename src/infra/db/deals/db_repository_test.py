@@ -1,9 +1,24 @@
 from decimal import Decimal
+from typing import Any, cast
+from unittest.mock import Mock
 
+from django.db import connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
-from core.models import DistributorModel, TagModel
-from infra.db.deals.db_repository import DealRepositoryDB
+from core.models import (
+    CompanyModel,
+    DealEventModel,
+    DealModel,
+    DistributorModel,
+    TagModel,
+)
+from domain.deals.entity import NewDeal
+from domain.deals.filters import DealFilters
+from domain.deals.pagination import DEAL_ORDERINGS, DealOrdering, InvalidCursorError
+from domain.deals.repository import InvalidDealReferencesError
+from infra.db.deals.db_repository import DEAL_ENTITY_FIELDS, DealRepositoryDB
 
 
 class DealRepositoryDBIntegrationTest(TestCase):
@@ -76,3 +91,508 @@ class DealRepositoryDBIntegrationTest(TestCase):
 
     def test_delete_not_found(self) -> None:
         self.assertFalse(self.repo.delete(9999))
+
+    def _create_deals(self, count: int) -> list[int]:
+        return [
+            self.repo.create(
+                title=f"Deal {i}",
+                company_id=self.company.id,
+                value=Decimal("10.0"),
+                tags=None,
+                distributor_id=None,
+            ).id
+            for i in range(count)
+        ]
+
+    def test_get_page_walks_all_deals_by_id(self) -> None:
+        ids = self._create_deals(5)
+
+        first = self.repo.get_page(limit=2)
+        self.assertEqual([d.id for d in first.deals], ids[:2])
+        self.assertIsNotNone(first.next_cursor)
+
+        second = self.repo.get_page(limit=2, cursor=first.next_cursor)
+        self.assertEqual([d.id for d in second.deals], ids[2:4])
+
+        last = self.repo.get_page(limit=2, cursor=second.next_cursor)
+        self.assertEqual([d.id for d in last.deals], ids[4:])
+        self.assertIsNone(last.next_cursor)
+
+    def test_get_page_by_updated_at_descending(self) -> None:
+        ids = self._create_deals(3)
+        # Touch the first deal so it becomes the most recently updated.
+        self.repo.update(
+            deal_id=ids[0], title="Touched", distributor_id=None, tags=None, value=None
+        )
+
+        seen: list[int] = []
+        cursor = None
+        while True:
+            page = self.repo.get_page(limit=1, cursor=cursor, ordering="-updated_at")
+            seen.extend(d.id for d in page.deals)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        self.assertEqual(seen[0], ids[0])
+        self.assertCountEqual(seen, ids)
+
+    def test_get_page_rejects_cursor_of_other_ordering(self) -> None:
+        self._create_deals(2)
+        page = self.repo.get_page(limit=1)
+        assert page.next_cursor is not None
+
+        with self.assertRaises(InvalidCursorError):
+            self.repo.get_page(limit=1, cursor=page.next_cursor, ordering="-id")
+
+    def test_get_page_rejects_malformed_cursor(self) -> None:
+        with self.assertRaises(InvalidCursorError):
+            self.repo.get_page(limit=1, cursor="not-a-cursor")
+
+    def test_reads_use_constant_number_of_queries(self) -> None:
+        for count in (1, 10):
+            for i in range(count):
+                self.repo.create(
+                    title=f"Deal {i}",
+                    company_id=self.company.id,
+                    value=Decimal("10.0"),
+                    tags=[self.tag1.id, self.tag2.id],
+                    distributor_id=self.distributor.id,
+                )
+
+            # One query for the deals and one for all of their tags.
+            with self.assertNumQueries(2):
+                deals = self.repo.get_all()
+            self.assertTrue(all(d.tags == [self.tag1.id, self.tag2.id] for d in deals))
+
+            with self.assertNumQueries(2):
+                self.repo.get_page(limit=count)
+
+            with self.assertNumQueries(2):
+                self.repo.get_one(deals[-1].id)
+
+    def test_create_returns_deduplicated_tags(self) -> None:
+        deal_entity = self.repo.create(
+            title="Tags",
+            company_id=self.company.id,
+            value=Decimal("1.0"),
+            tags=[self.tag2.id, self.tag1.id, self.tag2.id],
+            distributor_id=None,
+        )
+        self.assertEqual(deal_entity.tags, [self.tag1.id, self.tag2.id])
+        self.assertEqual(self.repo.get_one(deal_entity.id), deal_entity)
+
+    def test_iter_all_yields_every_deal_in_batches(self) -> None:
+        ids = self._create_deals(5)
+
+        # Two full batches, one partial batch; two queries each.
+        with self.assertNumQueries(6):
+            deals = list(self.repo.iter_all(batch_size=2))
+        self.assertEqual([d.id for d in deals], ids)
+
+    def test_iter_all_on_empty_table(self) -> None:
+        self.assertEqual(list(self.repo.iter_all()), [])
+
+    def test_bulk_create(self) -> None:
+        created = self.repo.bulk_create(
+            [
+                NewDeal(
+                    title="Bulk 1",
+                    company_id=self.company.id,
+                    value=Decimal("1.0"),
+                    tags=[self.tag2.id, self.tag1.id],
+                    distributor_id=self.distributor.id,
+                ),
+                NewDeal(title="Bulk 2", company_id=self.company.id, value=Decimal("2.0")),
+            ]
+        )
+        self.assertEqual([d.title for d in created], ["Bulk 1", "Bulk 2"])
+        self.assertEqual(created[0].tags, [self.tag1.id, self.tag2.id])
+        self.assertEqual(created[1].tags, [])
+        self.assertEqual(self.repo.get_one(created[0].id), created[0])
+        self.assertEqual(self.repo.get_one(created[1].id), created[1])
+
+    def test_bulk_create_query_count_does_not_depend_on_size(self) -> None:
+        for count in (1, 50):
+            deals = [
+                NewDeal(
+                    title=f"Bulk {i}",
+                    company_id=self.company.id,
+                    value=Decimal("1.0"),
+                    tags=[self.tag1.id],
+                    distributor_id=self.distributor.id,
+                )
+                for i in range(count)
+            ]
+            # Savepoint, 3 reference lookups, 3 inserts, 2 stats writes, release.
+            with self.assertNumQueries(10):
+                self.repo.bulk_create(deals)
+
+    def test_writes_record_events_in_their_transaction(self) -> None:
+        deal = self.repo.create(
+            title="Events",
+            company_id=self.company.id,
+            value=Decimal("1.0"),
+            tags=None,
+            distributor_id=None,
+        )
+        self.repo.update(
+            deal_id=deal.id, title="Renamed", distributor_id=None, tags=None, value=None
+        )
+        self.repo.delete(deal.id)
+        with self.assertRaises(ValueError):
+            self.repo.update(
+                deal_id=deal.id, title="Gone", distributor_id=None, tags=None, value=None
+            )
+
+        self.assertEqual(
+            list(
+                DealEventModel.objects.order_by("id").values_list("event_type", "deal_id")
+            ),
+            [("created", deal.id), ("updated", deal.id), ("deleted", deal.id)],
+        )
+
+    def test_events_go_to_the_injected_publisher(self) -> None:
+        events = Mock()
+        repo = DealRepositoryDB(events=events)
+        deal = repo.create(
+            title="Injected",
+            company_id=self.company.id,
+            value=Decimal("1.0"),
+            tags=None,
+            distributor_id=None,
+        )
+        repo.delete(deal.id)
+
+        self.assertEqual(
+            [c.args for c in events.publish.call_args_list],
+            [("created", [deal.id]), ("deleted", [deal.id])],
+        )
+        self.assertFalse(DealEventModel.objects.exists())
+
+    def test_rolled_back_write_records_no_event(self) -> None:
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.repo.create(
+                title="Rolled back",
+                company_id=self.company.id,
+                value=Decimal("1.0"),
+                tags=None,
+                distributor_id=None,
+            )
+            raise RuntimeError
+        self.assertFalse(DealEventModel.objects.exists())
+
+    def test_bulk_create_reports_missing_references_per_item(self) -> None:
+        with self.assertRaises(InvalidDealReferencesError) as ctx:
+            self.repo.bulk_create(
+                [
+                    NewDeal(title="Ok", company_id=self.company.id, value=Decimal("1")),
+                    NewDeal(
+                        title="Bad",
+                        company_id=9999,
+                        value=Decimal("1"),
+                        tags=[self.tag1.id, 8888],
+                        distributor_id=7777,
+                    ),
+                ]
+            )
+
+        self.assertEqual(list(ctx.exception.errors), [1])
+        self.assertEqual(
+            set(ctx.exception.errors[1]), {"company_id", "distributor_id", "tags"}
+        )
+        self.assertFalse(DealModel.objects.exists())
+
+    def test_bulk_create_empty(self) -> None:
+        self.assertEqual(self.repo.bulk_create([]), [])
+
+    def test_update_keeps_shared_tags(self) -> None:
+        first = self.repo.create(
+            title="First",
+            company_id=self.company.id,
+            value=Decimal("1.0"),
+            tags=[self.tag1.id],
+            distributor_id=None,
+        )
+        second = self.repo.create(
+            title="Second",
+            company_id=self.company.id,
+            value=Decimal("1.0"),
+            tags=[self.tag1.id],
+            distributor_id=None,
+        )
+
+        updated = self.repo.update(
+            deal_id=first.id, title=None, distributor_id=None, tags=[], value=None
+        )
+
+        assert updated is not None
+        self.assertEqual(updated.tags, [])
+        self.assertTrue(TagModel.objects.filter(id=self.tag1.id).exists())
+        self.assertEqual(self.repo.get_one(second.id), second)
+
+    def test_update_only_touches_changed_tag_links(self) -> None:
+        deal_entity = self.repo.create(
+            title="Tags",
+            company_id=self.company.id,
+            value=Decimal("1.0"),
+            tags=[self.tag1.id],
+            distributor_id=None,
+        )
+        tag3 = TagModel.objects.create(name="tag3")
+        link = self.repo.deal_tags_manager.get(dealmodel_id=deal_entity.id)
+
+        updated = self.repo.update(
+            deal_id=deal_entity.id,
+            title=None,
+            distributor_id=None,
+            tags=[self.tag1.id, tag3.id, 9999],
+            value=None,
+        )
+
+        assert updated is not None
+        self.assertEqual(updated.tags, [self.tag1.id, tag3.id])
+        # The unchanged link row survives.
+        self.assertTrue(DealModel.tags.through.objects.filter(id=link.id).exists())
+        self.assertEqual(self.repo.get_one(deal_entity.id), updated)
+
+    def test_update_writes_only_changed_columns(self) -> None:
+        deal_entity = self.repo.create(
+            title="Columns",
+            company_id=self.company.id,
+            value=Decimal("1.0"),
+            tags=None,
+            distributor_id=None,
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            updated = self.repo.update(
+                deal_id=deal_entity.id,
+                title="Renamed",
+                distributor_id=None,
+                tags=None,
+                value=Decimal("1.0"),
+            )
+
+        updates = [
+            q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"title"', updates[0])
+        self.assertNotIn('"value"', updates[0])
+        assert updated is not None
+        self.assertEqual(updated.title, "Renamed")
+        self.assertEqual(self.repo.get_one(deal_entity.id), updated)
+
+    def test_update_unknown_distributor(self) -> None:
+        deal_entity = self.repo.create(
+            title="Distributor",
+            company_id=self.company.id,
+            value=Decimal("1.0"),
+            tags=None,
+            distributor_id=None,
+        )
+        with self.assertRaises(ValueError):
+            self.repo.update(
+                deal_id=deal_entity.id,
+                title=None,
+                distributor_id=9999,
+                tags=None,
+                value=None,
+            )
+
+    def test_update_not_found(self) -> None:
+        with self.assertRaises(ValueError):
+            self.repo.update(
+                deal_id=9999, title="x", distributor_id=None, tags=None, value=None
+            )
+
+
+class DealRepositoryDBFilterTest(TestCase):
+    def setUp(self) -> None:
+        self.repo = DealRepositoryDB()
+        self.company_a = CompanyModel.objects.create(name="A")
+        self.company_b = CompanyModel.objects.create(name="B")
+        self.distributor = DistributorModel.objects.create(name="D1")
+        self.tag1 = TagModel.objects.create(name="tag1")
+        self.tag2 = TagModel.objects.create(name="tag2")
+
+        def create(
+            company: CompanyModel, value: str, tags: list[int], distributor_id: int | None
+        ) -> int:
+            return self.repo.create(
+                title="Deal",
+                company_id=company.id,
+                value=Decimal(value),
+                tags=tags,
+                distributor_id=distributor_id,
+            ).id
+
+        self.a_small = create(self.company_a, "10", [self.tag1.id], None)
+        self.a_large = create(
+            self.company_a, "500", [self.tag1.id, self.tag2.id], self.distributor.id
+        )
+        self.b_medium = create(self.company_b, "100", [self.tag2.id], self.distributor.id)
+        self.b_untagged = create(self.company_b, "50", [], None)
+
+    def _ids(self, ordering: DealOrdering = "id", **criteria: object) -> list[int]:
+        """Walk every page of the filtered deals, one deal per page."""
+        ids: list[int] = []
+        cursor = None
+        while True:
+            page = self.repo.get_page(
+                limit=1,
+                cursor=cursor,
+                ordering=ordering,
+                filters=DealFilters.model_validate(criteria),
+            )
+            ids.extend(deal.id for deal in page.deals)
+            cursor = page.next_cursor
+            if cursor is None:
+                return ids
+
+    def test_filters(self) -> None:
+        self.assertEqual(
+            self._ids(company_id=self.company_a.id), [self.a_small, self.a_large]
+        )
+        self.assertEqual(
+            self._ids(distributor_id=self.distributor.id, tags=[self.tag2.id]),
+            [self.a_large, self.b_medium],
+        )
+        self.assertEqual(
+            self._ids(tags=[self.tag1.id, self.tag2.id]),
+            [self.a_small, self.a_large, self.b_medium],
+        )
+        self.assertEqual(
+            self._ids(tags=[self.tag1.id, self.tag2.id], tags_match="all"),
+            [self.a_large],
+        )
+        self.assertEqual(
+            self._ids(value_min=Decimal("50"), value_max=Decimal("100")),
+            [self.b_medium, self.b_untagged],
+        )
+        self.assertEqual(self._ids(company_id=self.company_b.id, tags=[self.tag1.id]), [])
+
+    def test_updated_since(self) -> None:
+        since = timezone.now()
+        self.repo.update(
+            deal_id=self.b_untagged,
+            title="New",
+            distributor_id=None,
+            tags=None,
+            value=None,
+        )
+        self.assertEqual(self._ids(updated_since=since), [self.b_untagged])
+
+    def test_value_ordering_pages_through_ties(self) -> None:
+        tie = self.repo.create(
+            title="Tie",
+            company_id=self.company_a.id,
+            value=Decimal("100"),
+            tags=None,
+            distributor_id=None,
+        ).id
+        self.assertEqual(
+            self._ids(ordering="-value"),
+            [self.a_large, tie, self.b_medium, self.b_untagged, self.a_small],
+        )
+        self.assertEqual(
+            self._ids(ordering="value", value_min=Decimal("100")),
+            [self.b_medium, tie, self.a_large],
+        )
+
+    def test_page_versions_apply_filters(self) -> None:
+        versions = self.repo.get_page_versions(
+            limit=10, filters=DealFilters(company_id=self.company_b.id)
+        )
+        self.assertEqual(
+            [deal_id for deal_id, _ in versions], [self.b_medium, self.b_untagged]
+        )
+
+    def test_any_filters_in_any_ordering(self) -> None:
+        # Filters the index of the ordering doesn't serve are checked on the
+        # deals read in order.
+        since = timezone.now()
+        self.repo.update(
+            deal_id=self.a_small,
+            title="New",
+            distributor_id=None,
+            tags=None,
+            value=None,
+        )
+        self.assertEqual(
+            self._ids(ordering="-updated_at", value_min=Decimal("50")),
+            [self.b_untagged, self.b_medium, self.a_large],
+        )
+        self.assertEqual(
+            self._ids(ordering="id", value_min=Decimal("50"), value_max=Decimal("100")),
+            [self.b_medium, self.b_untagged],
+        )
+        self.assertEqual(
+            self._ids(ordering="-value", tags=[self.tag1.id], value_min=Decimal("5")),
+            [self.a_large, self.a_small],
+        )
+        self.assertEqual(
+            self._ids(value_min=Decimal("5"), updated_since=since), [self.a_small]
+        )
+
+    def test_each_filter_is_served_by_an_index(self) -> None:
+        since = timezone.now()
+        criteria: dict[str, dict[str, Any]] = {
+            "company": {"company_id": 1},
+            "distributor": {"distributor_id": 1},
+            "tags": {"tags": [1, 2]},
+            "all_tags": {"tags": [1, 2], "tags_match": "all"},
+            "value_min": {"value_min": Decimal(10)},
+            "value_max": {"value_max": Decimal(20)},
+            "updated_since": {"updated_since": since},
+        }
+        for name, values in criteria.items():
+            filters = DealFilters(**values)
+            field = filters.default_ordering()
+            for ordering in (field, f"-{field}"):
+                with self.subTest(filters=name, ordering=ordering):
+                    self._assert_indexed(filters, cast(DealOrdering, ordering))
+
+    def test_access_patterns_are_served_by_an_index(self) -> None:
+        patterns: dict[str, dict[str, Any]] = {
+            "deals of a company": {"company_id": 1},
+            "deals of a distributor with a tag": {"distributor_id": 1, "tags": [1]},
+            "deals of a distributor with tags": {
+                "distributor_id": 1,
+                "tags": [1, 2],
+                "tags_match": "all",
+            },
+        }
+        for name, values in patterns.items():
+            for ordering in DEAL_ORDERINGS:
+                with self.subTest(pattern=name, ordering=ordering):
+                    self._assert_indexed(
+                        DealFilters(**values), cast(DealOrdering, ordering)
+                    )
+
+        # Deals above a value, newest first: read in update order until the
+        # page is filled.
+        self._assert_indexed(
+            DealFilters(value_min=Decimal(10)), "-updated_at", search=False
+        )
+
+    def _assert_indexed(
+        self, filters: DealFilters, ordering: DealOrdering, search: bool = True
+    ) -> None:
+        plan = (
+            self.repo.page_queryset(None, ordering, filters)
+            .values(*DEAL_ENTITY_FIELDS)[:51]
+            .explain()
+        )
+        # Every table access goes through an index, which yields the deals in
+        # order, and is a search unless the filters are checked on the deals
+        # read in order.
+        self.assertNotIn("TEMP B-TREE", plan)
+        accesses = [
+            line for line in plan.splitlines() if " SCAN " in line or " SEARCH " in line
+        ]
+        self.assertTrue(accesses, plan)
+        for access in accesses:
+            self.assertIn("SEARCH" if search else "USING", access, plan)
+            self.assertIn("USING", access, plan)
@@ -0,0 +1,143 @@
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from typing import cast
+
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from core.models import DealEventModel
+from domain.deals.events import DealEvent, DealEventType, EventPublisher
+from infra.db.inserts import insert_rows
+from infra.db.lookups import ID_LOOKUP_BATCH_SIZE
+
+
+class DealOutbox(EventPublisher):
+    """Transactional outbox of deal events.
+
+    Events are recorded in the transaction of the change they describe, so they
+    exist exactly when the change commits, and are published later by a relay.
+    Delivery is at least once: a relay that fails after publishing a batch
+    publishes it again on its next run.
+    """
+
+    def __init__(
+        self, using: str | None = None, event_id_stride: int = 1, event_id_offset: int = 0
+    ) -> None:
+        """Initialize the outbox with the event manager.
+
+        Args:
+            using: Alias of the database holding the outbox
+            event_id_stride: Factor applied to the row IDs of events to build
+                their event IDs, so that the events of several outboxes (one
+                per shard) get distinct event IDs
+            event_id_offset: Added to the event IDs, distinct per outbox
+        """
+        self.using = using
+        self.event_manager = DealEventModel._default_manager.db_manager(using)
+        self.event_id_stride = event_id_stride
+        self.event_id_offset = event_id_offset
+
+    def publish(self, event_type: DealEventType, deal_ids: list[int]) -> None:
+        """Record events in the outbox, to be published by the relay."""
+        self.record(event_type, deal_ids)
+
+    def record(self, event_type: DealEventType, deal_ids: Iterable[int]) -> None:
+        """Record one event of the given type per deal, in a single insert."""
+        using = self.using or router.db_for_write(DealEventModel)
+        created_at = connections[using].ops.adapt_datetimefield_value(timezone.now())
+        insert_rows(
+            DealEventModel,
+            ("event_type", "deal_id", "created_at"),
+            ((event_type, deal_id, created_at) for deal_id in deal_ids),
+            using=using,
+        )
+
+    def relay(
+        self,
+        publish: Callable[[list[DealEvent]], None],
+        batch_size: int,
+        min_age: float = 0,
+    ) -> int:
+        """Publish the oldest unsent events as one batch, then mark them as sent.
+
+        Args:
+            publish: Callable publishing a batch of events; if it raises, the
+                events stay unsent
+            batch_size: Maximum number of events published at once
+            min_age: Seconds an event waits before being published, so that
+                bursts of events about a deal end up in the same batch
+
+        Returns:
+            int: Number of events published
+        """
+        queryset = self.event_manager.filter(sent_at__isnull=True)
+        if min_age:
+            queryset = queryset.filter(
+                created_at__lte=timezone.now() - timedelta(seconds=min_age)
+            )
+
+        # The batch is read and marked in short transactions of their own, so
+        # that no lock is held while the broker is called. Concurrent relays
+        # may thus publish the same batch twice, as delivery is at least once.
+        rows = list(
+            queryset.order_by("id").values("id", "event_type", "deal_id")[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        publish(
+            [
+                DealEvent(
+                    event_id=row["id"] * self.event_id_stride + self.event_id_offset,
+                    event_type=cast(DealEventType, row["event_type"]),
+                    deal_id=row["deal_id"],
+                )
+                for row in rows
+            ]
+        )
+
+        # Mark exactly the published rows: events committed late by another
+        # transaction may have lower IDs than the last one of the batch.
+        sent_at = timezone.now()
+        event_ids = [row["id"] for row in rows]
+        with transaction.atomic(using=self.using):
+            for start in range(0, len(event_ids), ID_LOOKUP_BATCH_SIZE):
+                self.event_manager.filter(
+                    id__in=event_ids[start : start + ID_LOOKUP_BATCH_SIZE]
+                ).update(sent_at=sent_at)
+        return len(rows)
+
+    def relay_all(
+        self,
+        publish: Callable[[list[DealEvent]], None],
+        batch_size: int,
+        min_age: float = 0,
+    ) -> int:
+        """Publish every unsent event old enough, batch by batch.
+
+        Returns:
+            int: Number of events published
+        """
+        total = 0
+        while True:
+            published = self.relay(publish, batch_size, min_age)
+            total += published
+            if published < batch_size:
+                return total
+
+    def prune(self, sent_before: datetime, batch_size: int = 1000) -> int:
+        """Delete events sent before a date, in batches to keep transactions short.
+
+        Returns:
+            int: Number of events deleted
+        """
+        total = 0
+        while True:
+            event_ids = list(
+                self.event_manager.filter(sent_at__lt=sent_before)
+                .order_by("id")
+                .values_list("id", flat=True)[: min(batch_size, ID_LOOKUP_BATCH_SIZE)]
+            )
+            if not event_ids:
+                return total
+            total += self.event_manager.filter(id__in=event_ids).delete()[0]
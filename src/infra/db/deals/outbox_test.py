@@ -0,0 +1,102 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import Mock, patch
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import DealEventModel
+from domain.deals.events import DealEvent
+from infra.db.deals.outbox import DealOutbox
+
+
+class DealOutboxTest(TestCase):
+    def setUp(self) -> None:
+        self.outbox = DealOutbox()
+
+    def test_record_inserts_one_event_per_deal_at_once(self) -> None:
+        with self.assertNumQueries(1):
+            self.outbox.record("created", [1, 2, 3])
+
+        self.assertEqual(
+            list(DealEventModel.objects.values_list("event_type", "deal_id")),
+            [("created", 1), ("created", 2), ("created", 3)],
+        )
+
+    def test_relay_publishes_in_batches_and_marks_sent(self) -> None:
+        self.outbox.record("created", [1, 2])
+        self.outbox.record("deleted", [1])
+        publish = Mock()
+
+        self.assertEqual(self.outbox.relay_all(publish, batch_size=2), 3)
+
+        batches = [call.args[0] for call in publish.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertEqual(
+            batches[1],
+            [DealEvent(event_id=batches[1][0].event_id, event_type="deleted", deal_id=1)],
+        )
+        self.assertFalse(DealEventModel.objects.filter(sent_at__isnull=True).exists())
+        self.assertEqual(self.outbox.relay_all(publish, batch_size=2), 0)
+
+    def test_failed_publish_leaves_events_unsent(self) -> None:
+        self.outbox.record("updated", [1])
+        publish = Mock(side_effect=ConnectionError)
+
+        with self.assertRaises(ConnectionError):
+            self.outbox.relay(publish, batch_size=10)
+        self.assertTrue(DealEventModel.objects.filter(sent_at__isnull=True).exists())
+
+    def test_publish_runs_outside_the_relay_transactions(self) -> None:
+        self.outbox.record("updated", [1])
+        outer_blocks = len(transaction.get_connection().atomic_blocks)
+        publish = Mock(
+            side_effect=lambda events: self.assertEqual(
+                len(transaction.get_connection().atomic_blocks), outer_blocks
+            )
+        )
+
+        self.assertEqual(self.outbox.relay(publish, batch_size=10), 1)
+        publish.assert_called_once()
+
+    def test_prune_deletes_only_old_sent_events(self) -> None:
+        self.outbox.record("created", [1, 2, 3])
+        self.outbox.record("created", [4])
+        now = timezone.now()
+        DealEventModel.objects.filter(deal_id__lte=2).update(
+            sent_at=now - timedelta(days=2)
+        )
+        DealEventModel.objects.filter(deal_id=3).update(sent_at=now)
+
+        self.assertEqual(self.outbox.prune(now - timedelta(days=1), batch_size=1), 2)
+        self.assertEqual(
+            sorted(DealEventModel.objects.values_list("deal_id", flat=True)), [3, 4]
+        )
+
+    def test_relay_waits_for_events_older_than_min_age(self) -> None:
+        self.outbox.record("updated", [1])
+        DealEventModel.objects.update(created_at=timezone.now() - timedelta(seconds=30))
+        self.outbox.record("updated", [1])
+        publish = Mock()
+
+        self.assertEqual(self.outbox.relay_all(publish, batch_size=10, min_age=10), 1)
+        self.assertEqual(self.outbox.relay_all(publish, batch_size=10), 1)
+
+    def test_relay_command_publishes_coalesced_events(self) -> None:
+        self.outbox.record("created", [1, 2])
+        self.outbox.record("updated", [1, 1, 3, 3])
+        self.outbox.record("deleted", [2])
+        stdout = StringIO()
+
+        with patch("application.tasks.deals.tasks.deal_events_emitter") as emitter:
+            call_command("relay_deal_events", batch_size=10, stdout=stdout)
+
+        emitter.delay.assert_called_once()
+        self.assertEqual(
+            [(e["event_type"], e["deal_id"]) for e in emitter.delay.call_args.args[0]],
+            [("created", 1), ("updated", 3)],
+        )
+        self.assertIn("Relayed 7 deal event(s).", stdout.getvalue())
+        self.assertFalse(DealEventModel.objects.filter(sent_at__isnull=True).exists())
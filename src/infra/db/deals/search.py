@@ -0,0 +1,181 @@
+import math
+from typing import Any
+
+from django.db import connections
+from django.db.models import Q
+
+from core.models import DealModel
+from domain.deals.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+# Created by the `0006_deal_title_fts` migration, on SQLite only.
+DEAL_TITLE_FTS_TABLE = "core_deal_title_fts"
+
+# Only the most recent matches are ranked, bounding the cost of broad queries.
+# Older matches follow them, by ID.
+MAX_RANKED_MATCHES = 1000
+
+# Terms shorter than the shortest prefix indexed by the migration match whole
+# words only, as their prefix would have to be expanded to every indexed word.
+MIN_PREFIX_LENGTH = 2
+
+# Matching deal IDs with their bm25 score, lower being better, after a keyset
+# position. The score is computed in a subquery so the outer query can filter
+# and sort on it.
+FTS_PAGE_SQL = """
+SELECT id, score FROM (
+    SELECT rowid AS id, bm25(core_deal_title_fts) AS score
+    FROM core_deal_title_fts
+    WHERE core_deal_title_fts MATCH %s
+    ORDER BY rowid DESC
+    LIMIT %s
+)
+WHERE %s IS NULL OR score > %s OR (score = %s AND id > %s)
+ORDER BY score, id
+LIMIT %s
+"""
+
+# Matching deal IDs older than the ranked window, by ID after a keyset position.
+FTS_UNRANKED_PAGE_SQL = """
+SELECT id FROM (
+    SELECT rowid AS id
+    FROM core_deal_title_fts
+    WHERE core_deal_title_fts MATCH %s
+    ORDER BY rowid DESC
+    LIMIT -1 OFFSET %s
+)
+WHERE %s IS NULL OR id > %s
+ORDER BY id
+LIMIT %s
+"""
+
+
+def fts_query(terms: list[str]) -> str:
+    """Build an FTS5 query matching titles with a word starting with each term.
+
+    Terms are quoted, so they are never parsed as FTS5 operators.
+    """
+    return " ".join(
+        '"{}"{}'.format(
+            term.replace('"', '""'), "*" if len(term) >= MIN_PREFIX_LENGTH else ""
+        )
+        for term in terms
+    )
+
+
+class DealTitleSearch:
+    """Ranked search of deal IDs by the words of their title.
+
+    On SQLite it queries the FTS5 index of the titles, ranking the
+    `MAX_RANKED_MATCHES` most recent matches by bm25, followed by the older
+    matches in ID order. Other databases, and
+    SQLite databases not migrated yet, fall back to one `icontains` condition
+    per term, which scans the table, ordered by ID.
+    """
+
+    def __init__(self, using: str | None = None) -> None:
+        """Initialize with the manager of deals of the given database."""
+        self.deal_manager = DealModel._default_manager.db_manager(using)
+
+    def uses_fts(self) -> bool:
+        """Return whether the deal database has the full-text index.
+
+        The lookup reads the in-memory schema of SQLite, so it is cheap enough
+        to repeat on each search.
+        """
+        connection = connections[self.deal_manager.db]
+        if connection.vendor != "sqlite":
+            return False
+        with connection.cursor() as db_cursor:
+            db_cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                [DEAL_TITLE_FTS_TABLE],
+            )
+            return db_cursor.fetchone() is not None
+
+    def page(
+        self, terms: list[str], limit: int, cursor: str | None = None
+    ) -> tuple[list[int], str | None]:
+        """Return the IDs of a page of matching deals and the next cursor."""
+        matches = self.matches(terms, limit + 1, cursor)
+        next_cursor = None
+        if len(matches) > limit:
+            matches = matches[:limit]
+            next_cursor = encode_cursor("search", matches[-1][1])
+        return [deal_id for deal_id, _ in matches], next_cursor
+
+    def matches(
+        self, terms: list[str], limit: int, cursor: str | None = None
+    ) -> list[tuple[int, list[Any]]]:
+        """Return the IDs of the first matching deals after a cursor, in rank order.
+
+        Each ID comes with its keyset position, in the order of the ranking, so
+        the matches of several databases can be merged and paginated.
+        """
+        if not terms:
+            return []
+        if self.uses_fts():
+            return self._fts_matches(terms, limit, cursor)
+        return self._fallback_matches(terms, limit, cursor)
+
+    def _fts_matches(
+        self, terms: list[str], limit: int, cursor: str | None
+    ) -> list[tuple[int, list[Any]]]:
+        """Return the FTS5 matches after a cursor, ranked ones first.
+
+        Keyset positions are `[0, score, id]` within the ranked window and
+        `[1, 0, id]` past it, so that they sort in the order of the matches.
+        """
+        ranked = True
+        score: float | None = None
+        last_id: int | None = None
+        if cursor is not None:
+            keys = decode_cursor(cursor, "search")
+            try:
+                tier, raw_score, raw_id = keys
+                ranked, score, last_id = tier == 0, float(raw_score), int(raw_id)
+            except (TypeError, ValueError) as exc:
+                raise InvalidCursorError("Malformed cursor.") from exc
+            if tier not in (0, 1) or not math.isfinite(score):
+                raise InvalidCursorError("Malformed cursor.")
+
+        query = fts_query(terms)
+        matches: list[tuple[int, list[Any]]] = []
+        with connections[self.deal_manager.db].cursor() as db_cursor:
+            if ranked:
+                db_cursor.execute(
+                    FTS_PAGE_SQL,
+                    [query, MAX_RANKED_MATCHES, score, score, score, last_id, limit],
+                )
+                rows: list[tuple[int, float]] = db_cursor.fetchall()
+                matches = [
+                    (deal_id, [0, row_score, deal_id]) for deal_id, row_score in rows
+                ]
+                if len(matches) == limit:
+                    return matches
+                last_id = None
+
+            db_cursor.execute(
+                FTS_UNRANKED_PAGE_SQL,
+                [query, MAX_RANKED_MATCHES, last_id, last_id, limit - len(matches)],
+            )
+            matches += [(deal_id, [1, 0, deal_id]) for (deal_id,) in db_cursor.fetchall()]
+        return matches
+
+    def _fallback_matches(
+        self, terms: list[str], limit: int, cursor: str | None
+    ) -> list[tuple[int, list[Any]]]:
+        """Return the deals whose title contains every term after a cursor, by ID."""
+        condition = Q()
+        for term in terms:
+            condition &= Q(title__icontains=term)
+        queryset = self.deal_manager.filter(condition)
+        if cursor is not None:
+            keys = decode_cursor(cursor, "search")
+            try:
+                (raw_id,) = keys
+                queryset = queryset.filter(id__gt=int(raw_id))
+            except (TypeError, ValueError) as exc:
+                raise InvalidCursorError("Malformed cursor.") from exc
+
+        deal_ids = queryset.order_by("id").values_list("id", flat=True)[:limit]
+        return [(deal_id, [deal_id]) for deal_id in deal_ids]
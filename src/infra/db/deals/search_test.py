@@ -0,0 +1,138 @@
+import importlib
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+
+from core.models import CompanyModel, DealModel
+from domain.deals.pagination import InvalidCursorError
+from infra.db.deals.db_repository import DealRepositoryDB
+from infra.db.deals.search import DealTitleSearch, fts_query
+
+title_fts_migration = importlib.import_module("core.migrations.0006_deal_title_fts")
+
+
+class DealSearchTest(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Tests run without migrations, so create the index as the migration
+        # does. SQLite can't roll back FTS5 DDL cleanly, so this happens
+        # before the class transaction starts.
+        with connection.cursor() as cursor:
+            cursor.execute(title_fts_migration.CREATE_TABLE)
+            for sql in title_fts_migration.CREATE_TRIGGERS:
+                cursor.execute(sql)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        with connection.cursor() as cursor:
+            for sql in title_fts_migration.DROP_INDEX:
+                cursor.execute(sql)
+
+    def setUp(self) -> None:
+        self.repo = DealRepositoryDB()
+        company = CompanyModel.objects.create(name="Company")
+        self.deal_ids = {
+            title: self.repo.create(
+                title=title,
+                company_id=company.id,
+                value=Decimal(1),
+                tags=None,
+                distributor_id=None,
+            ).id
+            for title in (
+                "Acme renewal",
+                "Acme Acme expansion",
+                "Globex renewal",
+                "Café supplies",
+            )
+        }
+
+    def _titles(self, query: str, limit: int = 10) -> list[str]:
+        return [deal.title for deal in self.repo.search(query, limit=limit).deals]
+
+    def test_ranked_prefix_matches(self) -> None:
+        self.assertEqual(self._titles("acme"), ["Acme Acme expansion", "Acme renewal"])
+        self.assertEqual(self._titles("ren"), ["Acme renewal", "Globex renewal"])
+        self.assertEqual(self._titles("acme ren"), ["Acme renewal"])
+        self.assertEqual(self._titles("cafe"), ["Café supplies"])
+        self.assertEqual(self._titles("initech"), [])
+
+    def test_operators_are_searched_as_words(self) -> None:
+        self.assertEqual(self._titles('acme OR "globex'), [])
+        self.assertEqual(self._titles("NEAR(acme)"), [])
+        self.assertEqual(self._titles("***"), [])
+
+    def test_index_follows_updates_and_deletes(self) -> None:
+        deal_id = self.deal_ids["Globex renewal"]
+        self.repo.update(
+            deal_id=deal_id,
+            title="Initech pilot",
+            distributor_id=None,
+            tags=None,
+            value=None,
+        )
+        self.assertEqual(self._titles("initech"), ["Initech pilot"])
+        self.assertEqual(self._titles("globex"), [])
+
+        DealModel.objects.filter(id=deal_id).delete()
+        self.assertEqual(self._titles("initech"), [])
+
+    def test_cursor_pagination(self) -> None:
+        first = self.repo.search("acme", limit=1)
+        assert first.next_cursor is not None
+        second = self.repo.search("acme", limit=1, cursor=first.next_cursor)
+
+        self.assertEqual(
+            [deal.title for deal in first.deals + second.deals],
+            self._titles("acme"),
+        )
+        self.assertIsNone(second.next_cursor)
+        with self.assertRaises(InvalidCursorError):
+            self.repo.search("acme", limit=1, cursor="bad")
+
+    def test_matches_past_the_ranked_window_follow_by_id(self) -> None:
+        self.repo.create(
+            title="Acme pilot",
+            company_id=CompanyModel.objects.get().id,
+            value=Decimal(1),
+            tags=None,
+            distributor_id=None,
+        )
+        with patch("infra.db.deals.search.MAX_RANKED_MATCHES", 1):
+            titles = []
+            cursor = None
+            while True:
+                page = self.repo.search("acme", limit=1, cursor=cursor)
+                titles += [deal.title for deal in page.deals]
+                if (cursor := page.next_cursor) is None:
+                    break
+
+        self.assertEqual(titles, ["Acme pilot", "Acme renewal", "Acme Acme expansion"])
+
+    def test_fallback_without_full_text_index(self) -> None:
+        with patch.object(DealTitleSearch, "uses_fts", return_value=False):
+            first = self.repo.search("renewal", limit=1)
+            assert first.next_cursor is not None
+            second = self.repo.search("renewal", limit=1, cursor=first.next_cursor)
+
+        self.assertEqual(
+            [deal.title for deal in first.deals + second.deals],
+            ["Acme renewal", "Globex renewal"],
+        )
+
+    def test_rebuild_indexes_existing_titles(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO core_deal_title_fts(core_deal_title_fts) "
+                "VALUES ('delete-all')"
+            )
+            self.assertEqual(self._titles("acme"), [])
+            cursor.execute(title_fts_migration.REBUILD_INDEX)
+        self.assertEqual(len(self._titles("acme")), 2)
+
+    def test_fts_query_quotes_terms(self) -> None:
+        self.assertEqual(fts_query(["acme", 'a"b', "x"]), '"acme"* "a""b"* "x"')
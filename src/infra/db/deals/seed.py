@@ -0,0 +1,264 @@
+import itertools
+import math
+import os
+import random
+import tempfile
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+
+import django
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Max, Model
+
+from core.models import CompanyModel, DealModel, DistributorModel, TagModel
+from infra.db.deals.stats import DealStatsTable
+
+# Deals generated and inserted per transaction.
+SEED_BATCH_SIZE = 5000
+
+TITLE_WORDS = (
+    "annual",
+    "cloud",
+    "enterprise",
+    "hardware",
+    "license",
+    "maintenance",
+    "renewal",
+    "services",
+    "support",
+    "upgrade",
+)
+
+# Relative frequency of deals with 0, 1, 2... tags: most have one or two,
+# a long tail has many.
+TAG_COUNT_WEIGHTS = (20, 35, 25, 10, 5, 3, 1, 1)
+
+
+@dataclass(frozen=True)
+class DealDataset:
+    """Shape of a synthetic deal dataset.
+
+    Companies, distributors and tags are numbered from 1 by decreasing
+    popularity, which follows Zipf's law with exponent `skew`: the first
+    company has about twice the deals of the second, three times those of the
+    third... Deal values are log-normal, around 5000.
+    """
+
+    deals: int
+    companies: int
+    distributors: int
+    tags: int
+    seed: int = 0
+    skew: float = 1.1
+    # Share of deals without distributor.
+    no_distributor: float = 0.2
+
+    @classmethod
+    def for_size(cls, deals: int, seed: int = 0, skew: float = 1.1) -> "DealDataset":
+        """Return a dataset of `deals` deals with proportionate reference data."""
+        return cls(
+            deals=deals,
+            companies=max(deals // 100, 10),
+            distributors=max(deals // 1000, 5),
+            tags=max(min(deals // 1000, 500), 50),
+            seed=seed,
+            skew=skew,
+        )
+
+
+def seed_deals(
+    deals: int | DealDataset,
+    seed: int = 0,
+    workers: int = 1,
+    batch_size: int = SEED_BATCH_SIZE,
+    using: str = DEFAULT_DB_ALIAS,
+) -> int:
+    """Add a synthetic dataset to a database, returning the deals added.
+
+    Missing companies, distributors and tags are created; deals are numbered
+    after the existing ones. Each batch of deals is generated from the seed
+    and its position only, so a dataset is the same whatever the number of
+    workers. The deal stats are rebuilt at the end.
+
+    SQLite runs one write transaction at a time, while most of the time of a
+    batch goes into building its rows and statements. With several workers,
+    each batch is therefore written to a staging file of its own, which is
+    then copied into the database by a single statement.
+
+    Args:
+        deals: Number of deals, or the full shape of the dataset
+        seed: Seed of the generated data, when `deals` is a number
+        workers: Processes generating and inserting batches
+        batch_size: Deals per transaction
+        using: Alias of the database to fill
+    """
+    dataset = (
+        deals if isinstance(deals, DealDataset) else DealDataset.for_size(deals, seed)
+    )
+    _create_references(dataset, using)
+
+    first_id = (
+        DealModel._default_manager.using(using).aggregate(last=Max("id"))["last"] or 0
+    ) + 1
+    batches = [
+        (dataset, index, first_id + start, min(batch_size, dataset.deals - start), using)
+        for index, start in enumerate(range(0, dataset.deals, batch_size))
+    ]
+    if workers > 1 and len(batches) > 1:
+        # Children must open their own connections rather than share ours.
+        connections.close_all()
+        with ProcessPoolExecutor(workers, initializer=django.setup) as pool:
+            if connections[using].vendor == "sqlite":
+                for path in pool.map(_stage_batch, *zip(*batches, strict=True)):
+                    _merge_staged(path, using)
+            else:
+                list(pool.map(_insert_batch, *zip(*batches, strict=True)))
+    else:
+        for batch in batches:
+            _insert_batch(*batch)
+
+    DealStatsTable(using=using).rebuild()
+    return dataset.deals
+
+
+def _create_references(dataset: DealDataset, using: str) -> None:
+    references: tuple[tuple[type[Model], int, str], ...] = (
+        (CompanyModel, dataset.companies, "Company {}"),
+        (DistributorModel, dataset.distributors, "Distributor {}"),
+        (TagModel, dataset.tags, "tag-{}"),
+    )
+    for model, count, name in references:
+        model._default_manager.using(using).bulk_create(
+            (model(id=index, name=name.format(index)) for index in range(1, count + 1)),
+            batch_size=SEED_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+
+def _zipf_weights(count: int, skew: float) -> list[float]:
+    return list(itertools.accumulate(1 / rank**skew for rank in range(1, count + 1)))
+
+
+def _insert_batch(
+    dataset: DealDataset, index: int, first_id: int, count: int, using: str
+) -> None:
+    deals, tag_links = zip(*_generate(dataset, index, first_id, count), strict=True)
+    # The stubs take the through model of `tags` for TagModel.
+    through: type[Model] = DealModel.tags.through
+    with transaction.atomic(using=using):
+        DealModel._default_manager.using(using).bulk_create(deals)
+        through._default_manager.using(using).bulk_create(
+            through(dealmodel_id=deal_id, tagmodel_id=tag_id)
+            for deal_id, tag_ids in zip(
+                range(first_id, first_id + count), tag_links, strict=True
+            )
+            for tag_id in tag_ids
+        )
+
+
+def _stage_batch(
+    dataset: DealDataset, index: int, first_id: int, count: int, using: str
+) -> Path:
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name IN (%s, %s)",
+            [DealModel._meta.db_table, DealModel.tags.through._meta.db_table],
+        )
+        tables = [sql for (sql,) in cursor.fetchall()]
+
+    handle, name = tempfile.mkstemp(prefix="seed-", suffix=".sqlite3")
+    os.close(handle)
+    database = connection.settings_dict["NAME"]
+    connection.close()
+    # This process only serves this batch: it can point the alias elsewhere.
+    connection.settings_dict["NAME"] = name
+    try:
+        with connection.cursor() as cursor:
+            # Referenced rows are only in the database being filled.
+            cursor.execute("PRAGMA foreign_keys = OFF")
+            for sql in tables:
+                cursor.execute(sql)
+        _insert_batch(dataset, index, first_id, count, using)
+    finally:
+        connection.close()
+        connection.settings_dict["NAME"] = database
+    return Path(name)
+
+
+def _merge_staged(path: Path, using: str) -> None:
+    connection = connections[using]
+    through = DealModel.tags.through
+    deal_columns = ", ".join(
+        connection.ops.quote_name(field.column)
+        for field in DealModel._meta.local_concrete_fields
+    )
+    tags = DealModel.tags.field
+    link_columns = ", ".join(
+        connection.ops.quote_name(column)
+        for column in (tags.m2m_column_name(), tags.m2m_reverse_name())
+    )
+    deal_table = connection.ops.quote_name(DealModel._meta.db_table)
+    link_table = connection.ops.quote_name(through._meta.db_table)
+
+    # Databases cannot be attached inside a transaction.
+    with connection.cursor() as cursor:
+        cursor.execute("ATTACH DATABASE %s AS staged", [str(path)])
+    try:
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {deal_table} ({deal_columns}) "  # noqa: S608
+                f"SELECT {deal_columns} FROM staged.{deal_table}"
+            )
+            cursor.execute(
+                f"INSERT INTO {link_table} ({link_columns}) "  # noqa: S608
+                f"SELECT {link_columns} FROM staged.{link_table}"
+            )
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("DETACH DATABASE staged")
+        path.unlink()
+
+
+def _generate(
+    dataset: DealDataset, index: int, first_id: int, count: int
+) -> Iterator[tuple[DealModel, set[int]]]:
+    # Not for security: reproducible fake data, seeded per batch.
+    rng = random.Random(dataset.seed * 1_000_003 + index)  # noqa: S311
+    companies = rng.choices(
+        range(1, dataset.companies + 1),
+        cum_weights=_zipf_weights(dataset.companies, dataset.skew),
+        k=count,
+    )
+    distributors = rng.choices(
+        range(1, dataset.distributors + 1),
+        cum_weights=_zipf_weights(dataset.distributors, dataset.skew),
+        k=count,
+    )
+    tag_weights = _zipf_weights(dataset.tags, dataset.skew)
+    tag_counts = rng.choices(
+        range(len(TAG_COUNT_WEIGHTS)), weights=TAG_COUNT_WEIGHTS, k=count
+    )
+    tag_ids = range(1, dataset.tags + 1)
+
+    for offset in range(count):
+        deal_id = first_id + offset
+        value = min(round(rng.lognormvariate(math.log(5000), 1.5), 2), 99_999_999.99)
+        yield (
+            DealModel(
+                id=deal_id,
+                title=" ".join(rng.sample(TITLE_WORDS, 3)) + f" {deal_id}",
+                company_id=companies[offset],
+                distributor_id=(
+                    distributors[offset]
+                    if rng.random() >= dataset.no_distributor
+                    else None
+                ),
+                value=Decimal(f"{max(value, 0.01):.2f}"),
+            ),
+            # Popular tags are drawn more than once: deals get fewer distinct ones.
+            set(rng.choices(tag_ids, cum_weights=tag_weights, k=tag_counts[offset])),
+        )
@@ -0,0 +1,72 @@
+from collections import Counter
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from core.models import CompanyModel, DealModel, DealStatsModel, TagModel
+from infra.db.deals.seed import DealDataset, seed_deals
+
+
+class SeedDealsTest(TestCase):
+    def _dump(self) -> list[tuple[object, ...]]:
+        return [
+            (
+                deal.id,
+                deal.title,
+                deal.company_id,
+                deal.distributor_id,
+                deal.value,
+                sorted(tag.id for tag in deal.tags.all()),
+            )
+            for deal in DealModel.objects.prefetch_related("tags").order_by("id")
+        ]
+
+    def test_same_seed_same_data(self) -> None:
+        dataset = DealDataset(deals=300, companies=20, distributors=5, tags=10, seed=3)
+        self.assertEqual(seed_deals(dataset, batch_size=70), 300)
+        first = self._dump()
+
+        DealModel.objects.all().delete()
+        seed_deals(dataset, batch_size=70)
+        self.assertEqual(self._dump(), first)
+
+        DealModel.objects.all().delete()
+        seed_deals(DealDataset(deals=300, companies=20, distributors=5, tags=10, seed=4))
+        self.assertNotEqual(self._dump(), first)
+
+    def test_distributions_are_skewed(self) -> None:
+        seed_deals(DealDataset(deals=2000, companies=50, distributors=10, tags=20))
+
+        per_company = Counter(DealModel.objects.values_list("company_id", flat=True))
+        self.assertGreater(per_company[1], 5 * per_company[10])
+        no_distributor = DealModel.objects.filter(distributor__isnull=True).count()
+        self.assertAlmostEqual(no_distributor / 2000, 0.2, delta=0.05)
+        # One row per tag of each tagged deal.
+        tag_counts = Counter(
+            DealModel.objects.filter(tags__isnull=False).values_list("id", flat=True)
+        )
+        self.assertGreater(len(set(tag_counts.values())), 3)
+
+    def test_appends_after_existing_deals(self) -> None:
+        seed_deals(100)
+        seed_deals(100)
+
+        self.assertEqual(DealModel.objects.count(), 200)
+        self.assertEqual(CompanyModel.objects.count(), 10)
+        self.assertEqual(TagModel.objects.count(), 50)
+        self.assertEqual(
+            DealStatsModel.objects.filter(dimension="company").count(),
+            len(set(DealModel.objects.values_list("company_id", flat=True))),
+        )
+
+    def test_command(self) -> None:
+        out = StringIO()
+        call_command(
+            "seed_deals", 150, "--companies", "3", "--batch-size", "40", stdout=out
+        )
+        self.assertIn("Added 150 deals of 3 companies", out.getvalue())
+        self.assertEqual(DealModel.objects.count(), 150)
+
+        with self.assertRaisesMessage(CommandError, "in-memory"):
+            call_command("seed_deals", 150, "--workers", "2")
@@ -0,0 +1,492 @@
+import heapq
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import ExitStack
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from django.db.models import Case, Value, When
+
+from core.models import CompanyModel, DealModel, DistributorModel, TagModel
+from domain.deals.entity import DealEntity, NewDeal
+from domain.deals.events import DealEventType, EventPublisher
+from domain.deals.filters import DealFilters
+from domain.deals.pagination import DealOrdering, DealPage, encode_cursor
+from domain.deals.repository import DealRepository, InvalidDealReferencesError
+from domain.deals.search import search_terms
+from domain.deals.stats import DealStats, StatsDimension
+from infra.db.deals.db_repository import DealRepositoryDB
+from infra.db.deals.outbox import DealOutbox
+from infra.db.deals.shards import ShardIdAllocator, ShardMap
+from infra.db.deals.stats import StatsChanges
+from infra.db.lookups import ID_LOOKUP_BATCH_SIZE
+
+# Rows whose timestamps are restored per UPDATE when moving a company.
+TIMESTAMP_BATCH_SIZE = 100
+
+
+class ShardEventPublisher(EventPublisher):
+    """Publishes the events of a shard's writes once that shard commits."""
+
+    def __init__(self, publisher: EventPublisher, using: str) -> None:
+        """Initialize with the publisher to defer and the shard's database."""
+        self.publisher = publisher
+        self.using = using
+
+    def publish(self, event_type: DealEventType, deal_ids: list[int]) -> None:
+        """Publish the events once the shard's transaction commits."""
+        transaction.on_commit(
+            lambda: self.publisher.publish(event_type, deal_ids), using=self.using
+        )
+
+
+class ShardedDealRepository(DealRepository):
+    """DealRepository spreading deals over databases by company.
+
+    Writes and the reads of one company go to the shard of the company. Reads
+    by deal ID try the shard that allocated the ID first. Other reads query
+    every shard and merge their results in order, paginating them with the
+    same cursors as a single database. Bulk creations spanning shards commit
+    one shard after the other: a failing commit leaves the others committed.
+    """
+
+    def __init__(self, shard_map: ShardMap, events: EventPublisher | None = None) -> None:
+        """Initialize with a repository per shard.
+
+        Args:
+            shard_map: Shards of the deals
+            events: Publisher of the events of writes. Defaults to the
+                transactional outbox of each shard.
+        """
+        self.shard_map = shard_map
+        outboxes = {outbox.using: outbox for outbox in shard_map.outboxes()}
+        self.shards = {
+            alias: DealRepositoryDB(
+                events=(
+                    outboxes[alias]
+                    if events is None or isinstance(events, DealOutbox)
+                    else ShardEventPublisher(events, alias)
+                ),
+                using=alias,
+                ids=ShardIdAllocator(shard_map, alias),
+            )
+            for alias in shard_map.databases
+        }
+
+    @classmethod
+    def from_settings(cls, events: EventPublisher | None = None) -> DealRepository:
+        """Build the repository configured by `DEALS_SHARDS`.
+
+        With a single shard, it is a plain `DealRepositoryDB`.
+        """
+        shard_map = ShardMap.from_settings()
+        if len(shard_map.databases) == 1:
+            (alias,) = shard_map.databases
+            return DealRepositoryDB(
+                events=events, using=None if alias == DEFAULT_DB_ALIAS else alias
+            )
+        return cls(shard_map, events)
+
+    def create(
+        self,
+        title: str,
+        company_id: int,
+        value: Decimal,
+        tags: list[int] | None,
+        distributor_id: int | None,
+    ) -> DealEntity:
+        """Create a new deal in the shard of its company.
+
+        Retried if the company moved to another shard before the transaction
+        of its shard started.
+        """
+        while True:
+            alias = self.shard_map.for_company(company_id)
+            with transaction.atomic(using=alias):
+                if self._holds_companies(alias, [company_id]):
+                    return self.shards[alias].create(
+                        title=title,
+                        company_id=company_id,
+                        value=value,
+                        tags=tags,
+                        distributor_id=distributor_id,
+                    )
+
+    def bulk_create(self, deals: list[NewDeal]) -> list[DealEntity]:
+        """Create many deals, in one transaction per shard.
+
+        Raises:
+            InvalidDealReferencesError: With the errors of every shard, keyed by
+                position in `deals`, in which case no deal is created
+        """
+        while True:
+            positions: dict[str, list[int]] = {}
+            shards = self.shard_map.for_companies(deal.company_id for deal in deals)
+            for index, deal in enumerate(deals):
+                positions.setdefault(shards[deal.company_id], []).append(index)
+
+            with ExitStack() as transactions:
+                for alias in sorted(positions):
+                    transactions.enter_context(transaction.atomic(using=alias))
+                if all(
+                    self._holds_companies(
+                        alias, [deals[index].company_id for index in indexes]
+                    )
+                    for alias, indexes in positions.items()
+                ):
+                    return self._bulk_create_in_shards(deals, positions)
+
+    def _bulk_create_in_shards(
+        self, deals: list[NewDeal], positions: dict[str, list[int]]
+    ) -> list[DealEntity]:
+        """Create deals in the shards of their positions, in their transactions."""
+        entities: list[DealEntity | None] = [None] * len(deals)
+        errors: dict[int, dict[str, list[str]]] = {}
+        for alias, indexes in sorted(positions.items()):
+            try:
+                created = self.shards[alias].bulk_create(
+                    [deals[index] for index in indexes]
+                )
+            except InvalidDealReferencesError as exc:
+                errors.update(
+                    (indexes[index], deal_errors)
+                    for index, deal_errors in exc.errors.items()
+                )
+                continue
+            for index, entity in zip(indexes, created, strict=True):
+                entities[index] = entity
+        if errors:
+            raise InvalidDealReferencesError(dict(sorted(errors.items())))
+        return [entity for entity in entities if entity is not None]
+
+    def get_one(
+        self, deal_id: int, min_version: datetime | None = None
+    ) -> DealEntity | None:
+        """Retrieve a deal by its ID, always current: shards cache nothing."""
+        for alias in self.shard_map.candidates(deal_id):
+            entity = self.shards[alias].get_one(deal_id)
+            if entity is not None:
+                return entity
+        return None
+
+    def get_all(self) -> list[DealEntity]:
+        """Retrieve all deals, ordered by ID."""
+        return sorted(
+            (entity for shard in self.shards.values() for entity in shard.get_all()),
+            key=lambda entity: entity.id,
+        )
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[DealEntity]:
+        """Iterate over all deals ordered by ID, merging the shards' iterators."""
+        return heapq.merge(
+            *(shard.iter_all(batch_size=batch_size) for shard in self.shards.values()),
+            key=lambda entity: entity.id,
+        )
+
+    def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> DealPage:
+        """Retrieve a page of deals, merging the pages of the shards.
+
+        The deals of a single company are paginated by its shard alone.
+        """
+        if filters is not None and filters.company_id is not None:
+            return self.shards[self.shard_map.for_company(filters.company_id)].get_page(
+                limit=limit, cursor=cursor, ordering=ordering, filters=filters
+            )
+
+        field = ordering.lstrip("-")
+        pages = [
+            shard.get_page(limit=limit, cursor=cursor, ordering=ordering, filters=filters)
+            for shard in self.shards.values()
+        ]
+
+        def sort_key(entity: DealEntity) -> tuple[Any, int]:
+            return (getattr(entity, field), entity.id)
+
+        merged = self._unique(
+            heapq.merge(
+                *(page.deals for page in pages),
+                key=sort_key,
+                reverse=ordering.startswith("-"),
+            )
+        )
+        deals = merged[:limit]
+        next_cursor = None
+        if deals and (len(merged) > limit or any(page.next_cursor for page in pages)):
+            last = deals[-1]
+            next_cursor = encode_cursor(
+                ordering,
+                DealRepositoryDB.keyset_values(
+                    field,
+                    {"id": last.id, "updated_at": last.updated_at, "value": last.value},
+                ),
+            )
+        return DealPage(deals=deals, next_cursor=next_cursor)
+
+    def get_version(self, deal_id: int) -> datetime | None:
+        """Return when a deal was last updated."""
+        for alias in self.shard_map.candidates(deal_id):
+            version = self.shards[alias].get_version(deal_id)
+            if version is not None:
+                return version
+        return None
+
+    def get_page_versions(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> list[tuple[int, datetime]]:
+        """Return the (id, updated_at) pairs of a page, plus the first row after it.
+
+        Built from a merged page of deals, as the shards' pairs lack the values
+        some orderings merge on.
+        """
+        page = self.get_page(limit + 1, cursor=cursor, ordering=ordering, filters=filters)
+        return [
+            (entity.id, entity.updated_at)
+            for entity in page.deals
+            if entity.updated_at is not None
+        ]
+
+    def search(self, query: str, limit: int, cursor: str | None = None) -> DealPage:
+        """Search deals by title in every shard, merging the matches by rank.
+
+        Scores are computed by each shard, so ranks across shards are only
+        comparable when the shards hold similar titles.
+        """
+        terms = search_terms(query)
+        merged = heapq.merge(
+            *(
+                [
+                    (keys, deal_id, alias)
+                    for deal_id, keys in shard.title_search.matches(
+                        terms, limit + 1, cursor
+                    )
+                ]
+                for alias, shard in self.shards.items()
+            ),
+            key=lambda match: match[0],
+        )
+        matches = []
+        seen: set[int] = set()
+        for match in merged:
+            if match[1] not in seen:
+                seen.add(match[1])
+                matches.append(match)
+            if len(matches) > limit:
+                break
+
+        next_cursor = None
+        if len(matches) > limit:
+            matches = matches[:limit]
+            next_cursor = encode_cursor("search", matches[-1][0])
+
+        entities: dict[int, DealEntity] = {}
+        for alias, shard in self.shards.items():
+            deal_ids = [
+                deal_id for _, deal_id, shard_alias in matches if shard_alias == alias
+            ]
+            if deal_ids:
+                entities.update(
+                    (entity.id, entity) for entity in shard._ranked_entities(deal_ids)
+                )
+        return DealPage(
+            deals=[entities[deal_id] for _, deal_id, _ in matches if deal_id in entities],
+            next_cursor=next_cursor,
+        )
+
+    def get_stats(
+        self, dimension: StatsDimension, group_ids: list[int]
+    ) -> list[DealStats]:
+        """Return the deal count and value sum of groups, summed over the shards."""
+        totals: dict[int, tuple[int, Decimal]] = {}
+        for shard in self.shards.values():
+            for stats in shard.get_stats(dimension, group_ids):
+                count, value_sum = totals.get(stats.group_id, (0, Decimal(0)))
+                totals[stats.group_id] = (
+                    count + stats.deal_count,
+                    value_sum + stats.value_sum,
+                )
+        return [
+            DealStats(
+                dimension=dimension,
+                group_id=group_id,
+                deal_count=totals[group_id][0],
+                value_sum=totals[group_id][1],
+            )
+            for group_id in group_ids
+        ]
+
+    def update(
+        self,
+        deal_id: int,
+        title: str | None,
+        distributor_id: int | None,
+        tags: list[int] | None,
+        value: Decimal | None,
+    ) -> DealEntity | None:
+        """Update an existing deal in the shard holding it."""
+        alias = self._locate(deal_id) or self.shard_map.candidates(deal_id)[0]
+        return self.shards[alias].update(
+            deal_id=deal_id,
+            title=title,
+            distributor_id=distributor_id,
+            tags=tags,
+            value=value,
+        )
+
+    def delete(self, deal_id: int) -> bool:
+        """Delete a deal by its ID from the shard holding it."""
+        alias = self._locate(deal_id)
+        return alias is not None and self.shards[alias].delete(deal_id)
+
+    def move_company(self, company_id: int, database: str) -> int:
+        """Move the deals of a company to another shard, returning how many moved.
+
+        The deals keep their IDs and timestamps. The company, distributors and
+        tags they reference are copied to the target shard if missing there.
+        The deals are read and deleted in one transaction of the source shard,
+        holding the company's row, so creations for the company wait for the
+        move to finish, then go to the target shard. No event is published:
+        the deals do not change.
+
+        Raises:
+            ValueError: If the target is not a shard
+        """
+        if database not in self.shards:
+            raise ValueError(f"{database!r} is not a deal shard.")
+        source = self.shard_map.for_company(company_id)
+        if source == database:
+            return 0
+        source_shard, target_shard = self.shards[source], self.shards[database]
+
+        with transaction.atomic(using=source):
+            self._holds_companies(source, [company_id])
+            rows = list(
+                source_shard.deal_manager.select_for_update()
+                .filter(company_id=company_id)
+                .order_by("id")
+                .values()
+            )
+            tag_links = list(
+                source_shard.deal_tags_manager.filter(
+                    dealmodel__company_id=company_id
+                ).values_list("dealmodel_id", "tagmodel_id")
+            )
+            tags_by_deal: dict[int, list[int]] = {}
+            for deal_id, tag_id in tag_links:
+                tags_by_deal.setdefault(deal_id, []).append(tag_id)
+            added, removed = StatsChanges(), StatsChanges()
+            for row in rows:
+                for changes, sign in ((added, 1), (removed, -1)):
+                    changes.add_deal(
+                        row["company_id"],
+                        row["distributor_id"],
+                        tags_by_deal.get(row["id"], []),
+                        row["value"],
+                        sign=sign,
+                    )
+
+            with transaction.atomic(using=database):
+                self._copy_missing(CompanyModel, {company_id}, source, database)
+                self._copy_missing(
+                    DistributorModel,
+                    {row["distributor_id"] for row in rows if row["distributor_id"]},
+                    source,
+                    database,
+                )
+                self._copy_missing(
+                    TagModel, {tag_id for _, tag_id in tag_links}, source, database
+                )
+                self._insert(target_shard.deal_manager, DealModel, rows)
+                target_shard.deal_tags_manager.bulk_create(
+                    target_shard.deal_tags_manager.model(
+                        dealmodel_id=deal_id, tagmodel_id=tag_id
+                    )
+                    for deal_id, tag_id in tag_links
+                )
+                target_shard.stats.apply(added)
+
+            self.shard_map.override_manager.update_or_create(
+                company_id=company_id, defaults={"database": database}
+            )
+            source_shard.deal_manager.filter(company_id=company_id).delete()
+            source_shard.stats.apply(removed)
+        return len(rows)
+
+    def _holds_companies(self, alias: str, company_ids: list[int]) -> bool:
+        """Lock the rows of companies in a shard, and check their deals live there.
+
+        Must be called in a transaction of the shard. The lock makes moves of
+        the companies and writes of their deals wait for each other: on SQLite,
+        whose transactions take the write lock as they begin, it changes
+        nothing.
+        """
+        list(
+            CompanyModel._default_manager.db_manager(alias)
+            .select_for_update()
+            .filter(id__in=company_ids)
+            .values_list("id", flat=True)
+        )
+        shards = self.shard_map.for_companies(company_ids)
+        return all(shard == alias for shard in shards.values())
+
+    def _locate(self, deal_id: int) -> str | None:
+        """Return the shard holding a deal, if any."""
+        for alias in self.shard_map.candidates(deal_id):
+            if self.shards[alias].get_version(deal_id) is not None:
+                return alias
+        return None
+
+    @staticmethod
+    def _unique(entities: Iterator[DealEntity]) -> list[DealEntity]:
+        """Drop the deals seen already, found in two shards during a move."""
+        seen: set[int] = set()
+        unique = []
+        for entity in entities:
+            if entity.id not in seen:
+                seen.add(entity.id)
+                unique.append(entity)
+        return unique
+
+    def _copy_missing(
+        self, model: type[models.Model], ids: set[int], source: str, target: str
+    ) -> None:
+        """Copy the rows of a model missing from the target shard."""
+        target_manager = model._default_manager.db_manager(target)
+        missing = sorted(ids - DealRepositoryDB._existing_ids(target_manager, ids))
+        for start in range(0, len(missing), ID_LOOKUP_BATCH_SIZE):
+            rows = list(
+                model._default_manager.db_manager(source)
+                .filter(id__in=missing[start : start + ID_LOOKUP_BATCH_SIZE])
+                .values()
+            )
+            self._insert(target_manager, model, rows)
+
+    @staticmethod
+    def _insert(
+        manager: "models.Manager[Any]",
+        model: type[models.Model],
+        rows: Sequence[Mapping[str, Any]],
+    ) -> None:
+        """Insert rows as they are, restoring the timestamps set on insert."""
+        manager.bulk_create(model(**row) for row in rows)
+        for start in range(0, len(rows), TIMESTAMP_BATCH_SIZE):
+            batch = rows[start : start + TIMESTAMP_BATCH_SIZE]
+            manager.filter(id__in=[row["id"] for row in batch]).update(
+                **{
+                    field: Case(
+                        *(When(id=row["id"], then=Value(row[field])) for row in batch),
+                        output_field=models.DateTimeField(),
+                    )
+                    for field in ("created_at", "updated_at")
+                }
+            )
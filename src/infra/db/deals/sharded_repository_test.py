@@ -0,0 +1,237 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import (
+    CompanyModel,
+    CompanyShardModel,
+    DealEventModel,
+    DealModel,
+    TagModel,
+)
+from domain.deals.entity import NewDeal
+from domain.deals.events import DealEvent
+from domain.deals.repository import InvalidDealReferencesError
+from infra.db.deals.db_repository import DealRepositoryDB
+from infra.db.deals.sharded_repository import ShardedDealRepository
+from infra.db.deals.shards import ShardMap
+
+SHARDS = {"default": 0, "shard": 1}
+
+
+class ShardedDealRepositoryTest(TestCase):
+    databases = {"default", "shard"}
+
+    def setUp(self) -> None:
+        self.shard_map = ShardMap(SHARDS, directory="default", stride=1024)
+        self.repo = ShardedDealRepository(self.shard_map)
+        # The first company hashing to each shard.
+        self.companies: dict[str, int] = {}
+        company_id = 1
+        while len(self.companies) < len(SHARDS):
+            self.companies.setdefault(self.shard_map.hashed(company_id), company_id)
+            company_id += 1
+        # Reference data is present in every shard.
+        for alias in SHARDS:
+            for name, company_id in self.companies.items():
+                CompanyModel.objects.using(alias).create(id=company_id, name=name)
+            TagModel.objects.using(alias).create(id=1, name="tag")
+
+    def _create(self, alias: str, value: str, title: str = "Deal") -> int:
+        return self.repo.create(
+            title=title,
+            company_id=self.companies[alias],
+            value=Decimal(value),
+            tags=[1],
+            distributor_id=None,
+        ).id
+
+    def test_create_goes_to_the_company_shard(self) -> None:
+        for alias, number in SHARDS.items():
+            deal_id = self._create(alias, "10.00")
+            self.assertEqual(deal_id % 1024, number)
+            self.assertTrue(DealModel.objects.using(alias).filter(id=deal_id).exists())
+            self.assertEqual(
+                list(
+                    DealEventModel.objects.using(alias).values_list("deal_id", flat=True)
+                ),
+                [deal_id],
+            )
+
+    def test_ids_start_past_existing_deals(self) -> None:
+        legacy = DealRepositoryDB().create(
+            title="Before sharding",
+            company_id=self.companies["shard"],
+            value=Decimal("1.00"),
+            tags=None,
+            distributor_id=None,
+        )
+        DealModel.objects.filter(id=legacy.id).update(id=5000)
+
+        deal_ids = [self._create("shard", "1.00"), self._create("shard", "1.00")]
+        self.assertEqual(deal_ids, [5 * 1024 + 1, 6 * 1024 + 1])
+
+    def test_reads_and_writes_find_the_deal(self) -> None:
+        deal_id = self._create("shard", "10.00")
+
+        found = self.repo.get_one(deal_id)
+        assert found is not None
+        self.assertEqual(found.company_id, self.companies["shard"])
+        self.assertIsNotNone(self.repo.get_version(deal_id))
+
+        updated = self.repo.update(
+            deal_id=deal_id, title="New", distributor_id=None, tags=None, value=None
+        )
+        assert updated is not None
+        self.assertEqual(DealModel.objects.using("shard").get(id=deal_id).title, "New")
+
+        self.assertTrue(self.repo.delete(deal_id))
+        self.assertIsNone(self.repo.get_one(deal_id))
+        self.assertFalse(self.repo.delete(deal_id))
+
+    def test_pages_merge_the_shards(self) -> None:
+        values = {"default": ["5.00", "30.00", "20.00"], "shard": ["10.00", "40.00"]}
+        for alias, alias_values in values.items():
+            for value in alias_values:
+                self._create(alias, value)
+        expected = sorted((deal.value, deal.id) for deal in self.repo.get_all())
+
+        for ordering in ("value", "-value"):
+            with self.subTest(ordering=ordering):
+                seen: list[tuple[Decimal, int]] = []
+                cursor = None
+                while True:
+                    page = self.repo.get_page(limit=2, cursor=cursor, ordering=ordering)
+                    seen.extend((deal.value, deal.id) for deal in page.deals)
+                    cursor = page.next_cursor
+                    if cursor is None:
+                        break
+                self.assertEqual(
+                    seen, expected if ordering == "value" else expected[::-1]
+                )
+
+        self.assertEqual(
+            [deal.id for deal in self.repo.iter_all(batch_size=2)],
+            sorted(deal_id for _, deal_id in expected),
+        )
+        versions = self.repo.get_page_versions(limit=2, ordering="-value")
+        self.assertEqual(
+            [deal_id for deal_id, _ in versions],
+            [deal_id for _, deal_id in expected[::-1][:3]],
+        )
+
+    def test_search_merges_the_shards(self) -> None:
+        self._create("default", "1.00", title="Blue whale")
+        self._create("shard", "1.00", title="Blue moon")
+        self._create("shard", "1.00", title="Red moon")
+
+        first = self.repo.search("blue", limit=1)
+        assert first.next_cursor is not None
+        second = self.repo.search("blue", limit=1, cursor=first.next_cursor)
+        self.assertEqual(
+            sorted(deal.title for deal in first.deals + second.deals),
+            ["Blue moon", "Blue whale"],
+        )
+        self.assertIsNone(second.next_cursor)
+
+    def test_bulk_create_errors_by_position(self) -> None:
+        deals = [
+            NewDeal(title="A", company_id=self.companies["default"], value=Decimal(1)),
+            NewDeal(title="B", company_id=self.companies["shard"], value=Decimal(1)),
+            NewDeal(
+                title="C",
+                company_id=self.companies["shard"],
+                value=Decimal(1),
+                tags=[99],
+            ),
+        ]
+        with self.assertRaises(InvalidDealReferencesError) as raised:
+            self.repo.bulk_create(deals)
+        self.assertEqual(list(raised.exception.errors), [2])
+        self.assertFalse(DealModel.objects.using("default").exists())
+        self.assertFalse(DealModel.objects.using("shard").exists())
+
+        created = self.repo.bulk_create(deals[:2])
+        self.assertEqual([deal.title for deal in created], ["A", "B"])
+        self.assertEqual([deal.id % 1024 for deal in created], [0, 1])
+
+    def test_stats_sum_the_shards(self) -> None:
+        self._create("default", "10.00")
+        self._create("shard", "5.00")
+
+        (stats,) = self.repo.get_stats("tag", [1])
+        self.assertEqual((stats.deal_count, stats.value_sum), (2, Decimal("15.00")))
+
+    def test_move_company(self) -> None:
+        company_id = self.companies["default"]
+        deal_id = self._create("default", "10.00")
+        updated_at = timezone.now() - timedelta(days=1)
+        DealModel.objects.filter(id=deal_id).update(updated_at=updated_at)
+        CompanyModel.objects.using("shard").filter(id=company_id).delete()
+
+        self.assertEqual(self.repo.move_company(company_id, "shard"), 1)
+        self.assertEqual(self.repo.move_company(company_id, "shard"), 0)
+
+        self.assertFalse(DealModel.objects.using("default").exists())
+        moved = DealModel.objects.using("shard").get(id=deal_id)
+        self.assertEqual(moved.updated_at, updated_at)
+        self.assertEqual(list(moved.tags.values_list("id", flat=True)), [1])
+        self.assertTrue(
+            CompanyModel.objects.using("shard").filter(id=company_id).exists()
+        )
+        self.assertEqual(
+            CompanyShardModel.objects.get(company_id=company_id).database, "shard"
+        )
+        self.assertEqual(self.repo.shard_map.for_company(company_id), "shard")
+
+        (stats,) = self.repo.get_stats("company", [company_id])
+        self.assertEqual((stats.deal_count, stats.value_sum), (1, Decimal("10.00")))
+        found = self.repo.get_one(deal_id)
+        assert found is not None
+        self.assertEqual(found.company_id, company_id)
+        self.assertEqual(self._create("default", "1.00") % 1024, 1)
+
+    def test_create_racing_a_move_goes_to_the_new_shard(self) -> None:
+        for_company = self.shard_map.for_company
+
+        def resolve_then_move(company_id: int) -> str:
+            # The company moves once its shard was resolved for the creation.
+            alias = for_company(company_id)
+            CompanyShardModel.objects.update_or_create(
+                company_id=company_id, defaults={"database": "shard"}
+            )
+            return alias
+
+        with patch.object(self.shard_map, "for_company", side_effect=resolve_then_move):
+            deal_id = self._create("default", "1.00")
+
+        self.assertFalse(DealModel.objects.using("default").exists())
+        self.assertTrue(DealModel.objects.using("shard").filter(id=deal_id).exists())
+
+    @override_settings(DEALS_SHARDS={"DATABASES": SHARDS})
+    def test_move_command(self) -> None:
+        company_id = self.companies["default"]
+        self._create("default", "10.00")
+
+        out = StringIO()
+        call_command("move_company_shard", company_id, "shard", "--dry-run", stdout=out)
+        self.assertIn("'default' with 1 deal(s)", out.getvalue())
+        self.assertTrue(DealModel.objects.using("default").exists())
+
+        call_command("move_company_shard", company_id, "shard", stdout=out)
+        self.assertIn("Moved 1 deal(s)", out.getvalue())
+        self.assertTrue(DealModel.objects.using("shard").exists())
+
+    def test_outbox_event_ids_are_distinct(self) -> None:
+        self._create("default", "1.00")
+        self._create("shard", "1.00")
+
+        published: list[DealEvent] = []
+        for outbox in self.shard_map.outboxes():
+            outbox.relay_all(published.extend, batch_size=10)
+        self.assertEqual(len({event.event_id for event in published}), 2)
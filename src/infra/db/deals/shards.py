@@ -0,0 +1,164 @@
+import hashlib
+from collections.abc import Iterable
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import F, Max
+
+from core.models import CompanyShardModel, DealIdSequenceModel, DealModel
+from infra.db.deals.outbox import DealOutbox
+from infra.db.lookups import ID_LOOKUP_BATCH_SIZE
+
+DEFAULT_SHARD_SETTINGS: dict[str, Any] = {
+    "DATABASES": {"default": 0},
+    "DIRECTORY": "default",
+    "ID_STRIDE": 1024,
+}
+
+
+def shard_settings() -> dict[str, Any]:
+    """Return `DEALS_SHARDS` completed with the defaults.
+
+    Raises:
+        ImproperlyConfigured: If a shard or the directory is not a database, or
+            shard numbers are not distinct and below the ID stride
+    """
+    config = {**DEFAULT_SHARD_SETTINGS, **getattr(settings, "DEALS_SHARDS", {})}
+    databases: dict[str, int] = config["DATABASES"]
+    for alias in [*databases, config["DIRECTORY"]]:
+        if alias not in settings.DATABASES:
+            raise ImproperlyConfigured(f"Deal shard database {alias!r} is not defined.")
+    numbers = list(databases.values())
+    if len(set(numbers)) != len(numbers) or not all(
+        0 <= number < config["ID_STRIDE"] for number in numbers
+    ):
+        raise ImproperlyConfigured(
+            "Deal shard numbers must be distinct and lower than the ID stride."
+        )
+    return config
+
+
+class ShardMap:
+    """Maps companies and deal IDs to the shards holding their deals.
+
+    A company's deals are in the shard its ID hashes to by rendezvous hashing,
+    so adding a shard only moves the companies hashing to it, unless the
+    directory database overrides it (see `CompanyShardModel`). A deal ID
+    allocated by a shard ends with its number in base `stride`, so deals are
+    looked up in that shard first.
+    """
+
+    def __init__(self, databases: dict[str, int], directory: str, stride: int) -> None:
+        """Initialize the map.
+
+        Args:
+            databases: Number of each shard by database alias, which must never
+                change once deals were created
+            directory: Alias of the database holding the overrides
+            stride: Base of the deal IDs, bounding the number of shards
+        """
+        self.databases = databases
+        self.directory = directory
+        self.stride = stride
+        self._by_number = {number: alias for alias, number in databases.items()}
+        self.override_manager = CompanyShardModel._default_manager.db_manager(directory)
+
+    @classmethod
+    def from_settings(cls) -> "ShardMap":
+        """Build the map configured by `DEALS_SHARDS`."""
+        config = shard_settings()
+        return cls(config["DATABASES"], config["DIRECTORY"], config["ID_STRIDE"])
+
+    def hashed(self, company_id: int) -> str:
+        """Return the shard a company hashes to."""
+        return max(
+            self.databases,
+            key=lambda alias: hashlib.blake2b(
+                f"{alias}:{company_id}".encode(), digest_size=8
+            ).digest(),
+        )
+
+    def for_company(self, company_id: int) -> str:
+        """Return the shard holding the deals of a company."""
+        return self.for_companies([company_id])[company_id]
+
+    def for_companies(self, company_ids: Iterable[int]) -> dict[int, str]:
+        """Return the shard of each company, looking overrides up in batches."""
+        ordered = sorted(set(company_ids))
+        overrides: dict[int, str] = {}
+        for start in range(0, len(ordered), ID_LOOKUP_BATCH_SIZE):
+            overrides.update(
+                self.override_manager.filter(
+                    company_id__in=ordered[start : start + ID_LOOKUP_BATCH_SIZE]
+                ).values_list("company_id", "database")
+            )
+        return {
+            company_id: (
+                overrides[company_id]
+                if overrides.get(company_id) in self.databases
+                else self.hashed(company_id)
+            )
+            for company_id in ordered
+        }
+
+    def candidates(self, deal_id: int) -> list[str]:
+        """Return the shards that may hold a deal, the one that allocated it first.
+
+        Deals moved with their company, or created before sharding, may be in
+        any shard.
+        """
+        home = self._by_number.get(deal_id % self.stride)
+        return sorted(self.databases, key=lambda alias: alias != home)
+
+    def outboxes(self) -> list[DealOutbox]:
+        """Return the event outbox of each shard, with distinct event IDs."""
+        if len(self.databases) == 1:
+            return [DealOutbox(using=next(iter(self.databases)))]
+        return [
+            DealOutbox(using=alias, event_id_stride=self.stride, event_id_offset=number)
+            for alias, number in self.databases.items()
+        ]
+
+
+class ShardIdAllocator:
+    """Allocates deal IDs unique across shards, from a sequence in each shard.
+
+    IDs of shard `n` are `value * stride + n`. A shard's sequence starts past
+    the largest deal ID of every shard, so IDs allocated by the database
+    before sharding are never reused. Must be called in a transaction of the
+    shard, which holds the sequence row until it commits.
+    """
+
+    def __init__(self, shard_map: ShardMap, database: str) -> None:
+        """Initialize the allocator of a shard."""
+        self.shard_map = shard_map
+        self.number = shard_map.databases[database]
+        self.sequence_manager = DealIdSequenceModel._default_manager.db_manager(database)
+
+    def allocate(self, count: int) -> list[int]:
+        """Return `count` unused deal IDs, in increasing order."""
+        sequence = self.sequence_manager.filter(shard=self.number)
+        if not sequence.update(last_value=F("last_value") + count):
+            self.sequence_manager.bulk_create(
+                [DealIdSequenceModel(shard=self.number, last_value=self._start())],
+                ignore_conflicts=True,
+            )
+            sequence.update(last_value=F("last_value") + count)
+
+        last_value = sequence.values_list("last_value", flat=True).get()
+        return [
+            value * self.shard_map.stride + self.number
+            for value in range(last_value - count + 1, last_value + 1)
+        ]
+
+    def _start(self) -> int:
+        """Return the sequence value below which IDs may be in use already."""
+        largest = [
+            DealModel._default_manager.db_manager(alias).aggregate(largest=Max("id"))[
+                "largest"
+            ]
+            or 0
+            for alias in self.shard_map.databases
+        ]
+        return max(largest) // self.shard_map.stride
@@ -0,0 +1,215 @@
+from collections.abc import Iterable
+from decimal import Decimal
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, Manager, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from core.models import DealModel, DealStatsModel
+from domain.deals.stats import DealStats, StatsDimension
+
+StatsKey = tuple[StatsDimension, int]
+
+# Groups changed per UPDATE statement, each binding about 8 parameters.
+STATS_UPDATE_BATCH_SIZE = 100
+
+
+class StatsChanges:
+    """Changes of the deal count and value sum of groups, summed per group."""
+
+    def __init__(self) -> None:
+        """Initialize with no changes."""
+        self.changes: dict[StatsKey, tuple[int, Decimal]] = {}
+
+    def add_deal(
+        self,
+        company_id: int,
+        distributor_id: int | None,
+        tag_ids: Iterable[int],
+        value: Decimal,
+        sign: int = 1,
+    ) -> None:
+        """Count a deal in its groups, or uncount it with a negative sign."""
+        keys: list[StatsKey] = [("company", company_id)]
+        if distributor_id is not None:
+            keys.append(("distributor", distributor_id))
+        keys.extend(("tag", tag_id) for tag_id in tag_ids)
+
+        for key in keys:
+            count, total = self.changes.get(key, (0, Decimal(0)))
+            self.changes[key] = (count + sign, total + sign * value)
+
+    def nonzero(self) -> dict[StatsKey, tuple[int, Decimal]]:
+        """Return the changes that don't cancel out, ordered by group."""
+        return {
+            key: change
+            for key, change in sorted(self.changes.items())
+            if change != (0, Decimal(0))
+        }
+
+
+class DealStatsTable:
+    """Deal count and value sum per company, distributor and tag.
+
+    The deal repository applies the changes of each write in its transaction,
+    so reading the stats of a group is one unique index lookup instead of an
+    aggregate over its deals. Deals deleted by cascade (with their company,
+    say) are not accounted for until the table is rebuilt.
+    """
+
+    def __init__(self, using: str | None = None) -> None:
+        """Initialize with the managers of the involved models.
+
+        Args:
+            using: Alias of the database holding the deals and their stats
+        """
+        self.using = using
+        self.stats_manager = DealStatsModel._default_manager.db_manager(using)
+        self.deal_manager = DealModel._default_manager.db_manager(using)
+        # The stubs take the through model of `tags` for TagModel.
+        self.deal_tags_manager: Manager[Any] = (
+            DealModel.tags.through._default_manager.db_manager(using)
+        )
+
+    def apply(self, changes: StatsChanges) -> None:
+        """Add the changes to the stored stats, creating missing groups.
+
+        Counters are incremented in place by the database, so concurrent writes
+        to the same group don't overwrite each other. Groups are locked in a
+        fixed order, avoiding deadlocks between concurrent writes.
+        """
+        pending = list(changes.nonzero().items())
+        if not pending:
+            return
+
+        self.stats_manager.bulk_create(
+            [
+                DealStatsModel(dimension=dimension, group_id=group_id)
+                for (dimension, group_id), _ in pending
+            ],
+            ignore_conflicts=True,
+        )
+        for start in range(0, len(pending), STATS_UPDATE_BATCH_SIZE):
+            batch = pending[start : start + STATS_UPDATE_BATCH_SIZE]
+            groups = [
+                Q(dimension=dimension, group_id=group_id)
+                for (dimension, group_id), _ in batch
+            ]
+            count_changes = [
+                When(groups[index], then=Value(count))
+                for index, (_, (count, _)) in enumerate(batch)
+            ]
+            value_changes = [
+                When(groups[index], then=Value(total))
+                for index, (_, (_, total)) in enumerate(batch)
+            ]
+            self.stats_manager.filter(Q(*groups, _connector=Q.OR)).update(
+                deal_count=F("deal_count") + Case(*count_changes, default=Value(0)),
+                value_sum=F("value_sum")
+                + Case(
+                    *value_changes,
+                    default=Value(Decimal(0)),
+                    output_field=DecimalField(max_digits=20, decimal_places=2),
+                ),
+            )
+
+    def get(self, dimension: StatsDimension, group_ids: list[int]) -> list[DealStats]:
+        """Return the stats of the groups, zero for groups without any."""
+        stored = {
+            group_id: (deal_count, value_sum)
+            for group_id, deal_count, value_sum in self.stats_manager.filter(
+                dimension=dimension, group_id__in=set(group_ids)
+            ).values_list("group_id", "deal_count", "value_sum")
+        }
+        return [
+            DealStats(
+                dimension=dimension,
+                group_id=group_id,
+                deal_count=stored.get(group_id, (0, 0))[0],
+                value_sum=stored.get(group_id, (0, Decimal(0)))[1],
+            )
+            for group_id in group_ids
+        ]
+
+    def compute(self) -> dict[StatsKey, tuple[int, Decimal]]:
+        """Aggregate the stats of every group from the deals themselves."""
+        value_sum = Coalesce(Sum("value"), Value(Decimal(0)))
+        computed: dict[StatsKey, tuple[int, Decimal]] = {}
+        for row in (
+            self.deal_manager.order_by()
+            .values("company_id")
+            .annotate(deal_count=Count("id"), value_sum=value_sum)
+        ):
+            computed["company", row["company_id"]] = (row["deal_count"], row["value_sum"])
+        for row in (
+            self.deal_manager.filter(distributor_id__isnull=False)
+            .order_by()
+            .values("distributor_id")
+            .annotate(deal_count=Count("id"), value_sum=value_sum)
+        ):
+            computed["distributor", row["distributor_id"]] = (
+                row["deal_count"],
+                row["value_sum"],
+            )
+        for row in (
+            self.deal_tags_manager.order_by()
+            .values("tagmodel_id")
+            .annotate(
+                deal_count=Count("dealmodel_id"),
+                value_sum=Coalesce(Sum("dealmodel__value"), Value(Decimal(0))),
+            )
+        ):
+            computed["tag", row["tagmodel_id"]] = (row["deal_count"], row["value_sum"])
+        return computed
+
+    def rebuild(self, dry_run: bool = False) -> int:
+        """Reconcile the stored stats with the deals, returning the fixed groups.
+
+        Only groups whose stats differ are written. Writes committed while the
+        deals are aggregated may be missed, so run it when writes are quiet.
+
+        Args:
+            dry_run: Only count the groups that differ, without fixing them
+        """
+        with transaction.atomic(using=self.using):
+            return self._rebuild(dry_run)
+
+    def _rebuild(self, dry_run: bool) -> int:
+        """Reconcile the stored stats with the deals, in the current transaction."""
+        computed = self.compute()
+        stored = {
+            (row["dimension"], row["group_id"]): (row["deal_count"], row["value_sum"])
+            for row in self.stats_manager.values(
+                "dimension", "group_id", "deal_count", "value_sum"
+            )
+        }
+
+        stale = [
+            key for key, stats in stored.items() if key not in computed and any(stats)
+        ]
+        changed = [key for key, stats in computed.items() if stored.get(key) != stats]
+        if dry_run:
+            return len(stale) + len(changed)
+
+        # Groups left without deals keep a zero row, as they do after deletes.
+        for dimension, group_id in stale:
+            self.stats_manager.filter(dimension=dimension, group_id=group_id).update(
+                deal_count=0, value_sum=Decimal(0)
+            )
+        self.stats_manager.bulk_create(
+            [
+                DealStatsModel(
+                    dimension=dimension,
+                    group_id=group_id,
+                    deal_count=computed[dimension, group_id][0],
+                    value_sum=computed[dimension, group_id][1],
+                )
+                for dimension, group_id in changed
+            ],
+            update_conflicts=True,
+            unique_fields=["dimension", "group_id"],
+            update_fields=["deal_count", "value_sum"],
+            batch_size=STATS_UPDATE_BATCH_SIZE,
+        )
+        return len(stale) + len(changed)
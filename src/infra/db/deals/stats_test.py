@@ -0,0 +1,134 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models import (
+    CompanyModel,
+    DealModel,
+    DealStatsModel,
+    DistributorModel,
+    TagModel,
+)
+from domain.deals.entity import NewDeal
+from domain.deals.stats import DealStats
+from infra.db.deals.db_repository import DealRepositoryDB
+from infra.db.deals.stats import DealStatsTable
+
+
+class DealStatsTableTest(TestCase):
+    def setUp(self) -> None:
+        self.repo = DealRepositoryDB()
+        self.table = DealStatsTable()
+        self.company = CompanyModel.objects.create(name="Company")
+        self.distributor = DistributorModel.objects.create(name="Distributor")
+        self.tag1 = TagModel.objects.create(name="tag1")
+        self.tag2 = TagModel.objects.create(name="tag2")
+
+    def _stored(self) -> dict[tuple[str, int], tuple[int, Decimal]]:
+        return {
+            key: stats
+            for key, stats in (
+                ((row.dimension, row.group_id), (row.deal_count, row.value_sum))
+                for row in DealStatsModel.objects.all()
+            )
+            if stats != (0, Decimal(0))
+        }
+
+    def test_writes_keep_the_stats_in_sync(self) -> None:
+        deal = self.repo.create(
+            title="One",
+            company_id=self.company.id,
+            value=Decimal("10.50"),
+            tags=[self.tag1.id],
+            distributor_id=None,
+        )
+        self.repo.bulk_create(
+            [
+                NewDeal(
+                    title=f"Bulk {index}",
+                    company_id=self.company.id,
+                    value=Decimal("2.25"),
+                    tags=[self.tag1.id, self.tag2.id],
+                    distributor_id=self.distributor.id,
+                )
+                for index in range(3)
+            ]
+        )
+        self.assertEqual(self._stored(), self.table.compute())
+        self.assertEqual(
+            self.repo.get_stats("company", [self.company.id]),
+            [
+                DealStats(
+                    dimension="company",
+                    group_id=self.company.id,
+                    deal_count=4,
+                    value_sum=Decimal("17.25"),
+                )
+            ],
+        )
+
+        self.repo.update(
+            deal_id=deal.id,
+            title=None,
+            distributor_id=self.distributor.id,
+            tags=[self.tag2.id],
+            value=Decimal("1.00"),
+        )
+        self.assertEqual(self._stored(), self.table.compute())
+
+        self.repo.delete(deal.id)
+        self.assertEqual(self._stored(), self.table.compute())
+        self.assertEqual(
+            [
+                (stats.deal_count, stats.value_sum)
+                for stats in self.repo.get_stats("tag", [self.tag1.id, self.tag2.id])
+            ],
+            [(3, Decimal("6.75")), (3, Decimal("6.75"))],
+        )
+
+    def test_get_returns_zero_for_unknown_groups(self) -> None:
+        with self.assertNumQueries(1):
+            stats = self.table.get("distributor", [self.distributor.id])
+        self.assertEqual(
+            stats, [DealStats(dimension="distributor", group_id=self.distributor.id)]
+        )
+
+    def test_rolled_back_writes_leave_the_stats_unchanged(self) -> None:
+        with self.assertRaises(ValueError):
+            self.repo.bulk_create(
+                [
+                    NewDeal(
+                        title="Invalid",
+                        company_id=self.company.id,
+                        value=Decimal(1),
+                        tags=[self.tag1.id + 1000],
+                        distributor_id=None,
+                    )
+                ]
+            )
+        self.assertFalse(DealStatsModel.objects.exists())
+
+    def test_rebuild_fixes_drift(self) -> None:
+        deal = self.repo.create(
+            title="One",
+            company_id=self.company.id,
+            value=Decimal("3.00"),
+            tags=[self.tag1.id],
+            distributor_id=self.distributor.id,
+        )
+        # Cascaded deletes and raw writes bypass the repository.
+        DealModel.objects.filter(id=deal.id).update(value=Decimal("5.00"))
+        DealStatsModel.objects.create(
+            dimension="tag", group_id=self.tag2.id, deal_count=1
+        )
+
+        out = StringIO()
+        call_command("rebuild_deal_stats", "--check", stdout=out)
+        self.assertIn("4 deal stats group(s) out of date.", out.getvalue())
+
+        call_command("rebuild_deal_stats", stdout=out)
+        self.assertIn("Fixed 4 deal stats group(s).", out.getvalue())
+        self.assertEqual(self._stored(), self.table.compute())
+        self.assertEqual(self.table.rebuild(), 0)
@@ -0,0 +1,32 @@
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import DealEventModel
+from infra.db.inserts import insert_rows
+
+
+class InsertRowsTest(TestCase):
+    def test_inserts_rows_of_the_given_fields(self) -> None:
+        now = timezone.now()
+        insert_rows(
+            DealEventModel,
+            ("event_type", "deal_id", "created_at"),
+            [
+                ("created", deal_id, connection.ops.adapt_datetimefield_value(now))
+                for deal_id in (1, 2)
+            ],
+        )
+        self.assertEqual(
+            list(
+                DealEventModel.objects.order_by("id").values_list(
+                    "event_type", "deal_id", "created_at", "sent_at"
+                )
+            ),
+            [("created", 1, now, None), ("created", 2, now, None)],
+        )
+
+    def test_without_rows(self) -> None:
+        with self.assertNumQueries(0):
+            insert_rows(DealEventModel, ("event_type", "deal_id", "created_at"), [])
+        self.assertFalse(DealEventModel.objects.exists())
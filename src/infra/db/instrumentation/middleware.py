@@ -0,0 +1,108 @@
+import logging
+from collections.abc import Callable
+from contextlib import ExitStack
+from typing import Any
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponseBase
+
+from infra.db.instrumentation.queries import (
+    QueryBudgetExceededError,
+    QueryRecorder,
+    sql_instrumentation_settings,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class QueryInstrumentationMiddleware:
+    """Count and time the SQL queries of each request, and enforce budgets.
+
+    The number of queries, their time and the repeated statements are sent in
+    a `Server-Timing` header and logged. A request running more queries than
+    the budget of its view is logged as a warning, or fails with
+    `QueryBudgetExceededError` when `ON_BUDGET_EXCEEDED` is "raise", as in
+    tests. Queries run while a streaming response is consumed are not
+    counted. Not used unless `SQL_INSTRUMENTATION["ENABLED"]`.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        """Initialize the middleware, unless instrumentation is disabled."""
+        self.config = sql_instrumentation_settings()
+        if not self.config["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        """Record the queries of a request, then report them."""
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        view = self._view_name(request)
+        if self.config["SERVER_TIMING"]:
+            self._add_server_timing(response, recorder)
+        if self.config["LOG"]:
+            self._log(request, response, view, recorder)
+        self._check_budget(view, recorder)
+        return response
+
+    @staticmethod
+    def _view_name(request: HttpRequest) -> str | None:
+        """Return the URL name of the request's view, else its dotted path."""
+        match = request.resolver_match
+        if match is None:
+            return None
+        return match.view_name or match._func_path
+
+    @staticmethod
+    def _add_server_timing(response: HttpResponseBase, recorder: QueryRecorder) -> None:
+        metric = (
+            f'db;dur={recorder.duration * 1000:.2f};desc="{recorder.count} queries, '
+            f'{recorder.duplicates} duplicates"'
+        )
+        existing = response.get("Server-Timing")
+        response["Server-Timing"] = f"{existing}, {metric}" if existing else metric
+
+    @staticmethod
+    def _log(
+        request: HttpRequest,
+        response: HttpResponseBase,
+        view: str | None,
+        recorder: QueryRecorder,
+    ) -> None:
+        fields: dict[str, Any] = {
+            "method": request.method,
+            "path": request.path,
+            "view": view,
+            "status": response.status_code,
+            "queries": recorder.count,
+            "db_ms": round(recorder.duration * 1000, 3),
+            "duplicates": recorder.duplicates,
+        }
+        repeated = recorder.most_repeated()
+        if repeated is not None:
+            fields["most_repeated"] = {"sql": repeated[0], "count": repeated[1]}
+        logger.info(
+            "sql view=%s queries=%d db_ms=%.3f duplicates=%d",
+            view,
+            fields["queries"],
+            fields["db_ms"],
+            fields["duplicates"],
+            extra={"sql": fields},
+        )
+
+    def _check_budget(self, view: str | None, recorder: QueryRecorder) -> None:
+        budget = self.config["BUDGETS"].get(view, self.config["DEFAULT_BUDGET"])
+        if budget is None or recorder.count <= budget:
+            return
+        message = f"View {view} ran {recorder.count} queries, over its budget of {budget}"
+        repeated = recorder.most_repeated()
+        if repeated is not None:
+            message += f"; ran {repeated[1]} times: {repeated[0]}"
+        if self.config["ON_BUDGET_EXCEEDED"] == "raise":
+            raise QueryBudgetExceededError(message)
+        logger.warning(message)
@@ -0,0 +1,85 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from core.models import CompanyModel
+from infra.db.deals.db_repository import DealRepositoryDB
+from infra.db.instrumentation.queries import QueryBudgetExceededError, QueryRecorder
+
+LOGGER = "infra.db.instrumentation.middleware"
+
+
+def instrumentation(**options: object) -> dict[str, object]:
+    return {"ENABLED": True, "BUDGETS": {}, "ON_BUDGET_EXCEEDED": "raise", **options}
+
+
+class QueryRecorderTest(TestCase):
+    def test_records_duplicated_statements(self) -> None:
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for company_id in (1, 2, 3):
+                CompanyModel.objects.filter(id=company_id).exists()
+            CompanyModel.objects.count()
+
+        self.assertEqual(recorder.count, 4)
+        self.assertEqual(recorder.duplicates, 2)
+        self.assertGreater(recorder.duration, 0)
+        repeated = recorder.most_repeated()
+        assert repeated is not None
+        self.assertIn("core_companymodel", repeated[0])
+        self.assertEqual(repeated[1], 3)
+
+
+class QueryInstrumentationMiddlewareTest(TestCase):
+    def setUp(self) -> None:
+        company = CompanyModel.objects.create(name="Company")
+        deal = DealRepositoryDB().create(
+            title="Deal",
+            company_id=company.id,
+            value=Decimal("10.00"),
+            tags=None,
+            distributor_id=None,
+        )
+        self.url = f"/api/deals/{deal.id}/"
+
+    @override_settings(SQL_INSTRUMENTATION=instrumentation())
+    def test_reports_queries(self) -> None:
+        with self.assertLogs(LOGGER, "INFO") as logs:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(
+            response["Server-Timing"], r'^db;dur=[0-9.]+;desc="2 queries, 0 duplicates"$'
+        )
+        (record,) = logs.records
+        # Passed as an `extra` of the record.
+        sql = record.__dict__["sql"]
+        self.assertEqual(sql["view"], "deal-detail")
+        self.assertEqual(sql["queries"], 2)
+
+    @override_settings(SQL_INSTRUMENTATION=instrumentation(BUDGETS={"deal-detail": 1}))
+    def test_fails_over_budget(self) -> None:
+        with self.assertRaisesMessage(
+            QueryBudgetExceededError, "deal-detail ran 2 queries, over its budget of 1"
+        ):
+            self.client.get(self.url)
+
+    @override_settings(
+        SQL_INSTRUMENTATION=instrumentation(
+            DEFAULT_BUDGET=1, ON_BUDGET_EXCEEDED="warn", LOG=False
+        )
+    )
+    def test_warns_over_budget(self) -> None:
+        with self.assertLogs(LOGGER, "WARNING") as logs:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("over its budget of 1", logs.output[0])
+
+    @override_settings(SQL_INSTRUMENTATION={"ENABLED": False})
+    def test_disabled(self) -> None:
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Server-Timing", response)
@@ -0,0 +1,93 @@
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+DEFAULT_SQL_INSTRUMENTATION_SETTINGS: dict[str, Any] = {
+    "ENABLED": False,
+    # Maximum queries of a request, by URL name or dotted path of the view.
+    "BUDGETS": {},
+    # Budget of the views missing from BUDGETS; None for no budget.
+    "DEFAULT_BUDGET": None,
+    # What a request over its budget does: "warn" logs, "raise" fails it.
+    "ON_BUDGET_EXCEEDED": "warn",
+    "SERVER_TIMING": True,
+    "LOG": True,
+}
+
+BUDGET_ACTIONS = frozenset({"warn", "raise"})
+
+
+def sql_instrumentation_settings() -> dict[str, Any]:
+    """Return `SQL_INSTRUMENTATION` completed with the defaults.
+
+    Raises:
+        ImproperlyConfigured: If the action on exceeded budgets is unknown
+    """
+    config = {
+        **DEFAULT_SQL_INSTRUMENTATION_SETTINGS,
+        **getattr(settings, "SQL_INSTRUMENTATION", {}),
+    }
+    if config["ON_BUDGET_EXCEEDED"] not in BUDGET_ACTIONS:
+        raise ImproperlyConfigured(
+            f"Unknown ON_BUDGET_EXCEEDED {config['ON_BUDGET_EXCEEDED']!r}."
+        )
+    return config
+
+
+class QueryBudgetExceededError(Exception):
+    """Raised when a request runs more queries than its view's budget."""
+
+
+class QueryRecorder:
+    """Execute wrapper counting and timing the queries it runs.
+
+    Statements are keyed by their SQL, parameters excluded, so the same
+    statement run for each row of a result, the mark of an N+1 access
+    pattern, shows up as duplicates. Install it on connections with
+    `connection.execute_wrapper()`.
+    """
+
+    __slots__ = ("duration", "statements")
+
+    def __init__(self) -> None:
+        """Initialize with no query recorded."""
+        # Seconds spent in the database.
+        self.duration = 0.0
+        # Times each SQL statement ran.
+        self.statements: dict[str, int] = {}
+
+    def __call__(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,  # noqa: ANN401
+        many: bool,
+        context: dict[str, Any],
+    ) -> Any:  # noqa: ANN401
+        """Run a query, recording its statement and duration."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.statements[sql] = self.statements.get(sql, 0) + 1
+
+    @property
+    def count(self) -> int:
+        """Return the number of queries run."""
+        return sum(self.statements.values())
+
+    @property
+    def duplicates(self) -> int:
+        """Return the number of queries repeating an earlier statement."""
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def most_repeated(self) -> tuple[str, int] | None:
+        """Return the statement run the most times, if any ran more than once."""
+        sql, count = max(
+            self.statements.items(), key=lambda item: item[1], default=("", 0)
+        )
+        return (sql, count) if count > 1 else None
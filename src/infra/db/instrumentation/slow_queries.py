@@ -0,0 +1,283 @@
+import hashlib
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+DEFAULT_SLOW_QUERY_LOG_SETTINGS: dict[str, Any] = {
+    "ENABLED": False,
+    "THRESHOLD_MS": 100.0,  # Queries taking longer are logged
+    "PATH": None,  # Defaults to BASE_DIR / "var" / "log" / "slow_queries.log"
+    "MAX_BYTES": 10 * 1024 * 1024,  # Size at which the log rotates
+    "BACKUP_COUNT": 5,  # Rotated logs kept
+    "EXPLAIN": True,  # Log the query plan, by running EXPLAIN on the query
+}
+
+# Statements which EXPLAIN describes without running them.
+EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+# Plan lines reading a whole table: SQLite's "SCAN table" without an index, and
+# PostgreSQL's "Seq Scan on table".
+FULL_SCAN = re.compile(r"^SCAN (\S+)$|Seq Scan on (\S+)")
+
+# Parts of the call stack naming where a query comes from, by source directory.
+ORIGINS = {
+    "view": "application/presentation/",
+    "usecase": "application/usecase/",
+    "task": "application/tasks/",
+}
+
+
+def slow_query_log_settings() -> dict[str, Any]:
+    """Return `SLOW_QUERY_LOG` completed with the defaults."""
+    config = {
+        **DEFAULT_SLOW_QUERY_LOG_SETTINGS,
+        **getattr(settings, "SLOW_QUERY_LOG", {}),
+    }
+    if config["PATH"] is None:
+        config["PATH"] = Path(settings.BASE_DIR) / "var" / "log" / "slow_queries.log"
+    return config
+
+
+def normalize(sql: str) -> str:
+    """Return a statement with its literals and parameter lists replaced by `?`.
+
+    Statements differing only by their values, or by the length of their `IN`
+    and `VALUES` lists, normalize alike.
+    """
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"%s|\b\d+(?:\.\d+)?\b", "?", sql)
+    sql = re.sub(r"\(\s*\?(?:\s*,\s*\?)*\s*\)", "(?)", sql)
+    sql = re.sub(r"\(\?\)(?:\s*,\s*\(\?\))+", "(?)", sql)
+    return " ".join(sql.split())
+
+
+def fingerprint(sql: str) -> str:
+    """Return a short hash identifying the normalized form of a statement."""
+    return hashlib.sha1(normalize(sql).encode(), usedforsecurity=False).hexdigest()[:16]
+
+
+def full_scans(plan: list[str]) -> list[str]:
+    """Return the tables a query plan reads in full."""
+    return [
+        match.group(1) or match.group(2)
+        for line in plan
+        if (match := FULL_SCAN.search(line.strip()))
+    ]
+
+
+def query_origin() -> dict[str, str]:
+    """Return the view, use case and task running the current query, if any.
+
+    Also names the innermost project function outside this package, which
+    made the query, as `caller`.
+    """
+    base = f"{settings.BASE_DIR}/"
+    origin: dict[str, str] = {}
+    frame: FrameType | None = sys._getframe(1)  # noqa: SLF001
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(base) and "/infra/db/instrumentation/" not in filename:
+            name = frame.f_code.co_qualname
+            origin.setdefault("caller", f"{filename.removeprefix(base)}:{name}")
+            for kind, directory in ORIGINS.items():
+                if directory in filename:
+                    # The outermost frame of each kind is kept.
+                    origin[kind] = name
+        frame = frame.f_back
+    return origin
+
+
+_handlers: dict[Path, RotatingFileHandler] = {}
+_handlers_lock = threading.Lock()
+
+
+def _handler(config: dict[str, Any]) -> RotatingFileHandler:
+    path = Path(config["PATH"])
+    with _handlers_lock:
+        handler = _handlers.get(path)
+        if handler is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(
+                path,
+                maxBytes=config["MAX_BYTES"],
+                backupCount=config["BACKUP_COUNT"],
+                delay=True,
+            )
+            _handlers[path] = handler
+        return handler
+
+
+class SlowQueryLog:
+    """Execute wrapper logging the queries slower than a threshold.
+
+    Each slow query is written as a JSON line to a rotating log, with its
+    parameters, duration, origin and, unless disabled, the plan of the
+    database, flagging the tables it scans in full. The plan comes from
+    running EXPLAIN after the query, delaying its caller a little more. Read
+    the log with `slow_query_report`.
+    """
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        """Initialize with the settings of `slow_query_log_settings`."""
+        self.threshold = config["THRESHOLD_MS"] / 1000
+        self.explain = config["EXPLAIN"]
+        self.handler = _handler(config)
+
+    def __call__(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,  # noqa: ANN401
+        many: bool,
+        context: dict[str, Any],
+    ) -> Any:  # noqa: ANN401
+        """Run a query, logging it if it is slow."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            if duration >= self.threshold:
+                self.log(context["connection"], sql, params, many, duration)
+
+    def log(
+        self,
+        connection: BaseDatabaseWrapper,
+        sql: str,
+        params: Any,  # noqa: ANN401
+        many: bool,
+        duration: float,
+    ) -> None:
+        """Write the entry of a slow query to the log."""
+        entry: dict[str, Any] = {
+            "time": datetime.now(UTC).isoformat(),
+            "database": connection.alias,
+            "duration_ms": round(duration * 1000, 3),
+            "fingerprint": fingerprint(sql),
+            "sql": sql,
+            # Only the size of executemany() batches.
+            "params": f"{len(params)} rows" if many else params,
+            "origin": query_origin(),
+        }
+        if self.explain and not many and EXPLAINABLE.match(sql):
+            plan = self._plan(connection, sql, params)
+            entry["plan"] = plan
+            entry["full_scans"] = full_scans(plan)
+        self.handler.handle(
+            logging.makeLogRecord({"msg": json.dumps(entry, default=str)})
+        )
+
+    @staticmethod
+    def _plan(
+        connection: BaseDatabaseWrapper,
+        sql: str,
+        params: Any,  # noqa: ANN401
+    ) -> list[str]:
+        # Without wrappers, the EXPLAIN is neither logged nor counted itself.
+        wrappers, connection.execute_wrappers = connection.execute_wrappers, []
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+                # SQLite has a row per step, its detail last; others a line per row.
+                return [str(row[-1]) for row in cursor.fetchall()]
+        except DatabaseError as error:
+            return [f"EXPLAIN failed: {error}"]
+        finally:
+            connection.execute_wrappers = wrappers
+
+
+def install_slow_query_log(
+    sender: type[BaseDatabaseWrapper],
+    connection: BaseDatabaseWrapper,
+    **kwargs: Any,  # noqa: ANN401
+) -> None:
+    """Log the slow queries of a new connection, if enabled.
+
+    A receiver of the `connection_created` signal, so every query is covered:
+    requests, tasks and commands alike.
+    """
+    config = slow_query_log_settings()
+    if not config["ENABLED"] or any(
+        isinstance(wrapper, SlowQueryLog) for wrapper in connection.execute_wrappers
+    ):
+        return
+    # First, as `execute_wrapper()` blocks remove the last wrapper when they exit.
+    connection.execute_wrappers.insert(0, SlowQueryLog(config))
+
+
+def read_entries(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the entries of a slow query log and of its rotated files, oldest first.
+
+    Lines that are not JSON, e.g. cut by a crash, are skipped.
+    """
+    backups = sorted(
+        path.parent.glob(f"{path.name}.*"),
+        key=lambda backup: int(backup.suffix[1:]) if backup.suffix[1:].isdigit() else 0,
+        reverse=True,
+    )
+    for log in [*backups, path]:
+        if not log.exists():
+            continue
+        with log.open() as lines:
+            for line in lines:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+@dataclass
+class SlowQueryGroup:
+    """The slow queries sharing a normalized statement."""
+
+    fingerprint: str
+    statement: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    full_scans: set[str] = field(default_factory=set)
+    origins: Counter[str] = field(default_factory=Counter)
+    # The plan of the slowest occurrence.
+    plan: list[str] = field(default_factory=list)
+
+    @property
+    def mean_ms(self) -> float:
+        """Return the mean duration of the queries."""
+        return self.total_ms / self.count if self.count else 0.0
+
+
+def group_entries(entries: Iterator[dict[str, Any]]) -> list[SlowQueryGroup]:
+    """Group slow query entries by fingerprint, the longest total time first."""
+    groups: dict[str, SlowQueryGroup] = {}
+    for entry in entries:
+        group = groups.get(entry["fingerprint"])
+        if group is None:
+            group = groups[entry["fingerprint"]] = SlowQueryGroup(
+                fingerprint=entry["fingerprint"], statement=normalize(entry["sql"])
+            )
+        group.count += 1
+        group.total_ms += entry["duration_ms"]
+        if entry["duration_ms"] >= group.max_ms:
+            group.max_ms = entry["duration_ms"]
+            group.plan = entry.get("plan", [])
+        group.full_scans.update(entry.get("full_scans", []))
+        origin = entry["origin"]
+        group.origins[
+            origin.get("usecase") or origin.get("task") or origin.get("caller", "-")
+        ] += 1
+    return sorted(groups.values(), key=lambda group: group.total_ms, reverse=True)
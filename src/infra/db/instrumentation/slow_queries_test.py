@@ -0,0 +1,135 @@
+import io
+import json
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from core.models import CompanyModel
+from infra.db.deals.db_repository import DealRepositoryDB
+from infra.db.instrumentation.queries import QueryRecorder
+from infra.db.instrumentation.slow_queries import (
+    SlowQueryLog,
+    fingerprint,
+    full_scans,
+    install_slow_query_log,
+    normalize,
+)
+
+
+class NormalizeTest(TestCase):
+    def test_replaces_values_and_lists(self) -> None:
+        self.assertEqual(
+            normalize("SELECT *  FROM t WHERE a = 'x''y' AND b IN (%s, %s) LIMIT 21"),
+            "SELECT * FROM t WHERE a = ? AND b IN (?) LIMIT ?",
+        )
+        self.assertEqual(
+            fingerprint('SELECT "U0"."id" FROM t WHERE id IN (%s)'),
+            fingerprint('SELECT "U0"."id" FROM t WHERE id IN (%s, %s, %s)'),
+        )
+        self.assertEqual(
+            normalize("INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)"),
+            "INSERT INTO t (a, b) VALUES (?)",
+        )
+
+    def test_full_scans(self) -> None:
+        plan = [
+            "SCAN core_dealmodel",
+            "SEARCH core_companymodel USING INTEGER PRIMARY KEY (rowid=?)",
+            "SCAN core_tagmodel USING COVERING INDEX tag_idx",
+            "  ->  Seq Scan on core_dealmodel  (cost=0.00..1.01 rows=1 width=4)",
+        ]
+        self.assertEqual(full_scans(plan), ["core_dealmodel", "core_dealmodel"])
+
+
+class SlowQueryLogTest(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "slow.log"
+        self.slow_query_log = SlowQueryLog(
+            {
+                "THRESHOLD_MS": 0,
+                "PATH": self.path,
+                "MAX_BYTES": 0,
+                "BACKUP_COUNT": 1,
+                "EXPLAIN": True,
+            }
+        )
+        self.addCleanup(self.slow_query_log.handler.close)
+        company = CompanyModel.objects.create(name="Company")
+        self.deal = DealRepositoryDB().create(
+            title="Deal",
+            company_id=company.id,
+            value=Decimal("10.00"),
+            tags=None,
+            distributor_id=None,
+        )
+
+    def entries(self) -> list[dict[str, Any]]:
+        return [json.loads(line) for line in self.path.read_text().splitlines()]
+
+    def test_logs_plans_and_full_scans(self) -> None:
+        recorder = QueryRecorder()
+        with (
+            connection.execute_wrapper(recorder),
+            connection.execute_wrapper(self.slow_query_log),
+        ):
+            DealRepositoryDB().get_one(self.deal.id)
+            DealRepositoryDB().search("deal", limit=10)
+
+        # The EXPLAIN queries are neither logged nor counted.
+        entries = self.entries()
+        self.assertEqual(len(entries), recorder.count)
+
+        by_id, *_ = entries
+        self.assertEqual(by_id["full_scans"], [])
+        self.assertIn(self.deal.id, by_id["params"])
+        # Outside views and use cases, only the function running the query.
+        self.assertEqual(list(by_id["origin"]), ["caller"])
+        self.assertTrue(
+            by_id["origin"]["caller"].startswith(
+                "infra/db/deals/db_repository.py:DealRepositoryDB."
+            )
+        )
+        self.assertIn(
+            "core_dealmodel",
+            {table for entry in entries for table in entry["full_scans"]},
+        )
+
+    def test_report(self) -> None:
+        with connection.execute_wrapper(self.slow_query_log):
+            for _ in range(3):
+                DealRepositoryDB().get_all()
+        # MAX_BYTES of 0 never rotates; the report reads the rotated log too.
+        self.path.rename(f"{self.path}.1")
+        with connection.execute_wrapper(self.slow_query_log):
+            DealRepositoryDB().get_all()
+
+        report = io.StringIO()
+        call_command("slow_query_report", path=self.path, full_scans=True, stdout=report)
+        lines = report.getvalue().splitlines()
+        self.assertRegex(lines[1], r"^[0-9a-f]{16} +4 .* core_dealmodel$")
+        self.assertIn('FROM "core_dealmodel"', lines[2])
+        self.assertRegex(lines[3], r"db_repository.py:DealRepositoryDB\.\w+ \(4\)$")
+
+    def test_installs_once_and_first(self) -> None:
+        with self.settings(SLOW_QUERY_LOG={"ENABLED": True, "PATH": self.path}):
+            with connection.execute_wrapper(QueryRecorder()):
+                install_slow_query_log(type(connection), connection)
+                install_slow_query_log(type(connection), connection)
+                wrappers = list(connection.execute_wrappers)
+            # The block removed its own wrapper on exit.
+            self.assertIs(connection.execute_wrappers[0], wrappers[0])
+            connection.execute_wrappers.remove(wrappers[0])
+
+        self.assertEqual(
+            [type(wrapper) for wrapper in wrappers], [SlowQueryLog, QueryRecorder]
+        )
+        log = wrappers[0]
+        assert isinstance(log, SlowQueryLog)
+        log.handler.close()
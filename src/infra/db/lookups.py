@@ -0,0 +1,2 @@
+# IDs per `IN (...)` lookup, below SQLite's historical limit of 999 parameters.
+ID_LOOKUP_BATCH_SIZE = 900
@@ -0,0 +1,60 @@
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponseBase
+
+from infra.db.replicas.router import ReadScope, read_scope, replica_settings
+
+
+class ReplicaRoutingMiddleware:
+    """Give each request a read scope, so clients read their own writes.
+
+    After a request writes, its response carries the time until which its
+    client reads from the primary, as a cookie and a header. Later requests
+    bearing either before that time read from the primary, giving replicas
+    `STICKY_SECONDS` to catch up. Clients without cookies may send the header
+    back. Not used when no replica is configured.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        """Initialize the middleware, unless there are no replicas."""
+        if not replica_settings()["REPLICAS"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        """Route the reads of a request, and pin its client after a write."""
+        config = replica_settings()
+        scope = ReadScope(primary=self._sticky_until(request, config) > time.time())
+        token = read_scope.set(scope)
+        try:
+            response = self.get_response(request)
+        finally:
+            read_scope.reset(token)
+            scope.close()
+
+        if scope.wrote:
+            seconds = config["STICKY_SECONDS"]
+            until = f"{time.time() + seconds:.3f}"
+            response.set_cookie(
+                config["STICKY_COOKIE"],
+                until,
+                max_age=seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+            response[config["STICKY_HEADER"]] = until
+        return response
+
+    @staticmethod
+    def _sticky_until(request: HttpRequest, config: dict[str, Any]) -> float:
+        """Return until when the client reads from the primary, 0 if it need not."""
+        value = request.headers.get(config["STICKY_HEADER"]) or request.COOKIES.get(
+            config["STICKY_COOKIE"]
+        )
+        try:
+            return float(value) if value else 0.0
+        except ValueError:
+            return 0.0
@@ -0,0 +1,70 @@
+from decimal import Decimal
+
+from django.db import connections
+from django.test import Client, TransactionTestCase, override_settings
+
+from core.models import CompanyModel
+from infra.db.deals.db_repository import DealRepositoryDB
+
+
+def replicate() -> None:
+    """Copy the primary test database over its replica, as replication would."""
+    primary, replica = connections["default"], connections["replica"]
+    primary.ensure_connection()
+    replica.ensure_connection()
+    primary.connection.backup(replica.connection)
+
+
+@override_settings(DATABASE_REPLICAS={"REPLICAS": {"replica": 1}, "STICKY_SECONDS": 60})
+class ReplicaRoutingMiddlewareTest(TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self) -> None:
+        company = CompanyModel.objects.create(name="Company")
+        self.deal = DealRepositoryDB().create(
+            title="Old",
+            company_id=company.id,
+            value=Decimal("10.00"),
+            tags=None,
+            distributor_id=None,
+        )
+        self.url = f"/api/deals/{self.deal.id}/"
+        replicate()
+
+    def _title(self, client: Client, **headers: str) -> str:
+        response = client.get(self.url, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        title: str = response.json()["title"]
+        return title
+
+    def test_reads_go_to_the_replica(self) -> None:
+        CompanyModel.objects.create(name="Not replicated")
+
+        response = self.client.get("/api/deals/")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("primary_until", response.cookies)
+        self.assertEqual(CompanyModel.objects.using("replica").count(), 1)
+
+    def test_client_reads_its_own_writes(self) -> None:
+        response = self.client.put(
+            self.url, {"title": "New"}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["title"], "New")
+        self.assertIn("primary_until", response.cookies)
+        until = response["X-Primary-Until"]
+
+        # The writer reads from the primary, other clients from the stale replica.
+        self.assertEqual(self._title(self.client), "New")
+        self.assertEqual(self._title(Client()), "Old")
+        self.assertEqual(self._title(Client(), x_primary_until=until), "New")
+
+        replicate()
+        self.assertEqual(self._title(Client()), "New")
+
+    def test_expired_pin_reads_the_replica(self) -> None:
+        DealRepositoryDB().update(
+            deal_id=self.deal.id, title="New", distributor_id=None, tags=None, value=None
+        )
+        self.assertEqual(self._title(Client(), x_primary_until="1.0"), "Old")
+        self.assertEqual(self._title(Client(), x_primary_until="soon"), "Old")
@@ -0,0 +1,196 @@
+import random
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db.models import Model
+
+DEFAULT_REPLICA_SETTINGS: dict[str, Any] = {
+    "PRIMARY": "default",
+    "REPLICAS": {},
+    "SELECTION": "weighted",
+    "STICKY_SECONDS": 5.0,
+    "STICKY_COOKIE": "primary_until",
+    "STICKY_HEADER": "X-Primary-Until",
+}
+
+REPLICA_SELECTIONS = frozenset({"weighted", "least_loaded"})
+
+
+def replica_settings() -> dict[str, Any]:
+    """Return `DATABASE_REPLICAS` completed with the defaults.
+
+    Raises:
+        ImproperlyConfigured: If the selection is unknown or a replica is not a
+            database alias with a positive weight
+    """
+    config = {**DEFAULT_REPLICA_SETTINGS, **getattr(settings, "DATABASE_REPLICAS", {})}
+    if config["SELECTION"] not in REPLICA_SELECTIONS:
+        raise ImproperlyConfigured(f"Unknown replica selection {config['SELECTION']!r}.")
+    for alias, weight in config["REPLICAS"].items():
+        if alias not in settings.DATABASES or alias == config["PRIMARY"]:
+            raise ImproperlyConfigured(f"Replica {alias!r} is not a replica database.")
+        if weight <= 0:
+            raise ImproperlyConfigured(f"Replica {alias!r} must have a positive weight.")
+    return config
+
+
+class ReplicaLoad:
+    """Number of read scopes using each replica in this process."""
+
+    def __init__(self) -> None:
+        """Initialize with no replica in use."""
+        self._lock = threading.Lock()
+        self._active: dict[str, int] = {}
+
+    def acquire(self, replicas: dict[str, float], selection: str) -> str:
+        """Select a replica and count it as used until released."""
+        with self._lock:
+            if selection == "least_loaded":
+                # The replica with the fewest scopes for its weight, the
+                # heaviest one first on a tie.
+                alias = min(
+                    replicas,
+                    key=lambda alias: (
+                        self._active.get(alias, 0) / replicas[alias],
+                        -replicas[alias],
+                    ),
+                )
+            else:
+                # Not for security: spreads the reads over the replicas.
+                alias = random.choices(  # noqa: S311
+                    list(replicas), weights=list(replicas.values())
+                )[0]
+            self._active[alias] = self._active.get(alias, 0) + 1
+            return alias
+
+    def release(self, alias: str) -> None:
+        """Count a replica as no longer used by a scope."""
+        with self._lock:
+            self._active[alias] -= 1
+
+    def active(self, alias: str) -> int:
+        """Return the number of scopes using a replica."""
+        with self._lock:
+            return self._active.get(alias, 0)
+
+
+replica_load = ReplicaLoad()
+
+
+class ReadScope:
+    """Where the reads of a request go, and whether the request wrote."""
+
+    def __init__(self, primary: bool = False) -> None:
+        """Initialize the scope.
+
+        Args:
+            primary: Whether reads must go to the primary, as the client wrote
+                recently
+        """
+        self.primary = primary
+        self.replica: str | None = None
+        self.wrote = False
+
+    def close(self) -> None:
+        """Release the replica used by the scope, if any."""
+        if self.replica is not None:
+            replica_load.release(self.replica)
+            self.replica = None
+
+
+# The scope of the current request, set by `ReplicaRoutingMiddleware`.
+read_scope: ContextVar[ReadScope | None] = ContextVar("read_scope", default=None)
+
+# Whether reads must go to the primary, set by `primary_reads()`.
+_primary_reads: ContextVar[bool] = ContextVar("primary_reads", default=False)
+
+
+@contextmanager
+def primary_reads() -> Iterator[None]:
+    """Read from the primary within the block, whatever the read scope.
+
+    For reads whose result outlives the request, e.g. filling a cache, which
+    must not keep the copy of a lagging replica.
+    """
+    token = _primary_reads.set(True)
+    try:
+        yield
+    finally:
+        _primary_reads.reset(token)
+
+
+class ReplicaRouter:
+    """Database router sending reads to replicas and writes to the primary.
+
+    Replicas are configured by `DATABASE_REPLICAS`. Without any, every query
+    goes to the primary. A request reads from a single replica, selected when
+    it first reads, and from the primary once it wrote, after a recent write of
+    its client (see `ReplicaRoutingMiddleware`), inside a transaction or within
+    `primary_reads()`. Reads outside requests select a replica per query.
+    """
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> str:  # noqa: ANN401
+        """Return the database a model is read from."""
+        config = replica_settings()
+        primary: str = config["PRIMARY"]
+        instance: Model | None = hints.get("instance")
+        if instance is not None and instance._state.db:
+            # Related objects are read from where their instance came from.
+            return instance._state.db
+        if (
+            not config["REPLICAS"]
+            or connections[primary].in_atomic_block
+            or _primary_reads.get()
+        ):
+            return primary
+
+        scope = read_scope.get()
+        if scope is None:
+            alias = replica_load.acquire(config["REPLICAS"], config["SELECTION"])
+            replica_load.release(alias)
+            return alias
+        if scope.primary or scope.wrote:
+            return primary
+        if scope.replica is None:
+            scope.replica = replica_load.acquire(config["REPLICAS"], config["SELECTION"])
+        return scope.replica
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str:  # noqa: ANN401
+        """Return the primary, noting that the request wrote.
+
+        Objects read from another database than the primary and its replicas,
+        e.g. a shard, are written back to it.
+        """
+        scope = read_scope.get()
+        if scope is not None:
+            scope.wrote = True
+        config = replica_settings()
+        primary: str = config["PRIMARY"]
+        instance: Model | None = hints.get("instance")
+        if (
+            instance is not None
+            and instance._state.db
+            and instance._state.db not in config["REPLICAS"]
+        ):
+            return instance._state.db
+        return primary
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> bool | None:  # noqa: ANN401
+        """Allow relations between objects of the primary and its replicas."""
+        config = replica_settings()
+        databases = {config["PRIMARY"], *config["REPLICAS"]}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool | None:  # noqa: ANN401
+        """Only migrate the primary: replicas get its schema by replication."""
+        if db in replica_settings()["REPLICAS"]:
+            return False
+        return None
@@ -0,0 +1,73 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from core.models import DealModel
+from infra.db.replicas.router import ReadScope, ReplicaLoad, ReplicaRouter, read_scope
+
+REPLICAS = {"REPLICAS": {"replica": 1}}
+
+
+class ReplicaRouterTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.router = ReplicaRouter()
+
+    def _in_scope(self, scope: ReadScope) -> None:
+        token = read_scope.set(scope)
+        self.addCleanup(read_scope.reset, token)
+        self.addCleanup(scope.close)
+
+    def test_without_replicas_reads_the_primary(self) -> None:
+        self.assertEqual(self.router.db_for_read(DealModel), "default")
+        self.assertIsNone(self.router.allow_migrate("replica", "core"))
+
+    @override_settings(DATABASE_REPLICAS=REPLICAS)
+    def test_reads_replicas_and_writes_the_primary(self) -> None:
+        self.assertEqual(self.router.db_for_read(DealModel), "replica")
+        self.assertEqual(self.router.db_for_write(DealModel), "default")
+        self.assertFalse(self.router.allow_migrate("replica", "core"))
+        self.assertIsNone(self.router.allow_migrate("default", "core"))
+
+    @override_settings(DATABASE_REPLICAS=REPLICAS)
+    def test_scope_reads_the_primary_once_written(self) -> None:
+        scope = ReadScope()
+        self._in_scope(scope)
+
+        self.assertEqual(self.router.db_for_read(DealModel), "replica")
+        self.router.db_for_write(DealModel)
+        self.assertTrue(scope.wrote)
+        self.assertEqual(self.router.db_for_read(DealModel), "default")
+
+    @override_settings(DATABASE_REPLICAS=REPLICAS)
+    def test_pinned_scope_reads_the_primary(self) -> None:
+        self._in_scope(ReadScope(primary=True))
+        self.assertEqual(self.router.db_for_read(DealModel), "default")
+
+    @override_settings(DATABASE_REPLICAS={"REPLICAS": {"default": 1}})
+    def test_primary_is_not_a_replica(self) -> None:
+        with self.assertRaises(ImproperlyConfigured):
+            self.router.db_for_read(DealModel)
+
+    @override_settings(DATABASE_REPLICAS={**REPLICAS, "SELECTION": "fastest"})
+    def test_unknown_selection(self) -> None:
+        with self.assertRaises(ImproperlyConfigured):
+            self.router.db_for_read(DealModel)
+
+
+class ReplicaLoadTest(SimpleTestCase):
+    def test_least_loaded_follows_weights(self) -> None:
+        load = ReplicaLoad()
+        replicas = {"a": 2.0, "b": 1.0}
+
+        aliases = [load.acquire(replicas, "least_loaded") for _ in range(6)]
+        self.assertEqual(aliases.count("a"), 4)
+        self.assertEqual(aliases.count("b"), 2)
+
+        load.release("a")
+        load.release("a")
+        self.assertEqual(load.acquire(replicas, "least_loaded"), "a")
+        self.assertEqual(load.active("a"), 3)
+
+    def test_weighted_skips_nothing(self) -> None:
+        load = ReplicaLoad()
+        aliases = {load.acquire({"a": 1.0, "b": 1.0}, "weighted") for _ in range(100)}
+        self.assertEqual(aliases, {"a", "b"})
@@ -0,0 +1,99 @@
+import re
+import sqlite3
+from collections.abc import Mapping
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DatabaseError
+from django.db.backends.sqlite3 import base
+
+# Applied to every new connection, unless overridden by OPTIONS["pragmas"].
+DEFAULT_PRAGMAS: dict[str, str | int] = {
+    # Readers no longer block the writer, nor the writer the readers.
+    "journal_mode": "wal",
+    # Durable on application crashes, fsyncing only at WAL checkpoints.
+    "synchronous": "normal",
+    "mmap_size": 256 * 1024 * 1024,
+    # Negative sizes are in KiB, so 64 MiB of page cache per connection.
+    "cache_size": -64 * 1024,
+    "temp_store": "memory",
+    # Milliseconds a connection waits for a lock before failing.
+    "busy_timeout": 5000,
+}
+
+# Pragmas that may be set, so values interpolated into PRAGMA statements come
+# from a known list of names.
+ALLOWED_PRAGMAS = frozenset(
+    {
+        *DEFAULT_PRAGMAS,
+        "foreign_keys",
+        "journal_size_limit",
+        "wal_autocheckpoint",
+    }
+)
+
+PRAGMA_VALUE_PATTERN = re.compile(r"-?\w+")
+
+
+def pragma_statements(pragmas: Mapping[str, str | int | None]) -> list[str]:
+    """Return the PRAGMA statements setting the given pragmas.
+
+    Pragmas set to None are left at the SQLite default.
+
+    Raises:
+        ImproperlyConfigured: If a pragma is unknown or its value is not a word
+            or an integer
+    """
+    statements = []
+    for name, value in pragmas.items():
+        if value is None:
+            continue
+        if name not in ALLOWED_PRAGMAS:
+            raise ImproperlyConfigured(f"Unsupported SQLite pragma {name!r}.")
+        if not PRAGMA_VALUE_PATTERN.fullmatch(str(value)):
+            raise ImproperlyConfigured(f"Invalid value {value!r} for pragma {name!r}.")
+        statements.append(f"PRAGMA {name} = {value}")
+    return statements
+
+
+def apply_pragmas(
+    connection: sqlite3.Connection, pragmas: Mapping[str, str | int | None]
+) -> None:
+    """Set the pragmas on a raw SQLite connection."""
+    for statement in pragma_statements(pragmas):
+        connection.execute(statement)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite backend applying a pragma profile to each new connection.
+
+    Configure it with `"ENGINE": "infra.db.sqlite"`. `OPTIONS["pragmas"]`
+    overrides entries of `DEFAULT_PRAGMAS`. Unlike the stock backend, it checks
+    that a connection still answers before reusing it, so `CONN_HEALTH_CHECKS`
+    has an effect.
+    """
+
+    pragmas: dict[str, str | int | None]
+
+    def get_connection_params(self) -> dict[str, Any]:
+        """Return the parameters of `sqlite3.connect`, without the pragmas."""
+        # The stock backend passes every option on to `sqlite3.connect`.
+        params = super().get_connection_params()
+        self.pragmas = {**DEFAULT_PRAGMAS, **params.pop("pragmas", {})}
+        return params
+
+    def get_new_connection(self, conn_params: dict[str, Any]) -> sqlite3.Connection:
+        """Open a connection and apply the pragma profile to it."""
+        connection: sqlite3.Connection = super().get_new_connection(conn_params)
+        apply_pragmas(connection, self.pragmas)
+        return connection
+
+    def is_usable(self) -> bool:
+        """Return whether the connection still answers a trivial query."""
+        if self.connection is None:
+            return False
+        try:
+            self.connection.execute("SELECT 1")
+        except (sqlite3.Error, DatabaseError):
+            return False
+        return True
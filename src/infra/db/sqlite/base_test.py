@@ -0,0 +1,76 @@
+import tempfile
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase
+
+from infra.db.sqlite.base import DatabaseWrapper, pragma_statements
+from infra.db.sqlite.bench import BENCH_PROFILES, run_benchmark
+
+
+class PragmaProfileTest(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name)
+
+    def _wrapper(self, **options: object) -> DatabaseWrapper:
+        wrapper = DatabaseWrapper(
+            {
+                **connection.settings_dict,
+                "ENGINE": "infra.db.sqlite",
+                "NAME": str(self.path / "db.sqlite3"),
+                "OPTIONS": options,
+            },
+            alias="pragma_test",
+        )
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def _pragma(self, wrapper: DatabaseWrapper, name: str) -> object:
+        with wrapper.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_new_connections_get_the_profile(self) -> None:
+        wrapper = self._wrapper(pragmas={"cache_size": -1024, "mmap_size": None})
+
+        self.assertEqual(self._pragma(wrapper, "journal_mode"), "wal")
+        self.assertEqual(self._pragma(wrapper, "synchronous"), 1)
+        self.assertEqual(self._pragma(wrapper, "busy_timeout"), 5000)
+        self.assertEqual(self._pragma(wrapper, "cache_size"), -1024)
+        self.assertEqual(self._pragma(wrapper, "mmap_size"), 0)
+
+    def test_health_check(self) -> None:
+        wrapper = self._wrapper()
+        wrapper.ensure_connection()
+        self.assertTrue(wrapper.is_usable())
+
+        assert wrapper.connection is not None
+        wrapper.connection.close()
+        self.assertFalse(wrapper.is_usable())
+
+    def test_pragmas_are_validated(self) -> None:
+        self.assertEqual(
+            pragma_statements({"synchronous": "normal", "cache_size": -2000}),
+            ["PRAGMA synchronous = normal", "PRAGMA cache_size = -2000"],
+        )
+        with self.assertRaises(ImproperlyConfigured):
+            pragma_statements({"writable_schema": "on"})
+        with self.assertRaises(ImproperlyConfigured):
+            pragma_statements({"synchronous": "off; DROP TABLE deal"})
+
+    def test_benchmark_runs_every_profile(self) -> None:
+        for name, profile in BENCH_PROFILES.items():
+            with self.subTest(name):
+                result = run_benchmark(
+                    self.path / f"{name}.sqlite3",
+                    profile,
+                    readers=2,
+                    writers=1,
+                    seconds=0.2,
+                    rows=100,
+                )
+                self.assertGreater(result.reads, 0)
+                self.assertGreater(result.writes, 0)
@@ -0,0 +1,198 @@
+import random
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from infra.db.sqlite.base import DEFAULT_PRAGMAS, apply_pragmas
+from infra.db.sqlite.write_coordinator import WriteCoordinator
+
+
+@dataclass(frozen=True)
+class BenchProfile:
+    """How benchmark connections are configured and reused."""
+
+    name: str
+    pragmas: Mapping[str, str | int | None]
+    # Whether each thread keeps its connection, like CONN_MAX_AGE > 0, instead
+    # of opening one per operation, like a request without persistent connections.
+    persistent: bool
+    # Whether transactions take the write lock when they start.
+    immediate: bool
+    # Whether writes go through a WriteCoordinator, group-committing them.
+    coordinated: bool = False
+
+
+BENCH_PROFILES = {
+    # The stock Django SQLite backend: rollback journal, a connection per request.
+    "default": BenchProfile("default", {}, persistent=False, immediate=False),
+    # The `infra.db.sqlite` backend as configured in settings.
+    "tuned": BenchProfile("tuned", DEFAULT_PRAGMAS, persistent=True, immediate=True),
+    # The tuned backend with `DEALS_WRITES["COORDINATED"]` enabled.
+    "coordinated": BenchProfile(
+        "coordinated", DEFAULT_PRAGMAS, persistent=True, immediate=True, coordinated=True
+    ),
+}
+
+
+@dataclass
+class BenchResult:
+    """Operations completed by a benchmark run."""
+
+    profile: str
+    seconds: float
+    reads: int = 0
+    writes: int = 0
+    errors: int = 0
+
+    @property
+    def reads_per_second(self) -> float:
+        """Return the read throughput."""
+        return self.reads / self.seconds
+
+    @property
+    def writes_per_second(self) -> float:
+        """Return the write throughput."""
+        return self.writes / self.seconds
+
+
+def _seed(path: Path, profile: BenchProfile, rows: int) -> None:
+    """Create the benchmark table with `rows` deals."""
+    connection = sqlite3.connect(path, isolation_level=None)
+    apply_pragmas(connection, profile.pragmas)
+    connection.execute(
+        "CREATE TABLE deal (id INTEGER PRIMARY KEY, title TEXT, value INTEGER)"
+    )
+    connection.execute("BEGIN")
+    connection.executemany(
+        "INSERT INTO deal (id, title, value) VALUES (?, ?, 0)",
+        ((index, f"Deal {index}") for index in range(1, rows + 1)),
+    )
+    connection.execute("COMMIT")
+    connection.close()
+
+
+def _update(connection: sqlite3.Connection, deal_id: int) -> None:
+    """Read a deal then update it."""
+    connection.execute("SELECT value FROM deal WHERE id = ?", (deal_id,))
+    connection.execute("UPDATE deal SET value = value + 1 WHERE id = ?", (deal_id,))
+
+
+@contextmanager
+def _atomic(connection: sqlite3.Connection, begin: str) -> Iterator[None]:
+    """Run a block in a transaction, or in a savepoint when one is open."""
+    if connection.in_transaction:
+        connection.execute("SAVEPOINT bench")
+        try:
+            yield
+        except BaseException:
+            connection.execute("ROLLBACK TO bench")
+            raise
+        finally:
+            connection.execute("RELEASE bench")
+        return
+
+    connection.execute(begin)
+    try:
+        yield
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+def run_benchmark(
+    path: Path,
+    profile: BenchProfile,
+    readers: int = 8,
+    writers: int = 2,
+    seconds: float = 5.0,
+    rows: int = 10_000,
+) -> BenchResult:
+    """Run concurrent readers and writers against a fresh SQLite file.
+
+    Readers fetch a deal by ID. Writers read a deal then update it in one
+    transaction, like the repository's `update`. Operations failing on a lock
+    are counted as errors.
+
+    Args:
+        path: Database file to create, which must not exist yet
+        profile: Connection configuration to measure
+        readers: Number of reading threads
+        writers: Number of writing threads
+        seconds: Duration of the run
+        rows: Number of deals seeded before the run
+    """
+    _seed(path, profile, rows)
+    result = BenchResult(profile=profile.name, seconds=seconds)
+    lock = threading.Lock()
+    stop = threading.Event()
+    begin = "BEGIN IMMEDIATE" if profile.immediate else "BEGIN"
+
+    def connect() -> sqlite3.Connection:
+        # Python's default timeout matches the stock backend's 5 seconds.
+        connection = sqlite3.connect(path, isolation_level=None)
+        apply_pragmas(connection, profile.pragmas)
+        return connection
+
+    # The connection of each thread. A coordinator leader applies the writes
+    # of other threads on its own connection, as it does with Django's.
+    local = threading.local()
+    coordinator = WriteCoordinator(
+        path.with_suffix(".write-lock"),
+        atomic=lambda: _atomic(local.connection, begin),
+    )
+
+    def read(connection: sqlite3.Connection, deal_id: int) -> None:
+        connection.execute(
+            "SELECT id, title, value FROM deal WHERE id = ?", (deal_id,)
+        ).fetchone()
+
+    def write(connection: sqlite3.Connection, deal_id: int) -> None:
+        if profile.coordinated:
+            coordinator.run(lambda: _update(local.connection, deal_id))
+            return
+        with _atomic(connection, begin):
+            _update(connection, deal_id)
+
+    def worker(operation: str) -> None:
+        done = errors = 0
+        # Not for security: spreads the operations over the table.
+        deal_ids = random.Random()  # noqa: S311
+        persistent = connect() if profile.persistent else None
+        while not stop.is_set():
+            connection = persistent or connect()
+            local.connection = connection
+            try:
+                deal_id = deal_ids.randint(1, rows)
+                if operation == "reads":
+                    read(connection, deal_id)
+                else:
+                    write(connection, deal_id)
+                done += 1
+            except sqlite3.OperationalError:
+                errors += 1
+            finally:
+                if persistent is None:
+                    connection.close()
+        if persistent is not None:
+            persistent.close()
+        with lock:
+            setattr(result, operation, getattr(result, operation) + done)
+            result.errors += errors
+
+    threads = [
+        threading.Thread(target=worker, args=(operation,))
+        for operation, count in (("reads", readers), ("writes", writers))
+        for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return result
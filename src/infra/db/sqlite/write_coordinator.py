@@ -0,0 +1,198 @@
+import contextvars
+import fcntl
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from functools import partial
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+from django.db import transaction
+
+T = TypeVar("T")
+
+# Bounds of the sleep between attempts to take the host lock from another process.
+HOST_LOCK_MIN_SLEEP = 0.0005
+HOST_LOCK_MAX_SLEEP = 0.01
+
+
+class WriteTimeoutError(TimeoutError):
+    """Raised when a write could not start before the coordinator's timeout."""
+
+
+class _PendingWrite:
+    """A write waiting in the coordinator queue, its caller's state and its outcome.
+
+    The leader applies the write on its own thread and connection, so the
+    write carries the context variables of its caller (e.g. its request's read
+    scope) and the execute wrappers of its caller's connection (e.g. its
+    request's query recorder).
+    """
+
+    def __init__(self, operation: Callable[[], Any], execute_wrappers: list[Any]) -> None:
+        self.operation = operation
+        self.context = contextvars.copy_context()
+        self.execute_wrappers = execute_wrappers
+        self.wakeup = threading.Event()
+        # Set when this write's thread must commit the next batch.
+        self.leading = False
+        self.done = False
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+    def finish(self, result: object = None, error: BaseException | None = None) -> None:
+        """Record the outcome and wake the waiting thread."""
+        self.result, self.error, self.done = result, error, True
+        self.wakeup.set()
+
+
+class WriteCoordinator:
+    """Serializes the writes of every process of a host to one database.
+
+    Within a process, writes queue in FIFO order. The thread of the oldest
+    write leads: it takes the host-wide file lock, applies up to `max_batch`
+    queued writes in one transaction, each in its own savepoint, commits once
+    and hands the lead to the thread of the next queued write. Other threads
+    wait for their outcome, so at most one thread per process contends for the
+    lock and SQLite never sees two writers at once.
+
+    A write that has not started after `timeout` seconds fails with
+    `WriteTimeoutError`. Once started, it runs to completion. Writes issued
+    inside a transaction run inline, as they must commit with it. A write runs
+    in the context of its caller, with the execute wrappers of its caller's
+    connection; its `on_commit` hooks run on the leader's thread once the
+    batch commits.
+    """
+
+    def __init__(
+        self,
+        lock_path: Path,
+        timeout: float = 10.0,
+        max_batch: int = 32,
+        atomic: Callable[[], AbstractContextManager[Any]] | None = None,
+        using: str | None = None,
+    ) -> None:
+        """Initialize the coordinator.
+
+        Args:
+            lock_path: File locked by the process writing, shared by the host
+            timeout: Seconds a write may wait before starting
+            max_batch: Maximum number of writes committed together
+            atomic: Factory of the transactions and savepoints writes run in.
+                Defaults to the transactions of the database written.
+            using: Alias of the database written. Defaults to the default
+                database.
+        """
+        self.lock_path = lock_path
+        self.timeout = timeout
+        self.max_batch = max_batch
+        self.using = using
+        self.atomic = atomic or partial(transaction.atomic, using=using)
+        self._queue: deque[_PendingWrite] = deque()
+        self._mutex = threading.Lock()
+        self._leader_active = False
+
+    def run(self, operation: Callable[[], T]) -> T:
+        """Apply a write in turn, returning its result or raising its error."""
+        connection = transaction.get_connection(self.using)
+        if connection.in_atomic_block:
+            return operation()
+
+        pending = _PendingWrite(operation, list(connection.execute_wrappers))
+        with self._mutex:
+            self._queue.append(pending)
+            if not self._leader_active:
+                self._leader_active = pending.leading = True
+
+        deadline = time.monotonic() + self.timeout
+        started = False
+        while not pending.done:
+            if pending.leading:
+                self._lead(deadline)
+                continue
+            remaining = None if started else max(deadline - time.monotonic(), 0)
+            if not pending.wakeup.wait(remaining):
+                with self._mutex:
+                    if not pending.leading and pending in self._queue:
+                        self._queue.remove(pending)
+                        raise WriteTimeoutError("Timed out waiting to write.")
+                # A leader took the write already: wait for its outcome.
+                started = True
+                continue
+            pending.wakeup.clear()
+
+        if pending.error is not None:
+            raise pending.error
+        return cast(T, pending.result)
+
+    def _lead(self, deadline: float) -> None:
+        """Commit the next batch, then hand the lead to the next queued write."""
+        with self._mutex:
+            batch = [
+                self._queue.popleft()
+                for _ in range(min(self.max_batch, len(self._queue)))
+            ]
+        try:
+            self._commit(batch, deadline)
+        finally:
+            with self._mutex:
+                if self._queue:
+                    successor = self._queue[0]
+                    successor.leading = True
+                    successor.wakeup.set()
+                else:
+                    self._leader_active = False
+
+    def _commit(self, batch: list[_PendingWrite], deadline: float) -> None:
+        """Apply a batch of writes in one transaction under the host lock."""
+        connection = transaction.get_connection(self.using)
+        own_wrappers = connection.execute_wrappers
+        try:
+            with self._host_lock(deadline), self.atomic():
+                for pending in batch:
+                    connection.execute_wrappers = pending.execute_wrappers
+                    try:
+                        with self.atomic():
+                            pending.result = pending.context.run(pending.operation)
+                    except Exception as exc:
+                        pending.error = exc
+                    finally:
+                        connection.execute_wrappers = own_wrappers
+        except BaseException as exc:
+            # The batch could not be committed: fail the writes that succeeded.
+            for pending in batch:
+                pending.finish(error=pending.error or exc)
+            if not isinstance(exc, Exception):
+                raise
+            return
+
+        for pending in batch:
+            pending.finish(pending.result, pending.error)
+
+    @contextmanager
+    def _host_lock(self, deadline: float) -> Iterator[None]:
+        """Hold the host-wide file lock, waiting for it up to the deadline."""
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            sleep = HOST_LOCK_MIN_SLEEP
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise WriteTimeoutError(
+                            "Timed out waiting for the write lock."
+                        ) from None
+                    time.sleep(sleep)
+                    sleep = min(sleep * 2, HOST_LOCK_MAX_SLEEP)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
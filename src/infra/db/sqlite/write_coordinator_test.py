@@ -0,0 +1,230 @@
+import tempfile
+import threading
+from collections.abc import Callable
+from contextvars import ContextVar
+from decimal import Decimal
+from functools import partial
+from pathlib import Path
+from types import TracebackType
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from core.models import CompanyModel, DealModel
+from infra.db.deals.coordinated_repository import CoordinatedDealRepository
+from infra.db.deals.db_repository import DealRepositoryDB
+from infra.db.sqlite.write_coordinator import WriteCoordinator, WriteTimeoutError
+
+REQUEST: ContextVar[str] = ContextVar("request", default="none")
+
+
+class FakeAtomic:
+    """Counts the transactions and savepoints entered by a coordinator."""
+
+    def __init__(self) -> None:
+        """Start with no transaction."""
+        self.depth = 0
+        self.transactions = 0
+        self.savepoints = 0
+
+    def __call__(self) -> "FakeAtomic":
+        """Return the context manager, like `transaction.atomic()`."""
+        return self
+
+    def __enter__(self) -> None:
+        """Count a transaction, or a savepoint when nested."""
+        if self.depth:
+            self.savepoints += 1
+        else:
+            self.transactions += 1
+        self.depth += 1
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Leave the transaction or savepoint."""
+        self.depth -= 1
+
+
+class WriteCoordinatorTest(SimpleTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.lock_path = Path(directory.name) / "db.write-lock"
+        self.atomic = FakeAtomic()
+
+    def _coordinator(self, timeout: float = 5.0) -> WriteCoordinator:
+        return WriteCoordinator(self.lock_path, timeout=timeout, atomic=self.atomic)
+
+    def _in_thread(self, target: Callable[[], object]) -> threading.Thread:
+        thread = threading.Thread(target=target)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        return thread
+
+    def test_results_and_errors_are_returned_to_their_caller(self) -> None:
+        coordinator = self._coordinator()
+        empty: dict[str, int] = {}
+        self.assertEqual(coordinator.run(lambda: 42), 42)
+        with self.assertRaises(KeyError):
+            coordinator.run(lambda: empty["missing"])
+        self.assertEqual(coordinator.run(lambda: "next"), "next")
+
+    def test_concurrent_writes_are_applied_in_turn_and_group_committed(self) -> None:
+        coordinator = self._coordinator()
+        release = threading.Event()
+        applied: list[int] = []
+
+        # The first write holds the lead until every other write is queued.
+        first = self._in_thread(lambda: coordinator.run(lambda: release.wait(5)))
+        results: dict[int, int] = {}
+
+        def write(index: int) -> None:
+            def apply() -> int:
+                applied.append(index)
+                return index
+
+            results[index] = coordinator.run(apply)
+
+        writers = [self._in_thread(partial(write, index)) for index in range(10)]
+        while len(coordinator._queue) < 10:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in [first, *writers]:
+            thread.join(5)
+
+        self.assertEqual(results, {index: index for index in range(10)})
+        self.assertEqual(sorted(applied), list(range(10)))
+        self.assertEqual(self.atomic.savepoints, 11)
+        self.assertEqual(self.atomic.transactions, 2)
+
+    def test_writes_run_with_the_state_of_their_caller(self) -> None:
+        coordinator = self._coordinator()
+        release = threading.Event()
+        self._in_thread(lambda: coordinator.run(lambda: release.wait(5)))
+        while not coordinator._leader_active:
+            threading.Event().wait(0.001)
+
+        def wrapper(*args: object) -> object:
+            raise AssertionError("Not called without queries.")
+
+        def caller_state() -> tuple[str, list[object]]:
+            return REQUEST.get(), list(transaction.get_connection().execute_wrappers)
+
+        def write() -> None:
+            REQUEST.set("writer")
+            with transaction.get_connection().execute_wrapper(wrapper):
+                seen.append(coordinator.run(caller_state))
+
+        seen: list[tuple[str, list[object]]] = []
+        # The next leader queues first, and applies the writer's write too.
+        leader = self._in_thread(lambda: coordinator.run(lambda: None))
+        while len(coordinator._queue) < 1:
+            threading.Event().wait(0.001)
+        writer = self._in_thread(write)
+        while len(coordinator._queue) < 2:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in (leader, writer):
+            thread.join(5)
+
+        # Applied by the leader's thread, as if by the writer's.
+        self.assertEqual(seen, [("writer", [wrapper])])
+
+    def test_writes_that_cannot_start_in_time_fail(self) -> None:
+        coordinator = self._coordinator(timeout=0.05)
+        release = threading.Event()
+        self._in_thread(lambda: coordinator.run(lambda: release.wait(5)))
+        while not coordinator._leader_active:
+            threading.Event().wait(0.001)
+
+        with self.assertRaises(WriteTimeoutError):
+            coordinator.run(lambda: "late")
+        release.set()
+
+    def test_processes_share_the_host_lock(self) -> None:
+        # Two coordinators stand for two processes of the host.
+        holder, other = self._coordinator(), self._coordinator(timeout=0.05)
+        release, holding = threading.Event(), threading.Event()
+
+        def hold() -> bool:
+            holding.set()
+            return release.wait(5)
+
+        self._in_thread(lambda: holder.run(hold))
+        holding.wait(5)
+
+        with self.assertRaises(WriteTimeoutError):
+            other.run(lambda: "blocked")
+        release.set()
+
+
+class WriteCoordinatorTransactionTest(TestCase):
+    def test_writes_inside_a_transaction_run_inline(self) -> None:
+        coordinator = WriteCoordinator(Path(tempfile.gettempdir()) / "unused.lock")
+        with transaction.atomic():
+            self.assertEqual(coordinator.run(lambda: "inline"), "inline")
+
+
+class CoordinatedDealRepositoryTest(TransactionTestCase):
+    databases = {"default", "shard"}
+
+    def test_writes_go_through_the_coordinator(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            repo = CoordinatedDealRepository(
+                DealRepositoryDB(), WriteCoordinator(Path(directory) / "db.write-lock")
+            )
+            company = CompanyModel.objects.create(name="Company")
+            deal = repo.create(
+                title="Coordinated",
+                company_id=company.id,
+                value=Decimal(1),
+                tags=None,
+                distributor_id=None,
+            )
+            repo.update(
+                deal_id=deal.id,
+                title="Renamed",
+                distributor_id=None,
+                tags=None,
+                value=None,
+            )
+            self.assertEqual(DealModel.objects.get(id=deal.id).title, "Renamed")
+            with self.assertRaises(ValueError):
+                repo.update(
+                    deal_id=deal.id + 1,
+                    title="X",
+                    distributor_id=None,
+                    tags=None,
+                    value=None,
+                )
+            self.assertTrue(repo.delete(deal.id))
+            self.assertFalse(DealModel.objects.exists())
+
+    def test_from_settings_coordinates_the_deal_database(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            writes = {"COORDINATED": True, "LOCK_PATH": f"{directory}/db.write-lock"}
+            with self.settings(
+                DEALS_WRITES=writes, DEALS_SHARDS={"DATABASES": {"shard": 0}}
+            ):
+                repo = CoordinatedDealRepository.from_settings(
+                    DealRepositoryDB(using="shard")
+                )
+            assert isinstance(repo, CoordinatedDealRepository)
+            in_transaction = repo.coordinator.run(
+                lambda: transaction.get_connection("shard").in_atomic_block
+            )
+            self.assertTrue(in_transaction)
+
+            with (
+                self.settings(
+                    DEALS_WRITES=writes,
+                    DEALS_SHARDS={"DATABASES": {"default": 0, "shard": 1}},
+                ),
+                self.assertRaises(ImproperlyConfigured),
+            ):
+                CoordinatedDealRepository.from_settings(DealRepositoryDB())
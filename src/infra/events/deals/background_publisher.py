@@ -0,0 +1,305 @@
+import fcntl
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Literal
+
+from django.conf import settings
+from django.db import transaction
+
+from domain.deals.events import DealEvent, DealEventType, EventPublisher
+from infra.metrics.registry import registry
+
+logger = logging.getLogger(__name__)
+
+queue_depth = registry.gauge(
+    "deal_events_queue_depth", "Deal events waiting in the background publisher."
+)
+publish_lag = registry.gauge(
+    "deal_events_lag_seconds",
+    "Seconds between the commit of the last batch of deal events sent and its "
+    "hand-off to the broker.",
+)
+
+OverflowPolicy = Literal["block", "drop", "spill"]
+
+DEFAULT_PUBLISHER_SETTINGS: dict[str, Any] = {
+    "PUBLISHER": "outbox",
+    "QUEUE_SIZE": 10_000,
+    "BATCH_SIZE": 500,
+    "FLUSH_INTERVAL": 0.5,
+    "OVERFLOW": "block",
+    "BLOCK_TIMEOUT": 1.0,
+    "SPILL_PATH": None,
+}
+
+
+@dataclass
+class PublisherStats:
+    """Counters of a background publisher."""
+
+    queue_depth: int = 0
+    published: int = 0
+    dropped: int = 0
+    spilled: int = 0
+    failed: int = 0
+    # Seconds between the commit of an event and its hand-off to the broker.
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+
+
+class BackgroundEventPublisher(EventPublisher):
+    """Publishes events from a bounded in-process queue on a dedicated thread.
+
+    Events are queued once the transaction of the write commits, and a daemon
+    thread hands them to `send` in batches, so request threads never wait on
+    the broker. When the queue is full, events wait for room up to a timeout
+    (`block`), are dropped (`drop`), or are appended to a file replayed once the
+    queue drains (`spill`). Queued events are lost if the process dies, so this
+    trades the delivery guarantee of the outbox for lower write latency.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[list[DealEvent]], None],
+        queue_size: int = DEFAULT_PUBLISHER_SETTINGS["QUEUE_SIZE"],
+        batch_size: int = DEFAULT_PUBLISHER_SETTINGS["BATCH_SIZE"],
+        flush_interval: float = DEFAULT_PUBLISHER_SETTINGS["FLUSH_INTERVAL"],
+        overflow: OverflowPolicy = DEFAULT_PUBLISHER_SETTINGS["OVERFLOW"],
+        block_timeout: float = DEFAULT_PUBLISHER_SETTINGS["BLOCK_TIMEOUT"],
+        spill_path: Path | None = DEFAULT_PUBLISHER_SETTINGS["SPILL_PATH"],
+        autostart: bool = True,
+        using: str | None = None,
+    ) -> None:
+        """Initialize the publisher.
+
+        Args:
+            send: Callable handing a batch of events to the broker
+            queue_size: Maximum number of events waiting to be sent
+            batch_size: Maximum number of events sent at once
+            flush_interval: Seconds the thread waits for a batch to fill
+            overflow: What to do with events that don't fit in the queue
+            block_timeout: Seconds `block` waits for room, per `enqueue` call,
+                before dropping
+            spill_path: File receiving overflowing events, required by `spill`
+            autostart: Whether the first event starts the thread
+            using: Alias of the database whose commits queue the events.
+                Defaults to the default database.
+        """
+        if overflow == "spill" and spill_path is None:
+            raise ValueError("The spill overflow policy requires a spill path.")
+
+        self.send = send
+        self.queue: queue.Queue[tuple[float, DealEvent]] = queue.Queue(queue_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.spill_path = spill_path
+        self.autostart = autostart
+        self.using = using
+        self._stats = PublisherStats()
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._last_event_id = 0
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def from_settings(
+        cls, send: Callable[[list[DealEvent]], None], using: str | None = None
+    ) -> "BackgroundEventPublisher":
+        """Build the publisher as configured by the `DEALS_EVENTS` setting."""
+        config = {**DEFAULT_PUBLISHER_SETTINGS, **getattr(settings, "DEALS_EVENTS", {})}
+        spill_path = config["SPILL_PATH"]
+        return cls(
+            send,
+            queue_size=config["QUEUE_SIZE"],
+            batch_size=config["BATCH_SIZE"],
+            flush_interval=config["FLUSH_INTERVAL"],
+            overflow=config["OVERFLOW"],
+            block_timeout=config["BLOCK_TIMEOUT"],
+            spill_path=Path(spill_path) if spill_path else None,
+            using=using,
+        )
+
+    @property
+    def stats(self) -> PublisherStats:
+        """Return a snapshot of the counters, with the current queue depth."""
+        with self._lock:
+            self._stats.queue_depth = self.queue.qsize()
+            return PublisherStats(**vars(self._stats))
+
+    def publish(self, event_type: DealEventType, deal_ids: list[int]) -> None:
+        """Queue one event per deal once the current transaction commits."""
+        transaction.on_commit(
+            lambda: self.enqueue(event_type, deal_ids), using=self.using
+        )
+
+    def enqueue(self, event_type: DealEventType, deal_ids: list[int]) -> None:
+        """Queue one event per deal right away, applying the overflow policy."""
+        if self.autostart:
+            self.start()
+
+        now = time.monotonic()
+        # The events of a call wait for room up to the timeout in total, so a
+        # bulk write doesn't wait once per event.
+        deadline = now + self.block_timeout
+        overflowed: list[DealEvent] = []
+        for deal_id in deal_ids:
+            event = DealEvent(
+                event_id=self._next_event_id(), event_type=event_type, deal_id=deal_id
+            )
+            remaining = deadline - time.monotonic()
+            try:
+                if self.overflow == "block" and remaining > 0:
+                    self.queue.put((now, event), timeout=remaining)
+                else:
+                    self.queue.put_nowait((now, event))
+            except queue.Full:
+                overflowed.append(event)
+        queue_depth.labels().set(self.queue.qsize())
+
+        if overflowed:
+            if self.overflow == "spill":
+                self._spill(overflowed)
+            else:
+                self._count(dropped=len(overflowed))
+                logger.warning("Dropped %d deal event(s): queue full", len(overflowed))
+
+    def start(self) -> None:
+        """Start the publishing thread, unless it is running already."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="deal-event-publisher", daemon=True
+                )
+                self._thread.start()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued event was handled, returning whether it was."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.queue.unfinished_tasks == 0:
+                return True
+            time.sleep(0.005)
+        return False
+
+    def _next_event_id(self) -> int:
+        """Return an ID from the clock, increasing within the process."""
+        with self._lock:
+            self._last_event_id = max(self._last_event_id + 1, time.time_ns())
+            return self._last_event_id
+
+    def _count(self, **increments: int) -> None:
+        """Add to the counters."""
+        with self._lock:
+            for name, increment in increments.items():
+                setattr(self._stats, name, getattr(self._stats, name) + increment)
+
+    def _run(self) -> None:
+        """Send queued events in batches, forever."""
+        while True:
+            try:
+                first = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._replay_spill()
+                continue
+
+            # Wait up to the flush interval for the batch to fill.
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(
+                        self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+                    )
+                except queue.Empty:
+                    break
+            queue_depth.labels().set(self.queue.qsize())
+
+            try:
+                self._send([event for _, event in batch], enqueued_at=batch[0][0])
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _send(self, events: list[DealEvent], enqueued_at: float | None = None) -> None:
+        """Send a batch, spilling or counting it as failed if the broker errors."""
+        try:
+            self.send(events)
+        except Exception:
+            logger.exception("Failed to publish %d deal event(s)", len(events))
+            if self.overflow == "spill":
+                self._spill(events)
+            else:
+                self._count(failed=len(events))
+            return
+
+        self._count(published=len(events))
+        if enqueued_at is not None:
+            lag = time.monotonic() - enqueued_at
+            publish_lag.labels().set(lag)
+            with self._lock:
+                self._stats.last_lag = lag
+                self._stats.max_lag = max(self._stats.max_lag, lag)
+
+    def _spill(self, events: list[DealEvent]) -> None:
+        """Append events to the spill file, one JSON object per line.
+
+        The file may be shared by the processes of a host: appends hold its
+        lock, and go to a new file once a replay claimed the current one.
+        """
+        if self.spill_path is None:
+            raise RuntimeError("No spill path configured.")
+
+        with self._spill_lock:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            while True:
+                with self.spill_path.open("a") as spill_file:
+                    fcntl.flock(spill_file, fcntl.LOCK_EX)
+                    if _is_linked(spill_file, self.spill_path):
+                        spill_file.writelines(
+                            event.model_dump_json() + "\n" for event in events
+                        )
+                        break
+        self._count(spilled=len(events))
+
+    def _replay_spill(self) -> None:
+        """Send the spilled events while the queue is idle.
+
+        The spill file is first renamed, so that appends made meanwhile go to a
+        new file, and read once the appends to it are over.
+        """
+        if self.spill_path is None:
+            return
+
+        claimed = self.spill_path.with_name(
+            f"{self.spill_path.name}.{os.getpid()}-{uuid.uuid4().hex}.replay"
+        )
+        try:
+            self.spill_path.rename(claimed)
+        except FileNotFoundError:
+            return
+        with claimed.open() as spill_file:
+            fcntl.flock(spill_file, fcntl.LOCK_EX)
+            lines = spill_file.read().splitlines()
+        claimed.unlink()
+
+        events = [DealEvent(**json.loads(line)) for line in lines if line]
+        for start in range(0, len(events), self.batch_size):
+            self._send(events[start : start + self.batch_size])
+
+
+def _is_linked(file: IO[str], path: Path) -> bool:
+    """Return whether an open file is still the one at its path."""
+    try:
+        return os.stat(path).st_ino == os.fstat(file.fileno()).st_ino
+    except FileNotFoundError:
+        return False
@@ -0,0 +1,179 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+from django.db import transaction
+from django.test import TestCase
+
+from domain.deals.events import DealEvent
+from infra.events.deals.background_publisher import (
+    BackgroundEventPublisher,
+    publish_lag,
+    queue_depth,
+)
+
+
+def _summary(batches: list[list[DealEvent]]) -> list[list[tuple[str, int]]]:
+    return [[(event.event_type, event.deal_id) for event in batch] for batch in batches]
+
+
+class BackgroundEventPublisherTest(TestCase):
+    databases = {"default", "shard"}
+
+    def setUp(self) -> None:
+        self.sent: list[list[DealEvent]] = []
+
+    def _publisher(self, **kwargs: object) -> BackgroundEventPublisher:
+        return BackgroundEventPublisher(
+            self.sent.append,
+            flush_interval=0.01,
+            **kwargs,  # type: ignore[arg-type]
+        )
+
+    def test_events_are_queued_on_commit_and_sent_in_batches(self) -> None:
+        publisher = self._publisher(batch_size=2, autostart=False)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            publisher.publish("created", [1, 2, 3])
+            self.assertEqual(publisher.stats.queue_depth, 0)
+        self.assertEqual(publisher.stats.queue_depth, 3)
+
+        publisher.start()
+        self.assertTrue(publisher.flush())
+        self.assertEqual(
+            _summary(self.sent),
+            [[("created", 1), ("created", 2)], [("created", 3)]],
+        )
+        stats = publisher.stats
+        self.assertEqual((stats.published, stats.queue_depth), (3, 0))
+        self.assertGreater(stats.max_lag, 0)
+
+    def test_events_are_queued_on_commit_of_their_database(self) -> None:
+        publisher = self._publisher(autostart=False, using="shard")
+
+        with (
+            self.captureOnCommitCallbacks() as default_callbacks,
+            self.captureOnCommitCallbacks(using="shard", execute=True),
+        ):
+            publisher.publish("created", [1])
+        self.assertEqual(default_callbacks, [])
+        self.assertEqual(publisher.stats.queue_depth, 1)
+
+    def test_queue_depth_and_lag_are_gauges(self) -> None:
+        publisher = self._publisher(autostart=False)
+        publisher.enqueue("created", [1, 2])
+        self.assertEqual(queue_depth.labels().samples(), [("", {}, 2)])
+
+        publisher.start()
+        self.assertTrue(publisher.flush())
+        self.assertEqual(queue_depth.labels().samples(), [("", {}, 0)])
+        self.assertEqual(
+            publish_lag.labels().samples(), [("", {}, publisher.stats.last_lag)]
+        )
+
+    def test_rolled_back_events_are_not_sent(self) -> None:
+        publisher = self._publisher()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                publisher.publish("updated", [1])
+                raise RuntimeError
+        self.assertEqual(publisher.stats.queue_depth, 0)
+
+    def test_event_ids_increase(self) -> None:
+        publisher = self._publisher(autostart=False)
+        publisher.enqueue("updated", [1, 1, 1])
+
+        event_ids = [publisher.queue.get_nowait()[1].event_id for _ in range(3)]
+        self.assertEqual(event_ids, sorted(set(event_ids)))
+
+    def test_drop_overflow(self) -> None:
+        publisher = self._publisher(queue_size=2, overflow="drop", autostart=False)
+        publisher.enqueue("updated", [1, 2, 3])
+
+        stats = publisher.stats
+        self.assertEqual((stats.queue_depth, stats.dropped), (2, 1))
+
+    def test_block_overflow_waits_then_drops(self) -> None:
+        publisher = self._publisher(
+            queue_size=1, overflow="block", block_timeout=0.01, autostart=False
+        )
+        publisher.enqueue("updated", [1, 2])
+        self.assertEqual(publisher.stats.dropped, 1)
+
+    def test_block_overflow_waits_once_per_call(self) -> None:
+        publisher = self._publisher(
+            queue_size=1, overflow="block", block_timeout=0.2, autostart=False
+        )
+        started = time.monotonic()
+        publisher.enqueue("updated", [1, 2, 3, 4, 5])
+
+        self.assertLess(time.monotonic() - started, 0.6)
+        self.assertEqual(publisher.stats.dropped, 4)
+
+    def test_block_overflow_resumes_when_room_is_made(self) -> None:
+        release = threading.Event()
+        send = Mock(side_effect=lambda events: release.wait(5))
+        publisher = BackgroundEventPublisher(
+            send, queue_size=1, batch_size=1, flush_interval=0.01, block_timeout=5
+        )
+
+        publisher.enqueue("updated", [1, 2])
+        release.set()
+        self.assertTrue(publisher.flush())
+        self.assertEqual(publisher.stats.published, 2)
+        self.assertEqual(publisher.stats.dropped, 0)
+
+    def test_spill_overflow_is_replayed_when_idle(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            spill_path = Path(directory) / "events.spill"
+            publisher = self._publisher(
+                queue_size=1, overflow="spill", spill_path=spill_path, autostart=False
+            )
+            publisher.enqueue("updated", [1, 2, 3])
+            self.assertEqual(len(spill_path.read_text().splitlines()), 2)
+
+            publisher.start()
+            for _ in range(500):
+                if not spill_path.exists() and publisher.stats.published == 3:
+                    break
+                threading.Event().wait(0.01)
+
+        self.assertEqual(
+            sorted(deal_id for batch in _summary(self.sent) for _, deal_id in batch),
+            [1, 2, 3],
+        )
+        self.assertEqual(publisher.stats.spilled, 2)
+
+    def test_spill_after_a_replay_claim_is_kept(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            spill_path = Path(directory) / "events.spill"
+            publisher = self._publisher(
+                queue_size=1, overflow="spill", spill_path=spill_path, autostart=False
+            )
+            publisher.enqueue("updated", [1, 2])
+            claimed = spill_path.with_name("events.spill.claimed")
+            spill_path.rename(claimed)
+            publisher.enqueue("updated", [3])
+
+            self.assertEqual(len(claimed.read_text().splitlines()), 1)
+            self.assertEqual(len(spill_path.read_text().splitlines()), 1)
+            publisher._replay_spill()
+            self.assertFalse(spill_path.exists())
+            self.assertEqual(publisher.stats.published, 1)
+            self.assertEqual(list(Path(directory).iterdir()), [claimed])
+
+    def test_spill_requires_a_path(self) -> None:
+        with self.assertRaises(ValueError):
+            self._publisher(overflow="spill")
+
+    def test_failed_sends_are_counted(self) -> None:
+        publisher = BackgroundEventPublisher(
+            Mock(side_effect=ConnectionError), flush_interval=0.01
+        )
+        publisher.enqueue("deleted", [1])
+
+        self.assertTrue(publisher.flush())
+        self.assertEqual(publisher.stats.failed, 1)
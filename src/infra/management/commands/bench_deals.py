@@ -0,0 +1,87 @@
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from application.benchmarks.deals import load_results, run_suite, save_results
+from application.benchmarks.harness import compare
+
+
+class Command(BaseCommand):
+    """Benchmark the deal repository, use cases and endpoints."""
+
+    help = (
+        "Benchmark deals on seeded databases of each size, save the results as "
+        "JSON and fail on regressions against a baseline."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments."""
+        bench_dir = Path(settings.BASE_DIR) / "var" / "bench"
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[1_000, 100_000, 1_000_000],
+            help="Numbers of deals of the seeded databases.",
+        )
+        parser.add_argument(
+            "--iterations", type=int, default=200, help="Timed calls of each case."
+        )
+        parser.add_argument(
+            "--only", help="Only run the cases whose name starts with this prefix."
+        )
+        parser.add_argument(
+            "--data-dir",
+            type=Path,
+            default=bench_dir,
+            help="Directory of the seeded databases, reused between runs.",
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            default=bench_dir / "results.json",
+            help="File to write the results to.",
+        )
+        parser.add_argument(
+            "--baseline",
+            type=Path,
+            default=Path(settings.BASE_DIR) / "benchmarks" / "baseline.json",
+            help="Results to compare against; skipped if the file does not exist.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Allowed relative increase of a case's p95 latency.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        """Run the benchmarks and compare them against the baseline."""
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1.")
+
+        results = run_suite(
+            options["sizes"],
+            options["data_dir"],
+            options["iterations"],
+            only=options["only"],
+            report=self.stdout.write,
+        )
+        save_results(results, options["output"])
+        self.stdout.write(f"Results written to {options['output']}.")
+
+        baseline: Path = options["baseline"]
+        if baseline.resolve() == options["output"].resolve():
+            self.stdout.write("Baseline saved.")
+            return
+        if not baseline.exists():
+            self.stdout.write(f"No baseline at {baseline}, nothing to compare.")
+            return
+        regressions = compare(results, load_results(baseline), options["tolerance"])
+        if regressions:
+            raise CommandError(
+                "Regressions against the baseline:\n" + "\n".join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
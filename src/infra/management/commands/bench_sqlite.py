@@ -0,0 +1,47 @@
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from infra.db.sqlite.bench import BENCH_PROFILES, run_benchmark
+
+
+class Command(BaseCommand):
+    """Compare SQLite throughput under concurrent load across connection profiles."""
+
+    help = (
+        "Benchmark concurrent reads and writes on a scratch SQLite file, with the "
+        "stock configuration and with the tuned pragma profile."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument("--seconds", type=float, default=5.0)
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--writers", type=int, default=2)
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument(
+            "--profile",
+            choices=sorted(BENCH_PROFILES),
+            action="append",
+            help="Profile to run, repeatable (default: all).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        """Run each profile on its own scratch database and print a summary."""
+        self.stdout.write(f"{'profile':<10}{'reads/s':>12}{'writes/s':>12}{'errors':>10}")
+        for name in options["profile"] or sorted(BENCH_PROFILES):
+            with tempfile.TemporaryDirectory() as directory:
+                result = run_benchmark(
+                    Path(directory) / "bench.sqlite3",
+                    BENCH_PROFILES[name],
+                    readers=options["readers"],
+                    writers=options["writers"],
+                    seconds=options["seconds"],
+                    rows=options["rows"],
+                )
+            self.stdout.write(
+                f"{result.profile:<10}{result.reads_per_second:>12.0f}"
+                f"{result.writes_per_second:>12.0f}{result.errors:>10}"
+            )
@@ -0,0 +1,47 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from infra.db.deals.sharded_repository import ShardedDealRepository
+from infra.db.deals.shards import ShardMap
+
+
+class Command(BaseCommand):
+    """Move the deals of a company to another shard."""
+
+    help = "Move a company's deals to another deal shard, keeping their IDs."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument("company_id", type=int, help="Company to move.")
+        parser.add_argument("database", help="Alias of the target shard.")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report where the company is and how many deals would move.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        """Move the company, or report the move with `--dry-run`."""
+        repository = ShardedDealRepository(ShardMap.from_settings())
+        company_id, database = options["company_id"], options["database"]
+        if database not in repository.shards:
+            raise CommandError(f"{database!r} is not a deal shard.")
+
+        source = repository.shard_map.for_company(company_id)
+        if options["dry_run"]:
+            deals = (
+                repository.shards[source]
+                .deal_manager.filter(company_id=company_id)
+                .count()
+            )
+            self.stdout.write(
+                f"Company {company_id} is in {source!r} with {deals} deal(s)."
+            )
+            return
+
+        moved = repository.move_company(company_id, database)
+        self.stdout.write(
+            f"Moved {moved} deal(s) of company {company_id} from {source!r} "
+            f"to {database!r}."
+        )
@@ -0,0 +1,67 @@
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from infra.profiling.profiler import profiling_settings
+from infra.profiling.report import hottest_functions, largest_allocations, load_dumps
+
+
+class Command(BaseCommand):
+    """Rank the hottest functions and allocations of the profiled requests."""
+
+    help = (
+        "Aggregate the request profiles written by ProfilingMiddleware into the "
+        "functions taking the most time and the lines allocating the most memory."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument(
+            "--directory",
+            type=Path,
+            help="Directory of the profiles. Defaults to PROFILING['DIRECTORY'].",
+        )
+        parser.add_argument("--view", help="Only the requests to this view name.")
+        parser.add_argument(
+            "--sort",
+            choices=("cumtime", "tottime"),
+            default="cumtime",
+            help="Rank functions by time including (cumtime) or excluding "
+            "(tottime) the functions they call.",
+        )
+        parser.add_argument("--limit", type=int, default=30, help="Rows per ranking.")
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        """Print the rankings."""
+        directory = Path(options["directory"] or profiling_settings()["DIRECTORY"])
+        dumps = load_dumps(directory, options["view"])
+        if not dumps:
+            raise CommandError(f"No profiles in {directory}.")
+
+        durations = sorted(dump["duration_ms"] for dump in dumps)
+        median = durations[len(durations) // 2]
+        self.stdout.write(
+            f"{len(dumps)} request(s) profiled, median {median:.1f} ms, "
+            f"max {durations[-1]:.1f} ms"
+        )
+
+        functions, total = hottest_functions(dumps, options["sort"], options["limit"])
+        self.stdout.write(f"\nHottest functions by {options['sort']}")
+        self.stdout.write(
+            f"{'function':<80} {'calls':>9} {'tottime':>9} {'cumtime':>9} {'share':>6}"
+        )
+        for cost in functions:
+            share = getattr(cost, options["sort"]) / total if total else 0.0
+            self.stdout.write(
+                f"{cost.function[-80:]:<80} {cost.calls:>9} {cost.tottime:>9.4f} "
+                f"{cost.cumtime:>9.4f} {share:>6.1%}"
+            )
+
+        self.stdout.write("\nLargest allocations still held when the view returned")
+        self.stdout.write(f"{'line':<80} {'KiB':>10} {'blocks':>9} {'requests':>9}")
+        for site in largest_allocations(dumps, options["limit"]):
+            self.stdout.write(
+                f"{site.location[-80:]:<80} {site.size / 1024:>10.1f} {site.count:>9} "
+                f"{site.requests:>9}"
+            )
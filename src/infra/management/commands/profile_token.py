@@ -0,0 +1,22 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from infra.profiling.profiler import make_token, profiling_settings
+
+
+class Command(BaseCommand):
+    """Print a token to profile requests on demand."""
+
+    help = (
+        "Print a signed token; requests sending it in the PROFILING['HEADER'] header "
+        "are profiled until it expires."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        """Print the token and the header to send it in."""
+        config = profiling_settings()
+        self.stdout.write(f"{config['HEADER']}: {make_token()}")
+        self.stdout.write(
+            f"Valid for {config['TOKEN_MAX_AGE']} second(s), while PROFILING['ENABLED']."
+        )
@@ -0,0 +1,31 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from infra.db.deals.shards import ShardMap
+from infra.db.deals.stats import DealStatsTable
+
+
+class Command(BaseCommand):
+    """Reconcile the deal stats table with the deals."""
+
+    help = "Rebuild the per company, distributor and tag deal stats from the deals."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report the groups whose stats are off, without fixing them.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        """Rebuild the stats of each shard, or count the drifted groups with `--check`."""
+        fixed = sum(
+            DealStatsTable(using=alias).rebuild(dry_run=options["check"])
+            for alias in ShardMap.from_settings().databases
+        )
+        if options["check"]:
+            self.stdout.write(f"{fixed} deal stats group(s) out of date.")
+        else:
+            self.stdout.write(f"Fixed {fixed} deal stats group(s).")
@@ -0,0 +1,37 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from application.tasks.deals.tasks import relay_outbox
+
+
+class Command(BaseCommand):
+    """Publish the pending deal events of the outbox."""
+
+    help = "Publish pending deal events from the outbox, once or continuously."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Events published per message (default: DEALS_OUTBOX['BATCH_SIZE']).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep relaying, sleeping this many seconds when idle (default: once).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        """Relay the outbox until it is empty, or forever with `--interval`."""
+        while True:
+            published = relay_outbox(options["batch_size"])
+            if published:
+                self.stdout.write(f"Relayed {published} deal event(s).")
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
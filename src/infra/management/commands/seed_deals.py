@@ -0,0 +1,101 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+
+from infra.db.deals.seed import SEED_BATCH_SIZE, DealDataset, seed_deals
+
+
+class Command(BaseCommand):
+    """Fill a database with synthetic deals."""
+
+    help = (
+        "Generate deals with skewed companies, distributors and tags for load "
+        "and scale testing. The same seed always generates the same data."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument("deals", type=int, help="Number of deals to add.")
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the data.")
+        parser.add_argument(
+            "--companies",
+            type=int,
+            help="Number of companies (default: one per 100 deals).",
+        )
+        parser.add_argument(
+            "--distributors",
+            type=int,
+            help="Number of distributors (default: one per 1000 deals).",
+        )
+        parser.add_argument(
+            "--tags", type=int, help="Number of tags (default: 50 to 500)."
+        )
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.1,
+            help="Zipf exponent of the popularity of companies, distributors and tags.",
+        )
+        parser.add_argument(
+            "--no-distributor",
+            type=float,
+            default=0.2,
+            help="Share of deals without distributor.",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=1, help="Processes generating deals."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SEED_BATCH_SIZE,
+            help="Deals inserted per transaction.",
+        )
+        parser.add_argument(
+            "--database", default=DEFAULT_DB_ALIAS, help="Database to fill."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        """Generate the deals and report the insert rate."""
+        if options["deals"] < 1 or options["batch_size"] < 1 or options["workers"] < 1:
+            raise CommandError("deals, --batch-size and --workers must be positive.")
+        if not 0 <= options["no_distributor"] <= 1:
+            raise CommandError("--no-distributor must be between 0 and 1.")
+        database = options["database"]
+        if database not in connections:
+            raise CommandError(f"Unknown database {database!r}.")
+        connection = connections[database]
+        if (
+            options["workers"] > 1
+            and isinstance(connection, SQLiteDatabaseWrapper)
+            and connection.is_in_memory_db()
+        ):
+            raise CommandError("An in-memory database cannot be shared by workers.")
+
+        sized = DealDataset.for_size(options["deals"], options["seed"], options["skew"])
+        dataset = DealDataset(
+            deals=options["deals"],
+            companies=options["companies"] or sized.companies,
+            distributors=options["distributors"] or sized.distributors,
+            tags=options["tags"] or sized.tags,
+            seed=options["seed"],
+            skew=options["skew"],
+            no_distributor=options["no_distributor"],
+        )
+
+        started = time.perf_counter()
+        added = seed_deals(
+            dataset,
+            workers=options["workers"],
+            batch_size=options["batch_size"],
+            using=database,
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"Added {added} deals of {dataset.companies} companies, "
+            f"{dataset.distributors} distributors and {dataset.tags} tags "
+            f"in {elapsed:.1f}s ({added / elapsed:.0f} deals/s)."
+        )
@@ -0,0 +1,64 @@
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from infra.db.instrumentation.slow_queries import (
+    group_entries,
+    read_entries,
+    slow_query_log_settings,
+)
+
+
+class Command(BaseCommand):
+    """Report the slow queries logged, grouped by statement."""
+
+    help = (
+        "Group the slow query log by normalized statement, the longest total time "
+        "first, with the tables scanned in full and where the queries come from."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument(
+            "--path",
+            type=Path,
+            help="Slow query log to read. Defaults to SLOW_QUERY_LOG['PATH'].",
+        )
+        parser.add_argument("--limit", type=int, default=20, help="Statements shown.")
+        parser.add_argument(
+            "--full-scans",
+            action="store_true",
+            help="Only the statements scanning a table in full.",
+        )
+        parser.add_argument(
+            "--plans", action="store_true", help="Print the plan of each statement."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        """Print the statements with their count, durations and full scans."""
+        path = Path(options["path"] or slow_query_log_settings()["PATH"])
+        groups = group_entries(read_entries(path))
+        if not groups:
+            raise CommandError(f"No slow queries logged in {path}.")
+        if options["full_scans"]:
+            groups = [group for group in groups if group.full_scans]
+
+        self.stdout.write(
+            f"{'fingerprint':<16} {'count':>7} {'total ms':>10} {'mean ms':>9} "
+            f"{'max ms':>9}  full scans"
+        )
+        for group in groups[: options["limit"]]:
+            self.stdout.write(
+                f"{group.fingerprint:<16} {group.count:>7} {group.total_ms:>10.1f} "
+                f"{group.mean_ms:>9.1f} {group.max_ms:>9.1f}  "
+                f"{', '.join(sorted(group.full_scans)) or '-'}"
+            )
+            self.stdout.write(f"  {group.statement}")
+            origins = ", ".join(
+                f"{origin} ({count})" for origin, count in group.origins.most_common(3)
+            )
+            self.stdout.write(f"  from {origins}")
+            if options["plans"]:
+                for line in group.plan:
+                    self.stdout.write(f"    {line}")
@@ -0,0 +1,48 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from infra.celery.results import (
+    prune_task_results,
+    result_policy,
+    task_result_table_bytes,
+    task_result_usage,
+)
+
+
+class Command(BaseCommand):
+    """Report the storage used by the Celery result backend."""
+
+    help = "Report rows and bytes stored by the django-db Celery result backend."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Delete expired results first, as set by TASK_RESULT_POLICIES.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        """Print the rows and payload bytes per task and status."""
+        if options["prune"]:
+            self.stdout.write(f"Pruned {prune_task_results()} expired result(s).")
+
+        usage = task_result_usage()
+        self.stdout.write(
+            f"{'task':<60} {'status':<8} {'policy':<12} {'rows':>8} {'bytes':>12}"
+        )
+        for row in usage:
+            policy = result_policy(row.task_name)["POLICY"]
+            self.stdout.write(
+                f"{row.task_name or '-':<60} {row.status:<8} {policy:<12} "
+                f"{row.rows:>8} {row.payload_bytes:>12}"
+            )
+
+        total_rows = sum(row.rows for row in usage)
+        total_bytes = sum(row.payload_bytes for row in usage)
+        self.stdout.write(f"Total: {total_rows} row(s), {total_bytes} payload byte(s)")
+
+        table_bytes = task_result_table_bytes()
+        if table_bytes is not None:
+            self.stdout.write(f"Table and indexes on disk: {table_bytes} byte(s)")
@@ -0,0 +1,237 @@
+from collections.abc import AsyncIterator, Iterator
+from datetime import datetime
+from decimal import Decimal
+
+from domain.deals.entity import DealEntity, NewDeal
+from domain.deals.filters import DealFilters
+from domain.deals.pagination import DealOrdering, DealPage
+from domain.deals.repository import AsyncDealRepository, DealRepository
+from domain.deals.stats import DealStats, StatsDimension
+from infra.metrics.instrumentation import timed
+from infra.metrics.registry import metrics_settings, registry
+
+repository_duration = registry.histogram(
+    "deal_repository_duration_seconds",
+    "Duration of deal repository calls; iterations are timed until exhausted.",
+    ("method", "outcome"),
+)
+
+
+class InstrumentedDealRepository(DealRepository):
+    """DealRepository timing every call to the repository it wraps."""
+
+    def __init__(self, repository: DealRepository) -> None:
+        """Initialize with the repository to time."""
+        self.repository = repository
+
+    @classmethod
+    def from_settings(cls, repository: DealRepository) -> DealRepository:
+        """Wrap the repository, unless metrics are disabled."""
+        return cls(repository) if metrics_settings()["ENABLED"] else repository
+
+    def create(
+        self,
+        title: str,
+        company_id: int,
+        value: Decimal,
+        tags: list[int] | None,
+        distributor_id: int | None,
+    ) -> DealEntity:
+        """Create a new deal."""
+        with timed(repository_duration, "create"):
+            return self.repository.create(
+                title=title,
+                company_id=company_id,
+                value=value,
+                tags=tags,
+                distributor_id=distributor_id,
+            )
+
+    def bulk_create(self, deals: list[NewDeal]) -> list[DealEntity]:
+        """Create many deals at once."""
+        with timed(repository_duration, "bulk_create"):
+            return self.repository.bulk_create(deals)
+
+    def get_one(
+        self, deal_id: int, min_version: datetime | None = None
+    ) -> DealEntity | None:
+        """Retrieve a deal by its ID."""
+        with timed(repository_duration, "get_one"):
+            return self.repository.get_one(deal_id, min_version)
+
+    def get_all(self) -> list[DealEntity]:
+        """Retrieve all deals."""
+        with timed(repository_duration, "get_all"):
+            return self.repository.get_all()
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[DealEntity]:
+        """Iterate over all deals ordered by ID."""
+        with timed(repository_duration, "iter_all"):
+            yield from self.repository.iter_all(batch_size=batch_size)
+
+    def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> DealPage:
+        """Retrieve a page of deals."""
+        with timed(repository_duration, "get_page"):
+            return self.repository.get_page(
+                limit=limit, cursor=cursor, ordering=ordering, filters=filters
+            )
+
+    def get_version(self, deal_id: int) -> datetime | None:
+        """Return when a deal was last updated."""
+        with timed(repository_duration, "get_version"):
+            return self.repository.get_version(deal_id)
+
+    def get_page_versions(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> list[tuple[int, datetime]]:
+        """Return the (id, updated_at) pairs of a page."""
+        with timed(repository_duration, "get_page_versions"):
+            return self.repository.get_page_versions(
+                limit=limit, cursor=cursor, ordering=ordering, filters=filters
+            )
+
+    def search(self, query: str, limit: int, cursor: str | None = None) -> DealPage:
+        """Search deals by title."""
+        with timed(repository_duration, "search"):
+            return self.repository.search(query, limit, cursor)
+
+    def get_stats(
+        self, dimension: StatsDimension, group_ids: list[int]
+    ) -> list[DealStats]:
+        """Return the deal count and value sum of groups."""
+        with timed(repository_duration, "get_stats"):
+            return self.repository.get_stats(dimension, group_ids)
+
+    def update(
+        self,
+        deal_id: int,
+        title: str | None,
+        distributor_id: int | None,
+        tags: list[int] | None,
+        value: Decimal | None,
+    ) -> DealEntity | None:
+        """Update an existing deal."""
+        with timed(repository_duration, "update"):
+            return self.repository.update(
+                deal_id=deal_id,
+                title=title,
+                distributor_id=distributor_id,
+                tags=tags,
+                value=value,
+            )
+
+    def delete(self, deal_id: int) -> bool:
+        """Delete a deal by its ID."""
+        with timed(repository_duration, "delete"):
+            return self.repository.delete(deal_id)
+
+
+class AsyncInstrumentedDealRepository(AsyncDealRepository):
+    """AsyncDealRepository timing every call to the repository it wraps.
+
+    Its methods are labelled with an "async_" prefix.
+    """
+
+    def __init__(self, repository: AsyncDealRepository) -> None:
+        """Initialize with the repository to time."""
+        self.repository = repository
+
+    @classmethod
+    def from_settings(cls, repository: AsyncDealRepository) -> AsyncDealRepository:
+        """Wrap the repository, unless metrics are disabled."""
+        return cls(repository) if metrics_settings()["ENABLED"] else repository
+
+    async def create(
+        self,
+        title: str,
+        company_id: int,
+        value: Decimal,
+        tags: list[int] | None,
+        distributor_id: int | None,
+    ) -> DealEntity:
+        """Create a new deal."""
+        with timed(repository_duration, "async_create"):
+            return await self.repository.create(
+                title=title,
+                company_id=company_id,
+                value=value,
+                tags=tags,
+                distributor_id=distributor_id,
+            )
+
+    async def get_one(
+        self, deal_id: int, min_version: datetime | None = None
+    ) -> DealEntity | None:
+        """Retrieve a deal by its ID."""
+        with timed(repository_duration, "async_get_one"):
+            return await self.repository.get_one(deal_id, min_version)
+
+    async def iter_all(self, batch_size: int = 1000) -> AsyncIterator[DealEntity]:
+        """Iterate over all deals ordered by ID."""
+        with timed(repository_duration, "async_iter_all"):
+            async for deal in self.repository.iter_all(batch_size=batch_size):
+                yield deal
+
+    async def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> DealPage:
+        """Retrieve a page of deals."""
+        with timed(repository_duration, "async_get_page"):
+            return await self.repository.get_page(
+                limit=limit, cursor=cursor, ordering=ordering, filters=filters
+            )
+
+    async def get_version(self, deal_id: int) -> datetime | None:
+        """Return when a deal was last updated."""
+        with timed(repository_duration, "async_get_version"):
+            return await self.repository.get_version(deal_id)
+
+    async def get_page_versions(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        ordering: DealOrdering = "id",
+        filters: DealFilters | None = None,
+    ) -> list[tuple[int, datetime]]:
+        """Return the (id, updated_at) pairs of a page."""
+        with timed(repository_duration, "async_get_page_versions"):
+            return await self.repository.get_page_versions(
+                limit=limit, cursor=cursor, ordering=ordering, filters=filters
+            )
+
+    async def update(
+        self,
+        deal_id: int,
+        title: str | None,
+        distributor_id: int | None,
+        tags: list[int] | None,
+        value: Decimal | None,
+    ) -> DealEntity | None:
+        """Update an existing deal."""
+        with timed(repository_duration, "async_update"):
+            return await self.repository.update(
+                deal_id=deal_id,
+                title=title,
+                distributor_id=distributor_id,
+                tags=tags,
+                value=value,
+            )
+
+    async def delete(self, deal_id: int) -> bool:
+        """Delete a deal by its ID."""
+        with timed(repository_duration, "async_delete"):
+            return await self.repository.delete(deal_id)
@@ -0,0 +1,67 @@
+import math
+from collections.abc import Iterable
+from typing import Any
+
+# Content type of the Prometheus text format.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def merge(snapshots: Iterable[list[dict[str, Any]]]) -> list[dict[str, Any]]:
+    """Merge the metric families of several processes, summing their samples."""
+    families: dict[str, dict[str, Any]] = {}
+    values: dict[str, dict[tuple[str, tuple[tuple[str, str], ...]], float]] = {}
+    for snapshot in snapshots:
+        for family in snapshot:
+            name = family["name"]
+            families.setdefault(name, {**family, "samples": []})
+            family_values = values.setdefault(name, {})
+            for sample, labels, value in family["samples"]:
+                key = (sample, tuple(sorted(labels.items())))
+                family_values[key] = family_values.get(key, 0.0) + value
+
+    return [
+        {
+            **family,
+            "samples": [
+                [sample, dict(labels), value]
+                for (sample, labels), value in values[name].items()
+            ],
+        }
+        for name, family in sorted(families.items())
+    ]
+
+
+def render(families: Iterable[dict[str, Any]]) -> str:
+    """Render metric families in the Prometheus text format."""
+    lines = []
+    for family in families:
+        lines.append(f"# HELP {family['name']} {_escape_help(family['help'])}")
+        lines.append(f"# TYPE {family['name']} {family['type']}")
+        for sample, labels, value in family["samples"]:
+            if labels:
+                pairs = ",".join(
+                    f'{name}="{_escape_label(str(label))}"'
+                    for name, label in labels.items()
+                )
+                lines.append(f"{sample}{{{pairs}}} {_format_value(value)}")
+            else:
+                lines.append(f"{sample} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", r"\\").replace("\n", r"\n")
+
+
+def _escape_label(text: str) -> str:
+    return text.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value.is_integer() and abs(value) < 2**53:
+        return str(int(value))
+    return repr(value)
@@ -0,0 +1,110 @@
+import functools
+import inspect
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from celery import signals
+
+from infra.metrics.multiprocess import ensure_flusher
+from infra.metrics.registry import HistogramChild, Metric, metrics_settings, registry
+
+usecase_duration = registry.histogram(
+    "usecase_duration_seconds",
+    "Duration of use case executions.",
+    ("usecase", "outcome"),
+)
+celery_task_duration = registry.histogram(
+    "celery_task_duration_seconds",
+    "Duration of Celery task runs in this process.",
+    ("task", "state"),
+)
+celery_tasks_sent = registry.counter(
+    "celery_tasks_sent", "Celery task messages sent, emitters included.", ("task",)
+)
+
+
+@contextmanager
+def timed(histogram: Metric[HistogramChild], *labels: str) -> Iterator[None]:
+    """Observe the duration of the block, labelled with its outcome.
+
+    The outcome, added after `labels`, is "ok" unless the block raised.
+    Closing a generator timed by the block counts as "ok".
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    except GeneratorExit:
+        outcome = "ok"
+        raise
+    finally:
+        histogram.labels(*labels, outcome).observe(time.perf_counter() - start)
+
+
+def instrument_usecase[U](usecase: U) -> U:
+    """Time every `execute()` of a use case, sync or async; returns the use case.
+
+    Left as is when metrics are disabled.
+    """
+    if not metrics_settings()["ENABLED"]:
+        return usecase
+    name = type(usecase).__name__
+    execute = usecase.execute  # type: ignore[attr-defined]
+
+    if inspect.iscoroutinefunction(execute):
+
+        @functools.wraps(execute)
+        async def timed_execute(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            with timed(usecase_duration, name):
+                return await execute(*args, **kwargs)
+
+    else:
+
+        @functools.wraps(execute)
+        def timed_execute(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            with timed(usecase_duration, name):
+                return execute(*args, **kwargs)
+
+    usecase.execute = timed_execute  # type: ignore[attr-defined]
+    return usecase
+
+
+# Start times of the tasks running in this process, by task ID.
+_task_starts: dict[str, float] = {}
+
+
+def task_prerun(task_id: str, **kwargs: Any) -> None:  # noqa: ANN401
+    """Record when a task starts (Celery `task_prerun` signal)."""
+    ensure_flusher(registry)
+    _task_starts[task_id] = time.perf_counter()
+
+
+def task_postrun(
+    task_id: str,
+    task: Any,  # noqa: ANN401
+    state: str | None = None,
+    **kwargs: Any,  # noqa: ANN401
+) -> None:
+    """Observe the duration of a task that ran (Celery `task_postrun` signal)."""
+    start = _task_starts.pop(task_id, None)
+    if start is not None:
+        celery_task_duration.labels(task.name, state or "UNKNOWN").observe(
+            time.perf_counter() - start
+        )
+
+
+def after_task_publish(sender: str | None = None, **kwargs: Any) -> None:  # noqa: ANN401
+    """Count a task message sent (Celery `after_task_publish` signal)."""
+    celery_tasks_sent.labels(sender or "unknown").inc()
+
+
+def connect_celery_signals() -> None:
+    """Record the Celery task metrics, unless metrics are disabled."""
+    if not metrics_settings()["ENABLED"]:
+        return
+    signals.task_prerun.connect(task_prerun, weak=False)
+    signals.task_postrun.connect(task_postrun, weak=False)
+    signals.after_task_publish.connect(after_task_publish, weak=False)
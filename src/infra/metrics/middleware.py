@@ -0,0 +1,49 @@
+import time
+from collections.abc import Callable
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponseBase
+
+from infra.metrics.multiprocess import ensure_flusher
+from infra.metrics.registry import metrics_settings, registry
+
+request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Duration of HTTP requests, until their response is returned.",
+    ("view", "method", "status"),
+)
+requests_in_progress = registry.gauge(
+    "http_requests_in_progress", "HTTP requests being handled."
+)
+
+
+class MetricsMiddleware:
+    """Time every request by view, method and status.
+
+    Requests matching no URL are labelled "unmatched". Not used when metrics
+    are disabled.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        """Initialize the middleware, unless metrics are disabled."""
+        if not metrics_settings()["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        """Time the request."""
+        ensure_flusher(registry)
+        in_progress = requests_in_progress.labels()
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            in_progress.dec()
+        match = request.resolver_match
+        request_duration.labels(
+            match.view_name or match._func_path if match else "unmatched",
+            request.method,
+            response.status_code,
+        ).observe(time.perf_counter() - start)
+        return response
@@ -0,0 +1,168 @@
+import atexit
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from infra.metrics.exposition import merge
+from infra.metrics.registry import MetricsRegistry, metrics_settings
+
+# Header of a metrics file: a sequence number, odd while the file is being
+# written, and the length of the JSON payload that follows.
+HEADER = struct.Struct("<QQ")
+INITIAL_FILE_SIZE = 64 * 1024
+# Attempts to read a file that keeps being written meanwhile.
+READ_ATTEMPTS = 10
+
+
+class ProcessMetricsFile:
+    """Memory-mapped file through which a process publishes its metrics.
+
+    The process writes its whole snapshot at once; readers in other processes
+    retry when the sequence number shows they raced with a write, so neither
+    side ever waits for a lock.
+    """
+
+    def __init__(self, directory: Path, pid: int) -> None:
+        """Create the file of a process in the directory.
+
+        The name is unique to the process, so a process reusing the PID of one
+        that exited does not overwrite its counters.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / f"metrics-{pid}-{uuid.uuid4().hex}.mmap"
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size < INITIAL_FILE_SIZE:
+            os.ftruncate(self._fd, INITIAL_FILE_SIZE)
+        self._map = mmap.mmap(self._fd, 0)
+        self._sequence = HEADER.unpack_from(self._map)[0] & ~1
+
+    def write(self, families: list[dict[str, Any]]) -> None:
+        """Replace the metrics in the file."""
+        payload = json.dumps(families, separators=(",", ":")).encode()
+        size = HEADER.size + len(payload)
+        if size > len(self._map):
+            self._map.close()
+            os.ftruncate(self._fd, max(size, 2 * os.fstat(self._fd).st_size))
+            self._map = mmap.mmap(self._fd, 0)
+
+        HEADER.pack_into(self._map, 0, self._sequence + 1, len(payload))
+        self._map[HEADER.size : size] = payload
+        self._sequence += 2
+        HEADER.pack_into(self._map, 0, self._sequence, len(payload))
+
+    def close(self) -> None:
+        """Unmap and close the file, leaving it in the directory."""
+        self._map.close()
+        os.close(self._fd)
+
+
+def read_metrics_file(path: Path) -> list[dict[str, Any]] | None:
+    """Return the metrics in a process's file, None if it could not be read."""
+    for _ in range(READ_ATTEMPTS):
+        try:
+            with (
+                path.open("rb") as file,
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view,
+            ):
+                sequence, length = HEADER.unpack_from(view)
+                payload = view[HEADER.size : HEADER.size + length]
+                if sequence % 2 == 0 and HEADER.unpack_from(view)[0] == sequence:
+                    return json.loads(payload) if length else []
+        except (OSError, ValueError):
+            # Truncated while resized, or emptied: try again.
+            pass
+    return None
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class MetricsFlusher:
+    """Thread writing the metrics of this process to its file periodically."""
+
+    def __init__(
+        self, registry: MetricsRegistry, directory: Path, interval: float
+    ) -> None:
+        """Initialize for the current process; `start()` starts writing."""
+        self.registry = registry
+        self.pid = os.getpid()
+        self.file = ProcessMetricsFile(directory, self.pid)
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Write the metrics every interval, and on exit."""
+        threading.Thread(target=self._run, name="metrics-flusher", daemon=True).start()
+        atexit.register(self.flush)
+
+    def flush(self) -> None:
+        """Write the current metrics to the file."""
+        with self._lock:
+            self.file.write(self.registry.collect())
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+
+_flusher: MetricsFlusher | None = None
+_flusher_lock = threading.Lock()
+
+
+def ensure_flusher(registry: MetricsRegistry) -> MetricsFlusher | None:
+    """Start writing this process's metrics, if a shared directory is set.
+
+    Cheap enough to call on every request: a forked worker gets a flusher of
+    its own on its first call.
+    """
+    global _flusher  # noqa: PLW0603
+    flusher = _flusher
+    if flusher is not None and flusher.pid == os.getpid():
+        return flusher
+    config = metrics_settings()
+    if config["MULTIPROCESS_DIR"] is None:
+        return None
+    with _flusher_lock:
+        if _flusher is None or _flusher.pid != os.getpid():
+            _flusher = MetricsFlusher(
+                registry, Path(config["MULTIPROCESS_DIR"]), config["FLUSH_INTERVAL"]
+            )
+            _flusher.start()
+        return _flusher
+
+
+def collect_all(registry: MetricsRegistry) -> list[dict[str, Any]]:
+    """Return the metrics of every process of the host, or of this one.
+
+    Counters and histograms of the processes are summed, including those of
+    processes that exited. Gauges are summed over the live processes only.
+    """
+    flusher = ensure_flusher(registry)
+    if flusher is None:
+        return registry.collect()
+
+    flusher.flush()
+    snapshots = []
+    for path in sorted(flusher.file.path.parent.glob("metrics-*.mmap")):
+        families = read_metrics_file(path)
+        if families is None:
+            continue
+        pid = int(path.stem.split("-")[1])
+        if not _is_alive(pid):
+            families = [family for family in families if family["type"] != "gauge"]
+        snapshots.append(families)
+    return merge(snapshots)
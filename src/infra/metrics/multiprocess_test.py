@@ -0,0 +1,76 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from infra.metrics import multiprocess
+from infra.metrics.multiprocess import (
+    MetricsFlusher,
+    ProcessMetricsFile,
+    read_metrics_file,
+)
+from infra.metrics.registry import MetricsRegistry
+
+# Far above any PID the kernel hands out, so never a live process.
+DEAD_PID = 2**30
+
+
+class ProcessMetricsFileTest(SimpleTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def test_write_and_read(self) -> None:
+        registry = MetricsRegistry()
+        registry.counter("jobs", "Jobs done.").labels().inc(3)
+        metrics_file = ProcessMetricsFile(self.directory, os.getpid())
+        self.addCleanup(metrics_file.close)
+
+        metrics_file.write(registry.collect())
+        self.assertEqual(read_metrics_file(metrics_file.path), registry.collect())
+
+        # Snapshots larger than the file grow it.
+        registry.counter("big", "Many labels.", ("n",))
+        for index in range(5000):
+            registry.counter("big", "Many labels.", ("n",)).labels(index).inc()
+        metrics_file.write(registry.collect())
+        self.assertEqual(read_metrics_file(metrics_file.path), registry.collect())
+
+    def test_processes_reusing_a_pid_have_files_of_their_own(self) -> None:
+        first = ProcessMetricsFile(self.directory, DEAD_PID)
+        first.write([])
+        first.close()
+        second = ProcessMetricsFile(self.directory, DEAD_PID)
+        self.addCleanup(second.close)
+
+        self.assertNotEqual(first.path, second.path)
+        self.assertEqual(read_metrics_file(first.path), [])
+
+    def test_collect_all_merges_processes(self) -> None:
+        registry = MetricsRegistry()
+        registry.counter("jobs", "Jobs done.").labels().inc()
+        registry.gauge("busy", "Busy workers.").labels().set(1)
+        # A process that exited, having counted 2 jobs while busy.
+        dead = ProcessMetricsFile(self.directory, DEAD_PID)
+        dead_registry = MetricsRegistry()
+        dead_registry.counter("jobs", "Jobs done.").labels().inc(2)
+        dead_registry.gauge("busy", "Busy workers.").labels().set(1)
+        dead.write(dead_registry.collect())
+        dead.close()
+
+        self.addCleanup(setattr, multiprocess, "_flusher", None)
+        with (
+            self.settings(METRICS={"MULTIPROCESS_DIR": self.directory}),
+            # Written by collect_all itself, no need for the thread.
+            mock.patch.object(MetricsFlusher, "start"),
+        ):
+            families = {
+                family["name"]: family["samples"]
+                for family in multiprocess.collect_all(registry)
+            }
+
+        self.assertEqual(families["jobs"], [["jobs_total", {}, 3.0]])
+        self.assertEqual(families["busy"], [["busy", {}, 1.0]])
@@ -0,0 +1,306 @@
+import bisect
+import math
+import re
+import threading
+import weakref
+from collections.abc import Iterable
+from typing import Any, Literal, cast
+
+from django.conf import settings
+
+MetricType = Literal["counter", "gauge", "histogram"]
+
+# Upper bounds in seconds of the latency buckets, from 1ms to 10s.
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    10.0,
+)
+
+DEFAULT_METRICS_SETTINGS: dict[str, Any] = {
+    "ENABLED": True,
+    # Directory shared by the processes of a host (e.g. gunicorn workers), each
+    # writing its metrics there; None serves the metrics of each process only.
+    "MULTIPROCESS_DIR": None,
+    "FLUSH_INTERVAL": 1.0,  # Seconds between writes of a process's metrics
+}
+
+METRIC_NAME = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+
+
+def metrics_settings() -> dict[str, Any]:
+    """Return the `METRICS` setting, completed with the defaults."""
+    return {**DEFAULT_METRICS_SETTINGS, **getattr(settings, "METRICS", {})}
+
+
+class _ThreadOwner:
+    """Held by a thread only, so it is collected once the thread ends."""
+
+    __slots__ = ("__weakref__",)
+
+
+class _ThreadCells:
+    """Values updated without locks: each thread adds to cells of its own.
+
+    Once a thread ends, its cells are folded into base values, so nothing
+    added is lost and threads that come and go don't accumulate cells.
+    """
+
+    __slots__ = ("_base", "_cells", "_local", "_lock", "_size")
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._base = [0.0] * size
+        # The cells of the live threads, by their identity.
+        self._cells: dict[int, list[float]] = {}
+
+    def cell(self) -> list[float]:
+        try:
+            return cast(list[float], self._local.cell)
+        except AttributeError:
+            cell = self._local.cell = [0.0] * self._size
+            # The thread-local values are dropped when the thread ends.
+            owner = self._local.owner = _ThreadOwner()
+            with self._lock:
+                self._cells[id(cell)] = cell
+            weakref.finalize(owner, self._fold, cell).atexit = False
+            return cell
+
+    def _fold(self, cell: list[float]) -> None:
+        with self._lock:
+            del self._cells[id(cell)]
+            for index, value in enumerate(cell):
+                self._base[index] += value
+
+    def totals(self) -> list[float]:
+        with self._lock:
+            cells = [self._base, *self._cells.values()]
+            return [sum(cell[index] for cell in cells) for index in range(self._size)]
+
+
+class CounterChild:
+    """Counter of one combination of label values."""
+
+    __slots__ = ("_values",)
+
+    def __init__(self) -> None:
+        """Initialize at zero."""
+        self._values = _ThreadCells(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter."""
+        self._values.cell()[0] += amount
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        """Return the (name suffix, extra labels, value) samples of the counter."""
+        return [("_total", {}, self._values.totals()[0])]
+
+
+class GaugeChild:
+    """Gauge of one combination of label values."""
+
+    __slots__ = ("_lock", "_value")
+
+    def __init__(self) -> None:
+        """Initialize at zero."""
+        # Set overwrites the value of every thread: gauges keep one, locked.
+        self._lock = threading.Lock()
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        """Set the gauge."""
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the gauge."""
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the gauge."""
+        with self._lock:
+            self._value -= amount
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        """Return the (name suffix, extra labels, value) samples of the gauge."""
+        return [("", {}, self._value)]
+
+
+class HistogramChild:
+    """Histogram of one combination of label values."""
+
+    __slots__ = ("_buckets", "_values")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        """Initialize empty, with the upper bounds of the buckets."""
+        self._buckets = buckets
+        # One count per bucket, then +Inf, then the sum of the observations.
+        self._values = _ThreadCells(len(buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        """Count an observation in its bucket."""
+        cell = self._values.cell()
+        cell[bisect.bisect_left(self._buckets, value)] += 1
+        cell[-1] += value
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        """Return the cumulative buckets, sum and count of the histogram."""
+        totals = self._values.totals()
+        samples: list[tuple[str, dict[str, str], float]] = []
+        cumulative = 0.0
+        for bound, count in zip((*self._buckets, math.inf), totals, strict=False):
+            cumulative += count
+            samples.append(("_bucket", {"le": _format_bound(bound)}, cumulative))
+        samples.append(("_sum", {}, totals[-1]))
+        samples.append(("_count", {}, cumulative))
+        return samples
+
+
+Child = CounterChild | GaugeChild | HistogramChild
+
+
+class Metric[C: Child]:
+    """A named metric, with a child per combination of label values."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        kind: MetricType,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...] = (),
+    ) -> None:
+        """Initialize the metric.
+
+        Raises:
+            ValueError: If the name is not a valid Prometheus metric name
+        """
+        if not METRIC_NAME.match(name):
+            raise ValueError(f"Invalid metric name {name!r}.")
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._children: dict[tuple[str, ...], C] = {}
+
+    def labels(self, *values: object) -> C:
+        """Return the child of the given label values, in the order of the names.
+
+        Raises:
+            ValueError: If the number of values differs from the label names
+        """
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is not None:
+            return child
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}.")
+        with self._lock:
+            return self._children.setdefault(key, self._new_child())
+
+    def _new_child(self) -> Any:  # noqa: ANN401
+        if self.kind == "counter":
+            return CounterChild()
+        if self.kind == "gauge":
+            return GaugeChild()
+        return HistogramChild(self.buckets)
+
+    def collect(self) -> dict[str, Any]:
+        """Return the current samples of the metric, as a serializable family."""
+        with self._lock:
+            children = list(self._children.items())
+        samples = [
+            [
+                self.name + suffix,
+                {**dict(zip(self.labelnames, key, strict=True)), **extra},
+                value,
+            ]
+            for key, child in children
+            for suffix, extra, value in child.samples()
+        ]
+        return {
+            "name": self.name,
+            "help": self.documentation,
+            "type": self.kind,
+            "samples": samples,
+        }
+
+
+class MetricsRegistry:
+    """The metrics of a process.
+
+    Metrics are created on first use and returned as is afterwards, so that
+    modules may declare the metrics they update at import time.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without metrics."""
+        self._lock = threading.Lock()
+        self._metrics: dict[str, Metric[Any]] = {}
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> Metric[CounterChild]:
+        """Return the counter of this name, created if needed."""
+        return self._get(name, documentation, "counter", tuple(labelnames))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> Metric[GaugeChild]:
+        """Return the gauge of this name, created if needed."""
+        return self._get(name, documentation, "gauge", tuple(labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Metric[HistogramChild]:
+        """Return the histogram of this name, created if needed."""
+        return self._get(name, documentation, "histogram", tuple(labelnames), buckets)
+
+    def _get(
+        self,
+        name: str,
+        documentation: str,
+        kind: MetricType,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...] = (),
+    ) -> Metric[Any]:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = Metric(name, documentation, kind, labelnames, buckets)
+                self._metrics[name] = metric
+            elif metric.kind != kind or metric.labelnames != labelnames:
+                raise ValueError(f"Metric {name!r} exists with another type or labels.")
+            return metric
+
+    def collect(self) -> list[dict[str, Any]]:
+        """Return the samples of every metric, by family."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return [metric.collect() for metric in metrics]
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == math.inf else repr(float(bound))
+
+
+# The registry of this process.
+registry = MetricsRegistry()
@@ -0,0 +1,94 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from infra.metrics.exposition import merge, render
+from infra.metrics.registry import MetricsRegistry
+
+
+class MetricsRegistryTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.registry = MetricsRegistry()
+
+    def _samples(self) -> dict[tuple[str, tuple[tuple[str, str], ...]], float]:
+        return {
+            (name, tuple(sorted(labels.items()))): value
+            for family in self.registry.collect()
+            for name, labels, value in family["samples"]
+        }
+
+    def test_counter_sums_the_threads(self) -> None:
+        counter = self.registry.counter("jobs", "Jobs done.", ("kind",))
+
+        def work() -> None:
+            for _ in range(1000):
+                counter.labels("a").inc()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.labels("b").inc(2.5)
+
+        samples = self._samples()
+        self.assertEqual(samples["jobs_total", (("kind", "a"),)], 4000)
+        self.assertEqual(samples["jobs_total", (("kind", "b"),)], 2.5)
+
+    def test_cells_of_ended_threads_are_folded(self) -> None:
+        histogram = self.registry.histogram("latency", "Latency.", buckets=(1.0,))
+        child = histogram.labels()
+
+        for _ in range(3):
+            thread = threading.Thread(target=child.observe, args=(0.5,))
+            thread.start()
+            thread.join()
+        child.observe(2.0)
+
+        samples = self._samples()
+        self.assertEqual(samples["latency_bucket", (("le", "1.0"),)], 3)
+        self.assertEqual(samples["latency_count", ()], 4)
+        # Only the cell of this thread, which is still running, is kept.
+        self.assertEqual(len(child._values._cells), 1)  # noqa: SLF001
+
+    def test_gauge(self) -> None:
+        gauge = self.registry.gauge("queue_size", "Items queued.")
+        gauge.labels().set(5)
+        gauge.labels().inc()
+        gauge.labels().dec(2)
+
+        self.assertEqual(self._samples()["queue_size", ()], 4)
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        histogram = self.registry.histogram("latency", "Latency.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.labels().observe(value)
+
+        samples = self._samples()
+        self.assertEqual(samples["latency_bucket", (("le", "0.1"),)], 2)
+        self.assertEqual(samples["latency_bucket", (("le", "1.0"),)], 3)
+        self.assertEqual(samples["latency_bucket", (("le", "+Inf"),)], 4)
+        self.assertEqual(samples["latency_count", ()], 4)
+        self.assertAlmostEqual(samples["latency_sum", ()], 3.65)
+
+    def test_metrics_are_declared_once(self) -> None:
+        counter = self.registry.counter("jobs", "Jobs done.", ("kind",))
+        self.assertIs(self.registry.counter("jobs", "Jobs done.", ("kind",)), counter)
+        with self.assertRaises(ValueError):
+            self.registry.gauge("jobs", "Jobs done.")
+        with self.assertRaises(ValueError):
+            counter.labels("a", "b")
+        with self.assertRaises(ValueError):
+            self.registry.counter("not a name", "Invalid.")
+
+    def test_render_and_merge(self) -> None:
+        counter = self.registry.counter("jobs", "Jobs\ndone.", ("kind",))
+        counter.labels('say "hi"').inc()
+        snapshot = self.registry.collect()
+
+        self.assertEqual(
+            render(merge([snapshot, snapshot])),
+            "# HELP jobs Jobs\\ndone.\n"
+            "# TYPE jobs counter\n"
+            'jobs_total{kind="say \\"hi\\""} 2\n',
+        )
@@ -0,0 +1,73 @@
+import inspect
+import random
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponseBase
+
+from infra.profiling.profiler import (
+    dump_name,
+    is_valid_token,
+    profile_call,
+    profiling_settings,
+)
+
+
+class ProfilingMiddleware:
+    """Profile the view of sampled requests, or of requests asking for it.
+
+    A request is profiled when it bears a valid token from `profile_token` in
+    the `HEADER` header, or at random with probability `SAMPLE_RATE`. The
+    view, and only the view, then runs under cProfile and tracemalloc and its
+    profiles are written to `DIRECTORY`, for `profile_report` to rank. Async
+    views and requests arriving while another is profiled run unprofiled.
+    Not used unless `PROFILING["ENABLED"]`.
+
+    Listed last in MIDDLEWARE, so that the other middleware's `process_view`
+    still run.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        """Initialize the middleware, unless profiling is disabled."""
+        self.config = profiling_settings()
+        if not self.config["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.directory = Path(self.config["DIRECTORY"])
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        """Handle the request; profiling happens in `process_view`."""
+        return self.get_response(request)
+
+    def process_view(
+        self,
+        request: HttpRequest,
+        view_func: Callable[..., HttpResponseBase],
+        view_args: tuple[Any, ...],
+        view_kwargs: dict[str, Any],
+    ) -> HttpResponseBase | None:
+        """Run the view under the profilers if the request is to be profiled."""
+        if inspect.iscoroutinefunction(view_func) or not self._wants_profile(request):
+            return None
+        if len(list(self.directory.glob("*.prof"))) >= self.config["MAX_DUMPS"]:
+            return None
+
+        match = request.resolver_match
+        view = (match.view_name or match._func_path) if match else "unmatched"
+        response, _ = profile_call(
+            lambda: view_func(request, *view_args, **view_kwargs),
+            self.directory,
+            dump_name(view),
+            self.config,
+            {"view": view, "method": request.method, "path": request.path},
+        )
+        return response
+
+    def _wants_profile(self, request: HttpRequest) -> bool:
+        token = request.headers.get(self.config["HEADER"])
+        if token:
+            return is_valid_token(token, self.config["TOKEN_MAX_AGE"])
+        # Not for security: sampling.
+        return random.random() < float(self.config["SAMPLE_RATE"])  # noqa: S311
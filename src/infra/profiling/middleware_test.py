@@ -0,0 +1,57 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models import CompanyModel
+from infra.profiling.profiler import make_token
+
+
+class ProfilingMiddlewareTest(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        CompanyModel.objects.create(name="Company")
+
+    def profiling(self, **options: object) -> dict[str, object]:
+        return {"ENABLED": True, "DIRECTORY": self.directory, **options}
+
+    def test_profiles_requests_with_a_token(self) -> None:
+        with self.settings(PROFILING=self.profiling()):
+            response = self.client.get("/api/deals/", headers={"X-Profile": make_token()})
+
+        self.assertEqual(response.status_code, 200)
+        (stats,) = self.directory.glob("*.prof")
+        dump = json.loads(stats.with_name(f"{stats.stem}.alloc.json").read_text())
+        self.assertEqual(dump["view"], "deal-list-create")
+        self.assertEqual(dump["path"], "/api/deals/")
+        self.assertGreater(dump["peak_bytes"], 0)
+        self.assertTrue(dump["allocations"])
+
+        report = io.StringIO()
+        call_command("profile_report", directory=self.directory, stdout=report)
+        self.assertIn("1 request(s) profiled", report.getvalue())
+        self.assertIn("views.py", report.getvalue())
+
+    def test_ignores_invalid_tokens(self) -> None:
+        with self.settings(PROFILING=self.profiling(SAMPLE_RATE=1.0)):
+            self.client.get("/api/deals/", headers={"X-Profile": "profile:forged:sig"})
+
+        self.assertFalse(list(self.directory.iterdir()))
+
+    def test_samples_requests(self) -> None:
+        with self.settings(PROFILING=self.profiling(SAMPLE_RATE=1.0, MAX_DUMPS=2)):
+            for _ in range(3):
+                self.client.get("/api/deals/")
+
+        self.assertEqual(len(list(self.directory.glob("*.prof"))), 2)
+
+    def test_disabled(self) -> None:
+        with self.settings(PROFILING=self.profiling(ENABLED=False, SAMPLE_RATE=1.0)):
+            self.client.get("/api/deals/", headers={"X-Profile": make_token()})
+
+        self.assertFalse(list(self.directory.iterdir()))
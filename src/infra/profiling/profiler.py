@@ -0,0 +1,142 @@
+import cProfile
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+
+DEFAULT_PROFILING_SETTINGS: dict[str, Any] = {
+    "ENABLED": False,
+    "DIRECTORY": None,  # Defaults to BASE_DIR / "var" / "profiles"
+    # Share of the requests profiled at random, from 0 to 1.
+    "SAMPLE_RATE": 0.0,
+    # Requests bearing a token from `profile_token` in this header are profiled.
+    "HEADER": "X-Profile",
+    "TOKEN_MAX_AGE": 3600,  # Seconds a token stays valid
+    "MAX_DUMPS": 1000,  # Profiles kept in DIRECTORY before profiling stops
+    "TOP_ALLOCATIONS": 25,  # Source lines with the largest allocations kept
+    "TRACEMALLOC_FRAMES": 1,  # Frames kept by tracemalloc per allocation
+}
+
+TOKEN_SALT = "infra.profiling"  # noqa: S105
+TOKEN_VALUE = "profile"  # noqa: S105
+
+
+def profiling_settings() -> dict[str, Any]:
+    """Return `PROFILING` completed with the defaults.
+
+    Raises:
+        ImproperlyConfigured: If the sample rate is not between 0 and 1
+    """
+    config = {**DEFAULT_PROFILING_SETTINGS, **getattr(settings, "PROFILING", {})}
+    if not 0 <= config["SAMPLE_RATE"] <= 1:
+        raise ImproperlyConfigured("PROFILING['SAMPLE_RATE'] must be between 0 and 1.")
+    if config["DIRECTORY"] is None:
+        config["DIRECTORY"] = Path(settings.BASE_DIR) / "var" / "profiles"
+    return config
+
+
+def make_token() -> str:
+    """Return a token requesting profiles, signed with the secret key."""
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(TOKEN_VALUE)
+
+
+def is_valid_token(token: str, max_age: int) -> bool:
+    """Return whether a token comes from `make_token` and is recent enough."""
+    try:
+        return (
+            signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=max_age)
+            == TOKEN_VALUE
+        )
+    except signing.BadSignature:
+        return False
+
+
+# Allocations of the profilers themselves.
+PROFILER_FRAMES = (
+    tracemalloc.Filter(inclusive=False, filename_pattern=cProfile.__file__),
+    tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),
+)
+
+# Only one profiler may run at a time in a process.
+_profiling = threading.Lock()
+
+
+def profile_call[T](
+    call: Callable[[], T],
+    directory: Path,
+    name: str,
+    config: dict[str, Any],
+    metadata: dict[str, Any] | None = None,
+) -> tuple[T, Path | None]:
+    """Run a call under cProfile and tracemalloc, then dump both profiles.
+
+    Writes `<name>.prof`, the pstats of the call, and `<name>.alloc.json`,
+    the metadata, its peak traced memory and the source lines which allocated
+    the most memory still held when it returned. Allocations are traced for
+    the whole process, so those of other threads may appear.
+
+    Returns:
+        The result of the call, and the path of the pstats file; None when the
+        call ran unprofiled because another profile was running
+    """
+    if not _profiling.acquire(blocking=False):
+        return call(), None
+    try:
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start(config["TRACEMALLOC_FRAMES"])
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot().filter_traces(PROFILER_FRAMES)
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            result = profiler.runcall(call)
+        finally:
+            duration = time.perf_counter() - start
+            after = tracemalloc.take_snapshot().filter_traces(PROFILER_FRAMES)
+            peak = tracemalloc.get_traced_memory()[1]
+            if not tracing:
+                tracemalloc.stop()
+
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{name}.prof"
+        profiler.dump_stats(path)
+        allocations = [
+            {
+                "file": stat.traceback[0].filename,
+                "line": stat.traceback[0].lineno,
+                "size": stat.size_diff,
+                "count": stat.count_diff,
+            }
+            for stat in after.compare_to(before, "lineno")[: config["TOP_ALLOCATIONS"]]
+        ]
+        (directory / f"{name}.alloc.json").write_text(
+            json.dumps(
+                {
+                    **(metadata or {}),
+                    "name": name,
+                    "duration_ms": round(duration * 1000, 3),
+                    "peak_bytes": peak,
+                    "allocations": allocations,
+                }
+            )
+        )
+        return result, path
+    finally:
+        _profiling.release()
+
+
+def dump_name(view: str) -> str:
+    """Return a unique, sortable name for the dumps of a request to a view."""
+    stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%f")
+    safe_view = "".join(char if char.isalnum() or char in "-_." else "_" for char in view)
+    return f"{stamp}-{safe_view}-{os.getpid()}-{threading.get_ident()}"
@@ -0,0 +1,105 @@
+import json
+import pstats
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+from django.conf import settings
+
+SortKey = Literal["cumtime", "tottime"]
+
+
+@dataclass(frozen=True)
+class FunctionCost:
+    """Time spent in a function, summed over the profiled requests."""
+
+    function: str
+    calls: int
+    tottime: float
+    cumtime: float
+
+
+@dataclass(frozen=True)
+class AllocationSite:
+    """Memory allocated by a source line, summed over the profiled requests."""
+
+    location: str
+    size: int
+    count: int
+    requests: int
+
+
+def load_dumps(directory: Path, view: str | None = None) -> list[dict[str, Any]]:
+    """Return the metadata of the profiles in a directory, oldest first.
+
+    Args:
+        directory: Directory the profiles were written to
+        view: Keep only the profiles of this view
+    """
+    dumps = []
+    for path in sorted(directory.glob("*.alloc.json")):
+        dump = json.loads(path.read_text())
+        if view is None or dump.get("view") == view:
+            dumps.append({**dump, "stats": path.with_name(f"{dump['name']}.prof")})
+    return [dump for dump in dumps if dump["stats"].exists()]
+
+
+def hottest_functions(
+    dumps: list[dict[str, Any]], sort: SortKey = "cumtime", limit: int = 30
+) -> tuple[list[FunctionCost], float]:
+    """Rank the functions of the profiles by the time spent in them.
+
+    Returns:
+        The most costly functions, and the total time profiled in seconds
+    """
+    if not dumps:
+        return [], 0.0
+    stats = pstats.Stats(*(str(dump["stats"]) for dump in dumps))
+    costs = [
+        FunctionCost(
+            function=function_name(*function),
+            calls=calls,
+            tottime=tottime,
+            cumtime=cumtime,
+        )
+        # Keyed by (file, line, name): (primitive calls, calls, tottime, cumtime, callers)
+        for function, (_, calls, tottime, cumtime, _) in stats.stats.items()  # type: ignore[attr-defined]
+    ]
+    costs.sort(key=lambda cost: getattr(cost, sort), reverse=True)
+    return costs[:limit], stats.total_tt  # type: ignore[attr-defined]
+
+
+def largest_allocations(
+    dumps: list[dict[str, Any]], limit: int = 30
+) -> list[AllocationSite]:
+    """Rank the source lines of the profiles by the memory they allocated."""
+    sizes: dict[str, list[int]] = defaultdict(lambda: [0, 0, 0])
+    for dump in dumps:
+        for allocation in dump["allocations"]:
+            totals = sizes[f"{short_path(allocation['file'])}:{allocation['line']}"]
+            totals[0] += allocation["size"]
+            totals[1] += allocation["count"]
+            totals[2] += 1
+    sites = [
+        AllocationSite(location=location, size=size, count=count, requests=requests)
+        for location, (size, count, requests) in sizes.items()
+    ]
+    sites.sort(key=lambda site: site.size, reverse=True)
+    return sites[:limit]
+
+
+def function_name(filename: str, line: int, name: str) -> str:
+    """Return the name of a profiled function, with its short path and line."""
+    if (filename, line) == ("~", 0):
+        # A built-in function, e.g. "<built-in method time.sleep>".
+        return f"{{{name[1:-1]}}}" if name.startswith("<") else name
+    return f"{short_path(filename)}:{line}({name})"
+
+
+def short_path(filename: str) -> str:
+    """Return a source path relative to the project or to its site-packages."""
+    _, separator, package_path = filename.rpartition("site-packages/")
+    if separator:
+        return package_path
+    return filename.removeprefix(f"{settings.BASE_DIR}/")